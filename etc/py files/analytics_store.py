@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Columnar analytics store compiled from backend/data/results.json and users.json
+Each column is a flat little-endian binary file (one value per result, answer or user) that
+is memory-mapped with NumPy, so an analytics script loads the store in milliseconds instead of
+re-parsing the JSON. userId, chapterId, quizId, schoolCollege and the answer letters are
+dictionary-encoded (codes index the lists in meta.json) and the per-answer isCorrect flags are
+bit-packed. Recompiling appends only results submitted after the last compiled submittedAt;
+users.json is re-read only when it changed
+"""
+
+import argparse
+import os
+import shutil
+import time
+from datetime import datetime
+
+import numpy as np
+
+from json_stream import iter_items
+from scan_cache import CACHE_DIR, load_cache, save_cache
+from student_reports import DATA_DIR
+
+STORE_VERSION = "1"
+STORE_DIR = os.path.join(CACHE_DIR, "analytics")
+FLUSH_RESULTS = 50000  # results buffered before their columns are appended to disk
+
+# Column name -> dtype. Codes of dictionary-encoded columns are -1 when the value is missing
+RESULT_COLUMNS = {"user": "<i4", "chapter": "<i2", "quiz": "<i2", "score": "<i2", "total": "<i2",
+                  "percentage": "<f4", "submitted": "<i8", "answer_start": "<i8"}
+ANSWER_COLUMNS = {"question": "<i2", "choice": "<i2", "key": "<i2"}
+USER_COLUMNS = {"school": "<i4", "created": "<i8"}
+CORRECT_BITS = "answer_correct.bits"  # isCorrect of every answer, 8 per byte (little bit order)
+DICTIONARIES = ("users", "chapters", "quizzes", "schools", "choices")
+
+
+def millis(value):
+    """ISO timestamp ('2025-11-18T12:47:07.702Z') -> ms since the epoch, 0 if missing or invalid"""
+    try:
+        return int(datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        return 0
+
+
+def _number(value, default=0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Dictionary:
+    """Append-only value -> code mapping (values compared as strings); codes never change"""
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+
+    def code(self, value):
+        if value is None or value == "":
+            return -1
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def _source(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _column_path(store_dir, table, name):
+    return os.path.join(store_dir, f"{table}_{name}.bin")
+
+
+def _truncate(path, size):
+    """Cut off what an interrupted compile appended after the last saved meta.json"""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        os.truncate(path, size)
+
+
+def _append(path, values, dtype):
+    with open(path, "ab") as f:
+        f.write(np.asarray(values, dtype=dtype).tobytes())
+
+
+def _append_bits(path, count, flags):
+    """Append booleans to a bit-packed file that already holds `count` bits"""
+    bits = np.asarray(flags, dtype=np.uint8)
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+        f.seek(count // 8)
+        if count % 8:  # complete the partial last byte
+            last = np.frombuffer(f.read(1), dtype=np.uint8)
+            bits = np.concatenate([np.unpackbits(last, bitorder="little")[:count % 8], bits])
+            f.seek(count // 8)
+        f.write(np.packbits(bits, bitorder="little").tobytes())
+        f.truncate()
+
+
+class _ResultBuffer:
+    """Result and answer rows collected in lists and appended to the column files in blocks"""
+    def __init__(self, store_dir, counts):
+        self.store_dir = store_dir
+        self.counts = counts
+        self.results = {name: [] for name in RESULT_COLUMNS}
+        self.answers = {name: [] for name in ANSWER_COLUMNS}
+        self.correct = []
+
+    def add(self, result, dictionaries):
+        columns = self.results
+        answers = result.get("answers") or []
+        columns["user"].append(dictionaries["users"].code(result.get("userId")))
+        columns["chapter"].append(dictionaries["chapters"].code(result.get("chapterId")))
+        columns["quiz"].append(dictionaries["quizzes"].code(result.get("quizId")))
+        columns["score"].append(int(_number(result.get("score"))))
+        columns["total"].append(int(_number(result.get("totalQuestions"), len(answers))))
+        columns["percentage"].append(_number(result.get("percentage")))
+        columns["submitted"].append(millis(result.get("submittedAt")))
+        columns["answer_start"].append(self.counts["answers"] + len(self.correct))
+        choices = dictionaries["choices"]
+        for answer in answers:
+            self.answers["question"].append(int(_number(answer.get("questionId"), -1)))
+            self.answers["choice"].append(choices.code(answer.get("userAnswer")))
+            self.answers["key"].append(choices.code(answer.get("correctAnswer")))
+            self.correct.append(bool(answer.get("isCorrect")))
+        if len(columns["user"]) >= FLUSH_RESULTS:
+            self.flush()
+
+    def flush(self):
+        results = len(self.results["user"])
+        for name, dtype in RESULT_COLUMNS.items():
+            _append(_column_path(self.store_dir, "result", name), self.results[name], dtype)
+            self.results[name] = []
+        for name, dtype in ANSWER_COLUMNS.items():
+            _append(_column_path(self.store_dir, "answer", name), self.answers[name], dtype)
+            self.answers[name] = []
+        _append_bits(os.path.join(self.store_dir, CORRECT_BITS), self.counts["answers"], self.correct)
+        self.counts["results"] += results
+        self.counts["answers"] += len(self.correct)
+        self.correct = []
+
+
+def _add_results(data_dir, store_dir, meta, dictionaries):
+    """Append the results submitted after the last compile; returns how many were added"""
+    # Results at exactly the previous watermark are told apart by id
+    watermark, compiled_ids = meta["last_submitted"], set(meta["last_ids"])
+    last, last_ids = watermark, set(compiled_ids)
+    buffer = _ResultBuffer(store_dir, meta["counts"])
+    added = 0
+    for result in iter_items(os.path.join(data_dir, "results.json"), "results"):
+        submitted = millis(result.get("submittedAt"))
+        result_id = str(result.get("id"))
+        if submitted < watermark or submitted == watermark and result_id in compiled_ids:
+            continue
+        if submitted > last:
+            last, last_ids = submitted, set()
+        if submitted == last:
+            last_ids.add(result_id)
+        buffer.add(result, dictionaries)
+        added += 1
+    buffer.flush()
+    meta["last_submitted"], meta["last_ids"] = last, sorted(last_ids)
+    return added
+
+
+def _read_users(data_dir, dictionaries):
+    """{user code: (school code, created ms)} for every account in users.json"""
+    rows = {}
+    for user in iter_items(os.path.join(data_dir, "users.json"), "users"):
+        rows[dictionaries["users"].code(user.get("id"))] = (dictionaries["schools"].code(user.get("schoolCollege")),
+                                                            millis(user.get("createdAt")))
+    return rows
+
+
+def _write_users(store_dir, count, rows=None):
+    """Rewrite the user columns for `count` user codes (results of deleted accounts get -1 / 0)
+    With rows=None the compiled columns are kept and padded for the codes new results added"""
+    school = np.full(count, -1, dtype=USER_COLUMNS["school"])
+    created = np.zeros(count, dtype=USER_COLUMNS["created"])
+    if rows is None:
+        for name, values in (("school", school), ("created", created)):
+            compiled = np.fromfile(_column_path(store_dir, "user", name), dtype=values.dtype)
+            values[:len(compiled)] = compiled
+    else:
+        for code, (school_code, created_ms) in rows.items():
+            school[code], created[code] = school_code, created_ms
+    for name, values in (("school", school), ("created", created)):
+        path = _column_path(store_dir, "user", name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(values.tobytes())
+        os.replace(tmp, path)
+
+
+def compile_store(data_dir=DATA_DIR, store_dir=STORE_DIR, rebuild=False):
+    """Bring the store up to date with the JSON files; returns (results added, total results)"""
+    meta_path = os.path.join(store_dir, "meta.json")
+    meta = load_cache(meta_path, STORE_VERSION)
+    if rebuild or "counts" not in meta or meta.get("data_dir") != os.path.abspath(data_dir):
+        shutil.rmtree(store_dir, ignore_errors=True)
+        meta = {"version": STORE_VERSION, "data_dir": os.path.abspath(data_dir),
+                "counts": {"results": 0, "answers": 0, "users": 0}, "last_submitted": -1, "last_ids": [],
+                "dictionaries": {name: [] for name in DICTIONARIES}, "sources": {}}
+    os.makedirs(store_dir, exist_ok=True)
+    counts = meta["counts"]
+    for name, dtype in RESULT_COLUMNS.items():
+        _truncate(_column_path(store_dir, "result", name), counts["results"] * np.dtype(dtype).itemsize)
+    for name, dtype in ANSWER_COLUMNS.items():
+        _truncate(_column_path(store_dir, "answer", name), counts["answers"] * np.dtype(dtype).itemsize)
+    _truncate(os.path.join(store_dir, CORRECT_BITS), (counts["answers"] + 7) // 8)
+
+    dictionaries = {name: Dictionary(values) for name, values in meta["dictionaries"].items()}
+    sources = {name: _source(os.path.join(data_dir, name)) for name in ("results.json", "users.json")}
+    # Users first, so user codes follow users.json order however the results were appended
+    rows = None
+    if sources["users.json"] != meta["sources"].get("users.json"):
+        rows = _read_users(data_dir, dictionaries)
+    added = 0
+    if sources["results.json"] != meta["sources"].get("results.json"):
+        added = _add_results(data_dir, store_dir, meta, dictionaries)
+    if rows is not None or len(dictionaries["users"].values) != counts["users"]:
+        _write_users(store_dir, len(dictionaries["users"].values), rows)
+        counts["users"] = len(dictionaries["users"].values)
+    meta["dictionaries"] = {name: dictionary.values for name, dictionary in dictionaries.items()}
+    meta["sources"] = sources
+    save_cache(meta_path, meta)
+    return added, counts["results"]
+
+
+class AnalyticsStore:
+    """Read-only view of a compiled store; columns are memory-mapped when first used"""
+    def __init__(self, store_dir=STORE_DIR):
+        meta = load_cache(os.path.join(store_dir, "meta.json"), STORE_VERSION)
+        if "counts" not in meta:
+            raise FileNotFoundError(f"No analytics store in {store_dir} (run analytics_store.py)")
+        self.store_dir = store_dir
+        self.counts = meta["counts"]
+        self.dictionaries = meta["dictionaries"]
+        self.last_submitted = meta["last_submitted"]
+        self._columns = {}
+
+    def _map(self, path, dtype, count):
+        if not count:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count,))
+
+    def column(self, table, name):
+        """One column ('result', 'answer' or 'user' table) as a read-only array"""
+        key = (table, name)
+        if key not in self._columns:
+            dtype = {"result": RESULT_COLUMNS, "answer": ANSWER_COLUMNS, "user": USER_COLUMNS}[table][name]
+            count = self.counts[table + "s"]
+            self._columns[key] = self._map(_column_path(self.store_dir, table, name), dtype, count)
+        return self._columns[key]
+
+    def correct(self):
+        """isCorrect of every answer (bool array, unpacked from the bits)"""
+        count = self.counts["answers"]
+        bits = self._map(os.path.join(self.store_dir, CORRECT_BITS), np.uint8, (count + 7) // 8)
+        return np.unpackbits(bits, count=count, bitorder="little").astype(bool)
+
+    def answer_result(self):
+        """Result index of every answer"""
+        key = ("answer", "result")
+        if key not in self._columns:
+            starts = self.column("result", "answer_start")
+            lengths = np.diff(np.append(starts, self.counts["answers"]))
+            self._columns[key] = np.repeat(np.arange(len(starts)), lengths)
+        return self._columns[key]
+
+    def decode(self, dictionary, codes):
+        """Dictionary codes -> values (None for -1)"""
+        values = self.dictionaries[dictionary]
+        return [values[code] if code >= 0 else None for code in np.asarray(codes).tolist()]
+
+
+def print_summary(store):
+    """Attempts and pass rate per chapter and per school, straight from the columns"""
+    chapter = store.column("result", "chapter")
+    passed = store.column("result", "percentage") >= 50
+    chapters = store.dictionaries["chapters"]
+    attempts = np.bincount(chapter[chapter >= 0], minlength=len(chapters))
+    passes = np.bincount(chapter[chapter >= 0], weights=passed[chapter >= 0], minlength=len(chapters))
+    print(f"{'chapter':<10}{'attempts':>10}{'pass rate':>11}")
+    for code, value in sorted(enumerate(chapters), key=lambda item: _number(item[1])):
+        if attempts[code]:
+            print(f"{value:<10}{attempts[code]:>10}{passes[code] / attempts[code]:>10.0%}")
+
+    school = store.column("user", "school")[store.column("result", "user")]
+    schools = store.dictionaries["schools"]
+    attempts = np.bincount(school[school >= 0], minlength=len(schools))
+    passes = np.bincount(school[school >= 0], weights=passed[school >= 0], minlength=len(schools))
+    print(f"\n{'school/college':<30}{'attempts':>10}{'pass rate':>11}")
+    for code in np.argsort(-attempts)[:10]:
+        if attempts[code]:
+            print(f"{schools[code][:29]:<30}{attempts[code]:>10}{passes[code] / attempts[code]:>10.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile users.json / results.json into the columnar analytics store")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with users.json and results.json")
+    parser.add_argument("--store", default=STORE_DIR, help="store directory")
+    parser.add_argument("--rebuild", action="store_true", help="recompile from scratch instead of appending")
+    args = parser.parse_args()
+
+    print("🚀 Compiling analytics store...\n")
+    start = time.perf_counter()
+    added, total = compile_store(args.data_dir, args.store, args.rebuild)
+    print(f"✅ {added} new results appended ({total} in the store) in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    store = AnalyticsStore(args.store)
+    store.column("result", "chapter"), store.column("result", "percentage")
+    print(f"⏱️  Store opened in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+    print_summary(store)
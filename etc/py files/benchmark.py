@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the flowchart renderer and the report pipelines
+- graphs: synthetic flowcharts (flowchart_golden.synthetic_flowchart) of 10 to 50k nodes at several
+  edge densities; build, layout, routing, drawing and save are timed separately
+- pipelines: synthetic datasets (synthetic_data.write_dataset) of 1k to 1M quiz attempts; every
+  pipeline (analytics store, item analysis, funnel, traffic, student reports) is timed per phase
+Each case runs --repeat times (the fastest run is kept) and once more under tracemalloc for the
+peak memory of every phase. Every phase runs under a --budget of seconds: one that overruns it is
+interrupted and fails the run (the case's later phases don't run). Results are written as JSON;
+--compare checks them against a stored baseline. The exit status is 1 on any phase over budget or,
+with --compare, any phase that got slower or bigger than --tolerance allows.
+Datasets are cached in .cache/benchmark/ so repeated runs don't regenerate them
+Usage: python benchmark.py [--preset quick|full] [--graphs 10,100] [--densities 1.5] [--datasets 1000]
+                           [--pipelines store,funnel] [--budget 60] [--output FILE] [--compare [BASELINE]]
+                           [--save-baseline]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import signal
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from flowchart_batch import apply_batch_arguments
+from flowchart_golden import synthetic_flowchart
+from scan_cache import CACHE_DIR
+from synthetic_data import DATASET_VERSION, write_dataset
+
+BENCH_DIR = os.path.join(CACHE_DIR, "benchmark")
+BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_VERSION = "2"  # bump when cases or their inputs change; other baselines are not compared
+
+PRESETS = {
+    "quick": {"graphs": (10, 50, 500), "densities": (1.0, 2.0), "datasets": (1000, 10000)},
+    "full": {"graphs": (10, 50, 100, 1000, 10000, 50000), "densities": (1.0, 1.5, 3.0),
+             "datasets": (1000, 10000, 100000, 1000000)},
+}
+PIPELINES = ("store", "items", "funnel", "traffic", "reports")
+BUDGET = 60.0  # seconds per phase; a phase over it fails the run
+REPORT_SAMPLE = 100  # student reports rendered per dataset (the per-report time is what matters)
+
+TOLERANCE = 0.25          # allowed slowdown / memory growth against the baseline
+MIN_SECONDS = 0.005       # differences below this are noise
+MIN_BYTES = 1 << 20
+
+
+# Cases --------------------------------------------------------------------------
+def graph_phases(nodes, density, routing):
+    """[(phase, func)] for one synthetic graph; phases share state through the closure"""
+    from reportlab.pdfgen import canvas
+    from flowchart_layout import layout_flowchart
+    from flowchart_render import render_flowchart
+    from flowchart_route import route_flowchart
+    state = {}
+
+    def build():
+        state["chart"] = synthetic_flowchart(0, nodes, placed=False, density=density, routing=routing)
+
+    def layout():
+        layout_flowchart(state["chart"])
+
+    def route():
+        route_flowchart(state["chart"])
+
+    def draw():
+        chart = state["chart"]
+        chart.routing = "straight"  # already routed above: edges keep their waypoints, render skips the router
+        state["canvas"] = canvas.Canvas(io.BytesIO(), pagesize=chart.pagesize, invariant=True)
+        render_flowchart(chart, state["canvas"])
+
+    def save():
+        state["bytes"] = len(state["canvas"].getpdfdata())
+
+    phases = [("build", build), ("layout", layout)]
+    if routing == "orthogonal":
+        phases.append(("route", route))
+    phases += [("draw", draw), ("save", save)]
+    return phases, state
+
+
+def dataset_dir(attempts):
+    """A cached synthetic dataset with `attempts` results (written on first use)"""
+    data_dir = os.path.join(BENCH_DIR, f"data_v{DATASET_VERSION}_{attempts}")
+    if not os.path.exists(os.path.join(data_dir, "complete")):
+        start = time.perf_counter()
+        students, results = write_dataset(data_dir, attempts)
+        open(os.path.join(data_dir, "complete"), "w").close()
+        print(f"📁 dataset {attempts:,}: {students:,} students, {results:,} results "
+              f"({time.perf_counter() - start:.1f}s)")
+    return data_dir
+
+
+def pipeline_phases(name, data_dir, work_dir):
+    """[(phase, func)] of one pipeline over a dataset; caches and outputs go to work_dir"""
+    state = {}
+    store_dir = os.path.join(work_dir, "store")
+
+    def chapters():
+        from student_reports import load_chapters
+        return load_chapters(data_dir)
+
+    def quizzes():
+        with open(os.path.join(data_dir, "quizzes.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    if name == "store":
+        from analytics_store import compile_store
+        return [("compile", lambda: compile_store(data_dir, store_dir, rebuild=True))], state
+    if name == "items":
+        from analytics_store import AnalyticsStore, compile_store
+        from item_analysis import analyze, render_item_analysis
+
+        compile_store(data_dir, store_dir)  # setup, timed by the store pipeline
+
+        def analysis():
+            state["analysis"] = analyze(AnalyticsStore(store_dir), quizzes())
+        return [("analyze", analysis),
+                ("render", lambda: render_item_analysis(state["analysis"], chapters(), io.BytesIO()))], state
+    if name == "funnel":
+        from chapter_funnel import render_funnel, update_funnel
+
+        def aggregate():
+            state["funnel"] = update_funnel(data_dir, os.path.join(work_dir, "funnel.json"), rebuild=True)[0]
+        return [("aggregate", aggregate),
+                ("render", lambda: render_funnel(state["funnel"], chapters(), io.BytesIO()))], state
+    if name == "traffic":
+        from flowchart_output import render_pdf
+        from flowchart_traffic import build_traffic_flowchart, student_traffic
+
+        def count():
+            state["traffic"] = student_traffic(data_dir, os.path.join(work_dir, "traffic.json"), rebuild=True)
+        return [("count", count), ("render", lambda: render_pdf(build_traffic_flowchart(*state["traffic"]),
+                                                                invariant=True))], state
+    if name == "reports":
+        from render_server import StudentIndex
+        from student_reports import render_report
+
+        def index():
+            state["index"] = StudentIndex(data_dir)
+            state["index"].refresh()
+
+        def render():
+            students = state["index"]
+            for user_id in list(students.users)[:REPORT_SAMPLE]:
+                render_report(*students.student(user_id), students.chapters, io.BytesIO())
+        return [("index", index), (f"render_{REPORT_SAMPLE}", render)], state
+    raise ValueError(f"unknown pipeline {name}")
+
+
+# Runner ---------------------------------------------------------------------------
+class OverBudget(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise OverBudget()
+
+
+def run_budgeted(func, budget):
+    """func() interrupted with OverBudget after `budget` seconds; where there are no interval timers
+    (Windows) it runs to the end and only then raises OverBudget if it took too long"""
+    if not hasattr(signal, "setitimer"):
+        start = time.perf_counter()
+        func()
+        if time.perf_counter() - start > budget:
+            raise OverBudget()
+        return
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        func()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_phases(phases, traced=False, budget=None):
+    """Run (phase, func) in order; returns ({phase: seconds or traced peak bytes}, the phase that
+    overran `budget` or None). Phases after an overrun don't run: they need its results"""
+    measured = {}
+    for name, func in phases:
+        if traced:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            func()
+            measured[name] = tracemalloc.get_traced_memory()[1] - base
+            continue
+        start = time.perf_counter()
+        try:
+            if budget:
+                run_budgeted(func, budget)
+            else:
+                func()
+        except OverBudget:
+            return measured, name
+        measured[name] = time.perf_counter() - start
+    return measured, None
+
+
+def measure(make_phases, repeat, budget=BUDGET):
+    """Best-of-`repeat` seconds and traced peak bytes per phase of one case. The timed runs have
+    `budget` seconds per phase; the traced run (slower under tracemalloc) only repeats the phases
+    that kept to it"""
+    runs, over = [], None
+    for _ in range(repeat):
+        seconds, over = run_phases(make_phases()[0], budget=budget)
+        runs.append(seconds)
+        if over:
+            break
+    done = runs[-1]
+    tracemalloc.start()
+    try:
+        peaks = run_phases([(name, func) for name, func in make_phases()[0] if name in done], traced=True)[0]
+    finally:
+        tracemalloc.stop()
+    phases = {name: {"seconds": round(min(run[name] for run in runs), 6), "peak_bytes": peaks[name]}
+              for name in done}
+    if over:
+        phases[over] = {"over_budget": budget}
+        for name, _ in make_phases()[0]:
+            phases.setdefault(name, {"not_run": True})
+    return phases
+
+
+def over_budget(results):
+    """'case/phase' of every phase that overran its budget"""
+    return [f"{name}/{phase}" for name, case in results["cases"].items()
+            for phase, value in case["phases"].items() if "over_budget" in value]
+
+
+def run_suite(graphs, densities, routings, datasets, pipelines, repeat, budget=BUDGET):
+    cases = {}
+    for nodes in graphs:
+        for density in densities:
+            for routing in routings:
+                name = f"graph/{nodes}/{density:g}/{routing}"
+                cases[name] = {"params": {"nodes": nodes, "density": density, "routing": routing},
+                               "phases": measure(lambda: graph_phases(nodes, density, routing), repeat, budget)}
+                print_case(name, cases[name])
+    for attempts in datasets:
+        data_dir = dataset_dir(attempts)
+        for pipeline in pipelines:
+            name = f"{pipeline}/{attempts}"
+            work_dir = tempfile.mkdtemp(prefix="kla_bench_")
+            try:
+                cases[name] = {"params": {"pipeline": pipeline, "attempts": attempts},
+                               "phases": measure(lambda: pipeline_phases(pipeline, data_dir, work_dir), repeat,
+                                                 budget)}
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+            print_case(name, cases[name])
+    return {"version": RESULTS_VERSION, "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "repeat": repeat, "budget": budget, "cases": cases}
+
+
+def print_case(name, case):
+    parts = []
+    for phase, value in case["phases"].items():
+        if "over_budget" in value:
+            parts.append(f"{phase} ❌ over the {value['over_budget']:g}s budget")
+        elif value.get("not_run"):
+            parts.append(f"{phase} not run")
+        else:
+            parts.append(f"{phase} {value['seconds'] * 1000:.1f} ms / {value['peak_bytes'] / 1e6:.1f} MB")
+    print(f"⏱️  {name:<28} " + ", ".join(parts), flush=True)
+
+
+# Baseline comparison -----------------------------------------------------------------
+def compare(results, baseline, tolerance=TOLERANCE):
+    """(regressions, improvements) as printable lines; phases missing or not measured on either side
+    are ignored (over-budget phases fail the run on their own)"""
+    regressions, improvements = [], []
+    for name, case in results["cases"].items():
+        before_case = baseline.get("cases", {}).get(name)
+        if not before_case:
+            continue
+        for phase, now in case["phases"].items():
+            before = before_case["phases"].get(phase)
+            if not before or "seconds" not in now or "seconds" not in before:
+                continue
+            for key, unit, scale, floor in (("seconds", "ms", 1000, MIN_SECONDS), ("peak_bytes", "MB", 1e-6, MIN_BYTES)):
+                old, new = before[key], now[key]
+                if abs(new - old) < floor:
+                    continue
+                line = f"{name}/{phase}: {key} {old * scale:.1f} -> {new * scale:.1f} {unit} ({new / old if old else float('inf'):.2f}x)"
+                if new > old * (1 + tolerance):
+                    regressions.append(line)
+                elif new < old / (1 + tolerance):
+                    improvements.append(line)
+    return regressions, improvements
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save(path, results):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def _sizes(text):
+    return tuple(int(float(v)) for v in text.split(",")) if text else ()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and measure the flowchart renderer and report pipelines")
+    parser.add_argument("--preset", choices=PRESETS, default="quick", help="default sizes (quick: seconds, full: hours)")
+    parser.add_argument("--graphs", help="comma-separated graph sizes in nodes (e.g. 10,100,1e3); '' = none")
+    parser.add_argument("--densities", help="comma-separated edges per node")
+    parser.add_argument("--routing", default="straight,orthogonal", help="straight, orthogonal or both")
+    parser.add_argument("--datasets", help="comma-separated dataset sizes in quiz attempts; '' = none")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help=f"any of {', '.join(PIPELINES)}")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (the fastest counts)")
+    parser.add_argument("--budget", type=float, default=BUDGET,
+                        help="seconds per phase; a phase over it is interrupted and fails the run")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results.json"), help="JSON results file")
+    parser.add_argument("--compare", nargs="?", const=BASELINE, metavar="BASELINE",
+                        help="compare with a baseline (default: the saved one) and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    args.deterministic = True  # no wall-clock stamps in anything that is timed
+    apply_batch_arguments(args)
+
+    preset = PRESETS[args.preset]
+    graphs = preset["graphs"] if args.graphs is None else _sizes(args.graphs)
+    densities = tuple(float(v) for v in args.densities.split(",")) if args.densities else preset["densities"]
+    datasets = preset["datasets"] if args.datasets is None else _sizes(args.datasets)
+    pipelines = [p for p in args.pipelines.split(",") if p]
+    unknown = set(pipelines) - set(PIPELINES)
+    if unknown:
+        parser.error(f"unknown pipeline(s): {', '.join(sorted(unknown))}")
+
+    print(f"🚀 Benchmark: graphs {graphs} x densities {densities}, datasets {datasets} x {', '.join(pipelines)}\n")
+    start = time.perf_counter()
+    results = run_suite(graphs, densities, args.routing.split(","), datasets, pipelines, args.repeat,
+                        args.budget)
+    _save(args.output, results)
+    failures = over_budget(results)
+    print(f"\n{'❌' if failures else '✅'} {len(results['cases'])} cases in {time.perf_counter() - start:.1f}s: "
+          f"{args.output}")
+    if args.save_baseline:
+        _save(BASELINE, results)
+        print(f"📁 Baseline saved: {BASELINE}")
+    for line in failures:
+        print(f"❌ {line}: over the {args.budget:g}s budget")
+    if not args.compare:
+        sys.exit(1 if failures else 0)
+    if not os.path.exists(args.compare):
+        print(f"❌ No baseline at {args.compare} (run with --save-baseline)")
+        sys.exit(1)
+    baseline = _load(args.compare)
+    if baseline.get("version") != RESULTS_VERSION:
+        print(f"❌ Baseline {args.compare} is version {baseline.get('version')}, not {RESULTS_VERSION} "
+              f"(re-run with --save-baseline)")
+        sys.exit(1)
+    regressions, improvements = compare(results, baseline, args.tolerance)
+    for line in improvements:
+        print(f"   ✅ {line}")
+    for line in regressions:
+        print(f"   ❌ {line}")
+    print(f"\n{len(regressions)} regressions, {len(improvements)} improvements "
+          f"(tolerance {args.tolerance:.0%}) against {args.compare}")
+    sys.exit(1 if regressions or failures else 0)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Static call-graph indexer for frontend/js (student.js, admin.js, app.js, api.js)
+Builds a symbol table of function definitions, their call sites (including inline
+onclick="fn()" handlers in rendered HTML) and the API endpoint each fetch() hits,
+so the flowcharts list the function chains the frontend really has.
+Per-file results are cached by mtime/size (and content hash) in .cache/callgraph_index.json
+"""
+
+import os
+import re
+from collections import deque
+
+from js_tokens import tokenize, comment_text
+from scan_cache import CACHE_DIR, SCRIPT_DIR, cached_scan
+
+FRONTEND_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "frontend", "js"))
+CACHE_PATH = os.path.join(CACHE_DIR, "callgraph_index.json")
+INDEX_VERSION = 2
+SOURCE_FILES = ("api.js", "app.js", "student.js", "admin.js")
+
+# Template prefixes that evaluate to the backend's /api base URL
+API_BASES = ("window.API_URL", "API_BASE_URL")
+# Request helpers: name -> (url prefix, index of the method argument)
+FETCH_WRAPPERS = {"apiRequest": ("/api", 1)}
+
+_NOT_CALLS = {"if", "for", "while", "switch", "catch", "function", "return", "typeof", "await",
+              "new", "delete", "void", "in", "of", "super", "import"}
+_HANDLER_ATTR = re.compile(r"\bon[a-z]+\s*=\s*[\"']\s*(?:return\s+)?([A-Za-z_$][\w$]*)\s*\(")
+_TEMPLATE_EXPR = re.compile(r"\$\{[^}]*\}")
+
+
+class FrontendFunction:
+    """One function definition with its outgoing calls and API requests"""
+    def __init__(self, name, params, file, line, end_line, description=""):
+        self.name = name
+        self.params = params
+        self.file = file
+        self.line = line
+        self.end_line = end_line
+        self.description = description
+        self.calls = []       # resolved callee names, in source order, no duplicates
+        self.requests = []    # (verb, path) pairs, in source order
+        self.unresolved = []  # api.x.y() calls with no matching definition
+
+    @property
+    def signature(self):
+        return self.name if self.name.startswith("<") else f"{self.name}({self.params})"
+
+    def __repr__(self):
+        return f"FrontendFunction({self.name!r}, {self.file}:{self.line})"
+
+
+def _partners(code):
+    """Map every bracket index to the index of its matching bracket"""
+    partner = {}
+    stack = []
+    for i, t in enumerate(code):
+        if t.kind != "punct":
+            continue
+        if t.value in "([{":
+            stack.append(i)
+        elif t.value in ")]}" and stack:
+            j = stack.pop()
+            partner[i], partner[j] = j, i
+    return partner
+
+
+def _expression_end(code, partner, start):
+    """Index of the last token of an arrow function's expression body starting at `start`"""
+    i = start
+    while i < len(code):
+        t = code[i]
+        if t.kind == "punct":
+            if t.value in "([{" and i in partner:
+                i = partner[i] + 1
+                continue
+            if t.value in ",;)]}":
+                return i - 1
+        i += 1
+    return len(code) - 1
+
+
+def _function_at(code, partner, i):
+    """If a function expression starts at code[i], return (params, body_start, body_end) else None"""
+    if i < len(code) and code[i].value == "async":
+        i += 1
+    if i >= len(code):
+        return None
+    if code[i].value == "function":
+        i += 1
+        if i < len(code) and code[i].kind == "name":
+            i += 1
+        if i >= len(code) or code[i].value != "(" or i not in partner:
+            return None
+        close = partner[i]
+        params = (i + 1, close)
+        i = close + 1
+    elif code[i].value == "(" and i in partner and partner[i] + 1 < len(code) and code[partner[i] + 1].value == "=>":
+        params = (i + 1, partner[i])
+        i = partner[i] + 2
+    elif code[i].kind == "name" and i + 1 < len(code) and code[i + 1].value == "=>":
+        params = (i, i + 1)
+        i += 2
+    else:
+        return None
+    if i < len(code) and code[i].value == "{" and i in partner:
+        return params, i, partner[i]
+    return params, i, _expression_end(code, partner, i)
+
+
+def _params_text(code, span):
+    text = ""
+    for t in code[span[0]:span[1]]:
+        value = t.value if t.kind != "string" else f"'{t.value}'"
+        text += value + (" " if t.value in (",", "=") else "")
+    return text.replace(" =", "=").replace("= ", "=").strip()
+
+
+def _normalize_url(raw, base=""):
+    """'${window.API_URL}/auth/user/${id}' -> '/api/auth/user/:param' (None if not an API URL)"""
+    url = raw
+    for name in API_BASES:
+        url = url.replace("${" + name + "}", "/api")
+    url = _TEMPLATE_EXPR.sub(":param", url).split("?")[0]
+    url = re.sub(r"^[a-z]+://[^/]+", "", url)
+    if base and not url.startswith(base + "/"):
+        url = base + url
+    return url if url.startswith("/") else None
+
+
+def _request_at(code, partner, i):
+    """(verb, path) for a fetch()/wrapper call whose name token is code[i], else None"""
+    name = code[i].value
+    if i + 2 >= len(code) or code[i + 1].value != "(" or code[i + 2].kind not in ("string", "template"):
+        return None
+    close = partner.get(i + 1, len(code) - 1)
+    if name == "fetch":
+        url = _normalize_url(code[i + 2].value)
+        verb = "GET"
+        for j in range(i + 3, close - 2):
+            if code[j].value == "method" and code[j + 1].value == ":" and code[j + 2].kind == "string":
+                verb = code[j + 2].value.upper()
+                break
+    else:
+        base, method_arg = FETCH_WRAPPERS[name]
+        url = _normalize_url(code[i + 2].value, base)
+        args, depth, verb = 0, 0, "GET"
+        for j in range(i + 2, close):
+            value = code[j].value
+            if code[j].kind == "punct" and value in "([{":
+                depth += 1
+            elif code[j].kind == "punct" and value in ")]}":
+                depth -= 1
+            elif value == "," and depth == 0:
+                args += 1
+                if args == method_arg and code[j + 1].kind == "string":
+                    verb = code[j + 1].value.upper()
+    return (verb, url) if url else None
+
+
+def scan_source(source):
+    """Extract function definitions, call sites and API requests from one JS file"""
+    tokens = tokenize(source)
+    code = [t for t in tokens if t.kind != "comment"]
+    partner = _partners(code)
+    n = len(code)
+
+    # The comment directly above a definition describes it
+    comments = {}
+    for t in tokens:
+        if t.kind == "comment":
+            comments[t.line + t.value.count("\n")] = comment_text(t)
+
+    # Named object literals (const api = { chapters: {...} }) give methods qualified names
+    objects = []  # (open, close, name)
+    for i in range(n - 2):
+        if code[i].kind == "name" and code[i + 1].value in ("=", ":") and code[i + 2].value == "{":
+            if code[i + 1].value == "=" or any(o < i < c for o, c, _ in objects):
+                objects.append((i + 2, partner.get(i + 2, n - 1), code[i].value))
+
+    def qualified(i, name):
+        owners = [obj for obj in objects if obj[0] < i < obj[1]]
+        return ".".join([obj[2] for obj in sorted(owners)] + [name])
+
+    # Definitions: [name, params, line, end_line, description, body_start, body_end]
+    defs = []
+    for i in range(n):
+        t = code[i]
+        found = name = None
+        if t.value == "function" and i + 1 < n and code[i + 1].kind == "name" and (i == 0 or code[i - 1].value != "="):
+            name = code[i + 1].value
+            found = _function_at(code, partner, i)
+        elif t.kind == "name" and i + 2 < n and code[i + 1].value in ("=", ":") and (i == 0 or code[i - 1].value != "?"):
+            found = _function_at(code, partner, i + 2)
+            if found:
+                name = t.value
+                if code[i + 1].value == ":":
+                    name = qualified(i, name)
+                else:  # window.onclick = function ...
+                    j = i
+                    while j >= 2 and code[j - 1].value == "." and code[j - 2].kind == "name":
+                        j -= 2
+                        name = code[j].value + "." + name
+        elif t.value == "addEventListener" and i + 4 < n and code[i + 2].kind == "string" and code[i + 3].value == ",":
+            found = _function_at(code, partner, i + 4)
+            if found:
+                target = ""
+                if code[i - 2].value == ")" and code[i - 3].kind == "string":
+                    target = "#" + code[i - 3].value + " "
+                name = f"<{target}{code[i + 2].value}>"
+        if found:
+            params, body_start, body_end = found
+            defs.append([name, _params_text(code, params), t.line, code[body_end].line,
+                         comments.get(t.line - 1, ""), body_start, body_end])
+
+    # Event handlers registered inside another function are folded into it
+    defs = [d for d in defs if not (d[0].startswith("<") and any(
+        o[5] < d[5] and d[6] <= o[6] for o in defs if o is not d))]
+
+    # Nested callbacks belong to the innermost enclosing definition
+    def owner(i):
+        best = None
+        for d in defs:
+            if d[5] <= i <= d[6] and (best is None or d[5] > best[5]):
+                best = d
+        return best[0] if best else "<top-level>"
+
+    calls, requests = [], []
+    for i, t in enumerate(code):
+        if t.kind in ("string", "template"):
+            for m in _HANDLER_ATTR.finditer(t.value):
+                calls.append([owner(i), m.group(1), t.line])
+            continue
+        if t.kind != "name" or i + 1 >= n or code[i + 1].value != "(":
+            continue
+        member = i > 0 and code[i - 1].value in (".", "?.")
+        if t.value in _NOT_CALLS and not member:  # api.chapters.delete(id) is a call, delete(x) is not
+            continue
+        if i > 0 and code[i - 1].value == "function":
+            continue
+        name = t.value
+        j = i
+        while j >= 2 and code[j - 1].value in (".", "?.") and code[j - 2].kind == "name":
+            j -= 2
+            name = code[j].value + "." + name
+        if j > 0 and code[j - 1].value in (".", "?."):  # call on an expression result
+            continue
+        caller = owner(i)
+        calls.append([caller, name, t.line])
+        if name == "fetch" or name in FETCH_WRAPPERS:
+            request = _request_at(code, partner, i)
+            if request:
+                requests.append([caller, request[0], request[1], t.line])
+
+    namespaces = sorted({name for _, _, name in objects if any(d[0].startswith(name + ".") for d in defs)})
+    return {"defs": [d[:5] for d in defs], "calls": calls, "requests": requests, "namespaces": namespaces}
+
+
+def match_route(verb, path, routes):
+    """Best backend ApiRoute for a frontend request (literal segments beat :params), or None"""
+    segments = path.strip("/").split("/")
+    best, best_score = None, -1
+    for route in routes:
+        if route.verb not in (verb, "ALL"):
+            continue
+        route_segments = route.path.strip("/").split("/")
+        if len(route_segments) != len(segments):
+            continue
+        score = 0
+        for ours, theirs in zip(segments, route_segments):
+            if theirs.startswith(":"):
+                continue
+            if ours != theirs:
+                break
+            score += 1
+        else:
+            if score > best_score:
+                best, best_score = route, score
+    return best
+
+
+def build_index(frontend_dir=FRONTEND_DIR, cache_path=CACHE_PATH, files=SOURCE_FILES):
+    """Return {name: FrontendFunction} across all files, with calls resolved to known functions"""
+    rel_paths = [f for f in files if os.path.exists(os.path.join(frontend_dir, f))]
+    entries = cached_scan(frontend_dir, rel_paths, cache_path, INDEX_VERSION, scan_source)
+
+    functions = {}
+    for rel, entry in entries.items():
+        for name, params, line, end_line, description in entry["defs"]:
+            if name.startswith("<"):
+                name = f"{name[:-1]} {rel}>"
+            functions.setdefault(name, FrontendFunction(name, params, rel, line, end_line, description))
+    namespaces = {name for entry in entries.values() for name in entry["namespaces"]}
+
+    def lookup(rel, name):
+        if name.startswith("<"):
+            name = f"{name[:-1]} {rel}>"
+        for candidate in (name, name[len("window."):] if name.startswith("window.") else None):
+            if candidate in functions:
+                return functions[candidate]
+        return None
+
+    for rel, entry in entries.items():
+        for caller, callee, line in entry["calls"]:
+            source, target = lookup(rel, caller), lookup(rel, callee)
+            if target and target.name in FETCH_WRAPPERS:
+                continue
+            if source and target and target is not source and target.name not in source.calls:
+                source.calls.append(target.name)
+            elif source and not target and callee.split(".")[0] in namespaces and callee not in source.unresolved:
+                source.unresolved.append(callee)
+        for caller, verb, path, line in entry["requests"]:
+            source = lookup(rel, caller)
+            if source and (verb, path) not in source.requests:
+                source.requests.append((verb, path))
+    return functions
+
+
+def api_requests(functions, name, seen=None):
+    """(verb, path) pairs a function issues directly or through the functions it calls"""
+    seen = set() if seen is None else seen
+    if name in seen or name not in functions:
+        return []
+    seen.add(name)
+    func = functions[name]
+    result = list(func.requests)
+    for callee in func.calls:
+        if "." in callee:  # only follow request helpers (api.x.y), not the whole UI graph
+            result += [r for r in api_requests(functions, callee, seen) if r not in result]
+    return result
+
+
+def call_chain(functions, start, stop=None):
+    """Shortest call path from `start` to `stop`, or, without `stop` or when it is not reached,
+    to the function farthest from `start`. Breadth-first, so each function is visited once"""
+    if start not in functions:
+        return []
+    came = {start: None}
+    queue = deque([start])
+    while queue:
+        name = queue.popleft()
+        if name == stop:
+            break
+        for callee in functions[name].calls:
+            if "." not in callee and callee in functions and callee not in came:
+                came[callee] = name
+                queue.append(callee)
+    path = []
+    while name is not None:
+        path.append(name)
+        name = came[name]
+    return path[::-1]
+
+
+if __name__ == "__main__":
+    from route_index import scan_routes
+
+    routes = scan_routes()
+    index = build_index()
+    for func in sorted(index.values(), key=lambda f: (f.file, f.line)):
+        print(f"{func.file}:{func.line:<5} {func.signature}")
+        if func.calls:
+            print(f"{'':12}calls: {', '.join(func.calls)}")
+        for callee in func.unresolved:
+            print(f"{'':12}❌ {callee}() is not defined")
+        for verb, path in func.requests:
+            route = match_route(verb, path, routes)
+            print(f"{'':12}{verb} {path}  ->  {route.endpoint if route else '❌ no backend route'}")
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Per-chapter learning funnel: enrolled -> read -> attempted -> passed on the 1st attempt ->
+passed on the 2nd attempt -> locked out (failed both), overall and per schoolCollege
+A small group-by engine keeps running (chapter, school) aggregates together with the per-student
+facts behind them (school and chapters read from users.json, the first two attempts per chapter
+from results.json). New results are read from a saved cursor (json_stream.AppendedItems) and only
+the chapters they touch are updated; a changed users.json only re-counts the students that
+changed. Rendered as CHAPTER_FUNNEL.pdf next to the flowcharts, chapter titles in Kannada
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from flowchart_batch import apply_batch_arguments
+from flowchart_cache import build_time, deterministic, report_dir
+from json_stream import AppendedItems, iter_items
+from progress_rules import PASS_SCORE
+from scan_cache import CACHE_DIR, load_cache, save_cache
+from student_reports import DATA_DIR, LEFT, ROW, ReportPage
+
+FUNNEL_VERSION = "2"  # 2: cursors of CRLF files were off by one byte per line
+FUNNEL_CACHE = os.path.join(CACHE_DIR, "chapter_funnel.json")
+
+# Counted per (student, chapter); "enrolled" is the number of students and the same for every chapter
+STAGES = [("read", "Read"), ("attempted", "Attempted"), ("passed_first", "Passed 1st attempt"),
+          ("passed_second", "Passed 2nd attempt"), ("locked_out", "Locked out")]
+STAGE_COLORS = [colors.lightblue, colors.lightyellow, colors.lightgreen, colors.palegreen, colors.salmon]
+NO_SCHOOL = "(not given)"
+UNKNOWN_STUDENT = "(deleted accounts)"  # results whose user is not in users.json
+MAX_SCHOOLS = 15  # larger schools get a row each, the rest one "other schools" row
+
+SCHOOL_COLUMNS = [("School/College", 0), ("Enrolled", 8.5 * cm), ("Read", 10.6 * cm), ("Attempted", 13.0 * cm),
+                  ("Passed 1st", 15.4 * cm), ("Passed 2nd", 17.8 * cm), ("Locked out", 20.2 * cm)]
+BAR_LABEL_WIDTH = 4 * cm
+BAR_WIDTH = 14 * cm
+
+
+def school_of(user):
+    return " ".join(str(user.get("schoolCollege") or "").split()) or NO_SCHOOL
+
+
+class FunnelAggregates:
+    """Running funnel counts per (chapter, school) and the per-student facts they are derived from
+    Every update subtracts the old contribution of the (student, chapter) pairs it touches and adds
+    the new one, so the counts never have to be recomputed from scratch"""
+    def __init__(self, state=None):
+        state = state or {}
+        self.users = state.get("users", {})        # user id -> [school, [chapters read]]
+        self.attempts = state.get("attempts", {})  # "user|chapter" -> first two [submitted, percentage]
+        self.counts = state.get("counts", {})      # chapter -> school -> one count per stage
+        self.enrolled = state.get("enrolled", {})  # school -> students
+        self.user_chapters = {}                    # user id -> chapters with attempts (rebuilt, not saved)
+        for key in self.attempts:
+            user_id, chapter = key.rsplit("|", 1)
+            self.user_chapters.setdefault(user_id, set()).add(chapter)
+        self.changed = set()
+
+    def state(self):
+        return {"users": self.users, "attempts": self.attempts, "counts": self.counts, "enrolled": self.enrolled}
+
+    def stages(self, user_id, chapter):
+        """0/1 per stage for one (student, chapter) pair"""
+        user = self.users.get(user_id)
+        passed = [percentage >= PASS_SCORE for _, percentage in self.attempts.get(f"{user_id}|{chapter}", ())]
+        return [int(user is not None and chapter in user[1]), int(bool(passed)), int(passed[:1] == [True]),
+                int(passed == [False, True]), int(passed == [False, False])]
+
+    def _apply(self, user_id, chapter, sign):
+        stages = self.stages(user_id, chapter)
+        if not any(stages):
+            return
+        user = self.users.get(user_id)
+        schools = self.counts.setdefault(chapter, {})
+        school = user[0] if user else UNKNOWN_STUDENT
+        counts = schools.setdefault(school, [0] * len(STAGES))
+        for k, value in enumerate(stages):
+            counts[k] += sign * value
+        if not any(counts):
+            del schools[school]
+
+    def update_user(self, user_id, school, read):
+        """Set a student's school and chapters read (school None: the account is gone)"""
+        old = self.users.get(user_id)
+        new = None if school is None else [school, sorted(read)]
+        if old == new:
+            return
+        chapters = set(old[1] if old else ()) | set(read) | self.user_chapters.get(user_id, set())
+        for chapter in chapters:
+            self._apply(user_id, chapter, -1)
+        if old:
+            self.enrolled[old[0]] -= 1
+            if not self.enrolled[old[0]]:
+                del self.enrolled[old[0]]
+            del self.users[user_id]
+        if new:
+            self.users[user_id] = new
+            self.enrolled[school] = self.enrolled.get(school, 0) + 1
+        for chapter in chapters:
+            self._apply(user_id, chapter, +1)
+        self.changed |= chapters
+
+    def add_result(self, user_id, chapter, submitted, percentage):
+        """Record one quiz result; only the first two attempts of a chapter move the funnel"""
+        key = f"{user_id}|{chapter}"
+        attempts = self.attempts.get(key, [])
+        if len(attempts) == 2 and submitted >= attempts[1][0]:
+            return
+        self._apply(user_id, chapter, -1)
+        self.attempts[key] = sorted(attempts + [[submitted, percentage]])[:2]
+        self.user_chapters.setdefault(user_id, set()).add(chapter)
+        self._apply(user_id, chapter, +1)
+        self.changed.add(chapter)
+
+
+def _percentage(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def update_funnel(data_dir=DATA_DIR, cache_path=FUNNEL_CACHE, rebuild=False):
+    """Bring the saved aggregates up to date; returns (FunnelAggregates, new results)"""
+    cache = load_cache(cache_path, FUNNEL_VERSION)
+    saved = {} if rebuild else cache["files"]
+    results = AppendedItems(os.path.join(data_dir, "results.json"), "results", saved.get("cursor"))
+    if not results.resumed:  # results.json was rewritten: start over
+        saved = {}
+    funnel = FunnelAggregates(saved.get("state"))
+
+    users_file = os.path.join(data_dir, "users.json")
+    stat = os.stat(users_file)
+    source = [stat.st_mtime, stat.st_size]
+    users_changed = saved.get("users_source") != source
+    if users_changed:
+        seen = set()
+        for user in iter_items(users_file, "users"):
+            user_id = str(user.get("id"))
+            seen.add(user_id)
+            read = [str(chapter) for chapter, progress in (user.get("progress") or {}).items()
+                    if (progress or {}).get("hasRead")]
+            funnel.update_user(user_id, school_of(user), read)
+        for user_id in set(funnel.users) - seen:
+            funnel.update_user(user_id, None, ())
+
+    new_results = 0
+    for result in results:
+        if result.get("userId") is None or result.get("chapterId") is None:
+            continue
+        funnel.add_result(str(result["userId"]), str(result["chapterId"]), str(result.get("submittedAt") or ""),
+                          _percentage(result.get("percentage")))
+        new_results += 1
+    if users_changed or new_results or not results.resumed:
+        cache["files"] = {"cursor": results.cursor, "users_source": source, "state": funnel.state()}
+        save_cache(cache_path, cache)
+    return funnel, new_results
+
+
+# Report ------------------------------------------------------------------------
+def _share(count, total):
+    return f"{count:,} ({count / total:.0%})" if total else f"{count:,}"
+
+
+def school_rows(funnel, chapter):
+    """[(school, enrolled, stage counts)], largest schools first, the rest folded into one row"""
+    counts = funnel.counts.get(chapter, {})
+    schools = sorted(set(funnel.enrolled) | set(counts), key=lambda s: (-funnel.enrolled.get(s, 0), s))
+    known = [s for s in schools if s != UNKNOWN_STUDENT]
+    rows = [(s, funnel.enrolled.get(s, 0), counts.get(s, [0] * len(STAGES))) for s in known[:MAX_SCHOOLS]]
+    rest = known[MAX_SCHOOLS:]
+    if rest:
+        rows.append((f"Other schools ({len(rest)})", sum(funnel.enrolled.get(s, 0) for s in rest),
+                     [sum(counts.get(s, [0] * len(STAGES))[k] for s in rest) for k in range(len(STAGES))]))
+    if UNKNOWN_STUDENT in counts:
+        rows.append((UNKNOWN_STUDENT, 0, counts[UNKNOWN_STUDENT]))
+    return rows
+
+
+def render_funnel_bars(page, enrolled, totals):
+    """Horizontal funnel: one bar per stage, as a share of enrolled students"""
+    c = page.c
+    for label, count, color in [("Enrolled", enrolled, colors.lightgrey)] + \
+            [(name, totals[k], STAGE_COLORS[k]) for k, (_, name) in enumerate(STAGES)]:
+        page.need(ROW)
+        page.text(LEFT, label, "Helvetica", 9)
+        share = count / enrolled if enrolled else 0
+        c.setStrokeColor(colors.black)
+        c.setLineWidth(0.5)
+        c.setFillColor(color)
+        c.rect(LEFT + BAR_LABEL_WIDTH, page.y - 0.1 * cm, max(BAR_WIDTH * min(share, 1), 0.5), 0.4 * cm,
+               fill=1, stroke=1)
+        page.text(LEFT + BAR_LABEL_WIDTH + BAR_WIDTH + 0.3 * cm, _share(count, enrolled), "Helvetica", 9)
+        page.y -= ROW
+
+
+def render_funnel(funnel, chapters, filename, stamp=None):
+    width, height = landscape(A4)
+    c = canvas.Canvas(filename, pagesize=(width, height), invariant=deterministic())
+    c.setTitle("Chapter learning funnel")
+    page = ReportPage(c, "Kannada Learning App - Chapter Funnel", (width, height))
+    page.text(LEFT, "Chapter Learning Funnel", "Helvetica-Bold", 18)
+    page.y -= 0.6 * cm
+    if stamp is not None:
+        page.text(LEFT, f"Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}", "Helvetica", 9, colors.grey)
+    page.y -= 0.5 * cm
+    enrolled = sum(funnel.enrolled.values())
+    page.text(LEFT, f"{enrolled:,} students enrolled. Attempts are the first two quiz results per chapter "
+                    f"(pass >= {PASS_SCORE}%), also when an admin reset the quiz later; locked out = failed both. "
+                    f"Shares are of enrolled students.",
+              "Helvetica", 8, colors.grey)
+    page.y -= 0.4 * cm
+
+    titles = {str(chapter.get("id")): chapter for chapter in chapters}
+    ids = [str(chapter.get("id")) for chapter in chapters] + sorted(set(funnel.counts) - set(titles))
+    for chapter_id in ids:
+        chapter = titles.get(chapter_id, {})
+        page.heading(f"Chapter {chapter.get('chapterNumber', chapter_id)}: {chapter.get('title', '')}".rstrip(": "))
+        rows = school_rows(funnel, chapter_id)
+        totals = [sum(row[2][k] for row in rows) for k in range(len(STAGES))]
+        render_funnel_bars(page, enrolled, totals)
+        page.y -= 0.3 * cm
+        page.table_header(SCHOOL_COLUMNS)
+        for school, students, counts in rows:
+            page.row(SCHOOL_COLUMNS, [school, f"{students:,}"] + [_share(count, students) for count in counts],
+                     {6: colors.red} if counts[-1] else None)
+        page.header = None
+    c.showPage()
+    c.save()
+
+
+def generate_funnel(data_dir=DATA_DIR, output_dir=None, rebuild=False):
+    """Update the aggregates and write CHAPTER_FUNNEL.pdf into output_dir (default: report_dir());
+    returns its path"""
+    output_dir = output_dir or report_dir()
+    with open(os.path.join(data_dir, "chapters.json"), encoding="utf-8") as f:
+        chapters = sorted(json.load(f), key=lambda chapter: chapter.get("chapterNumber", 0))
+    start = time.perf_counter()
+    funnel, new_results = update_funnel(data_dir, rebuild=rebuild)
+    changed = ", ".join(sorted(funnel.changed, key=lambda k: (len(k), k))) or "none"
+    print(f"⏱️  {new_results:,} new results, {len(funnel.users):,} students in {time.perf_counter() - start:.2f}s "
+          f"(chapters updated: {changed})")
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, "CHAPTER_FUNNEL.pdf")
+    render_funnel(funnel, chapters, filename, build_time())
+    return filename
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-chapter learning funnel with a schoolCollege breakdown")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with chapters.json, users.json, results.json")
+    parser.add_argument("--output", help="directory for CHAPTER_FUNNEL.pdf (default: $KLA_OUTPUT_DIR or reports/)")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved aggregates and count everything again")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    print("🚀 Generating chapter funnel...\n")
+    try:
+        filename = generate_funnel(args.data_dir, args.output, args.rebuild)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Created: {filename}")
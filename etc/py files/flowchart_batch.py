@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Run independent chart/report jobs in one process or on a process pool
+Every job is timed and failures are collected instead of stopping the run
+"""
+
+import argparse
+import os
+import time
+import traceback
+
+# The flowchart generator scripts (each defines build_*flowchart* functions and a create_* per PDF)
+GENERATORS = ("generate_visual_flowcharts", "generate_flowcharts_visual", "generate_flowcharts")
+
+
+def run_task(name, func, args=()):
+    """Run one job and return its outcome (runs inside the worker process)"""
+    start = time.perf_counter()
+    try:
+        func(*args)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return {"name": name, "seconds": time.perf_counter() - start, "error": error}
+
+
+def run_charts(tasks, jobs=1):
+    """Run (name, func[, args]) tasks; jobs=1 stays in-process, jobs=0 uses every CPU"""
+    tasks = [(task[0], task[1], tuple(task[2]) if len(task) > 2 else ()) for task in tasks]
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(tasks) <= 1:
+        return [run_task(*task) for task in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor  # ~15 ms of imports only a pool needs
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as pool:
+        futures = [pool.submit(run_task, *task) for task in tasks]
+        results = []
+        for task, future in zip(tasks, futures):
+            try:
+                results.append(future.result())
+            except Exception:  # the worker itself died (pickling, crash)
+                results.append({"name": task[0], "seconds": 0.0, "error": traceback.format_exc()})
+        return results
+
+
+def report_results(results):
+    """Print per-chart timings and any failures; return True if everything succeeded"""
+    print("\n⏱️  Timings:")
+    for result in results:
+        status = "✅" if result["error"] is None else "❌"
+        print(f"   {status} {result['name']:<40} {result['seconds'] * 1000:8.1f} ms")
+
+    failures = [result for result in results if result["error"] is not None]
+    for result in failures:
+        print(f"\n❌ Error in {result['name']}:")
+        print(result["error"])
+    print(f"\n{len(results) - len(failures)}/{len(results)} succeeded, "
+          f"{sum(result['seconds'] for result in results):.2f}s total chart time")
+    return not failures
+
+
+def batch_arguments(description):
+    """Parser with the options every generator script's __main__ shares"""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="render charts in N worker processes (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="re-render even when the cached PDF matches the chart spec")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp "
+                             "(SOURCE_DATE_EPOCH is honoured)")
+    parser.add_argument("--kannada-font", metavar="TTF",
+                        help="TrueType font for Kannada text (default: Noto Sans Kannada / Nirmala UI if installed)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="lay out and record every chart without writing PDFs; print layout stats")
+    add_output_arguments(parser)
+    return parser
+
+
+def add_output_arguments(parser):
+    """--output-dir / --name-format / --no-compress, for scripts with their own parser"""
+    parser.add_argument("--output-dir", metavar="DIR", help="write the PDFs here instead of the app directory")
+    parser.add_argument("--name-format", metavar="FMT",
+                        help="output file name, e.g. '{stem}-nightly{ext}' ({stem}, {ext}, {name}: chart name)")
+    parser.add_argument("--no-compress", action="store_true",
+                        help="leave PDF page streams uncompressed (larger, diffable files)")
+
+
+def apply_batch_arguments(args):
+    """Export options workers need through the environment (inherited by the pool)"""
+    if args.deterministic:
+        os.environ["KLA_DETERMINISTIC"] = "1"
+    if args.kannada_font:
+        os.environ["KLA_KANNADA_FONT"] = os.path.abspath(args.kannada_font)
+    if getattr(args, "dry_run", False):
+        os.environ["KLA_DRY_RUN"] = "1"
+    if getattr(args, "output_dir", None):
+        os.environ["KLA_OUTPUT_DIR"] = os.path.abspath(args.output_dir)
+    if getattr(args, "name_format", None):
+        os.environ["KLA_OUTPUT_NAME"] = args.name_format
+    if getattr(args, "no_compress", False):
+        os.environ["KLA_COMPRESS"] = "0"
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Content-addressed incremental build cache for the generated flowchart PDFs
+A chart's spec (boxes, edges, styles, fonts, renderer version) is hashed before
+layout; if the manifest says the output file was built from the same hash it is skipped
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+from kannada_font import font_path, has_kannada
+from scan_cache import SCRIPT_DIR
+
+# Bump whenever flowchart_render/flowchart_layout output changes for the same spec
+RENDER_VERSION = "12"
+MANIFEST_NAME = ".flowchart_manifest.json"
+OUTPUT_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "reports"))  # default for every PDF
+OUTPUTS = []  # every chart file build_flowchart wrote or found fresh in this process (kla_charts stamps them)
+BUILT, FRESH, DRY_RUN = "built", "fresh", "dry-run"  # build_flowchart() results
+
+
+class OverlapError(Exception):
+    """A chart rendered with overlaps (edges through boxes, labels on boxes, ...); fails the build"""
+
+
+def deterministic():
+    """True when outputs must be byte-for-byte reproducible"""
+    return bool(os.environ.get("SOURCE_DATE_EPOCH") or os.environ.get("KLA_DETERMINISTIC"))
+
+
+def dry_run():
+    """True when charts are only laid out and recorded (--dry-run), never written"""
+    return bool(os.environ.get("KLA_DRY_RUN"))
+
+
+def compress_output():
+    """False when PDFs are written with uncompressed page streams (--no-compress)"""
+    return os.environ.get("KLA_COMPRESS", "1") != "0"
+
+
+def report_dir():
+    """Default directory for generated PDFs: KLA_OUTPUT_DIR (--output-dir) if set, else OUTPUT_DIR"""
+    return os.environ.get("KLA_OUTPUT_DIR") or OUTPUT_DIR
+
+
+def output_path(filename, name=None):
+    """Where a chart's PDF goes: KLA_OUTPUT_DIR replaces the directory of `filename` and
+    KLA_OUTPUT_NAME (a format string with {stem}, {ext}, {name}) its file name"""
+    directory, name_format = os.environ.get("KLA_OUTPUT_DIR"), os.environ.get("KLA_OUTPUT_NAME")
+    if not directory and not name_format:
+        return filename
+    # Callers may pass Windows paths, so split on either separator
+    old = re.split(r"[\\/]", filename)[-1]
+    base = old
+    if name_format:
+        stem, ext = os.path.splitext(old)
+        base = name_format.format(stem=stem, ext=ext, name=name or stem)
+    if directory:
+        return os.path.join(directory, base)
+    return filename[:len(filename) - len(old)] + base
+
+
+def build_time():
+    """Timestamp for 'Generated:' stamps; None means leave the stamp out (deterministic mode)"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    if os.environ.get("KLA_DETERMINISTIC"):
+        return None
+    return datetime.now()
+
+
+def _num(value):
+    return None if value is None else round(float(value), 3)
+
+
+def _color(color):
+    return color.hexval() if hasattr(color, "hexval") else str(color)
+
+
+def _kannada_fonts(chart):
+    """The Kannada TTFs a chart will embed (None if it has no Kannada text)"""
+    texts = ([b.text for b in chart.nodes.values()] + [str(b.style.get("heading", "")) for b in chart.nodes.values()]
+             + [e.label for e in chart.edges] + [k.label for k in chart.clusters.values()]
+             + [l.text for l in chart.labels])
+    if not any(has_kannada(text) for text in texts):
+        return None
+    return [font_path(), font_path(bold=True)]
+
+
+def chart_spec(chart):
+    """Plain, canonical description of everything that affects the rendered PDF"""
+    return {
+        "renderer": RENDER_VERSION,
+        "deterministic": deterministic(),
+        "compress": compress_output(),
+        "name": chart.name,
+        "title": chart.title,
+        "pagesize": [_num(v) for v in chart.pagesize],
+        "rankdir": chart.rankdir,
+        "routing": chart.routing,
+        "nodes": [[b.name, b.text, b.box_type, _color(b.color), _num(b.x), _num(b.y),
+                   _num(b.width), _num(b.height), b.page, b.cluster, sorted(b.style.items())]
+                  for b in chart.nodes.values()],
+        "edges": [[e.tail, e.head, e.label, [[_num(x), _num(y)] for x, y in e.points], e.page, _num(e.width),
+                   None if e.color is None else _color(e.color)]
+                  for e in chart.edges],
+        "clusters": [[k.name, k.label, k.page] for k in chart.clusters.values()],
+        "labels": [[l.text, _num(l.x), _num(l.y), l.font, _num(l.size), _color(l.color), l.page]
+                   for l in chart.labels if not l.volatile],
+        "kannada_fonts": _kannada_fonts(chart),
+    }
+
+
+def spec_hash(chart):
+    """sha256 of the canonical chart spec"""
+    data = json.dumps(chart_spec(chart), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _manifest_lock(path, timeout=30):
+    """Exclusive OS lock on path + ".lock" so parallel --jobs workers don't lose manifest updates
+    The OS drops it when the holder exits, so a killed run never leaves a stale lock behind;
+    raises TimeoutError if another live build holds it for longer than `timeout` seconds"""
+    fd = os.open(path + ".lock", os.O_CREAT | os.O_RDWR)
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if os.name == "nt":
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                else:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"{path}.lock held by another build for over {timeout}s")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def load_manifest(directory):
+    """Manifest maps spec hash -> {"file": output name, "bytes": size}"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _update_manifest(directory, digest, filename):
+    path = os.path.join(directory, MANIFEST_NAME)
+    with _manifest_lock(path):
+        manifest = load_manifest(directory)
+        # An output file holds exactly one build: drop older hashes pointing at it
+        manifest = {h: entry for h, entry in manifest.items() if entry["file"] != os.path.basename(filename)}
+        manifest[digest] = {"file": os.path.basename(filename), "bytes": os.path.getsize(filename)}
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+
+
+def is_fresh(chart, digest=None):
+    """True if chart.filename was already built from this exact spec"""
+    digest = digest or spec_hash(chart)
+    entry = load_manifest(os.path.dirname(chart.filename) or ".").get(digest)
+    return (entry is not None
+            and entry["file"] == os.path.basename(chart.filename)
+            and os.path.exists(chart.filename)
+            and os.path.getsize(chart.filename) == entry["bytes"])
+
+
+def build_flowchart(chart, force=False):
+    """Render chart unless its cached artifact is current; returns BUILT, FRESH (the cached PDF
+    matches) or DRY_RUN (--dry-run: laid out and recorded only, chart.stats has the layout stats)
+    Raises OverlapError if the chart has overlaps: the PDF and its report are written, but the
+    manifest is not updated, so the next run renders (and fails) again"""
+    if dry_run():
+        from flowchart_canvas import format_stats, layout_stats, record_chart
+        start = time.perf_counter()
+        ops = record_chart(chart)
+        chart.stats = format_stats(layout_stats(chart, ops), time.perf_counter() - start)
+        if chart.overlaps:
+            raise OverlapError(f"{chart.name}: {len(chart.overlaps)} overlaps\n"
+                               + "\n".join(f"   {overlap}" for overlap in chart.overlaps))
+        return DRY_RUN
+    chart.filename = output_path(chart.filename, chart.name)
+    if os.path.dirname(chart.filename):
+        os.makedirs(os.path.dirname(chart.filename), exist_ok=True)
+    digest = spec_hash(chart)
+    OUTPUTS.append(chart.filename)
+    if not force and is_fresh(chart, digest):
+        return FRESH
+    # The renderer's imports are only paid when something is actually drawn
+    from flowchart_render import render_flowchart
+    from flowchart_spatial import write_overlap_report
+    render_flowchart(chart, invariant=deterministic(), compress=compress_output())
+    report = write_overlap_report(chart)
+    if report:
+        raise OverlapError(f"{os.path.basename(chart.filename)}: {len(chart.overlaps)} overlaps, see {report}")
+    _update_manifest(os.path.dirname(chart.filename) or ".", digest, chart.filename)
+    return BUILT
+
+
+def build_message(chart, status, created=None):
+    """The line a generator prints for a build_flowchart() result (`created` replaces the BUILT line)"""
+    if status == DRY_RUN:
+        return f"📐 {chart.stats}"
+    if status == FRESH:
+        return f"⏭️  {os.path.basename(chart.filename)} up to date"
+    return created or f"✅ {os.path.basename(chart.filename)} created"
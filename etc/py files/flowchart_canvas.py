@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Canvas backends for flowchart_render.render_flowchart
+The renderer draws through a small subset of reportlab's Canvas (CANVAS_METHODS plus the path
+and text objects it hands out). A reportlab Canvas writes a PDF; RecordingCanvas implements
+the same subset by appending compact draw operations (shape, coordinates, text, style) to a
+list, without building any PDF objects. The op list is what golden checks diff and what
+--dry-run measures
+"""
+
+import difflib
+import json
+import os
+
+from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+
+CANVAS_METHODS = ("setFillColor", "setStrokeColor", "setLineWidth", "setFont", "beginPath", "drawPath",
+                  "beginText", "drawText", "drawString", "line", "rect", "roundRect", "ellipse",
+                  "saveState", "restoreState", "translate", "scale", "beginForm", "endForm", "doForm",
+                  "showPage", "save")
+DIGITS = 2  # coordinates are rounded so goldens don't churn on float noise
+
+
+def _num(value):
+    return round(float(value), DIGITS)
+
+
+def _color(color):
+    if isinstance(color, str):
+        color = colors.toColor(color)
+    return color.hexval()[2:] if hasattr(color, "hexval") else str(color)
+
+
+class RecordingPath:
+    """Path object: segments as ("M", x, y), ("L", x, y), ("Z",), ("R"/"E", x, y, w, h)"""
+    def __init__(self):
+        self.segments = []
+
+    def moveTo(self, x, y):
+        self.segments.append(("M", _num(x), _num(y)))
+
+    def lineTo(self, x, y):
+        self.segments.append(("L", _num(x), _num(y)))
+
+    def close(self):
+        self.segments.append(("Z",))
+
+    def rect(self, x, y, width, height):
+        self.segments.append(("R", _num(x), _num(y), _num(width), _num(height)))
+
+    def ellipse(self, x, y, width, height):
+        self.segments.append(("E", _num(x), _num(y), _num(width), _num(height)))
+
+
+class RecordingText:
+    """Text object: origin, font and fill changes and the strings shown"""
+    def __init__(self):
+        self.ops = []
+
+    def setFillColor(self, color):
+        self.ops.append(("fill", _color(color)))
+
+    def setFont(self, name, size, leading=None):
+        self.ops.append(("font", name, _num(size)))
+
+    def setTextOrigin(self, x, y):
+        self.ops.append(("at", _num(x), _num(y)))
+
+    def textOut(self, text):
+        self.ops.append(("show", text))
+
+
+class RecordingCanvas:
+    """Stand-in for reportlab's Canvas that records every draw operation in `ops`
+    Pages are separated by ("page",) ops; nothing is written unless save_ops() is called"""
+    def __init__(self, filename=None, pagesize=None, **options):
+        self.filename = filename
+        self.pagesize = pagesize
+        self.ops = []
+
+    def _op(self, *op):
+        self.ops.append(op)
+
+    def setTitle(self, title):
+        self._op("title", title)
+
+    def setFillColor(self, color):
+        self._op("fill", _color(color))
+
+    def setStrokeColor(self, color):
+        self._op("stroke", _color(color))
+
+    def setLineWidth(self, width):
+        self._op("width", _num(width))
+
+    def setFont(self, name, size, leading=None):
+        self._op("font", name, _num(size))
+
+    def beginPath(self):
+        return RecordingPath()
+
+    def drawPath(self, path, stroke=1, fill=0, fillMode=None):
+        self._op("path", tuple(path.segments), stroke, fill)
+
+    def beginText(self, x=0, y=0):
+        return RecordingText()
+
+    def drawText(self, text):
+        self._op("text", tuple(text.ops))
+
+    def drawString(self, x, y, text):
+        self._op("string", _num(x), _num(y), text)
+
+    def line(self, x1, y1, x2, y2):
+        self._op("line", _num(x1), _num(y1), _num(x2), _num(y2))
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        self._op("rect", _num(x), _num(y), _num(width), _num(height), stroke, fill)
+
+    def roundRect(self, x, y, width, height, radius, stroke=1, fill=0):
+        self._op("roundrect", _num(x), _num(y), _num(width), _num(height), _num(radius), stroke, fill)
+
+    def ellipse(self, x1, y1, x2, y2, stroke=1, fill=0):
+        self._op("ellipse", _num(x1), _num(y1), _num(x2), _num(y2), stroke, fill)
+
+    def saveState(self):
+        self._op("save")
+
+    def restoreState(self):
+        self._op("restore")
+
+    def translate(self, dx, dy):
+        self._op("translate", _num(dx), _num(dy))
+
+    def scale(self, x, y):
+        self._op("scale", _num(x), _num(y))
+
+    def beginForm(self, name, lowerx=0, lowery=0, upperx=None, uppery=None):
+        self._op("form", name)
+
+    def endForm(self):
+        self._op("endform")
+
+    def doForm(self, name):
+        self._op("use", name)
+
+    def showPage(self):
+        self._op("page")
+
+    def save(self):
+        pass
+
+
+def record_chart(chart, **options):
+    """Render a Flowchart into a RecordingCanvas (render_flowchart options pass through); returns its ops"""
+    from flowchart_render import render_flowchart
+    c = RecordingCanvas(chart.filename, chart.pagesize)
+    render_flowchart(chart, c, **options)
+    return c.ops
+
+
+# Layout stats (--dry-run) -----------------------------------------------------
+def _text_points(x, y, text, font):
+    yield x, y
+    if font is not None:
+        yield x + pdfmetrics.stringWidth(text, *font), y + font[1]
+
+
+def _op_points(op, font=None):
+    """Drawing-space points an op touches (before page transforms); font is the current (name, size)"""
+    kind = op[0]
+    if kind == "path":
+        for segment in op[1]:
+            if segment[0] in "ML":
+                yield segment[1:3]
+            elif segment[0] in "RE":
+                x, y, width, height = segment[1:]
+                yield x, y
+                yield x + width, y + height
+    elif kind in ("line", "ellipse"):
+        yield op[1:3]
+        yield op[3:5]
+    elif kind in ("rect", "roundrect"):
+        yield op[1:3]
+        yield op[1] + op[3], op[2] + op[4]
+    elif kind == "string":
+        yield from _text_points(op[1], op[2], op[3], font)
+    elif kind == "text":
+        x = y = 0
+        for text_op in op[1]:
+            if text_op[0] == "at":
+                x, y = text_op[1:]
+            elif text_op[0] == "font":
+                font = text_op[1:]
+            elif text_op[0] == "show":
+                yield from _text_points(x, y, text_op[1], font)
+                if font is not None:
+                    x += pdfmetrics.stringWidth(text_op[1], *font)
+
+
+def layout_stats(chart, ops):
+    """Numbers a --dry-run prints: sizes, draw ops and how much of each page the drawing covers"""
+    pages = []
+    page = {"ops": 0, "strings": 0, "box": None}
+    transform = font = None
+    for op in ops:
+        if op[0] == "page":
+            pages.append(page)
+            page = {"ops": 0, "strings": 0, "box": None}
+            transform = None
+            continue
+        page["ops"] += 1
+        if op[0] == "translate":
+            transform = (1, op[1], op[2])
+        elif op[0] == "scale" and transform:
+            transform = (op[1], transform[1], transform[2])
+        elif op[0] == "restore":
+            transform = None
+        elif op[0] == "font":
+            font = op[1:]
+        page["strings"] += sum(1 for text_op in op[1] if text_op[0] == "show") if op[0] == "text" \
+            else int(op[0] == "string")
+        scale, dx, dy = transform or (1, 0, 0)
+        for x, y in _op_points(op, font):
+            x, y = x * scale + dx, y * scale + dy
+            box = page["box"] or (x, y, x, y)
+            page["box"] = (min(box[0], x), min(box[1], y), max(box[2], x), max(box[3], y))
+    width, height = chart.pagesize
+    return {
+        "name": chart.name,
+        "pages": len(pages),
+        "nodes": len(chart.nodes),
+        "edges": len(chart.edges),
+        "ops": sum(p["ops"] for p in pages),
+        "strings": sum(p["strings"] for p in pages),
+        "overlaps": len(chart.overlaps),
+        "scale": min((t[0] for t in chart.transforms.values()), default=1.0),
+        "coverage": [round((b[2] - b[0]) * (b[3] - b[1]) / (width * height), 3) if b else 0.0
+                     for b in (p["box"] for p in pages)],
+        "off_page": sum(1 for p in pages if p["box"] and (p["box"][0] < -1 or p["box"][1] < -1
+                                                          or p["box"][2] > width + 1 or p["box"][3] > height + 1)),
+    }
+
+
+def format_stats(stats, seconds):
+    return (f"{stats['name']:<28} {stats['pages']:>3} pages {stats['nodes']:>4} nodes {stats['edges']:>4} edges "
+            f"{stats['ops']:>6} ops {stats['strings']:>5} strings  scale {stats['scale']:.2f}  "
+            f"coverage {'/'.join(f'{c:.0%}' for c in stats['coverage'])}  overlaps {stats['overlaps']}"
+            + (f"  OFF-PAGE {stats['off_page']}" if stats["off_page"] else "") + f"  {seconds * 1000:.1f} ms")
+
+
+# Goldens ----------------------------------------------------------------------
+def ops_lines(ops):
+    """One JSON line per op: stable, and readable in a diff"""
+    return [json.dumps(op, ensure_ascii=False, separators=(",", ":")) for op in ops]
+
+
+def save_ops(path, ops):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(ops_lines(ops)) + "\n")
+
+
+def load_ops_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def diff_ops(expected_lines, ops, name="golden", context=3):
+    """Unified diff between a golden op list and a new recording ([] when they match)"""
+    return list(difflib.unified_diff(expected_lines, ops_lines(ops), f"{name} (golden)", f"{name} (now)",
+                                     n=context, lineterm=""))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Golden op-list checks for the flowchart renderer
+Every chart of the generator scripts (and optionally N seeded synthetic charts) is rendered into
+flowchart_canvas.RecordingCanvas and its op list compared with the golden committed under goldens/
+(rewritten by --update-goldens); no PDF is written, so nothing touches the generators' output directories
+Usage: python flowchart_golden.py [--update-goldens] [--synthetic N] [--benchmark] [--golden-dir DIR]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+from flowchart_batch import apply_batch_arguments
+from flowchart_canvas import diff_ops, format_stats, layout_stats, load_ops_lines, record_chart, save_ops
+from flowchart_model import Flowchart
+from flowchart_output import render_pdf
+from render_stats import GENERATORS, chart_builders
+from scan_cache import SCRIPT_DIR
+
+GOLDEN_DIR = os.path.join(SCRIPT_DIR, "goldens")  # tracked, unlike .cache/
+DIFF_LINES = 40  # diff lines printed per failing chart
+
+BOX_TYPES = ("box", "diamond", "ellipse")
+BOX_COLORS = (colors.lightblue, colors.lightgreen, colors.lightyellow, colors.salmon, colors.yellow)
+LABELS = ("", "", "YES", "NO", "Read", "Quiz")
+
+
+def synthetic_flowchart(seed, nodes=12, placed=True, density=None, routing="auto"):
+    """A seeded random chart: a chain of steps with some jumps back and forth
+    placed=True puts the boxes on a grid; False leaves them to the auto-layout. With a density
+    (edges per node) random pairs, mostly forward, are joined until there are nodes * density edges"""
+    rng = random.Random(seed)
+    chart = Flowchart(f"synthetic_{seed}", f"Synthetic chart {seed}", f"synthetic_{seed}.pdf", routing=routing)
+    columns = 4
+    for k in range(nodes):
+        position = {}
+        if placed:
+            position = {"x": 1 * cm + (k % columns) * 6.5 * cm, "y": 2 * cm + (k // columns) * 3.5 * cm,
+                        "width": 3 * cm, "height": 1 * cm}
+        chart.node(f"n{k}", f"Step {k}\n{rng.choice(['Load', 'Check', 'Save', 'Show'])} data",
+                   rng.choice(BOX_TYPES), rng.choice(BOX_COLORS), **position)
+    for k in range(nodes - 1):
+        head = rng.randrange(nodes) if rng.random() < 0.3 else k + 1
+        if head != k:
+            chart.edge(f"n{k}", f"n{head}", rng.choice(LABELS))
+    for _ in range(max(0, round(nodes * (density or 0)) - len(chart.edges))):
+        tail, head = rng.randrange(nodes), rng.randrange(nodes)
+        if tail == head:
+            continue
+        if rng.random() < 0.8 and tail > head:
+            tail, head = head, tail
+        chart.edge(f"n{tail}", f"n{head}", rng.choice(LABELS))
+    return chart
+
+
+def golden_charts(synthetic=0):
+    """(golden name, chart builder) for every generator chart and `synthetic` synthetic charts"""
+    charts = [(f"{module}.{name}", builder) for module in GENERATORS for name, builder in chart_builders(module)]
+    charts += [(f"synthetic.{seed}", lambda seed=seed: synthetic_flowchart(seed)) for seed in range(synthetic)]
+    return charts
+
+
+def check(charts, golden_dir, update=False):
+    """Record every chart and compare with (or with update, replace) its golden; returns failures"""
+    failures = 0
+    for name, builder in charts:
+        ops = record_chart(builder())
+        path = os.path.join(golden_dir, f"{name}.ops")
+        if update:
+            save_ops(path, ops)
+            continue
+        if not os.path.exists(path):
+            print(f"❌ {name}: no golden (run with --update-goldens)")
+            failures += 1
+            continue
+        diff = diff_ops(load_ops_lines(path), ops, name)
+        if diff:
+            failures += 1
+            print(f"❌ {name}: op list changed")
+            for line in diff[:DIFF_LINES]:
+                print(f"   {line}")
+            if len(diff) > DIFF_LINES:
+                print(f"   ... {len(diff) - DIFF_LINES} more diff lines")
+    return failures
+
+
+def benchmark(charts, repeat=3):
+    """Per-chart time of building + recording vs building + rendering a PDF in memory"""
+    timings = {}
+    for mode, run in (("record", lambda builder: record_chart(builder())), ("pdf", lambda builder: render_pdf(builder(), invariant=True))):
+        for _, builder in charts:  # warm fonts and caches
+            run(builder)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for _, builder in charts:
+                run(builder)
+        timings[mode] = (time.perf_counter() - start) / (repeat * len(charts))
+    print(f"⏱️  {len(charts)} charts: record {timings['record'] * 1000:.2f} ms/chart "
+          f"({1 / timings['record']:.0f} charts/s), PDF {timings['pdf'] * 1000:.2f} ms/chart, "
+          f"{timings['pdf'] / timings['record']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare recorded flowchart op lists with their goldens")
+    parser.add_argument("--update-goldens", "--update", dest="update", action="store_true",
+                        help="(re)write the goldens from the current renderer; commit the result")
+    parser.add_argument("--synthetic", type=int, default=0, metavar="N", help="also check N seeded synthetic charts")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR, help="directory of the .ops golden files")
+    parser.add_argument("--benchmark", action="store_true", help="time recording against PDF rendering")
+    parser.add_argument("--stats", action="store_true", help="print layout stats of every chart")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    args.deterministic = True  # goldens never contain wall-clock stamps
+    apply_batch_arguments(args)
+
+    charts = golden_charts(args.synthetic)
+    if args.stats:
+        for name, builder in charts:
+            start = time.perf_counter()
+            chart = builder()
+            ops = record_chart(chart)
+            print(format_stats(layout_stats(chart, ops), time.perf_counter() - start))
+    if args.benchmark:
+        benchmark(charts)
+        sys.exit(0)
+    start = time.perf_counter()
+    failures = check(charts, args.golden_dir, args.update)
+    elapsed = time.perf_counter() - start
+    if args.update:
+        print(f"✅ {len(charts)} goldens written to {args.golden_dir} in {elapsed:.2f}s")
+        sys.exit(0)
+    print(f"\n{len(charts) - failures}/{len(charts)} charts match their goldens ({elapsed:.2f}s)")
+    sys.exit(1 if failures else 0)
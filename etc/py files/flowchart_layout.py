@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Pure Python layered (Sugiyama-style) layout for flowchart boxes without hand-picked coordinates
+Replaces Graphviz dot: cycle removal, rank assignment, barycenter crossing
+minimization and coordinate assignment, all linear-ish so 5,000+ node graphs lay out in seconds
+"""
+
+from reportlab.lib.units import cm
+
+from flowchart_text import LINE_HEIGHT, box_lines, string_width
+
+MARGIN = 1 * cm
+TOP_MARGIN = 2.5 * cm  # room for the title and "Generated" line
+NODE_SEP = 0.5 * cm
+RANK_SEP = 0.8 * cm
+DUMMY_SIZE = 0.2 * cm
+MIN_STEM = 0.05 * cm  # a box closer than this to the edge of its rank gets no stem
+SWEEPS = 8
+DUMMY_BUDGET = 4  # dummy vertices allowed per real node before the longest edges go direct
+MAX_BOX_WIDTH = 5 * cm  # longer labels wrap
+
+
+def size_box(box):
+    """Give an unsized box a width/height that fits its (wrapped) text"""
+    if box.width is None:
+        box.width = min(max(string_width(line) for line in box.text.split('\n')) + 0.6*cm, MAX_BOX_WIDTH)
+        if box.box_type == "diamond":
+            box.width *= 1.5
+    if box.height is None:
+        box.height = len(box_lines(box)) * LINE_HEIGHT + 0.4*cm
+        if box.box_type == "diamond":
+            box.height *= 1.5
+
+
+def remove_cycles(n, edges):
+    """Return the set of edge indices whose reversal makes the graph acyclic (DFS back edges)"""
+    out = [[] for _ in range(n)]
+    for i, (u, v) in enumerate(edges):
+        out[u].append((v, i))
+
+    state = [0] * n  # 0 = new, 1 = on stack, 2 = done
+    back = set()
+    for root in range(n):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(out[root]))]
+        while stack:
+            u, it = stack[-1]
+            for v, i in it:
+                if state[v] == 1:
+                    back.add(i)
+                elif state[v] == 0:
+                    state[v] = 1
+                    stack.append((v, iter(out[v])))
+                    break
+            else:
+                state[u] = 2
+                stack.pop()
+    return back
+
+
+def assign_ranks(n, dag):
+    """Longest-path ranks (Kahn order), then pull sources down next to their children"""
+    out = [[] for _ in range(n)]
+    indeg = [0] * n
+    for u, v in dag:
+        out[u].append(v)
+        indeg[v] += 1
+
+    rank = [0] * n
+    queue = [u for u in range(n) if indeg[u] == 0]
+    for u in queue:  # queue grows while we iterate
+        for v in out[u]:
+            if rank[u] + 1 > rank[v]:
+                rank[v] = rank[u] + 1
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+
+    # Sources sit at rank 0 by default; move them just above their highest child
+    has_parent = [False] * n
+    for u, v in dag:
+        has_parent[v] = True
+    for u in range(n):
+        if not has_parent[u] and out[u]:
+            rank[u] = min(rank[v] for v in out[u]) - 1
+    return rank
+
+
+def count_crossings(upper, lower_pos, down):
+    """Crossings between two adjacent layers (inversion count with a Fenwick tree)"""
+    ends = []
+    for u in upper:
+        ends.extend(sorted(lower_pos[v] for v in down[u]))
+    size = len(lower_pos) + 1
+    tree = [0] * (size + 1)
+    crossings = 0
+    for seen, p in enumerate(ends):
+        # number of earlier ends strictly to the right of p
+        i, below = p + 1, 0
+        while i > 0:
+            below += tree[i]
+            i -= i & -i
+        crossings += seen - below
+        i = p + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return crossings
+
+
+def order_layers(layers, up, down, sweeps=SWEEPS):
+    """Barycenter sweeps (down then up), keeping the ordering with the fewest crossings"""
+    pos = {}
+    for layer in layers:
+        for i, v in enumerate(layer):
+            pos[v] = i
+
+    def total_crossings():
+        return sum(count_crossings(layers[r], {v: pos[v] for v in layers[r + 1]}, down)
+                   for r in range(len(layers) - 1))
+
+    best = [list(layer) for layer in layers]
+    best_crossings = total_crossings()
+    for sweep in range(sweeps):
+        if sweep % 2 == 0:
+            order, neighbours = range(1, len(layers)), up
+        else:
+            order, neighbours = range(len(layers) - 2, -1, -1), down
+        for r in order:
+            layer = layers[r]
+            bary = {}
+            for v in layer:
+                nbrs = neighbours[v]
+                bary[v] = sum(pos[u] for u in nbrs) / len(nbrs) if nbrs else pos[v]
+            layer.sort(key=bary.__getitem__)
+            for i, v in enumerate(layer):
+                pos[v] = i
+        crossings = total_crossings()
+        if crossings < best_crossings:
+            best, best_crossings = [list(layer) for layer in layers], crossings
+        if best_crossings == 0:
+            break
+    return best
+
+
+def place_layer(layer, desired, breadth, sep=NODE_SEP):
+    """Closest positions to `desired` that keep the layer order and node separation"""
+    fwd, bwd = [], []
+    prev = None
+    for v in layer:
+        x = desired[v] if prev is None else max(desired[v], prev + (breadth[u] + breadth[v]) / 2 + sep)
+        fwd.append(x)
+        prev, u = x, v
+    nxt = None
+    for v in reversed(layer):
+        x = desired[v] if nxt is None else min(desired[v], nxt - (breadth[w] + breadth[v]) / 2 - sep)
+        bwd.append(x)
+        nxt, w = x, v
+    bwd.reverse()
+    # Both passes satisfy every separation constraint, and so does their average
+    return {v: (a + b) / 2 for v, a, b in zip(layer, fwd, bwd)}
+
+
+def assign_coordinates(layers, up, down, breadth, passes=4):
+    """Position nodes along each layer, pulling them toward their neighbours' mean"""
+    x = {}
+    for layer in layers:
+        cursor = 0
+        for v in layer:
+            x[v] = cursor + breadth[v] / 2
+            cursor += breadth[v] + NODE_SEP
+
+    for _ in range(passes):
+        for order, neighbours in ((range(1, len(layers)), up), (range(len(layers) - 2, -1, -1), down)):
+            for r in order:
+                desired = {}
+                for v in layers[r]:
+                    nbrs = neighbours[v]
+                    desired[v] = sum(x[u] for u in nbrs) / len(nbrs) if nbrs else x[v]
+                x.update(place_layer(layers[r], desired, breadth))
+    return x
+
+
+def layout_boxes(chart, boxes):
+    """Lay out one page worth of unplaced boxes in drawing coordinates"""
+    lr = chart.rankdir == "LR"
+    index = {box.name: i for i, box in enumerate(boxes)}
+    for box in boxes:
+        size_box(box)
+
+    graph_edges = [e for e in chart.edges
+                   if e.tail in index and e.head in index and e.tail != e.head]
+    edges = [(index[e.tail], index[e.head]) for e in graph_edges]
+    n = len(boxes)
+
+    back = remove_cycles(n, edges)
+    dag = [(v, u) if i in back else (u, v) for i, (u, v) in enumerate(edges)]
+    rank = assign_ranks(n, dag)
+
+    breadth = [box.height if lr else box.width for box in boxes]
+    depth = [box.width if lr else box.height for box in boxes]
+    up = [[] for _ in range(n)]
+    down = [[] for _ in range(n)]
+
+    # Split long edges into chains of dummy vertices, one per crossed rank.
+    # Past the dummy budget the longest edges are drawn direct instead,
+    # which keeps huge graphs near-linear while small charts keep every bend
+    limit = None
+    total = 0
+    for span in sorted(rank[v] - rank[u] for u, v in dag):
+        total += span - 1
+        if total > DUMMY_BUDGET * n:
+            limit = span
+            break
+
+    chains = []
+    for u, v in dag:
+        chain = []
+        if limit is not None and rank[v] - rank[u] >= limit:
+            chains.append(None)
+            continue
+        prev = u
+        for r in range(rank[u] + 1, rank[v]):
+            d = len(rank)
+            rank.append(r)
+            breadth.append(DUMMY_SIZE)
+            depth.append(0)
+            up.append([prev])
+            down.append([])
+            down[prev].append(d)
+            chain.append(d)
+            prev = d
+        down[prev].append(v)
+        up[v].append(prev)
+        chains.append(chain)
+
+    lowest = min(rank)
+    layers = [[] for _ in range(max(rank) - lowest + 1)]
+    for v, r in enumerate(rank):
+        layers[r - lowest].append(v)
+    layers = order_layers(layers, up, down)
+    along = assign_coordinates(layers, up, down, breadth)
+
+    # Rank offsets: each layer is as deep as its deepest box
+    across = {}
+    band = {}  # vertex -> (start, end) of its layer across the ranks
+    offset = 0
+    for layer in layers:
+        thickness = max(depth[v] for v in layer)
+        for v in layer:
+            across[v] = offset + thickness / 2
+            band[v] = (offset, offset + thickness)
+        offset += thickness + RANK_SEP
+    low = min(along[v] - breadth[v] / 2 for v in along)
+    extent_along = max(along[v] + breadth[v] / 2 for v in along) - low
+    extent_across = offset - RANK_SEP
+
+    # Drawing coordinates: TB grows downward, LR grows rightward
+    def to_xy(a, c):
+        a -= low
+        return (c, extent_along - a) if lr else (a, extent_across - c)
+
+    for i, box in enumerate(boxes):
+        cx, cy = to_xy(along[i], across[i])
+        box.x = cx - box.width / 2
+        box.y = cy - box.height / 2
+
+    # Dummy chains become the edge waypoints; reversed (back) edges run the chain backwards.
+    # Inside a layer an edge runs straight along its own slot (a stem from a box shallower than
+    # its layer, a dummy from edge to edge of the layer), so only the gaps between layers, which
+    # hold no boxes, get slanted segments
+    for i, ((u, v), edge, chain) in enumerate(zip(dag, graph_edges, chains)):
+        if edge.points or chain is None:
+            continue
+        points = []
+        if band[u][1] - (across[u] + depth[u] / 2) > MIN_STEM:
+            points.append((along[u], band[u][1]))
+        for d in chain:
+            points.append((along[d], band[d][0]))
+            if band[d][1] > band[d][0]:
+                points.append((along[d], band[d][1]))
+        if (across[v] - depth[v] / 2) - band[v][0] > MIN_STEM:
+            points.append((along[v], band[v][0]))
+        points = [to_xy(a, c) for a, c in points]
+        if i in back:
+            points.reverse()
+        edge.points = points
+
+    return (extent_across, extent_along) if lr else (extent_along, extent_across)
+
+
+def layout_flowchart(chart):
+    """Place every unplaced box (per page) and scale the drawing to fit under the title"""
+    width, height = chart.pagesize
+    area_w = width - 2 * MARGIN
+    area_h = height - TOP_MARGIN - MARGIN
+    for page in range(chart.page_count):
+        boxes = [box for box in chart.nodes.values() if box.page == page and not box.placed]
+        if not boxes:
+            continue
+        draw_w, draw_h = layout_boxes(chart, boxes)
+        scale = min(1.0, area_w / draw_w if draw_w else 1.0, area_h / draw_h if draw_h else 1.0)
+        tx = MARGIN + (area_w - scale * draw_w) / 2
+        ty = MARGIN + (area_h - scale * draw_h)
+        chart.transforms[page] = (scale, tx, ty)
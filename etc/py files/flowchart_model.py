@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Shared in-memory graph model for the Kannada Learning App flowcharts
+Every create_* function builds a Flowchart (nodes, edges, clusters, labels)
+and flowchart_render.render_flowchart() draws it in a single pass
+"""
+
+from reportlab.lib.pagesizes import landscape, A4
+from reportlab.lib import colors
+
+
+def to_color(color):
+    """Accept reportlab colors, color names ('lightblue') or hex strings ('#FFD700')"""
+    if isinstance(color, str):
+        return colors.toColor(color)
+    return color
+
+
+class FlowchartBox:
+    """Represents a box in the flowchart"""
+    def __init__(self, name, text, box_type="box", color=colors.lightblue,
+                 x=None, y=None, width=None, height=None, page=0, cluster=None, **style):
+        self.name = name
+        self.text = text
+        self.box_type = box_type  # "box", "diamond", "ellipse", "note"
+        self.color = to_color(color)
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.page = page
+        self.cluster = cluster
+        self.style = style  # note fonts: heading, heading_font, heading_size, font, font_size, leading, heading_gap
+
+    @property
+    def placed(self):
+        return None not in (self.x, self.y, self.width, self.height)
+
+    def center(self):
+        return (self.x + self.width / 2, self.y + self.height / 2)
+
+
+class FlowchartEdge:
+    """Directed edge between two named boxes, with optional waypoints"""
+    def __init__(self, tail, head, label="", points=None, page=0, width=None, color=None):
+        self.tail = tail
+        self.head = head
+        self.label = label
+        self.points = list(points or [])  # intermediate bends, endpoints are anchored on the boxes
+        self.page = page
+        self.width = width  # line width; None = the renderer's default
+        self.color = None if color is None else to_color(color)
+
+
+class FlowchartCluster:
+    """Named group of boxes (a column or swimlane), drawn around its members"""
+    def __init__(self, name, label, page=0):
+        self.name = name
+        self.label = label
+        self.page = page
+
+
+class FlowchartLabel:
+    """Free text on the page (titles, headings, legend captions)"""
+    def __init__(self, text, x, y, font="Helvetica", size=8, color=colors.black, page=0, volatile=False):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.font = font
+        self.size = size
+        self.color = to_color(color)
+        self.page = page
+        self.volatile = volatile  # e.g. timestamps: drawn, but not part of the cached spec
+
+
+class Flowchart:
+    """A multi-page flowchart document: the single spec every renderer consumes"""
+    def __init__(self, name, title, filename, pagesize=landscape(A4), rankdir="TB", routing="auto"):
+        self.name = name
+        self.title = title
+        self.filename = filename
+        self.pagesize = pagesize
+        self.rankdir = rankdir  # only used by auto-layout for unplaced boxes
+        # "straight", "orthogonal" (waypoint-less edges go around boxes), "mixed" (edges through boxes
+        # are rerouted) or "auto" (mixed on auto-laid-out pages, straight on hand-placed ones)
+        self.routing = routing
+        self.nodes = {}
+        self.edges = []
+        self.clusters = {}
+        self.labels = []
+        self.transforms = {}  # page -> (scale, dx, dy) for auto-laid-out drawings
+        self.overlaps = []    # flowchart_spatial.Overlap list, filled by render_flowchart
+        self.stats = None     # layout stats line of a --dry-run build (flowchart_canvas.format_stats)
+        self.page = 0
+
+    @property
+    def page_count(self):
+        return self.page + 1
+
+    def node(self, name, text, box_type="box", color=colors.lightblue, **kwargs):
+        """Add a box; anonymous boxes (name=None) get a generated name"""
+        if name is None:
+            name = f"_n{len(self.nodes)}"
+        if name in self.nodes:
+            raise ValueError(f"Duplicate flowchart node: {name}")
+        kwargs.setdefault("page", self.page)
+        box = FlowchartBox(name, text, box_type, color, **kwargs)
+        self.nodes[name] = box
+        return box
+
+    def edge(self, tail, head, label="", points=None, width=None, color=None):
+        """Add an arrow from tail to head"""
+        edge = FlowchartEdge(tail, head, label, points, page=self.page, width=width, color=color)
+        self.edges.append(edge)
+        return edge
+
+    def cluster(self, name, label):
+        """Add a cluster; boxes join it with node(..., cluster=name)"""
+        cluster = FlowchartCluster(name, label, page=self.page)
+        self.clusters[name] = cluster
+        return cluster
+
+    def label(self, text, x, y, font="Helvetica", size=8, color=colors.black, volatile=False):
+        """Add free text at an absolute position on the current page"""
+        label = FlowchartLabel(text, x, y, font, size, color, page=self.page, volatile=volatile)
+        self.labels.append(label)
+        return label
+
+    def new_page(self):
+        """Start a new page; later nodes, edges and labels go onto it"""
+        self.page += 1
+
+    def validate(self):
+        """Check that every edge references existing boxes"""
+        for edge in self.edges:
+            for name in (edge.tail, edge.head):
+                if name not in self.nodes:
+                    raise ValueError(f"Edge {edge.tail} -> {edge.head} references unknown node {name}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+In-memory rendering of flowchart_model.Flowchart charts
+render_pdf() draws a chart straight into a caller's file-like object (an HTTP response, a zip
+entry, a socket file) or, with no target, returns the PDF as a memoryview over the one bytes
+object reportlab builds - no temp file and no copy. write_archive() streams many charts into a
+zip the same way. The generator scripts still write files through flowchart_cache.build_flowchart,
+which honours the same output settings (--output-dir, --name-format, --no-compress)
+Usage: python flowchart_output.py --zip charts.zip [generate_visual_flowcharts ...]   (--zip - : stdout)
+"""
+
+import argparse
+import os
+import sys
+import time
+import zipfile
+
+from reportlab.pdfgen import canvas
+
+from flowchart_batch import add_output_arguments, apply_batch_arguments
+from flowchart_cache import compress_output, deterministic, output_path
+from flowchart_render import render_flowchart
+from render_stats import GENERATORS, chart_builders
+
+
+def render_pdf(chart, out=None, compress=None, invariant=None, **options):
+    """Render a chart as PDF into `out` (anything with write()) and return the bytes written,
+    or with out=None return the PDF as a read-only memoryview
+    compress/invariant default to the --no-compress/--deterministic settings; other options go to render_flowchart"""
+    compress = compress_output() if compress is None else compress
+    invariant = deterministic() if invariant is None else invariant
+    c = canvas.Canvas(out if out is not None else chart.filename, pagesize=chart.pagesize, invariant=invariant,
+                      pageCompression=int(compress))
+    render_flowchart(chart, c, **options)
+    data = c.getpdfdata()
+    if out is None:
+        return memoryview(data)
+    out.write(data)
+    return len(data)
+
+
+def render_bytes(chart, **options):
+    """render_pdf() as bytes, for callers that need an immutable copy"""
+    return bytes(render_pdf(chart, **options))
+
+
+def archive_name(chart):
+    """File name of a chart inside an archive (--name-format applies, the directory does not)"""
+    return os.path.basename(output_path(chart.filename.replace("\\", "/"), chart.name))
+
+
+def write_archive(entries, archive, compress=None):
+    """Stream (name in archive, chart) entries into a zip file (path or writable file object,
+    need not be seekable); compressed PDFs are stored as they are, uncompressed ones deflated"""
+    compress = compress_output() if compress is None else compress
+    method = zipfile.ZIP_STORED if compress else zipfile.ZIP_DEFLATED
+    sizes = {}
+    with zipfile.ZipFile(archive, "w", compression=method) as zf:
+        for name, chart in entries:
+            with zf.open(name, "w") as entry:
+                sizes[name] = render_pdf(chart, entry, compress)
+    return sizes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the generator charts into a zip without writing PDF files")
+    parser.add_argument("modules", nargs="*", default=GENERATORS, help="generator modules (default: all three)")
+    parser.add_argument("--zip", required=True, metavar="PATH", help="archive to write ('-' for stdout)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+
+    start = time.perf_counter()
+    # Two generators write charts of the same name, so every module gets its own folder
+    entries = [(f"{module}/{archive_name(chart)}", chart)
+               for module in args.modules for chart in (builder() for _, builder in chart_builders(module))]
+    to_stdout = args.zip == "-"
+    sizes = write_archive(entries, sys.stdout.buffer if to_stdout else args.zip)
+    log = sys.stderr if to_stdout else sys.stdout
+    for name, size in sizes.items():
+        print(f"   {name:<66} {size:>9,} bytes", file=log)
+    print(f"✅ {len(sizes)} charts streamed to {'stdout' if to_stdout else args.zip} "
+          f"in {time.perf_counter() - start:.2f}s", file=log)
@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Single-pass reportlab renderer for flowchart_model.Flowchart
+Shared by generate_flowcharts.py, generate_flowcharts_visual.py and generate_visual_flowcharts.py
+"""
+
+import math
+
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+from reportlab.pdfgen.canvas import FILL_NON_ZERO
+from reportlab.lib import colors
+
+from flowchart_spatial import PageIndex, text_rect
+from flowchart_text import BOX_FONT, BOX_FONT_SIZE, LINE_HEIGHT, box_lines, fit_box, string_width, text_width, wrap_text
+from kannada_font import draw_text, font_runs, shape
+
+ARROW_SIZE = 0.25 * cm
+EDGE_WIDTH = 1.5
+CLUSTER_PADDING = 0.3 * cm
+TEMPLATE_MIN_USES = 32  # a form costs ~300 bytes of objects, worth it only for shapes used this often
+
+
+def draw_box(c, x, y, width, height, text, box_type="box", color=colors.lightblue):
+    """Draw a box/diamond/ellipse on the canvas"""
+    c.setFillColor(color)
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1.5)
+
+    if box_type == "diamond":
+        # Draw diamond shape using path
+        path = c.beginPath()
+        path.moveTo(x + width/2, y + height)  # top
+        path.lineTo(x + width, y + height/2)   # right
+        path.lineTo(x + width/2, y)             # bottom
+        path.lineTo(x, y + height/2)            # left
+        path.close()
+        c.drawPath(path, fill=1, stroke=1)
+    elif box_type == "ellipse":
+        # Draw ellipse (start/end)
+        c.ellipse(x, y, x + width, y + height, fill=1)
+    else:  # box (rectangle)
+        c.rect(x, y, width, height, fill=1, stroke=1)
+
+    # Add text
+    c.setFillColor(colors.black)
+    c.setFont(BOX_FONT, BOX_FONT_SIZE)
+
+    text_x = x + width / 2
+    text_y = y + height / 2
+
+    # Wrap text to the box width
+    lines = wrap_text(text, text_width(box_type, width))
+    line_height = LINE_HEIGHT
+    start_y = text_y + (len(lines) - 1) * line_height / 2
+
+    for i, line in enumerate(lines):
+        y_pos = start_y - i * line_height
+        draw_text(c, text_x - string_width(line) / 2, y_pos, line, BOX_FONT, BOX_FONT_SIZE)
+
+
+def draw_note(c, box):
+    """Draw a borderless heading + text block (the text-only flowchart pages)"""
+    style = box.style
+    top = box.y + box.height
+    if style.get("heading"):
+        heading_font = style.get("heading_font", "Helvetica-Bold"), style.get("heading_size", 14)
+        c.setFillColor(colors.black)
+        c.setFont(*heading_font)
+        draw_text(c, box.x, top, style["heading"], *heading_font)
+        top -= style.get("heading_gap", 30)
+    font = style.get("font", "Helvetica"), style.get("font_size", 11)
+    c.setFillColor(colors.black)
+    c.setFont(*font)
+    for line in box.text.split('\n'):
+        draw_text(c, box.x + style.get("indent", 20), top, line, *font)
+        top -= style.get("leading", 20)
+
+
+def draw_arrow(c, x1, y1, x2, y2, label=""):
+    """Draw an arrow between two points"""
+    draw_polyline_arrow(c, [(x1, y1), (x2, y2)], label)
+
+
+def draw_polyline_arrow(c, points, label="", index=None, width=EDGE_WIDTH, color=colors.black):
+    """Draw a (possibly bent) arrow through points, with the head on the last segment
+    (with a PageIndex the label is nudged to the first free spot along the edge)"""
+    c.setStrokeColor(color)
+    c.setLineWidth(width)
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        c.line(x1, y1, x2, y2)
+
+    # Draw arrowhead as a filled path
+    path = c.beginPath()
+    add_arrowhead(path, points, arrow_size(width))
+    c.setFillColor(color)
+    c.drawPath(path, fill=1, stroke=0)
+
+    # Add label at the middle of the first segment
+    if label:
+        if index is not None:
+            label_x, label_y = index.place_label(label, points, "Helvetica", 7)
+        else:
+            (x1, y1), (x2, y2) = points[0], points[1]
+            label_x, label_y = (x1 + x2) / 2 + 0.2, (y1 + y2) / 2 + 0.1
+        c.setFillColor(colors.red)
+        c.setFont("Helvetica", 7)
+        draw_text(c, label_x, label_y, label, "Helvetica", 7)
+
+
+def arrow_size(width):
+    """Arrowhead length for a line width: the default head, larger for wide lines"""
+    return max(ARROW_SIZE, ARROW_SIZE / 2 + width)
+
+
+def add_arrowhead(path, points, size=ARROW_SIZE):
+    """Append a triangle arrowhead at the end of the polyline to a path"""
+    (x1, y1), (x2, y2) = points[-2], points[-1]
+    angle = math.atan2(y2 - y1, x2 - x1)
+
+    # Points for triangle arrowhead
+    p1_x = x2 - size * math.cos(angle - math.pi/6)
+    p1_y = y2 - size * math.sin(angle - math.pi/6)
+    p2_x = x2 - size * math.cos(angle + math.pi/6)
+    p2_y = y2 - size * math.sin(angle + math.pi/6)
+    path.moveTo(x2, y2)
+    path.lineTo(p1_x, p1_y)
+    path.lineTo(p2_x, p2_y)
+    path.close()
+
+
+def anchor(box, toward, rankdir=None):
+    """Point on the box outline facing `toward` (side centers, like dot's compass ports)
+    With the rankdir ("TB"/"LR") of a layered layout, edges use the two sides facing along the
+    ranks, so they never leave sideways through their neighbours in the same rank; only a
+    point level with the box (a router's side stub) gets a side port"""
+    cx, cy = box.center()
+    dx, dy = toward[0] - cx, toward[1] - cy
+    if rankdir == "TB":
+        vertical = abs(dy) > box.height / 2
+    elif rankdir == "LR":
+        vertical = abs(dx) <= box.width / 2
+    else:
+        vertical = abs(dy) * box.width >= abs(dx) * box.height
+    if vertical:
+        return (cx, box.y + box.height) if dy > 0 else (cx, box.y)
+    return (box.x + box.width, cy) if dx > 0 else (box.x, cy)
+
+
+def edge_points(chart, edge):
+    """Full polyline for an edge: anchored endpoints plus its waypoints
+    (auto-laid-out pages use rank-direction ports)"""
+    tail, head = chart.nodes[edge.tail], chart.nodes[edge.head]
+    first = edge.points[0] if edge.points else head.center()
+    last = edge.points[-1] if edge.points else tail.center()
+    rankdir = chart.rankdir if edge.page in chart.transforms else None
+    return [anchor(tail, first, rankdir)] + edge.points + [anchor(head, last, rankdir)]
+
+
+def edge_width(edge):
+    return EDGE_WIDTH if edge.width is None else edge.width
+
+
+def edge_color(edge):
+    return colors.black if edge.color is None else edge.color
+
+
+def cluster_bounds(members):
+    """Bounding box around a cluster's boxes, padded"""
+    x0 = min(b.x for b in members) - CLUSTER_PADDING
+    y0 = min(b.y for b in members) - CLUSTER_PADDING
+    x1 = max(b.x + b.width for b in members) + CLUSTER_PADDING
+    y1 = max(b.y + b.height for b in members) + CLUSTER_PADDING
+    return x0, y0, x1 - x0, y1 - y0
+
+
+def draw_cluster(c, cluster, members):
+    """Draw a thin grey frame around a cluster with its label on top"""
+    x, y, width, height = cluster_bounds(members)
+    c.setLineWidth(0.5)
+    c.setStrokeColor(colors.grey)
+    c.roundRect(x, y, width, height, 4, fill=0, stroke=1)
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica-Bold", 10)
+    draw_text(c, x, y + height + 0.2*cm, cluster.label, "Helvetica-Bold", 10)
+
+
+# ---------------------------------------------------------------------------
+# Batched drawing: one graphics-state change per style and one path/text object
+# per group instead of one per item
+# ---------------------------------------------------------------------------
+
+def _color_key(color):
+    return color.rgba() if hasattr(color, "rgba") else color
+
+
+class StateCanvas:
+    """Canvas proxy that tracks the graphics state and drops changes that change nothing"""
+    def __init__(self, c):
+        self._canvas = c
+        self._state = {}
+        self._stack = []
+
+    def __getattr__(self, name):
+        return getattr(self._canvas, name)
+
+    def _set(self, key, value, method, *args):
+        if self._state.get(key) != value:
+            self._state[key] = value
+            getattr(self._canvas, method)(*args)
+
+    def setFillColor(self, color):
+        self._set("fill", _color_key(color), "setFillColor", color)
+
+    def setStrokeColor(self, color):
+        self._set("stroke", _color_key(color), "setStrokeColor", color)
+
+    def setLineWidth(self, width):
+        self._set("line_width", width, "setLineWidth", width)
+
+    def setFont(self, name, size, leading=None):
+        self._set("font", (name, size, leading), "setFont", name, size, leading)
+
+    def saveState(self):
+        self._stack.append(dict(self._state))
+        self._canvas.saveState()
+
+    def restoreState(self):
+        self._state = self._stack.pop()
+        self._canvas.restoreState()
+
+    def showPage(self):
+        self._state = {}
+        self._stack = []
+        self._canvas.showPage()
+
+    def forget(self, *keys):
+        """State changed behind our back (e.g. inside a text object): re-emit it next time"""
+        for key in keys:
+            self._state.pop(key, None)
+
+
+class TextBatch:
+    """Collects drawString calls into a single PDF text object (fonts/colors set only on change)"""
+    def __init__(self, c):
+        self.c = c
+        self.text = c.beginText()
+        self.font = None
+        self.color = None
+        self.count = 0
+
+    def draw(self, x, y, text, font, size, color=colors.black, centred=False):
+        if _color_key(color) != self.color:
+            self.text.setFillColor(color)
+            self.color = _color_key(color)
+        if centred:
+            x -= string_width(text, font, size) / 2
+        self.text.setTextOrigin(x, y)
+        for run, run_font in font_runs(text, font):
+            if (run_font, size) != self.font:
+                self.text.setFont(run_font, size)
+                self.font = (run_font, size)
+            self.text.textOut(shape(run, run_font, size))
+        self.count += 1
+
+    def flush(self):
+        if self.count:
+            self.c.drawText(self.text)
+            if isinstance(self.c, StateCanvas):
+                self.c.forget("font", "fill")
+
+
+def _add_shape(path, box_type, x, y, width, height):
+    if box_type == "diamond":
+        path.moveTo(x + width/2, y + height)
+        path.lineTo(x + width, y + height/2)
+        path.lineTo(x + width/2, y)
+        path.lineTo(x, y + height/2)
+        path.close()
+    elif box_type == "ellipse":
+        path.ellipse(x, y, width, height)
+    else:
+        path.rect(x, y, width, height)
+
+
+def box_template_key(box):
+    """Template key of a node shape; rectangles stay inline (one 're' is cheaper than placing a form)"""
+    if box.box_type in ("diamond", "ellipse"):
+        return ("box", box.box_type, round(box.width, 2), round(box.height, 2), _color_key(box.color))
+    return None
+
+
+def head_template_key(points):
+    (x1, y1), (x2, y2) = points[-2], points[-1]
+    length = math.hypot(x2 - x1, y2 - y1) or 1.0
+    return ("head", round((x2 - x1) / length, 3), round((y2 - y1) / length, 3))
+
+
+class ShapeTemplates:
+    """Form XObjects for shapes that repeat within a document: every arrowhead direction and node
+    shape (type, size, fill) used more than once is defined once and placed with a translation"""
+    def __init__(self, c, keys):
+        self.c = c
+        self.counts = {}
+        for key in keys:
+            if key is not None:
+                self.counts[key] = self.counts.get(key, 0) + 1
+        self.names = {}
+
+    def use(self, key):
+        return key is not None and self.counts.get(key, 0) >= TEMPLATE_MIN_USES
+
+    def _place(self, key, x, y, bounds, draw):
+        name = self.names.get(key)
+        if name is None:
+            name = self.names[key] = f"shape{len(self.names)}"
+            raw = self.c._canvas if isinstance(self.c, StateCanvas) else self.c
+            raw.beginForm(name, *bounds)
+            draw(raw)
+            raw.endForm()
+        self.c.saveState()
+        self.c.translate(x, y)
+        self.c.doForm(name)
+        self.c.restoreState()
+
+    def place_box(self, box):
+        def draw(c):
+            path = c.beginPath()
+            _add_shape(path, box.box_type, 0, 0, box.width, box.height)
+            c.setFillColor(box.color)
+            c.setStrokeColor(colors.black)
+            c.setLineWidth(1.5)
+            c.drawPath(path, fill=1, stroke=1)
+        self._place(box_template_key(box), box.x, box.y, (-1, -1, box.width + 1, box.height + 1), draw)
+
+    def place_head(self, points):
+        key = head_template_key(points)
+
+        def draw(c):
+            path = c.beginPath()
+            add_arrowhead(path, [(-key[1], -key[2]), (0, 0)])
+            c.setFillColor(colors.black)
+            c.drawPath(path, fill=1, stroke=0)
+        self._place(key, points[-1][0], points[-1][1], (-ARROW_SIZE, -ARROW_SIZE, ARROW_SIZE, ARROW_SIZE), draw)
+
+
+def draw_edges_batched(c, edges, index=None, templates=None):
+    """Edges as (points, label, width, color): the lines of each style as one stroked path, their arrowheads
+    as one filled path (default-style heads may be template instances), labels in one text object"""
+    if not edges:
+        return
+    styles = {}
+    for edge in edges:
+        width, color = edge[2], edge[3]
+        styles.setdefault((width, _color_key(color)), []).append(edge)
+    shared = []
+    for group in styles.values():
+        width, color = group[0][2], group[0][3]
+        default = (width, _color_key(color)) == (EDGE_WIDTH, _color_key(colors.black))
+        lines, heads = c.beginPath(), c.beginPath()
+        inline = 0
+        for points, *_ in group:
+            lines.moveTo(*points[0])
+            for point in points[1:]:
+                lines.lineTo(*point)
+            if default and templates is not None and templates.use(head_template_key(points)):
+                shared.append(points)
+            else:
+                add_arrowhead(heads, points, arrow_size(width))
+                inline += 1
+        c.setStrokeColor(color)
+        c.setLineWidth(width)
+        c.drawPath(lines, stroke=1, fill=0)
+        if inline:
+            c.setFillColor(color)
+            c.drawPath(heads, stroke=0, fill=1, fillMode=FILL_NON_ZERO)  # overlapping heads must not cancel
+    for points in shared:
+        templates.place_head(points)
+
+    text = TextBatch(c)
+    for points, label, *_ in edges:
+        if label:
+            if index is not None:
+                x, y = index.place_label(label, points, "Helvetica", 7)
+            else:
+                (x1, y1), (x2, y2) = points[0], points[1]
+                x, y = (x1 + x2) / 2 + 0.2, (y1 + y2) / 2 + 0.1
+            text.draw(x, y, label, "Helvetica", 7, colors.red)
+    text.flush()
+
+
+def draw_boxes_batched(c, boxes, keep_order=False, templates=None):
+    """Shapes grouped by fill color into one path each (repeated shapes as template instances), then all
+    box and note text in one text object (keep_order=True keeps the paint order, for overlapping boxes)"""
+    groups = []
+    by_key = {}
+    for box in boxes:
+        if box.box_type == "note":
+            continue
+        if templates is not None and templates.use(box_template_key(box)):
+            key = "templates"
+        else:
+            key = _color_key(box.color)
+        if keep_order:  # only consecutive boxes of the same color can share a path
+            if groups and groups[-1][0] == key:
+                groups[-1][1].append(box)
+            else:
+                groups.append((key, [box]))
+        else:
+            if key not in by_key:
+                by_key[key] = []
+                groups.append((key, by_key[key]))
+            by_key[key].append(box)
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(1.5)
+    for key, group in groups:
+        if key == "templates":
+            for box in group:
+                templates.place_box(box)
+        else:
+            path = c.beginPath()
+            for box in group:
+                _add_shape(path, box.box_type, box.x, box.y, box.width, box.height)
+            c.setFillColor(group[0].color)
+            c.drawPath(path, stroke=1, fill=1, fillMode=FILL_NON_ZERO)
+        if keep_order:  # text of overlapping boxes must be painted before the next shape
+            _box_text(c, group)
+    if not keep_order:
+        _box_text(c, boxes)
+
+
+def _box_text(c, boxes):
+    text = TextBatch(c)
+    for box in boxes:
+        if box.box_type == "note":
+            style = box.style
+            top = box.y + box.height
+            if style.get("heading"):
+                text.draw(box.x, top, style["heading"], style.get("heading_font", "Helvetica-Bold"),
+                          style.get("heading_size", 14))
+                top -= style.get("heading_gap", 30)
+            for line in box.text.split('\n'):
+                text.draw(box.x + style.get("indent", 20), top, line, style.get("font", "Helvetica"),
+                          style.get("font_size", 11))
+                top -= style.get("leading", 20)
+            continue
+        lines = box_lines(box)
+        cx, cy = box.center()
+        start_y = cy + (len(lines) - 1) * LINE_HEIGHT / 2
+        for i, line in enumerate(lines):
+            if line:
+                text.draw(cx, start_y - i * LINE_HEIGHT, line, BOX_FONT, BOX_FONT_SIZE, centred=True)
+    text.flush()
+
+
+def render_flowchart(chart, c=None, invariant=False, batch=True, templates=True, compress=True):
+    """Draw every page of a Flowchart in one pass and save the PDF (invariant=True: reproducible bytes,
+    compress=False: uncompressed page streams,
+    batch=False: the old one-state-change-per-item drawing, kept for comparison,
+    templates=False: no Form XObjects for repeated shapes)"""
+    chart.validate()
+    for box in chart.nodes.values():
+        if box.box_type != "note" and box.width is not None:
+            fit_box(box)
+    if not all(box.placed for box in chart.nodes.values()):
+        from flowchart_layout import layout_flowchart
+        layout_flowchart(chart)
+    unrouted = []
+    if chart.routing in ("orthogonal", "mixed") or (chart.routing == "auto" and chart.transforms):
+        from flowchart_route import route_flowchart
+        unrouted = route_flowchart(chart)
+
+    # Bucket everything by page once, then walk the pages in order
+    pages = [{"nodes": [], "edges": [], "polylines": [], "labels": [], "clusters": {}}
+             for _ in range(chart.page_count)]
+    for box in chart.nodes.values():
+        pages[box.page]["nodes"].append(box)
+        if box.cluster:
+            pages[box.page]["clusters"].setdefault(box.cluster, []).append(box)
+    for edge in chart.edges:
+        pages[edge.page]["edges"].append(edge)
+        pages[edge.page]["polylines"].append(edge_points(chart, edge))
+    for label in chart.labels:
+        pages[label.page]["labels"].append(label)
+
+    own_canvas = c is None
+    if own_canvas:
+        c = canvas.Canvas(chart.filename, pagesize=chart.pagesize, invariant=invariant, pageCompression=int(compress))
+    target = c
+    shapes = None
+    if batch:
+        c = StateCanvas(c)
+        if templates:
+            shapes = ShapeTemplates(c, [box_template_key(box) for box in chart.nodes.values()]
+                                    + [head_template_key(points) for page in pages for points in page["polylines"]])
+
+    chart.overlaps = unrouted
+    width, height = chart.pagesize
+    for number, page in enumerate(pages):
+        transform = chart.transforms.get(number)
+        scale, dx, dy = transform or (1, 0, 0)
+
+        # Register everything in drawing coordinates before any edge label is placed
+        index = PageIndex(number, (-dx / scale, -dy / scale, (width - dx) / scale, (height - dy) / scale),
+                          len(page["nodes"]) + len(page["edges"]) + len(page["labels"]))
+        for box in page["nodes"]:
+            index.add_box(box)
+        for label in page["labels"]:
+            x0, y0, x1, y1 = text_rect(label.text, label.x, label.y, label.font, label.size)
+            index.add_text(label.text, ((x0 - dx) / scale, (y0 - dy) / scale, (x1 - dx) / scale, (y1 - dy) / scale))
+        polylines = page["polylines"]
+        for edge, points in zip(page["edges"], polylines):
+            index.add_edge(f"{edge.tail} -> {edge.head}", points, (edge.tail, edge.head))
+
+        if transform:
+            c.saveState()
+            c.translate(dx, dy)
+            c.scale(scale, scale)
+        for name, members in page["clusters"].items():
+            draw_cluster(c, chart.clusters[name], members)
+        if batch:
+            draw_edges_batched(c, [(points, edge.label, edge_width(edge), edge_color(edge))
+                                   for edge, points in zip(page["edges"], polylines)], index, shapes)
+            overlapping = any(o.kind == "box overlap" for o in index.overlaps)
+            draw_boxes_batched(c, page["nodes"], overlapping, shapes)
+        else:
+            for edge, points in zip(page["edges"], polylines):
+                draw_polyline_arrow(c, points, edge.label, index, edge_width(edge), edge_color(edge))
+            for box in page["nodes"]:
+                if box.box_type == "note":
+                    draw_note(c, box)
+                else:
+                    draw_box(c, box.x, box.y, box.width, box.height, box.text, box.box_type, box.color)
+        if transform:
+            c.restoreState()
+        if batch:
+            text = TextBatch(c)
+            for label in page["labels"]:
+                text.draw(label.x, label.y, label.text, label.font, label.size, label.color)
+            text.flush()
+        else:
+            for label in page["labels"]:
+                c.setFillColor(label.color)
+                c.setFont(label.font, label.size)
+                draw_text(c, label.x, label.y, label.text, label.font, label.size)
+        c.showPage()
+        chart.overlaps += index.overlaps
+
+    if own_canvas:
+        target.save()
+    return target
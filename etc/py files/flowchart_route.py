@@ -0,0 +1,652 @@
+#!/usr/bin/env python3
+"""
+Orthogonal edge router for flowchart_model.Flowchart
+Edges without waypoints are routed with A* on a channel graph (an orthogonal visibility
+graph: lines from every box corner and port stub, running until they meet a box), bending
+around boxes instead of cutting through them. Edges into the same box share channels,
+other overlapping channels are spread apart.
+A coarse corridor graph of page tiles (costlier the more the boxes cover them) picks each
+edge's corridor, cached per pair of tile spans; the channel search stays inside it, guided by
+the tiles left along the corridor. Channel crossings are found one tile at a time as the
+searches reach them, so a page costs what its corridors cover, not its whole area.
+An edge that finds no path in its corridor gets an elbow line and an "unrouted edge" warning.
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+
+from reportlab.lib.units import cm
+
+from flowchart_spatial import Overlap, SpatialIndex, box_rect, segment_hits_rect
+
+MARGIN = 0.2 * cm        # preferred clearance: channels start this far outside every box
+HAIRLINE = 1.0           # paths never come closer to a box than this (points)
+BEND_COST = 0.6 * cm     # a bend costs as much as this much extra length
+SHARED_FACTOR = 0.4      # re-using a channel of an edge into the same box is cheaper
+FOREIGN_COST = 1.0 * cm  # joining another edge's channel costs this much (once, like a bend)
+PORT_COST = 2.0 * cm     # leaving/entering through a side another edge (not of the same fan) uses
+CHANNEL_SPACING = 0.08 * cm
+TILE_FACTOR = 2          # corridor tiles are this many obstacle-index cells wide
+CROWDING = 4.0           # a tile the boxes cover entirely costs this much more to cross
+WIDEN = 1                # corridors extend this many tiles on each side of the coarse path
+TILE_TURN_COST = 1.0     # a turn in the coarse path costs as much as this many more tiles
+LARGE_PAGE = 200         # above this many edges per page, switch to weighted A*:
+HEURISTIC_WEIGHT = 2.0   # slightly longer routes, far fewer expanded vertices
+CORRIDOR_WEIGHT = 1.25   # ... and weighted coarse search: more and the routes zigzag
+INF = float("inf")
+CLOSED = -1.0            # below any path cost
+
+# Side of a box -> unit normal
+SIDES = {"top": (0, 1), "bottom": (0, -1), "right": (1, 0), "left": (-1, 0)}
+
+
+class ObstacleIndex:
+    """Uniform bucket grid over the inflated boxes for O(1) point-in-obstacle queries"""
+    def __init__(self, rects, cell=None):
+        self.rects = rects
+        if cell is None:
+            sizes = sorted(max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in rects) or [cm]
+            cell = max(sizes[len(sizes) // 2], 0.5 * cm)
+        self.cell = cell
+        self.buckets = {}
+        for k, (x0, y0, x1, y1) in enumerate(rects):
+            for gx in range(int(x0 // cell), int(x1 // cell) + 1):
+                for gy in range(int(y0 // cell), int(y1 // cell) + 1):
+                    self.buckets.setdefault((gx, gy), []).append(k)
+
+    def blocked(self, x, y):
+        """True if (x, y) lies strictly inside an obstacle"""
+        for k in self.buckets.get((int(x // self.cell), int(y // self.cell)), ()):
+            x0, y0, x1, y1 = self.rects[k]
+            if x0 < x < x1 and y0 < y < y1:
+                return True
+        return False
+
+    def ray(self, x, y, axis, sign, limit):
+        """Where a ray from (x, y) along `axis` (0: x, 1: y) in direction `sign` meets the first
+        obstacle, or `limit` if it meets none"""
+        cell = self.cell
+        gx, gy = int(x // cell), int(y // cell)
+        here = (x, y)[axis]
+        for g in range((gx, gy)[axis], int(limit // cell) + sign, sign):
+            hit = None
+            for k in self.buckets.get((g, gy) if axis == 0 else (gx, g), ()):
+                rect = self.rects[k]
+                lo, hi = rect[axis], rect[axis + 2]
+                if not rect[1 - axis] < (y, x)[axis] < rect[3 - axis]:
+                    continue
+                if sign > 0 and lo >= here and (hit is None or lo < hit):
+                    hit = lo
+                elif sign < 0 and hi <= here and (hit is None or hi > hit):
+                    hit = hi
+            if hit is not None:
+                return min(hit, limit) if sign > 0 else max(hit, limit)
+        return limit
+
+    def crosses(self, p, q):
+        """True if the axis-parallel segment p-q runs through an obstacle"""
+        x0, x1 = sorted((p[0], q[0]))
+        y0, y1 = sorted((p[1], q[1]))
+        cell = self.cell
+        for gx in range(int(x0 // cell), int(x1 // cell) + 1):
+            for gy in range(int(y0 // cell), int(y1 // cell) + 1):
+                for k in self.buckets.get((gx, gy), ()):
+                    rx0, ry0, rx1, ry1 = self.rects[k]
+                    if rx0 < x1 and x0 < rx1 and ry0 < y1 and y0 < ry1:
+                        return True
+        return False
+
+
+class CorridorGraph:
+    """Coarse tiles over the routing area; crossing a tile costs more the more the boxes cover it"""
+    def __init__(self, rects, bounds, tile):
+        self.x0, self.y0 = bounds[0], bounds[1]
+        self.tile = tile
+        self.columns = self.column(bounds[2]) + 1
+        self.rows = self.row(bounds[3]) + 1
+        covered = {}
+        for x0, y0, x1, y1 in rects:
+            for tx in range(self.column(x0), self.column(x1) + 1):
+                left = self.x0 + tx * tile
+                width = min(x1, left + tile) - max(x0, left)
+                for ty in range(self.row(y0), self.row(y1) + 1):
+                    bottom = self.y0 + ty * tile
+                    height = min(y1, bottom + tile) - max(y0, bottom)
+                    if width > 0 and height > 0:
+                        covered[tx, ty] = covered.get((tx, ty), 0.0) + width * height
+        self.cost = {tx * self.rows + ty: 1.0 + CROWDING * min(1.0, area / (tile * tile))
+                     for (tx, ty), area in covered.items()}
+        self.cache = {}  # (tail tiles, head tiles) -> corridor
+
+    def column(self, x):
+        return int((x - self.x0) // self.tile)
+
+    def row(self, y):
+        return int((y - self.y0) // self.tile)
+
+    def span(self, rect):
+        """(first column, first row, last column, last row) of the tiles under `rect`"""
+        x0, y0, x1, y1 = rect
+        return (max(self.column(x0), 0), max(self.row(y0), 0),
+                min(self.column(x1), self.columns - 1), min(self.row(y1), self.rows - 1))
+
+    def tiles(self, rect):
+        tx0, ty0, tx1, ty1 = self.span(rect)
+        return [(tx, ty) for tx in range(tx0, tx1 + 1) for ty in range(ty0, ty1 + 1)]
+
+    def corridor(self, tail, head, weight=1.0):
+        """{tile id (column * rows + row): tiles left to `head`} over the cheapest coarse path
+        between the rects `tail` and `head`, widened by WIDEN; edges between boxes on the same
+        tiles share one (cached) corridor"""
+        key = (self.span(tail), self.span(head))
+        corridor = self.cache.get(key)
+        if corridor is None:
+            corridor = self.cache[key] = self._search(tail, head, weight)
+        return corridor
+
+    def _search(self, tail, head, weight):
+        rows, columns, cost_of = self.rows, self.columns, self.cost
+        goals = set(self.tiles(head))
+        gx0, gy0, gx1, gy1 = self.span(head)
+
+        def heuristic(tile_id):
+            tx, ty = divmod(tile_id, rows)
+            dx = gx0 - tx if tx < gx0 else (tx - gx1 if tx > gx1 else 0)
+            dy = gy0 - ty if ty < gy0 else (ty - gy1 if ty > gy1 else 0)
+            return (dx + dy + (TILE_TURN_COST if dx and dy else 0.0)) * weight
+
+        # A state is tile id * 5 + the way it was entered (+x, -x, +y, -y; 4 at the tail): a
+        # turn costs TILE_TURN_COST
+        goal_ids = {tx * rows + ty for tx, ty in goals}
+        best, came, heap = {}, {}, []
+        for tx, ty in self.tiles(tail):
+            state = (tx * rows + ty) * 5 + 4
+            best[state] = 0.0
+            heap.append((heuristic(tx * rows + ty), 0.0, state))
+        heapq.heapify(heap)
+        path = []
+        while heap:
+            _, cost, state = heapq.heappop(heap)
+            if cost > best[state]:
+                continue
+            best[state] = CLOSED
+            tile_id, direction = divmod(state, 5)
+            if tile_id in goal_ids:
+                while state is not None:
+                    path.append(divmod(state // 5, rows))
+                    state = came.get(state)
+                break
+            ty = tile_id % rows
+            for way, near in enumerate((tile_id + rows, tile_id - rows, tile_id + 1, tile_id - 1)):
+                if (near < 0 or near >= columns * rows or (way == 2 and ty == rows - 1)
+                        or (way == 3 and ty == 0)):
+                    continue
+                new_cost = cost + cost_of.get(near, 1.0)
+                if direction != 4 and way != direction:
+                    new_cost += TILE_TURN_COST
+                next_state = near * 5 + way
+                if new_cost < best.get(next_state, INF):
+                    best[next_state] = new_cost
+                    came[next_state] = state
+                    heapq.heappush(heap, (new_cost + heuristic(near), new_cost, next_state))
+        rows, around = self.rows, range(-WIDEN, WIDEN + 1)
+        corridor = {tx * rows + ty for tx, ty in goals.union(self.tiles(tail))}
+        corridor.update((tx + dx) * rows + ty + dy for tx, ty in path for dx in around for dy in around
+                        if 0 <= tx + dx < self.columns and 0 <= ty + dy < rows)
+        # Tiles left to the head along the corridor: the fine search's guide around the boxes
+        remaining = {tx * rows + ty: 0 for tx, ty in goals}
+        frontier = list(remaining)
+        while frontier:
+            following = []
+            for tile_id in frontier:
+                ty = tile_id % rows
+                for near in (tile_id - rows, tile_id + rows,
+                             tile_id - 1 if ty > 0 else -1, tile_id + 1 if ty < rows - 1 else -1):
+                    if near in corridor and near not in remaining:
+                        remaining[near] = remaining[tile_id] + 1
+                        following.append(near)
+            frontier = following
+        return remaining
+
+
+class ChannelGraph:
+    """Orthogonal visibility graph of a page: from every interesting point (clearance corners,
+    port stubs) channels run left/right and up/down until they meet a box; the vertices are
+    where channels cross, the edges join neighbouring vertices along a channel.
+    Only the channel lines are built up front, filed under the corridor tiles they pass: where a
+    line crosses the others is worked out one tile at a time, the first time a search gets there.
+    Vertex ids are row line * number of column lines + column line"""
+    def __init__(self, index, points, bounds, corridors):
+        horizontal, vertical = {}, {}  # y -> [(x0, x1)], x -> [(y0, y1)]
+        for x, y in points:
+            if index.blocked(x, y):
+                continue
+            horizontal.setdefault(y, []).append((index.ray(x, y, 0, -1, bounds[0]), index.ray(x, y, 0, 1, bounds[2])))
+            vertical.setdefault(x, []).append((index.ray(x, y, 1, -1, bounds[1]), index.ray(x, y, 1, 1, bounds[3])))
+        # axis -> [(at, lo, hi)]: rows (y, x0, x1) run along axis 0, columns (x, y0, y1) along axis 1
+        self.lines = tuple([(at, lo, hi) for at, spans in lines.items() for lo, hi in _merge(spans)]
+                           for lines in (horizontal, vertical))
+        self.width = len(self.lines[1])
+        self.origin = (corridors.x0, corridors.y0)
+        self.tile, self.rows = corridors.tile, corridors.rows
+        self.line_at = ({}, {})  # axis -> at -> [line]
+        self.filed = ({}, {})  # axis -> (tile along, tile across) -> [lines of that axis through the tile]
+        for axis, lines in enumerate(self.lines):
+            for k, (at, lo, hi) in enumerate(lines):
+                self.line_at[axis].setdefault(at, []).append(k)
+                across = self.tile_index(1 - axis, at)
+                for along in range(self.tile_index(axis, lo), self.tile_index(axis, hi) + 1):
+                    self.filed[axis].setdefault((along, across), []).append(k)
+        self.cells = {}  # (axis, line, tile along) -> (sorted crossing coordinates, crossing lines)
+        self.adjacent = {}  # vertex -> neighbors(vertex)
+
+    def tile_index(self, axis, coordinate):
+        return int((coordinate - self.origin[axis]) // self.tile)
+
+    def tile_id(self, x, y):
+        """The point's tile, numbered like CorridorGraph.corridor's"""
+        return self.tile_index(0, x) * self.rows + self.tile_index(1, y)
+
+    def vertex(self, point):
+        """The vertex at `point` (where a row and a column line cross), or None"""
+        x, y = point
+        row = next((k for k in self.line_at[0].get(y, ()) if self.lines[0][k][1] <= x <= self.lines[0][k][2]), None)
+        column = next((k for k in self.line_at[1].get(x, ()) if self.lines[1][k][1] <= y <= self.lines[1][k][2]), None)
+        return None if row is None or column is None else row * self.width + column
+
+    def point(self, v):
+        row, column = divmod(v, self.width)
+        return self.lines[1][column][0], self.lines[0][row][0]
+
+    def neighbors(self, v):
+        """(point of `v`, [(vertex, axis, its point, its tile id, distance)] next to it on its two
+        channels)"""
+        found = self.adjacent.get(v)
+        if found is None:
+            row, column = divmod(v, self.width)
+            x, y = self.point(v)
+            moves = []
+            for sign in (-1, 1):
+                crossing = self.step(0, row, x, sign)
+                if crossing is not None:
+                    moves.append(self.move(row * self.width + crossing[1], 0, (crossing[0], y), x))
+                crossing = self.step(1, column, y, sign)
+                if crossing is not None:
+                    moves.append(self.move(crossing[1] * self.width + column, 1, (x, crossing[0]), y))
+            found = self.adjacent[v] = ((x, y), moves)
+        return found
+
+    def move(self, w, axis, point, here):
+        return w, axis, point, self.tile_id(*point), abs(point[axis] - here)
+
+    def cell(self, axis, line, along):
+        """(sorted coordinates, lines) of the crossings of `line` inside one tile"""
+        key = (axis, line, along)
+        found = self.cells.get(key)
+        if not found:
+            at, lo, hi = self.lines[axis][line]
+            others = self.lines[1 - axis]
+            filed = self.filed[1 - axis].get((self.tile_index(1 - axis, at), along), ())
+            crossings = sorted((others[k][0], k) for k in filed
+                               if others[k][1] <= at <= others[k][2] and lo <= others[k][0] <= hi)
+            found = self.cells[key] = ([c for c, _ in crossings], [k for _, k in crossings])
+        return found
+
+    def step(self, axis, line, here, sign):
+        """(coordinate, line) of the next crossing after `here` along `line` in direction `sign`, or None"""
+        at, lo, hi = self.lines[axis][line]
+        along = int((here - self.origin[axis]) // self.tile)
+        last = int(((hi if sign > 0 else lo) - self.origin[axis]) // self.tile)
+        cells = self.cells
+        while True:
+            coordinates, lines = cells.get((axis, line, along)) or self.cell(axis, line, along)
+            k = bisect_right(coordinates, here) if sign > 0 else bisect_left(coordinates, here) - 1
+            if 0 <= k < len(coordinates):
+                return coordinates[k], lines[k]
+            if along == last:
+                return None
+            along += sign
+
+    def toward(self, axis, line, here, target):
+        """(coordinate, line) of the crossing between `here` and `target` along `line` closest to
+        `target`, or None"""
+        at, lo, hi = self.lines[axis][line]
+        sign = 1 if target > here else -1
+        target = min(target, hi) if sign > 0 else max(target, lo)
+        along = int((target - self.origin[axis]) // self.tile)
+        first = int((here - self.origin[axis]) // self.tile)
+        cells = self.cells
+        while True:
+            coordinates, lines = cells.get((axis, line, along)) or self.cell(axis, line, along)
+            k = bisect_right(coordinates, target) - 1 if sign > 0 else bisect_left(coordinates, target)
+            if 0 <= k < len(coordinates) and (coordinates[k] - here) * sign > 0:
+                return coordinates[k], lines[k]
+            if along == first:
+                return None
+            along -= sign
+
+
+def _merge(spans):
+    """Union of overlapping (lo, hi) intervals"""
+    merged = []
+    for lo, hi in sorted(spans):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def _ports(box):
+    """(side, port on the outline, stub just outside the clearance) for each side of a box"""
+    cx, cy = box.center()
+    ports = []
+    for side, (nx, ny) in SIDES.items():
+        px = cx + nx * box.width / 2
+        py = cy + ny * box.height / 2
+        ports.append((side, (px, py), (px + nx * MARGIN, py + ny * MARGIN)))
+    return ports
+
+
+def _stub_rect(box):
+    """The box grown to its port stubs"""
+    return (box.x - MARGIN, box.y - MARGIN, box.x + box.width + MARGIN, box.y + box.height + MARGIN)
+
+
+def _side_penalty(box, side, toward):
+    """Prefer the sides that face the other end of the edge"""
+    cx, cy = box.center()
+    nx, ny = SIDES[side]
+    facing = nx * (toward[0] - cx) + ny * (toward[1] - cy)
+    return 0.0 if facing > 0 else BEND_COST * 2
+
+
+class LineUsage:
+    """The spans routes occupy along one channel line: all of them merged (a flat sorted list of
+    bounds, for bisecting) and each net's own"""
+    def __init__(self):
+        self.bounds = []
+        self.nets = {}
+
+    def add(self, lo, hi, net):
+        self.nets.setdefault(net, []).append((lo, hi))
+        bounds = self.bounds
+        i, j = bisect_left(bounds, lo), bisect_right(bounds, hi)
+        if i % 2:
+            i -= 1
+            lo = bounds[i]
+        if j % 2:
+            hi = bounds[j]
+            j += 1
+        bounds[i:j] = [lo, hi]
+
+    def cost(self, lo, hi, net, foreign, same_axis):
+        """(extra cost, joins) of running from lo to hi along the line: cheaper on the net's own
+        spans, FOREIGN_COST once for joining another net's"""
+        bounds = self.bounds
+        i = bisect_right(bounds, lo)
+        if not (i % 2 or (i < len(bounds) and bounds[i] < hi)):
+            return 0.0, 0
+        for a, b in self.nets.get(net, ()):
+            if a < hi and lo < b:
+                return (SHARED_FACTOR - 1.0) * (hi - lo), 0
+        return (0.0 if foreign and same_axis else FOREIGN_COST), 1
+
+
+def _astar(graph, starts, goals, tiles, usage, net, weight=1.0):
+    """Cheapest channel-graph path (vertex list) from any start stub to any goal stub inside the
+    corridor `tiles`, or None; starts/goals are [(vertex, extra cost)]. With a weighted heuristic
+    every expansion also jumps along both channels through the vertex to the one that lines up
+    best with the goals, so a long run is one step instead of one per crossing"""
+    width, toward, adjacent = graph.width, graph.toward, graph.adjacent
+    goal_cost = {}
+    for v, extra in goals:
+        goal_cost[v] = min(extra, goal_cost.get(v, extra))
+    # Distance to the goal stubs' bounding box: O(1) and never more than the true distance
+    goal_points = [graph.point(v) for v in goal_cost]
+    gx0, gx1 = min(x for x, _ in goal_points), max(x for x, _ in goal_points)
+    gy0, gy1 = min(y for _, y in goal_points), max(y for _, y in goal_points)
+    goal_range = ((gx0, gx1), (gy0, gy1))
+
+    # ... or, where the corridor bends around the boxes and that is more, the tiles still to go
+    # along it: a guide rather than a bound
+    guide = graph.tile
+
+    def heuristic(x, y, remaining):
+        dx = gx0 - x if x < gx0 else (x - gx1 if x > gx1 else 0.0)
+        dy = gy0 - y if y < gy0 else (y - gy1 if y > gy1 else 0.0)
+        along = (remaining - 1) * guide
+        return (dx + dy if dx + dy > along else along) * weight
+
+    # A state is vertex * 6 + (direction + 1) * 2 + joins: direction -1 at the start stubs,
+    # joins while running along another net's channel
+    best = {}  # state -> cheapest cost so far, CLOSED once expanded
+    came = {}
+    heap = []
+    for v, extra in starts:
+        best[v * 6] = extra
+        x, y = graph.point(v)
+        heapq.heappush(heap, (extra + heuristic(x, y, tiles.get(graph.tile_id(x, y), 1)), extra, v * 6))
+
+    while heap:
+        _, cost, state = heapq.heappop(heap)
+        if cost > best[state]:  # stale, or weighted and already expanded: expand each state once
+            continue
+        best[state] = CLOSED
+        v, rest = divmod(state, 6)
+        direction, foreign = rest // 2 - 1, rest & 1
+        if v in goal_cost:
+            path = [v]
+            while state in came:
+                state = came[state]
+                path.append(state // 6)
+            return path[::-1], cost + goal_cost[v]
+        here, moves = adjacent.get(v) or graph.neighbors(v)
+        if weight > 1.0:  # an exact search would still expand every vertex the jump skips
+            row, column = divmod(v, width)
+            for axis, line in ((0, row), (1, column)):
+                at = here[axis]
+                low, high = goal_range[axis]
+                if not low <= at <= high:
+                    jump = toward(axis, line, at, low if at < low else high)
+                    if jump is not None:
+                        if axis == 0:
+                            moves = moves + [graph.move(row * width + jump[1], 0, (jump[0], here[1]), at)]
+                        else:
+                            moves = moves + [graph.move(jump[1] * width + column, 1, (here[0], jump[0]), at)]
+        line_usages = (usage[0].get(here[1]), usage[1].get(here[0]))
+        for w, axis, point, tile_id, step in moves:
+            remaining = tiles.get(tile_id)
+            if remaining is None:
+                continue
+            joins = 0
+            line_usage = line_usages[axis]
+            if line_usage is not None:
+                at, other = here[axis], point[axis]
+                lo, hi = (other, at) if other < at else (at, other)
+                extra, joins = line_usage.cost(lo, hi, net, foreign, direction == axis)
+                step += extra
+            if direction != axis and direction != -1:
+                step += BEND_COST
+            next_state = w * 6 + (axis + 1) * 2 + joins
+            new_cost = cost + step
+            if new_cost < best.get(next_state, INF):
+                best[next_state] = new_cost
+                came[next_state] = state
+                heapq.heappush(heap, (new_cost + heuristic(point[0], point[1], remaining), new_cost, next_state))
+    return None
+
+
+def _simplify(points):
+    """Drop repeated and collinear points"""
+    result = []
+    for p in points:
+        if result and p == result[-1]:
+            continue
+        if len(result) >= 2:
+            (ax, ay), (bx, by) = result[-2], result[-1]
+            if (ax == bx == p[0]) or (ay == by == p[1]):
+                result[-1] = p
+                continue
+        result.append(p)
+    return result
+
+
+def _nudge(routes, index):
+    """Spread overlapping interior segments of different nets apart inside their channel
+    (narrower, or not at all, where a channel runs closer to a box than MARGIN)"""
+    lines = {}
+    for route_id, (net, points) in enumerate(routes):
+        for k in range(1, len(points) - 2):  # first/last segments stay on their ports
+            (x0, y0), (x1, y1) = points[k], points[k + 1]
+            if y0 == y1:
+                lines.setdefault(("h", round(y0, 3)), []).append((min(x0, x1), max(x0, x1), net, route_id, k))
+            else:
+                lines.setdefault(("v", round(x0, 3)), []).append((min(y0, y1), max(y0, y1), net, route_id, k))
+
+    limit = (MARGIN - HAIRLINE) * 0.9
+    for (orientation, at), segments in lines.items():
+        segments.sort()
+        group, group_end = [], None
+        for segment in segments + [None]:
+            if segment is not None and group and segment[0] < group_end:
+                group.append(segment)
+                group_end = max(group_end, segment[1])
+                continue
+            nets = sorted({s[2] for s in group})
+            if len(nets) > 1:
+                spacing = min(CHANNEL_SPACING, 2 * limit / (len(nets) - 1))
+                for _ in range(3):
+                    shifted = [(lo, hi, at + (nets.index(net) - (len(nets) - 1) / 2) * spacing)
+                               for lo, hi, net, _, _ in group]
+                    if orientation == "h":
+                        shifted = [((lo, c), (hi, c)) for lo, hi, c in shifted]
+                    else:
+                        shifted = [((c, lo), (c, hi)) for lo, hi, c in shifted]
+                    if not any(index.crosses(p, q) for p, q in shifted):
+                        break
+                    spacing /= 2
+                else:
+                    spacing = 0.0
+                for lo, hi, net, route_id, k in group if spacing else ():
+                    offset = (nets.index(net) - (len(nets) - 1) / 2) * spacing
+                    points = routes[route_id][1]
+                    for p in (k, k + 1):
+                        x, y = points[p]
+                        points[p] = (x, y + offset) if orientation == "h" else (x + offset, y)
+            if segment is not None:
+                group, group_end = [segment], segment[1]
+
+
+def _elbow(tail, head):
+    """Fallback waypoints: one bend below/above the tail, or none when the boxes line up"""
+    (ax, ay), (bx, by) = tail.center(), head.center()
+    if abs(ax - bx) < head.width / 2 or abs(ay - by) < tail.height / 2:
+        return []
+    return [(ax, by)]
+
+
+def route_edges(boxes, edges, nodes):
+    """Route each edge (tail/head names into `nodes`) around `boxes`
+    Returns ({edge index: waypoints}, [edge indices that got the elbow fallback])"""
+    if not boxes:
+        return {}, []
+    rects = [(b.x - HAIRLINE, b.y - HAIRLINE, b.x + b.width + HAIRLINE, b.y + b.height + HAIRLINE) for b in boxes]
+    index = ObstacleIndex(rects)
+    bounds = (min(b.x for b in boxes) - 1 * cm, min(b.y for b in boxes) - 1 * cm,
+              max(b.x + b.width for b in boxes) + 1 * cm, max(b.y + b.height for b in boxes) + 1 * cm)
+
+    # Channel lines from every clearance corner and port stub
+    points = [(bounds[0], bounds[1]), (bounds[0], bounds[3]), (bounds[2], bounds[1]), (bounds[2], bounds[3])]
+    for box in boxes:
+        x0, y0 = box.x - MARGIN, box.y - MARGIN
+        x1, y1 = box.x + box.width + MARGIN, box.y + box.height + MARGIN
+        points += [(x0, y0), (x0, y1), (x1, y0), (x1, y1)]
+        points += [stub for _, _, stub in _ports(box)]
+    corridors = CorridorGraph(rects, bounds, index.cell * TILE_FACTOR)
+    graph = ChannelGraph(index, points, bounds, corridors)
+
+    usage = ({}, {})  # axis -> y / x of a channel line -> its LineUsage
+    port_usage = {}  # (box, side) -> {("out", tail) / ("in", head)}: a side is shared only within a fan
+
+    def port_cost(box, side, toward, fan):
+        users = port_usage.get((box.name, side), ())
+        return _side_penalty(box, side, toward) + (PORT_COST if users and fan not in users else 0.0)
+
+    weight = HEURISTIC_WEIGHT if len(edges) > LARGE_PAGE else 1.0
+    routes, ids = [], []
+    fallback = {}
+    for edge_id, edge in edges:
+        tail, head = nodes[edge.tail], nodes[edge.head]
+        starts = [(v, port_cost(tail, side, head.center(), ("out", edge.tail)))
+                  for side, _, stub in _ports(tail) for v in [graph.vertex(stub)] if v is not None]
+        goals = [(v, port_cost(head, side, tail.center(), ("in", edge.head)))
+                 for side, _, stub in _ports(head) for v in [graph.vertex(stub)] if v is not None]
+        found = None
+        if starts and goals:
+            tiles = corridors.corridor(_stub_rect(tail), _stub_rect(head), CORRIDOR_WEIGHT if weight > 1 else 1.0)
+            found = _astar(graph, starts, goals, tiles, usage, edge.head, weight)
+        if found is None:  # boxed in, or no way through the corridor: one elbow, reported
+            fallback[edge_id] = _elbow(tail, head)
+            continue
+
+        path, _ = found
+        path = [graph.point(v) for v in path]
+        for p, q in zip(path, path[1:]):
+            axis = 0 if p[1] == q[1] else 1
+            lo, hi = sorted((p[axis], q[axis]))
+            if lo < hi:
+                usage[axis].setdefault(p[1 - axis], LineUsage()).add(lo, hi, edge.head)
+        side_tail, port_tail = next((side, port) for side, port, stub in _ports(tail) if stub == path[0])
+        side_head, port_head = next((side, port) for side, port, stub in _ports(head) if stub == path[-1])
+        port_usage.setdefault((edge.tail, side_tail), set()).add(("out", edge.tail))
+        port_usage.setdefault((edge.head, side_head), set()).add(("in", edge.head))
+        routes.append((edge.head, _simplify([port_tail] + path + [port_head])))
+        ids.append(edge_id)
+
+    _nudge(routes, index)
+    routed = {edge_id: points[1:-1] for edge_id, (_, points) in zip(ids, routes)}
+    routed.update(fallback)
+    return routed, list(fallback)
+
+
+def _crossing_edges(chart, page, boxes):
+    """(index, edge) of the page's edges whose drawn polyline runs through a box other than its ends"""
+    from flowchart_render import edge_points
+    index = SpatialIndex()
+    for box in boxes:
+        index.insert(box_rect(box), "box", box.name)
+    crossing = []
+    for k, edge in enumerate(chart.edges):
+        if edge.page != page or edge.tail == edge.head:
+            continue
+        points = edge_points(chart, edge)
+        if any(name not in (edge.tail, edge.head) and segment_hits_rect(p, q, rect)
+               for p, q in zip(points, points[1:]) for rect, _, name in index.query_segment(p, q)):
+            crossing.append((k, edge))
+    return crossing
+
+
+def route_flowchart(chart):
+    """Give the edges of an orthogonal chart a routed path (pages are independent): every
+    waypoint-less edge, or with routing="mixed" only the edges whose straight lines (or layout
+    waypoints) would run through a box; routing="auto" does the same as "mixed" on auto-laid-out pages
+    Returns an "unrouted edge" Overlap for each edge that fell back to an elbow"""
+    warnings = []
+    for page in range(chart.page_count):
+        if chart.routing == "auto" and page not in chart.transforms:
+            continue
+        boxes = [b for b in chart.nodes.values() if b.page == page and b.box_type != "note" and b.placed]
+        if chart.routing in ("mixed", "auto"):
+            edges = _crossing_edges(chart, page, boxes)
+            for _, edge in edges:
+                edge.points = []
+        else:
+            edges = [(k, e) for k, e in enumerate(chart.edges)
+                     if e.page == page and not e.points and e.tail != e.head]
+        routed, unrouted = route_edges(boxes, edges, chart.nodes)
+        for k, points in routed.items():
+            chart.edges[k].points = points
+        for k in unrouted:
+            warnings.append(Overlap("unrouted edge", page, f"{chart.edges[k].tail} -> {chart.edges[k].head}"))
+    return warnings
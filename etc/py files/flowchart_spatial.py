@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Spatial index for one flowchart page: boxes, edge segments and text register into a
+uniform grid hash, so overlap queries only look at nearby items instead of every pair.
+Rects go into every cell they cover, edge segments only into the cells they pass through
+(a long diagonal edge of a scaled-down drawing crosses a line of cells, not its whole bounding
+box). A page's cells are sized from its extent in drawing units (the paper size over the drawing
+scale) and its item count, so a big graph shrunk onto one page still has a few items per cell.
+render_flowchart uses it to nudge edge labels into free space and to collect an overlap
+report (box/box, box off page, edge through box, text on text)
+"""
+
+import math
+import os
+
+from reportlab.lib.units import cm
+
+from flowchart_text import string_width
+
+CELL = 1.5 * cm  # smallest grid cell, in drawing units
+TOLERANCE = 0.5  # points: touching outlines are not overlaps
+
+
+def text_rect(text, x, y, font, size, width=None):
+    """Bounding box of a drawString() call (baseline at y); pass `width` if it is already known"""
+    if width is None:
+        width = string_width(text, font, size)
+    return (x, y - 0.22 * size, x + width, y + 0.78 * size)
+
+
+def box_rect(box):
+    return (box.x, box.y, box.x + box.width, box.y + box.height)
+
+
+def segment_hits_rect(p, q, rect):
+    """True if the segment p-q passes through the interior of rect (Liang-Barsky clipping)"""
+    x0, y0, x1, y1 = rect[0] + TOLERANCE, rect[1] + TOLERANCE, rect[2] - TOLERANCE, rect[3] - TOLERANCE
+    dx, dy = q[0] - p[0], q[1] - p[1]
+    t0, t1 = 0.0, 1.0
+    for edge_p, edge_q in ((-dx, p[0] - x0), (dx, x1 - p[0]), (-dy, p[1] - y0), (dy, y1 - p[1])):
+        if edge_p == 0:
+            if edge_q < 0:
+                return False
+            continue
+        t = edge_q / edge_p
+        if edge_p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    return True
+
+
+class Overlap:
+    """One problem found while rendering a page"""
+    def __init__(self, kind, page, first, second=""):
+        self.kind = kind  # "box overlap", "off page", "edge crosses box", "label overlap", "unrouted edge"
+        self.page = page
+        self.first = first
+        self.second = second
+
+    def __str__(self):
+        detail = f"{self.first} / {self.second}" if self.second else self.first
+        return f"page {self.page + 1}: {self.kind}: {detail}"
+
+
+class SpatialIndex:
+    """Uniform grid hash of (rect, kind, name) items; edge items also keep their segment"""
+    def __init__(self, cell=CELL):
+        self.cell = cell
+        self.items = []
+        self.segments = {}  # item index -> (p, q) for segments, tested exactly by query()
+        self.grid = {}
+
+    def _cells(self, rect):
+        c = self.cell
+        xs = range(int(rect[0] // c), int(rect[2] // c) + 1)
+        return [(gx, gy) for gy in range(int(rect[1] // c), int(rect[3] // c) + 1) for gx in xs]
+
+    def _segment_cells(self, p, q):
+        """Cells the segment p-q passes through, in order (grid walk, one step per cell border)"""
+        c = self.cell
+        gx, gy = int(p[0] // c), int(p[1] // c)
+        end_x, end_y = int(q[0] // c), int(q[1] // c)
+        dx, dy = q[0] - p[0], q[1] - p[1]
+        step_x, step_y = (1 if dx > 0 else -1), (1 if dy > 0 else -1)
+        # Segment parameter t at the next vertical / horizontal cell border, and per cell
+        next_x = ((gx + (step_x > 0)) * c - p[0]) / dx if dx else math.inf
+        next_y = ((gy + (step_y > 0)) * c - p[1]) / dy if dy else math.inf
+        per_x, per_y = (c / abs(dx) if dx else math.inf), (c / abs(dy) if dy else math.inf)
+        cells = [(gx, gy)]
+        for _ in range(abs(end_x - gx) + abs(end_y - gy)):
+            if next_x < next_y:
+                gx += step_x
+                next_x += per_x
+            else:
+                gy += step_y
+                next_y += per_y
+            cells.append((gx, gy))
+        return cells
+
+    def _add(self, k, cells):
+        grid = self.grid
+        for key in cells:
+            cell = grid.get(key)
+            if cell is None:
+                grid[key] = [k]
+            else:
+                cell.append(k)
+
+    def insert(self, rect, kind, name):
+        k = len(self.items)
+        self.items.append((rect, kind, name))
+        self._add(k, self._cells(rect))
+        return k
+
+    def insert_segment(self, p, q, kind, name):
+        k = len(self.items)
+        self.items.append(((min(p[0], q[0]), min(p[1], q[1]), max(p[0], q[0]), max(p[1], q[1])), kind, name))
+        self.segments[k] = (p, q)
+        self._add(k, self._segment_cells(p, q))
+        return k
+
+    def _matches(self, candidates, rect, kinds):
+        found = []
+        items, segments = self.items, self.segments
+        x0, y0, x1, y1 = rect[0] + TOLERANCE, rect[1] + TOLERANCE, rect[2] - TOLERANCE, rect[3] - TOLERANCE
+        for k in candidates:
+            item = items[k]
+            other = item[0]
+            if x0 < other[2] and other[0] < x1 and y0 < other[3] and other[1] < y1 \
+                    and (kinds is None or item[1] in kinds) \
+                    and (k not in segments or segment_hits_rect(*segments[k], rect)):
+                found.append(item)
+        return found
+
+    def _candidates(self, cells):
+        grid = self.grid
+        if len(cells) == 1:  # the common case: no duplicates to skip
+            return grid.get(cells[0], ())
+        return sorted({k for key in cells for k in grid.get(key, ())})  # insertion order, as reports list items in it
+
+    def query(self, rect, kinds=None):
+        """Items whose rect (or segment) overlaps `rect` (optionally only of the given kinds)"""
+        return self._matches(self._candidates(self._cells(rect)), rect, kinds)
+
+    def hits(self, rect, kinds=None):
+        """True if any item overlaps `rect`: query() that stops at the first match"""
+        items, segments = self.items, self.segments
+        x0, y0, x1, y1 = rect[0] + TOLERANCE, rect[1] + TOLERANCE, rect[2] - TOLERANCE, rect[3] - TOLERANCE
+        for k in self._candidates(self._cells(rect)):
+            item = items[k]
+            other = item[0]
+            if x0 < other[2] and other[0] < x1 and y0 < other[3] and other[1] < y1 \
+                    and (kinds is None or item[1] in kinds) \
+                    and (k not in segments or segment_hits_rect(*segments[k], rect)):
+                return True
+        return False
+
+    def query_segment(self, p, q, kinds=None):
+        """Items whose rect overlaps the segment p-q's bounding box, from the cells the segment passes through"""
+        rect = (min(p[0], q[0]), min(p[1], q[1]), max(p[0], q[0]), max(p[1], q[1]))
+        return self._matches(self._candidates(self._segment_cells(p, q)), rect, kinds)
+
+
+class PageIndex(SpatialIndex):
+    """Spatial index of one page in drawing coordinates, collecting Overlaps as items register
+    `bounds` is the visible page in drawing coordinates (so it grows as the drawing scale shrinks);
+    with the expected number of `items` it sets the cell size to about one item per cell"""
+    def __init__(self, page, bounds, items=0):
+        area = (bounds[2] - bounds[0]) * (bounds[3] - bounds[1])
+        super().__init__(max(CELL, math.sqrt(area / items)) if items else CELL)
+        self.page = page
+        self.bounds = bounds  # the visible page, in drawing coordinates
+        self.overlaps = []
+
+    def report(self, kind, first, second=""):
+        self.overlaps.append(Overlap(kind, self.page, first, second))
+
+    def add_box(self, box):
+        """Register a box (text-page notes only clash with other notes)"""
+        rect = box_rect(box)
+        kind = "note" if box.box_type == "note" else "box"
+        for _, _, name in self.query(rect, (kind,)):
+            self.report("box overlap", name, box.name)
+        if not self._inside(rect, TOLERANCE):
+            self.report("off page", box.name)
+        self.insert(rect, kind, box.name)
+
+    def add_text(self, text, rect):
+        """Register free text, reporting the boxes and text it covers"""
+        for _, kind, name in self.query(rect, ("box", "text")):
+            self.report("label overlap", repr(text), name if kind == "box" else repr(name))
+        self.insert(rect, "text", text)
+
+    def add_edge(self, name, points, ends=()):
+        """Register an edge polyline and report boxes (other than its ends) it runs through"""
+        for p, q in zip(points, points[1:]):
+            for box_rect_, kind, box_name in self.query_segment(p, q, ("box",)):
+                if box_name not in ends and segment_hits_rect(p, q, box_rect_):
+                    self.report("edge crosses box", name, box_name)
+            self.insert_segment(p, q, "edge", name)
+
+    def place_label(self, text, points, font, size):
+        """Baseline position for an edge label: the first free spot along the edge, else the first
+        spot that only crosses edge lines, else the default"""
+        width = string_width(text, font, size)
+        for blocking in (("box", "text", "edge"), ("box", "text")):
+            for p, q in zip(points, points[1:]):
+                for t in (0.5, 0.25, 0.75):
+                    x, y = p[0] + (q[0] - p[0]) * t, p[1] + (q[1] - p[1]) * t
+                    for x, y in ((x + 2, y + 2), (x + 2, y - size - 1), (x - width - 2, y + 2), (x - width / 2, y + 3),
+                                 (x - width - 2, y - size - 1), (x - width / 2, y - size - 2),
+                                 (x + 2, y + size + 4), (x - width / 2, y - 2 * size - 4)):
+                        rect = text_rect(text, x, y, font, size, width)
+                        if self._inside(rect) and not self.hits(rect, blocking):
+                            self.insert(rect, "text", text)
+                            return x, y
+        default = ((points[0][0] + points[1][0]) / 2 + 0.2, (points[0][1] + points[1][1]) / 2 + 0.1)
+        self.add_text(text, text_rect(text, *default, font, size, width))
+        return default
+
+    def _inside(self, rect, tolerance=0.0):
+        x0, y0, x1, y1 = self.bounds
+        return (rect[0] >= x0 - tolerance and rect[1] >= y0 - tolerance
+                and rect[2] <= x1 + tolerance and rect[3] <= y1 + tolerance)
+
+
+def write_overlap_report(chart):
+    """Write <pdf name>_overlaps.txt next to the PDF (or remove a stale one); returns its path or None"""
+    path = os.path.splitext(chart.filename)[0] + "_overlaps.txt"
+    if not chart.overlaps:
+        if os.path.exists(path):
+            os.remove(path)
+        return None
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{chart.title}: {len(chart.overlaps)} overlaps\n")
+        for overlap in chart.overlaps:
+            f.write(f"{overlap}\n")
+    return path
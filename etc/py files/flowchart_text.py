@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Text measurement and wrapping for flowchart boxes
+Widths are cached per (text, font, size), so laying out thousands of labels
+measures each distinct string once. Labels wrap at spaces and, for words wider than the box
+(long Kannada compounds, paths) after '/', '-', '_' or '.', else between grapheme clusters:
+a base letter keeps its vowel signs and modifiers, and a consonant + virama stays joined to
+the next consonant (conjuncts)
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from kannada_font import text_width as _text_width
+
+BOX_FONT = "Helvetica"
+BOX_FONT_SIZE = 8
+LINE_HEIGHT = 10
+TEXT_PADDING = 1        # points between the text and the box outline, each side
+SHAPE_TEXT_WIDTH = {"diamond": 0.7, "ellipse": 0.85}  # share of the box width inside the shape at its middle
+
+VIRAMA = "\u0ccd"          # Kannada halant
+JOINERS = "\u200c\u200d"  # ZWNJ / ZWJ
+SOFT_BREAK = re.compile(r"(?<=[/\-_.])(?=.)")  # preferred break points inside a word
+
+
+@lru_cache(maxsize=65536)
+def string_width(text, font=BOX_FONT, size=BOX_FONT_SIZE):
+    """Cached width of text as drawn (Kannada runs measured in the Kannada font, shaped)"""
+    return _text_width(text, font, size)
+
+
+def graphemes(text):
+    """Split text into user-perceived characters (combining marks, joiners and conjuncts stay attached)"""
+    clusters = []
+    for ch in text:
+        if clusters and (unicodedata.category(ch).startswith("M") or ch in JOINERS
+                         or clusters[-1][-1] in JOINERS or clusters[-1][-1] == VIRAMA and ch.isalpha()):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+
+def fit_line(line, width, font="Helvetica", font_size=9):
+    """Trim `line` (between grapheme clusters) with an ellipsis so it fits `width` points"""
+    if string_width(line, font, font_size) > width:
+        clusters = graphemes(line)
+        # Longest prefix that fits with the ellipsis: bisection, widths grow with the prefix
+        low, high = 0, len(clusters)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if string_width("".join(clusters[:middle]) + "…", font, font_size) <= width:
+                low = middle
+            else:
+                high = middle - 1
+        line = "".join(clusters[:low]).rstrip() + "…"
+    return line
+
+
+def _break_word(word, width, font, size):
+    """Split a word wider than `width` after '/', '-', '_' or '.', else between grapheme clusters"""
+    lines, line = [], ""
+    for part in SOFT_BREAK.split(word):
+        pieces = [part] if string_width(part, font, size) <= width else graphemes(part)
+        for piece in pieces:
+            if line and string_width(line + piece, font, size) > width:
+                lines.append(line)
+                line = piece
+            else:
+                line += piece
+    return lines + [line]
+
+
+@lru_cache(maxsize=16384)
+def wrap_text(text, width, font=BOX_FONT, size=BOX_FONT_SIZE):
+    """Tuple of lines fitting `width`: explicit newlines are kept, then greedy word wrapping"""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            candidate = f"{line} {word}" if line else word
+            if string_width(candidate, font, size) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            if string_width(word, font, size) <= width:
+                line = word
+            else:
+                *full, line = _break_word(word, width, font, size)
+                lines += full
+        lines.append(line)
+    return tuple(lines)
+
+
+def text_width(box_type, width):
+    """Width available to the text of a box of this shape"""
+    return width * SHAPE_TEXT_WIDTH.get(box_type, 1.0) - 2 * TEXT_PADDING
+
+
+def box_lines(box):
+    """Wrapped lines of a placed box's label"""
+    return wrap_text(box.text, text_width(box.box_type, box.width))
+
+
+def fit_box(box):
+    """Grow a sized box's height (around its center) until the wrapped label fits; returns the lines"""
+    lines = box_lines(box)
+    needed = len(lines) * LINE_HEIGHT + 2 * TEXT_PADDING
+    if box.box_type == "diamond":
+        needed *= 1.5
+    if box.height is not None and needed > box.height:
+        if box.y is not None:
+            box.y -= (needed - box.height) / 2
+        box.height = needed
+    return lines
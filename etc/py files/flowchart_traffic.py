@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Traffic-weighted student flowchart: how often each edge of STUDENT_FLOWCHART_VISUAL is taken
+One pass over the backend data counts transitions per edge:
+- results.json: every submitted quiz walks the quiz path from "User Action?" to END. The first
+  two attempts of each (student, chapter), as in chapter_funnel, decide whether that chapter's quiz
+  ends up locked (progress_rules.quiz_lock): passed at once or failed twice count on the branch
+  to the matching LOCKED box
+- users.json progress: chapters read walk the read path; chapters not read yet count on the
+  "read first" branch
+Edges are drawn with width and color scaled by volume (square root, like a Sankey diagram).
+results.json is only appended to, so it is read from a saved cursor: a nightly run parses just
+the new results. users.json is a snapshot and is recounted only when it changed. Cache entries
+are keyed by the data file, so runs over different data directories don't mix.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+from flowchart_batch import add_output_arguments, apply_batch_arguments
+from chapter_funnel import _percentage
+from flowchart_cache import OUTPUT_DIR, build_flowchart, build_message
+from generate_visual_flowcharts import build_student_flowchart
+from json_stream import AppendedItems, iter_items
+from progress_rules import quiz_lock
+from scan_cache import CACHE_DIR, load_cache, save_cache
+from student_reports import DATA_DIR
+
+TRAFFIC_VERSION = "3"  # 2: cursors of CRLF files were off by one byte per line; 3: locks from results
+TRAFFIC_CACHE = os.path.join(CACHE_DIR, "student_traffic.json")
+
+QUIZ_PATH = [("user_action", "check_hasread"), ("check_hasread", "check_passed"), ("check_passed", "check_failed"),
+             ("check_failed", "load_quiz"), ("load_quiz", "answer"), ("answer", "submit"),
+             ("submit", "save_result"), ("save_result", "show_results"), ("show_results", "end")]
+READ_PATH = [("user_action", "open_chapter"), ("open_chapter", "mark_read"), ("mark_read", "save_progress")]
+LOCK_PATHS = {
+    "read-first": QUIZ_PATH[:1] + [("check_hasread", "locked_read")],
+    "already-passed": QUIZ_PATH[:2] + [("check_passed", "locked_passed")],
+    "failed-both": QUIZ_PATH[:3] + [("check_failed", "locked_failed")],
+}
+
+MIN_WIDTH, MAX_WIDTH = 0.75, 6.0
+LOW_COLOR, HIGH_COLOR = colors.HexColor("#9ecae1"), colors.HexColor("#d62728")
+UNMEASURED_COLOR = colors.lightgrey
+
+
+def _edge_key(tail, head):
+    return f"{tail}->{head}"
+
+
+def _add_path(counts, path, count=1):
+    for tail, head in path:
+        key = _edge_key(tail, head)
+        counts[key] = counts.get(key, 0) + count
+
+
+def attempts_lock(attempts):
+    """The lock a chapter's first attempts ([submitted, percentage]) leave its quiz in, or None"""
+    if not attempts:
+        return None
+    return quiz_lock({"hasRead": True, "quizAttempts": [{"score": percentage} for _, percentage in attempts]})
+
+
+def count_results(results, counts, attempts):
+    """Walk every result along the quiz path and keep each chapter's lock branch in step with its
+    first two attempts (attempts: "user|chapter" -> [[submitted, percentage]], updated); returns
+    the number of results"""
+    count = 0
+    for result in results:
+        count += 1
+        if result.get("userId") is None or result.get("chapterId") is None:
+            continue
+        key = f"{result['userId']}|{result['chapterId']}"
+        old = attempts.get(key, [])
+        submitted = str(result.get("submittedAt") or "")
+        if len(old) == 2 and submitted >= old[1][0]:
+            continue
+        new = attempts[key] = sorted(old + [[submitted, _percentage(result.get("percentage"))]])[:2]
+        old_lock, new_lock = attempts_lock(old), attempts_lock(new)
+        if old_lock != new_lock:
+            if old_lock:
+                _add_path(counts, LOCK_PATHS[old_lock], -1)
+            if new_lock:
+                _add_path(counts, LOCK_PATHS[new_lock])
+    _add_path(counts, QUIZ_PATH, count)
+    return count
+
+
+def count_progress(users, counts):
+    """Read path and "read first" locks from every users.json progress entry; returns the number of users"""
+    count = 0
+    for user in users:
+        count += 1
+        for progress in (user.get("progress") or {}).values():
+            if not progress:
+                continue
+            if progress.get("hasRead"):
+                _add_path(counts, READ_PATH)
+            elif quiz_lock(progress) == "read-first":
+                _add_path(counts, LOCK_PATHS["read-first"])
+    return count
+
+
+def student_traffic(data_dir=DATA_DIR, cache_path=TRAFFIC_CACHE, rebuild=False):
+    """Transitions per student flowchart edge, brought up to date from the saved cursor
+    Returns (counts {"tail->head": n}, totals {"results": n, "users": n, "new_results": n})"""
+    cache = load_cache(cache_path, TRAFFIC_VERSION)
+    if rebuild:
+        cache = {"version": TRAFFIC_VERSION, "files": {}}
+    results_file = os.path.abspath(os.path.join(data_dir, "results.json"))
+    users_file = os.path.abspath(os.path.join(data_dir, "users.json"))
+
+    saved = cache["files"].get(results_file) or {}
+    results = AppendedItems(results_file, "results", saved.get("cursor"))
+    result_counts = dict(saved.get("counts", {})) if results.resumed else {}
+    attempts = dict(saved.get("attempts", {})) if results.resumed else {}
+    new_results = count_results(results, result_counts, attempts)
+    total_results = (saved.get("total", 0) if results.resumed else 0) + new_results
+    cache["files"][results_file] = {"cursor": results.cursor, "counts": result_counts, "attempts": attempts,
+                                    "total": total_results}
+
+    stat = os.stat(users_file)
+    source = [stat.st_mtime, stat.st_size]
+    saved = cache["files"].get(users_file) or {}
+    if saved.get("source") != source:
+        user_counts = {}
+        users = count_progress(iter_items(users_file, "users"), user_counts)
+        saved = cache["files"][users_file] = {"source": source, "counts": user_counts, "total": users}
+    save_cache(cache_path, cache)
+
+    counts = dict(result_counts)
+    for key, count in saved["counts"].items():
+        counts[key] = counts.get(key, 0) + count
+    return counts, {"results": total_results, "users": saved["total"], "new_results": new_results}
+
+
+def edge_style(count, peak):
+    """(width, color) for an edge taken `count` times, the busiest edge `peak` times"""
+    share = math.sqrt(count / peak) if peak else 0.0
+    return (MIN_WIDTH + (MAX_WIDTH - MIN_WIDTH) * share,
+            colors.linearlyInterpolatedColor(LOW_COLOR, HIGH_COLOR, 0, 1, share))
+
+
+def apply_traffic(chart, counts):
+    """Scale and label every measured edge; edges the data says nothing about stay thin and grey"""
+    measured = {_edge_key(*edge) for edge in QUIZ_PATH + READ_PATH} \
+        | {_edge_key(*edge) for path in LOCK_PATHS.values() for edge in path}
+    peak = max(counts.values(), default=0)
+    for edge in chart.edges:
+        key = _edge_key(edge.tail, edge.head)
+        if key not in measured:
+            edge.width, edge.color = MIN_WIDTH, UNMEASURED_COLOR
+            continue
+        count = counts.get(key, 0)
+        edge.width, edge.color = edge_style(count, peak)
+        edge.label = f"{edge.label} ({count:,})" if edge.label else f"{count:,}"
+
+
+def build_traffic_flowchart(counts, totals):
+    """The student flowchart with edges weighted by traffic"""
+    chart = build_student_flowchart()
+    chart.name = "student_traffic"
+    chart.filename = os.path.join(OUTPUT_DIR, "STUDENT_FLOWCHART_TRAFFIC.pdf")
+    apply_traffic(chart, counts)
+    width, height = chart.pagesize
+    chart.label(f"Traffic: {totals['results']:,} quiz results, {totals['users']:,} students", 12*cm, height - 1*cm,
+                "Helvetica-Bold", 10)
+    chart.label("Edge width and color: transitions taken (square-root scale); grey: not recorded", 12*cm,
+                height - 1.45*cm, "Helvetica", 8, colors.grey)
+    chart.label("LOCKED branches: chapters not read yet, passed at once or failed twice (first two attempts)",
+                12*cm, height - 1.85*cm, "Helvetica", 8, colors.grey)
+    return chart
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Student flowchart with edges weighted by real traffic")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with results.json and users.json")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the saved cursor and count everything again")
+    parser.add_argument("--force", action="store_true", help="re-render even if the counts did not change")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    parser.add_argument("--dry-run", action="store_true", help="lay out the chart and print its stats, write nothing")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+
+    start = time.perf_counter()
+    try:
+        counts, totals = student_traffic(args.data_dir, rebuild=args.rebuild)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"⏱️  {totals['new_results']:,} new results ({totals['results']:,} total), {totals['users']:,} students "
+          f"counted in {time.perf_counter() - start:.2f}s")
+    chart = build_traffic_flowchart(counts, totals)
+    print(build_message(chart, build_flowchart(chart, args.force), f"✅ Created: {chart.filename}"))
@@ -4,88 +4,119 @@ Generate three detailed flowchart PDFs for Kannada Learning App
 Using simple PDF drawing approach
 """
 
-from reportlab.pdfgen import canvas
+import os
+import sys
+
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.colors import HexColor, black, white
-from reportlab.lib.units import inch
 
-def create_student_flowchart():
-    """Create Student Flow Flowchart PDF"""
-    pdf_path = "d:\\VS\\Learn\\kannada-learning-app\\STUDENT_FLOWCHART.pdf"
-    c = canvas.Canvas(pdf_path, pagesize=landscape(A4))
-    width, height = landscape(A4)
-    
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(width/2 - 200, height - 40, "📚 STUDENT FLOW - Kannada Learning App")
-    
-    # Page 1
-    y = height - 100
-    c.setFont("Helvetica-Bold", 14)
-    
-    c.drawString(50, y, "Page Load Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    functions = [
-        "• DOMContentLoaded() → loadStudentProgress(), syncProgressFromServer(), displayUserInfo()",
-        "• loadStudentProgress() → Load from localStorage",
-        "• syncProgressFromServer() → GET /api/auth/user/:id",
-        "• displayUserInfo() → Show welcome message + logout",
-        "• displayStudentStats() → Show total/completed/in-progress chapters",
-    ]
-    for func in functions:
-        c.drawString(70, y, func)
-        y -= 20
-    
-    y -= 10
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Chapter Reading Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    read_funcs = [
-        "• loadChapters() → Display chapters with progress bars",
-        "• getChapterProgress(chapterId) → Calculate 50% read + 50% passed quiz",
-        "• getChapterStatus(chapterId) → Determine completed/in-progress/failed status",
-        "• openChapterToRead(chapterId) → Show chapter content in modal",
-        "• markAsReadAndClose(chapterId) → Set hasRead=true, saveProgressToServer()",
-    ]
-    for func in read_funcs:
-        c.drawString(70, y, func)
-        y -= 20
-    
-    y -= 10
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Quiz Taking Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    quiz_funcs = [
-        "• startChapterQuiz(chapterId) → Check locks (hasRead, 1st pass, 2x fail)",
-        "• showReadFirstModal() → Lock quiz - student must read first",
-        "• showAlreadyPassedModal() → Lock quiz - already passed on 1st attempt",
-        "• showQuizLockedModal() → Lock quiz - failed 2 attempts",
-        "• startQuiz(chapterId) → Load quiz questions, initialize userAnswers[]",
-        "• saveAnswer(index, answer) → Update userAnswers on selection",
-        "• submitQuiz(event) → Send answers to /api/quizzes/:id/submit, calculate score",
-        "• saveResultToDatabase(results) → POST /api/results/submit",
-        "• updateChapterProgress(chapterId, hasRead, quizScore) → Track score & attempts",
-        "• saveProgressToServer() → PUT /api/auth/user/:id with progress",
-        "• showResults(results) → Display score, emoji, congratulations message",
+from flowchart_model import Flowchart
+from flowchart_text import fit_line
+from flowchart_batch import apply_batch_arguments, batch_arguments, run_charts, report_results
+from flowchart_cache import OUTPUT_DIR, build_flowchart, build_message, report_dir
+from route_index import scan_routes, routes_under
+from callgraph_index import api_requests, build_index, call_chain, match_route
+
+
+def add_section(chart, y, heading, lines, heading_size=14, heading_gap=30,
+                font="Helvetica", font_size=11, leading=20, gap=10, x=50, width=None):
+    """Add a heading + text block at y and return the y of the next section"""
+    height = heading_gap + leading * len(lines)
+    width = width or chart.pagesize[0] - 2 * x
+    chart.node(None, "\n".join(lines), "note", x=x, y=y - height, width=width, height=height,
+               heading=heading, heading_size=heading_size, heading_gap=heading_gap,
+               font=font, font_size=font_size, leading=leading)
+    return y - height - gap
+
+
+def endpoint_lines(routes, width, font="Helvetica", font_size=9):
+    """'VERB /path → description' lines, descriptions trimmed to fit `width` points"""
+    return [fit_line(f"{route.endpoint} → {route.description}" if route.description else route.endpoint,
+                     width, font, font_size)
+            for route in routes]
+
+
+def function_line(index, routes, func):
+    """'• name(params) → API requests, callees' (or the JS comment for leaf functions)"""
+    details = []
+    for verb, path in api_requests(index, func.name):
+        route = match_route(verb, path, routes)
+        details.append(route.endpoint if route else f"{verb} {path} (no backend route!)")
+    details += [f"{callee}() (undefined!)" for callee in func.unresolved]
+    details += [f"{callee}()" for callee in func.calls if "." not in callee]
+    detail = ", ".join(details) or func.description
+    return f"• {func.signature} → {detail}" if detail else f"• {func.signature}"
+
+
+def function_sections(index, files, groups):
+    """[(heading, functions)] from (heading, root names); each group takes everything its roots
+    reach in the call graph that no earlier group claimed, leftovers go to 'Other Functions'"""
+    roots = {name for _, names in groups for name in names}
+    claimed = set()
+    sections = []
+    for heading, names in groups:
+        members = []
+        stack = [name for name in reversed(names) if name in index]
+        while stack:
+            name = stack.pop()
+            if name in claimed or index[name].file not in files:
+                continue
+            claimed.add(name)
+            members.append(index[name])
+            stack += [c for c in reversed(index[name].calls) if c not in roots and "." not in c]
+        sections.append((heading, sorted(members, key=lambda func: (func.file, func.line))))
+    rest = [func for func in index.values() if func.file in files and func.name not in claimed]
+    if rest:
+        sections.append(("Other Functions:", sorted(rest, key=lambda func: (func.file, func.line))))
+    return [(heading, funcs) for heading, funcs in sections if funcs]
+
+
+def add_sections(chart, y, sections, continued, font="Helvetica", font_size=10, leading=15,
+                 heading_gap=26, gap=10, bottom=40, x=50):
+    """Add (heading, lines) sections from y down, continuing on new pages when a page fills up"""
+    width, height = chart.pagesize
+    for heading, lines in sections:
+        lines = [fit_line(line, width - 2 * x - 20, font, font_size) for line in lines]
+        while lines:
+            fits = int((y - bottom - heading_gap) // leading)
+            if fits < min(3, len(lines)):
+                chart.new_page()
+                chart.label(continued, x, height - 50, "Helvetica-Bold", 16)
+                y = height - 80
+                continue
+            y = add_section(chart, y, heading, lines[:fits], heading_size=12, heading_gap=heading_gap,
+                            font=font, font_size=font_size, leading=leading, gap=gap, x=x)
+            lines = lines[fits:]
+            heading = heading.rstrip(":") + " (cont.):" if lines else heading
+    return y
+
+
+def build_student_flowchart():
+    """Build the Student Flow document model"""
+    chart = Flowchart("student", "STUDENT FLOW - Kannada Learning App",
+                      os.path.join(OUTPUT_DIR, "STUDENT_FLOWCHART.pdf"))
+    width, height = chart.pagesize
+    chart.label("📚 STUDENT FLOW - Kannada Learning App", width/2 - 200, height - 40, "Helvetica-Bold", 20)
+    
+    # Page 1+ - generated from the frontend call graph
+    index, routes = build_index(), scan_routes()
+    chain = " → ".join(call_chain(index, "startChapterQuiz", "saveProgressToServer"))
+    groups = [
+        ("Page Load Functions:", ["<DOMContentLoaded student.js>"]),
+        ("Chapter Reading Functions:", ["loadChapters", "openChapter"]),
+        ("Quiz Taking Functions:", ["startChapterQuiz"]),
+        ("Profile & Password Functions:", ["openUserProfileModal", "logout"]),
     ]
-    for func in quiz_funcs:
-        c.drawString(70, y, func)
-        y -= 18
-    
-    c.showPage()
+    sections = [("Quiz Call Chain:", [chain])] if chain else []
+    sections += [(heading, [function_line(index, routes, func) for func in funcs])
+                 for heading, funcs in function_sections(index, {"student.js"}, groups)]
+    add_sections(chart, height - 80, sections, "STUDENT FUNCTIONS (continued)")
     
     # Page 2 - Data & Logic
+    chart.new_page()
     y = height - 50
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "DATA STRUCTURE & PROGRESS LOGIC")
+    chart.label("DATA STRUCTURE & PROGRESS LOGIC", 50, y, "Helvetica-Bold", 16)
     
     y -= 40
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "studentProgress Data Structure:")
-    y -= 25
-    c.setFont("Courier", 10)
     code_lines = [
         "studentProgress[chapterId] = {",
         "  hasRead: boolean,           // 50% progress when true",
@@ -93,30 +124,17 @@ def create_student_flowchart():
         "  bestScore: number           // 50% progress when >= 50",
         "}",
     ]
-    for line in code_lines:
-        c.drawString(70, y, line)
-        y -= 18
+    y = add_section(chart, y, "studentProgress Data Structure:", code_lines, heading_size=12, heading_gap=25,
+                    font="Courier", font_size=10, leading=18, gap=20)
     
-    y -= 20
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Progress Calculation:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     progress_rules = [
         "• 0% → No progress (not read, no attempts)",
         "• 50% → Read only (hasRead=true, no passing score)",
         "• 50% → Failed attempt (hasRead=true, bestScore < 50)",
         "• 100% → Completed (hasRead=true AND bestScore >= 50)",
     ]
-    for rule in progress_rules:
-        c.drawString(70, y, rule)
-        y -= 20
+    y = add_section(chart, y, "Progress Calculation:", progress_rules, heading_size=12, heading_gap=25, gap=20)
     
-    y -= 20
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "Quiz Attempt Rules:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     rules = [
         "• Scenario 1: hasRead=false → Show 'Read First' modal (LOCKED)",
         "• Scenario 2: Passed on 1st attempt (score >= 50) → LOCKED, no retakes",
@@ -124,162 +142,78 @@ def create_student_flowchart():
         "• Scenario 4: Failed both attempts → LOCKED (100% fail)",
         "• Scenario 5: Passed 2nd attempt after fail → COMPLETED",
     ]
-    for rule in rules:
-        c.drawString(70, y, rule)
-        y -= 20
-    
-    c.showPage()
-    c.save()
-    print(f"✅ STUDENT_FLOWCHART.pdf created")
+    add_section(chart, y, "Quiz Attempt Rules:", rules, heading_size=12, heading_gap=25)
+    return chart
 
-def create_admin_flowchart():
-    """Create Admin Flow Flowchart PDF"""
-    pdf_path = "d:\\VS\\Learn\\kannada-learning-app\\ADMIN_FLOWCHART.pdf"
-    c = canvas.Canvas(pdf_path, pagesize=landscape(A4))
-    width, height = landscape(A4)
-    
-    c.setFont("Helvetica-Bold", 20)
-    c.drawString(width/2 - 150, height - 40, "⚙️ ADMIN FLOW - Kannada Learning App")
-    
-    # Page 1
-    y = height - 100
-    c.setFont("Helvetica-Bold", 14)
-    
-    c.drawString(50, y, "Admin Dashboard Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    admin_funcs = [
-        "• loadAdminChapters() → GET /api/chapters, display list",
-        "• editChapter(id) → Load chapter data, populate form for edit",
-        "• deleteChapter(id) → DELETE /api/chapters/:id, remove from list",
-        "• loadChapterDropdown() → Populate chapter dropdown for quiz creation",
-        "• loadAdminQuizzes() → GET /api/quizzes, display all quizzes",
-        "• saveQuiz() → POST /api/quizzes or PUT /api/quizzes/:id",
-        "• editQuiz(id) → Load quiz, show questions for editing",
-        "• deleteQuiz(id) → DELETE /api/quizzes/:id",
-    ]
-    for func in admin_funcs:
-        c.drawString(70, y, func)
-        y -= 20
-    
-    y -= 10
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Results Management Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    results_funcs = [
-        "• loadResults() → GET /api/results/all, display table of all quiz submissions",
-        "• filterResults(userId) → GET /api/results/user/:userId, show student's history",
-        "• downloadPDF(resultId) → GET /api/results/download-pdf/:id, generate jsPDF",
-        "• resetQuiz(userId, chapterId) → POST /api/results/reset-quiz",
-        "  - Clears: hasRead=false, quizAttempts=[], bestScore=0",
-        "  - Result: Student can re-read and retake quiz",
+def build_admin_flowchart():
+    """Build the Admin Flow document model"""
+    chart = Flowchart("admin", "ADMIN FLOW - Kannada Learning App",
+                      os.path.join(OUTPUT_DIR, "ADMIN_FLOWCHART.pdf"))
+    width, height = chart.pagesize
+    chart.label("⚙️ ADMIN FLOW - Kannada Learning App", width/2 - 150, height - 40, "Helvetica-Bold", 20)
+    
+    # Page 1+ - generated from the frontend call graph
+    index, routes = build_index(), scan_routes()
+    groups = [
+        ("Chapter Management Functions:", ["loadAdminChapters", "<#chapter-form submit admin.js>"]),
+        ("Quiz Management Functions:", ["loadQuizForChapter", "addQuestion", "<#quiz-form submit admin.js>"]),
+        ("Navigation Functions (app.js):", ["showView", "showAdminTab"]),
     ]
-    for func in results_funcs:
-        c.drawString(70, y, func)
-        y -= 20
-    
-    y -= 10
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "Student Management Functions:")
-    y -= 30
-    c.setFont("Helvetica", 11)
-    student_funcs = [
-        "• loadStudents() → GET /api/auth/users, show enrollment",
-        "• searchStudent(query) → Filter students by name/email",
-        "• viewStudentProgress(userId) → GET /api/auth/user/:id, show progress details",
-        "• Statistics: Total enrolled, completed chapters, quiz attempts per student",
-    ]
-    for func in student_funcs:
-        c.drawString(70, y, func)
-        y -= 20
-    
-    c.showPage()
+    sections = [(heading, [function_line(index, routes, func) for func in funcs])
+                for heading, funcs in function_sections(index, {"admin.js", "app.js"}, groups)]
+    helpers = [func for func in index.values() if func.file == "api.js" and "." in func.name]
+    sections.append(("API Helpers (api.js):", [function_line(index, routes, func) for func in helpers]))
+    add_sections(chart, height - 80, sections, "ADMIN FUNCTIONS (continued)")
     
     # Page 2
+    chart.new_page()
     y = height - 50
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "ADMIN CAPABILITIES & WORKFLOWS")
+    chart.label("ADMIN CAPABILITIES & WORKFLOWS", 50, y, "Helvetica-Bold", 16)
+    workflow = dict(heading_size=12, heading_gap=25, leading=18, gap=15)
     
     y -= 40
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "1. CONTENT MANAGEMENT:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     content_wf = [
         "Create Chapter → Fill form (number, title, content, summary) → Submit",
         "Edit Chapter → Select chapter → Modify fields → Update",
         "Delete Chapter → Confirm deletion → Remove from system",
         "Result: chapters.json updated, students see changes immediately",
     ]
-    for item in content_wf:
-        c.drawString(70, y, item)
-        y -= 18
+    y = add_section(chart, y, "1. CONTENT MANAGEMENT:", content_wf, **workflow)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "2. QUIZ MANAGEMENT:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     quiz_wf = [
         "Create Quiz → Select chapter → Add questions (Q, options, answer) → Submit",
         "Edit Quiz → Select quiz → Modify questions → Update",
         "Delete Quiz → Confirm → Remove from system",
         "Result: quizzes.json updated, affects student assessments",
     ]
-    for item in quiz_wf:
-        c.drawString(70, y, item)
-        y -= 18
+    y = add_section(chart, y, "2. QUIZ MANAGEMENT:", quiz_wf, **workflow)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "3. RESULTS MONITORING:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     results_wf = [
         "View All Results → See all quiz submissions with timestamps & scores",
         "Filter by Student → Search by name → View student's quiz history",
         "Download PDF → Get detailed report (Q&A) in Kannada",
         "Result: results.json queried, jsPDF generated with Kannada support",
     ]
-    for item in results_wf:
-        c.drawString(70, y, item)
-        y -= 18
+    y = add_section(chart, y, "3. RESULTS MONITORING:", results_wf, **workflow)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "4. STUDENT PROGRESS RESET:")
-    y -= 25
-    c.setFont("Helvetica", 11)
     reset_wf = [
         "View Student Results → Click 'Reset Quiz' → Confirm",
         "Backend: Clear hasRead=false, quizAttempts=[], bestScore=0",
         "Student Experience: Chapter shows as unread, quiz re-available",
         "Workflow: Student reads again, can retake quiz from scratch",
     ]
-    for item in reset_wf:
-        c.drawString(70, y, item)
-        y -= 18
-    
-    c.showPage()
-    c.save()
-    print(f"✅ ADMIN_FLOWCHART.pdf created")
+    add_section(chart, y, "4. STUDENT PROGRESS RESET:", reset_wf, **workflow)
+    return chart
 
-def create_complete_system_flowchart():
-    """Create Complete System Flow Flowchart PDF"""
-    pdf_path = "d:\\VS\\Learn\\kannada-learning-app\\COMPLETE_SYSTEM_FLOWCHART.pdf"
-    c = canvas.Canvas(pdf_path, pagesize=landscape(A4))
-    width, height = landscape(A4)
-    
-    c.setFont("Helvetica-Bold", 18)
-    c.drawString(width/2 - 200, height - 40, "🌐 COMPLETE SYSTEM FLOW")
+def build_complete_system_flowchart():
+    """Build the Complete System Flow document model"""
+    chart = Flowchart("complete_system", "COMPLETE SYSTEM FLOW",
+                      os.path.join(OUTPUT_DIR, "COMPLETE_SYSTEM_FLOWCHART.pdf"))
+    width, height = chart.pagesize
+    chart.label("🌐 COMPLETE SYSTEM FLOW", width/2 - 200, height - 40, "Helvetica-Bold", 18)
     
     # Page 1 - Architecture & Journey
     y = height - 100
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "SYSTEM ARCHITECTURE:")
-    y -= 30
-    c.setFont("Helvetica", 10)
     arch = [
         "Frontend (Student): HTML + Vanilla JS | Chapter reading, quiz taking, progress tracking",
         "Frontend (Admin): HTML + Admin.js | Content mgmt, quiz mgmt, results, student reset",
@@ -287,15 +221,8 @@ def create_complete_system_flowchart():
         "Database: JSON Files | users.json, chapters.json, quizzes.json, results.json",
         "PDF Export: jsPDF + jspdf-autotable | Kannada support, downloadable results",
     ]
-    for item in arch:
-        c.drawString(70, y, item)
-        y -= 18
+    y = add_section(chart, y, "SYSTEM ARCHITECTURE:", arch, font_size=10, leading=18, gap=15)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "COMPLETE USER JOURNEY:")
-    y -= 25
-    c.setFont("Helvetica", 9)
     journey = [
         "1. Signup/Login → Credentials → users.json + JWT token",
         "2. Page Load → syncProgressFromServer() → GET /api/auth/user/:id",
@@ -310,108 +237,52 @@ def create_complete_system_flowchart():
         "11. Reset → resetQuiz() → POST /api/results/reset-quiz → Clear progress",
         "12. Retry → Student re-reads, retakes quiz",
     ]
-    for item in journey:
-        c.drawString(70, y, item)
-        y -= 16
+    add_section(chart, y, "COMPLETE USER JOURNEY:", journey, heading_gap=25, font_size=9, leading=16)
     
-    c.showPage()
-    
-    # Page 2 - API Endpoints
+    # Page 2 - API Endpoints, straight from the Express route registrations
+    chart.new_page()
     y = height - 50
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "BACKEND API ENDPOINTS:")
-    
-    y -= 35
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "AUTHENTICATION:")
-    y -= 22
-    c.setFont("Helvetica", 9)
-    auth_api = [
-        "POST /api/auth/signup → Create user → users.json + token",
-        "POST /api/auth/login → Verify creds → JWT token",
-        "GET /api/auth/user/:id → Fetch user+progress → syncProgressFromServer()",
-        "PUT /api/auth/user/:id → Update user/progress → saveProgressToServer()",
-    ]
-    for api in auth_api:
-        c.drawString(70, y, api)
-        y -= 16
+    chart.label("BACKEND API ENDPOINTS:", 50, y, "Helvetica-Bold", 14)
+    endpoints = dict(heading_size=11, heading_gap=22, font_size=9, leading=16, gap=12)
+    column = width / 2 - 70
+    text_width = column - 20  # note lines are indented 20pt
+    routes = scan_routes()
     
-    y -= 12
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "CONTENT:")
-    y -= 22
-    c.setFont("Helvetica", 9)
-    content_api = [
-        "GET /api/chapters → All chapters",
-        "GET /api/chapters/:id → Single chapter",
-        "POST /api/chapters → Create (admin)",
-        "PUT /api/chapters/:id → Update (admin)",
-        "DELETE /api/chapters/:id → Delete (admin)",
-    ]
-    for api in content_api:
-        c.drawString(70, y, api)
-        y -= 16
+    y = height - 85
+    auth_api = endpoint_lines(routes_under(routes, "/api/auth"), text_width)
+    add_section(chart, y, "AUTHENTICATION:", auth_api, width=column, **endpoints)
     
-    y -= 12
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "QUIZZES & RESULTS:")
-    y -= 22
-    c.setFont("Helvetica", 9)
-    quiz_api = [
-        "GET /api/quizzes/chapter/:id → Get quiz",
-        "POST /api/quizzes/:id/submit → Submit+score",
-        "POST /api/results/submit → Save result",
-        "GET /api/results/all → All results (admin)",
-        "GET /api/results/user/:id → Filter (admin)",
-        "GET /api/results/download-pdf/:id → PDF",
-        "POST /api/results/reset-quiz → Reset",
-    ]
-    for api in quiz_api:
-        c.drawString(70, y, api)
-        y -= 16
+    y = height - 85
+    content_api = endpoint_lines(routes_under(routes, "/api/chapters", "/api/health"), text_width)
+    y = add_section(chart, y, "CONTENT:", content_api, x=width / 2, width=column, **endpoints)
     
-    c.showPage()
+    quiz_api = endpoint_lines(routes_under(routes, "/api/quizzes", "/api/results"), text_width)
+    add_section(chart, y, "QUIZZES & RESULTS:", quiz_api, x=width / 2, width=column, **endpoints)
     
     # Page 3 - Key Logic & Data
+    chart.new_page()
     y = height - 50
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "KEY LOGIC & DATA STRUCTURES:")
+    chart.label("KEY LOGIC & DATA STRUCTURES:", 50, y, "Helvetica-Bold", 14)
     
     y -= 40
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "Progress Calculation (50% Read + 50% Pass):")
-    y -= 22
-    c.setFont("Courier", 9)
     logic = [
         "progress = 0;",
         "if (hasRead) progress += 50;",
         "if (bestScore >= 50) progress += 50;  // Passing score is 50%",
         "// Results: 0%, 50%, or 100%",
     ]
-    for line in logic:
-        c.drawString(70, y, line)
-        y -= 14
+    y = add_section(chart, y, "Progress Calculation (50% Read + 50% Pass):", logic, heading_size=11, heading_gap=22,
+                    font="Courier", font_size=9, leading=14, gap=15)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "Quiz Lock Rules:")
-    y -= 22
-    c.setFont("Helvetica", 9)
     lock_rules = [
         "IF hasRead=false → Lock: 'Read First'",
         "IF attempts=1 AND score>=50 → Lock: 'Already Passed'",
         "IF attempts>=2 AND allFailed → Lock: 'Failed Both'",
         "ELSE → Unlock: Allow Quiz",
     ]
-    for rule in lock_rules:
-        c.drawString(70, y, rule)
-        y -= 14
+    y = add_section(chart, y, "Quiz Lock Rules:", lock_rules, heading_size=11, heading_gap=22,
+                    font_size=9, leading=14, gap=15)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "User Progress Structure:")
-    y -= 22
-    c.setFont("Courier", 8)
     user_struct = [
         "user.progress[chapterId] = {",
         "  hasRead: boolean,",
@@ -419,15 +290,9 @@ def create_complete_system_flowchart():
         "  bestScore: 75  // Max score from all attempts",
         "}",
     ]
-    for line in user_struct:
-        c.drawString(70, y, line)
-        y -= 12
+    y = add_section(chart, y, "User Progress Structure:", user_struct, heading_size=11, heading_gap=22,
+                    font="Courier", font_size=8, leading=12, gap=15)
     
-    y -= 15
-    c.setFont("Helvetica-Bold", 11)
-    c.drawString(50, y, "Quiz Result Structure:")
-    y -= 22
-    c.setFont("Courier", 8)
     result_struct = [
         "result = {",
         "  id, userId, userName, chapterId, chapterTitle,",
@@ -435,22 +300,15 @@ def create_complete_system_flowchart():
         "  score: 3, totalQuestions: 5, percentage: 60, submittedAt",
         "}",
     ]
-    for line in result_struct:
-        c.drawString(70, y, line)
-        y -= 12
-    
-    c.showPage()
+    add_section(chart, y, "Quiz Result Structure:", result_struct, heading_size=11, heading_gap=22,
+                font="Courier", font_size=8, leading=12)
     
     # Page 4 - Capabilities
+    chart.new_page()
     y = height - 50
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y, "CAPABILITIES MATRIX:")
+    chart.label("CAPABILITIES MATRIX:", 50, y, "Helvetica-Bold", 14)
     
     y -= 40
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "STUDENT:")
-    y -= 25
-    c.setFont("Helvetica", 10)
     student_cap = [
         "✓ View chapters with progress % & status badges",
         "✓ Read chapter content in modal",
@@ -460,15 +318,9 @@ def create_complete_system_flowchart():
         "✓ View & update user profile",
         "✓ Auto-logout after 30 mins inactivity",
     ]
-    for cap in student_cap:
-        c.drawString(70, y, cap)
-        y -= 16
+    y = add_section(chart, y, "STUDENT:", student_cap, heading_size=12, heading_gap=25,
+                    font_size=10, leading=16, gap=20)
     
-    y -= 20
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(50, y, "ADMIN:")
-    y -= 25
-    c.setFont("Helvetica", 10)
     admin_cap = [
         "✓ Create/edit/delete chapters (with content mgmt)",
         "✓ Create/edit/delete quizzes (with Q&A management)",
@@ -478,29 +330,44 @@ def create_complete_system_flowchart():
         "✓ Reset individual student quizzes & progress",
         "✓ Monitor student enrollment & completion stats",
     ]
-    for cap in admin_cap:
-        c.drawString(70, y, cap)
-        y -= 16
-    
-    c.showPage()
-    c.save()
-    print(f"✅ COMPLETE_SYSTEM_FLOWCHART.pdf created")
+    add_section(chart, y, "ADMIN:", admin_cap, heading_size=12, heading_gap=25, font_size=10, leading=16)
+    return chart
+
+def create_student_flowchart(force=False):
+    """Create Student Flow Flowchart PDF"""
+    chart = build_student_flowchart()
+    print(build_message(chart, build_flowchart(chart, force)))
+
+def create_admin_flowchart(force=False):
+    """Create Admin Flow Flowchart PDF"""
+    chart = build_admin_flowchart()
+    print(build_message(chart, build_flowchart(chart, force)))
+
+def create_complete_system_flowchart(force=False):
+    """Create Complete System Flow Flowchart PDF"""
+    chart = build_complete_system_flowchart()
+    print(build_message(chart, build_flowchart(chart, force)))
 
 if __name__ == "__main__":
+    args = batch_arguments("Generate the Kannada Learning App flowchart PDFs").parse_args()
+    apply_batch_arguments(args)
     print("🚀 Generating Kannada Learning App Flowchart PDFs...\n")
     
-    try:
-        create_student_flowchart()
-        create_admin_flowchart()
-        create_complete_system_flowchart()
-        
-        print("\n✅ All three PDFs generated successfully!")
-        print("\n📁 Output Files in: d:\\VS\\Learn\\kannada-learning-app\\")
-        print("   1. STUDENT_FLOWCHART.pdf (2 pages)")
-        print("   2. ADMIN_FLOWCHART.pdf (2 pages)")
-        print("   3. COMPLETE_SYSTEM_FLOWCHART.pdf (4 pages)")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    results = run_charts([
+        ("STUDENT_FLOWCHART.pdf", create_student_flowchart, (args.force,)),
+        ("ADMIN_FLOWCHART.pdf", create_admin_flowchart, (args.force,)),
+        ("COMPLETE_SYSTEM_FLOWCHART.pdf", create_complete_system_flowchart, (args.force,)),
+    ], jobs=args.jobs)
+    
+    if not report_results(results):
+        sys.exit(1)
+    
+    if args.dry_run:
+        print("\n📐 Dry run: charts laid out and recorded, no PDFs written")
+        sys.exit(0)
+
+    print("\n✅ All three PDFs generated successfully!")
+    print(f"\n📁 Output Files in: {report_dir()}")
+    print("   1. STUDENT_FLOWCHART.pdf (functions generated from frontend/js)")
+    print("   2. ADMIN_FLOWCHART.pdf (functions generated from frontend/js)")
+    print("   3. COMPLETE_SYSTEM_FLOWCHART.pdf (4 pages)")
@@ -2,345 +2,356 @@
 """
 Generate visual flowchart diagrams with boxes for Kannada Learning App
 Using reportlab and PIL for pure Python flowchart generation (no Graphviz needed)
+Boxes are placed by the layered auto-layout; the PDFs are *_FLOWCHART_LAYERED.pdf so they sit
+next to the hand-placed *_FLOWCHART_VISUAL.pdf of generate_visual_flowcharts.py
 """
 
-from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from io import BytesIO
+import os
+import sys
 
-def create_student_flowchart_visual():
-    """Create visual Student Flow flowchart with boxes"""
+from flowchart_model import Flowchart
+from flowchart_batch import apply_batch_arguments, batch_arguments, run_charts, report_results
+from flowchart_cache import OUTPUT_DIR, build_flowchart, build_message, report_dir
+
+
+def build_student_flowchart_visual():
+    """Build visual Student Flow flowchart with boxes"""
     
-    dot = Digraph('Student Flow', comment='Student Journey Flowchart')
-    dot.attr(rankdir='TB', size='10,14')
-    dot.attr('node', shape='box', style='filled', fillcolor='lightblue', 
-             fontname='Helvetica', fontsize='10', margin='0.3,0.2')
-    dot.attr('graph', bgcolor='white', pad='0.5')
+    chart = Flowchart('student', 'Student Journey Flowchart',
+                      os.path.join(OUTPUT_DIR, 'STUDENT_FLOWCHART_LAYERED.pdf'), rankdir='TB', routing='mixed')
+    width, height = chart.pagesize
+    chart.label(chart.title, 1*cm, height - 1*cm, 'Helvetica-Bold', 16)
     
     # Define nodes with colors
-    dot.attr('node', fillcolor='lightgreen')
-    dot.node('start', 'START\nPage Load', shape='ellipse')
+    fill = 'lightgreen'
+    chart.node('start', 'START\nPage Load', 'ellipse', fill)
     
-    dot.attr('node', fillcolor='lightblue')
-    dot.node('load_progress', 'Load Progress\nfrom localStorage')
-    dot.node('sync_server', 'Sync Progress\nfrom Server\nGET /api/auth/user/:id')
-    dot.node('display_chapters', 'Display Chapters\nwith Progress Bars')
+    fill = 'lightblue'
+    chart.node('load_progress', 'Load Progress\nfrom localStorage', 'box', fill)
+    chart.node('sync_server', 'Sync Progress\nfrom Server\nGET /api/auth/user/:id', 'box', fill)
+    chart.node('display_chapters', 'Display Chapters\nwith Progress Bars', 'box', fill)
     
-    dot.attr('node', fillcolor='lightyellow')
-    dot.node('read_decision', 'User Clicks\nRead Chapter?', shape='diamond')
-    dot.node('open_chapter', 'Open Chapter\nModal\nopenChapterToRead()')
-    dot.node('mark_read', 'Mark as Read\nhasRead = true\nmarkAsReadAndClose()')
-    dot.node('save_progress_srv', 'Save Progress\nto Server\nPUT /api/auth/user/:id')
+    fill = 'lightyellow'
+    chart.node('read_decision', 'User Clicks\nRead Chapter?', 'diamond', fill)
+    chart.node('open_chapter', 'Open Chapter\nModal\nopenChapterToRead()', 'box', fill)
+    chart.node('mark_read', 'Mark as Read\nhasRead = true\nmarkAsReadAndClose()', 'box', fill)
+    chart.node('save_progress_srv', 'Save Progress\nto Server\nPUT /api/auth/user/:id', 'box', fill)
     
-    dot.attr('node', fillcolor='lightsalmon')
-    dot.node('quiz_decision', 'User Clicks\nTake Quiz?', shape='diamond')
-    dot.node('check_hasread', 'Check: hasRead?', shape='diamond', fillcolor='#FFB6C1')
-    dot.node('show_read_modal', 'Show Modal:\n"Read First"\nLOCKED', fillcolor='#FF6B6B')
+    fill = 'lightsalmon'
+    chart.node('quiz_decision', 'User Clicks\nTake Quiz?', 'diamond', fill)
+    chart.node('check_hasread', 'Check: hasRead?', 'diamond', '#FFB6C1')
+    chart.node('show_read_modal', 'Show Modal:\n"Read First"\nLOCKED', 'box', '#FF6B6B')
     
-    dot.attr('node', fillcolor='#FFD700')
-    dot.node('check_pass_1st', 'Check:\nPassed on\n1st attempt?', shape='diamond')
-    dot.node('show_pass_modal', 'Show Modal:\n"Already Passed"\nLOCKED', fillcolor='#FF6B6B')
+    fill = '#FFD700'
+    chart.node('check_pass_1st', 'Check:\nPassed on\n1st attempt?', 'diamond', fill)
+    chart.node('show_pass_modal', 'Show Modal:\n"Already Passed"\nLOCKED', 'box', '#FF6B6B')
     
-    dot.attr('node', fillcolor='#FFA500')
-    dot.node('check_fail_2x', 'Check:\nFailed both\nattempts?', shape='diamond')
-    dot.node('show_fail_modal', 'Show Modal:\n"Locked"\nLOCKED', fillcolor='#FF6B6B')
+    fill = '#FFA500'
+    chart.node('check_fail_2x', 'Check:\nFailed both\nattempts?', 'diamond', fill)
+    chart.node('show_fail_modal', 'Show Modal:\n"Locked"\nLOCKED', 'box', '#FF6B6B')
     
-    dot.attr('node', fillcolor='#90EE90')
-    dot.node('load_quiz', 'Load Quiz\nQuestions\nstartQuiz()')
-    dot.node('show_questions', 'Display Quiz\nwith Questions')
-    dot.node('save_answer', 'Student Selects\nAnswer\nsaveAnswer()')
+    fill = '#90EE90'
+    chart.node('load_quiz', 'Load Quiz\nQuestions\nstartQuiz()', 'box', fill)
+    chart.node('show_questions', 'Display Quiz\nwith Questions', 'box', fill)
+    chart.node('save_answer', 'Student Selects\nAnswer\nsaveAnswer()', 'box', fill)
     
-    dot.attr('node', fillcolor='#87CEEB')
-    dot.node('submit_quiz', 'Submit Quiz\nsubmitQuiz()\nPOST /api/quizzes/:id/submit')
-    dot.node('calculate_score', 'Calculate Score\nCompare Answers')
-    dot.node('save_result', 'Save Result to DB\nPOST /api/results/submit\nsaveResultToDatabase()')
+    fill = '#87CEEB'
+    chart.node('submit_quiz', 'Submit Quiz\nsubmitQuiz()\nPOST /api/quizzes/:id/submit', 'box', fill)
+    chart.node('calculate_score', 'Calculate Score\nCompare Answers', 'box', fill)
+    chart.node('save_result', 'Save Result to DB\nPOST /api/results/submit\nsaveResultToDatabase()', 'box', fill)
     
-    dot.attr('node', fillcolor='#DDA0DD')
-    dot.node('update_progress', 'Update Progress\nupdateChapterProgress()\nAdd attempt score')
-    dot.node('persist_progress', 'Persist to Server\nsaveProgressToServer()\nPUT /api/auth/user/:id')
+    fill = '#DDA0DD'
+    chart.node('update_progress', 'Update Progress\nupdateChapterProgress()\nAdd attempt score', 'box', fill)
+    chart.node('persist_progress', 'Persist to Server\nsaveProgressToServer()\nPUT /api/auth/user/:id', 'box', fill)
     
-    dot.attr('node', fillcolor='#FFB6C1')
-    dot.node('show_results', 'Show Results\nwith Score & Emoji\nshowResults()')
+    fill = '#FFB6C1'
+    chart.node('show_results', 'Show Results\nwith Score & Emoji\nshowResults()', 'box', fill)
     
-    dot.attr('node', fillcolor='lightgreen')
-    dot.node('end', 'Continue or\nLogout', shape='ellipse')
+    fill = 'lightgreen'
+    chart.node('end', 'Continue or\nLogout', 'ellipse', fill)
     
     # Define edges
-    dot.edge('start', 'load_progress')
-    dot.edge('load_progress', 'sync_server')
-    dot.edge('sync_server', 'display_chapters')
-    
-    dot.edge('display_chapters', 'read_decision')
-    dot.edge('read_decision', 'open_chapter', label='YES')
-    dot.edge('read_decision', 'quiz_decision', label='NO')
-    dot.edge('open_chapter', 'mark_read')
-    dot.edge('mark_read', 'save_progress_srv')
-    dot.edge('save_progress_srv', 'display_chapters')
-    
-    dot.edge('quiz_decision', 'check_hasread', label='YES')
-    dot.edge('quiz_decision', 'end', label='NO')
-    
-    dot.edge('check_hasread', 'show_read_modal', label='NO')
-    dot.edge('show_read_modal', 'end')
-    
-    dot.edge('check_hasread', 'check_pass_1st', label='YES')
-    dot.edge('check_pass_1st', 'show_pass_modal', label='YES')
-    dot.edge('show_pass_modal', 'end')
-    
-    dot.edge('check_pass_1st', 'check_fail_2x', label='NO')
-    dot.edge('check_fail_2x', 'show_fail_modal', label='YES')
-    dot.edge('show_fail_modal', 'end')
-    
-    dot.edge('check_fail_2x', 'load_quiz', label='NO')
-    dot.edge('load_quiz', 'show_questions')
-    
-    dot.edge('show_questions', 'save_answer')
-    dot.edge('save_answer', 'show_questions', label='More Questions')
-    
-    dot.edge('show_questions', 'submit_quiz', label='All Answered')
-    dot.edge('submit_quiz', 'calculate_score')
-    dot.edge('calculate_score', 'save_result')
-    dot.edge('save_result', 'update_progress')
-    dot.edge('update_progress', 'persist_progress')
-    dot.edge('persist_progress', 'show_results')
-    dot.edge('show_results', 'end')
-    
-    # Render to PDF
-    output_path = 'd:\\VS\\Learn\\kannada-learning-app\\STUDENT_FLOWCHART_VISUAL'
-    dot.render(output_path, format='pdf', cleanup=True)
-    print(f"✅ STUDENT_FLOWCHART_VISUAL.pdf created")
+    chart.edge('start', 'load_progress')
+    chart.edge('load_progress', 'sync_server')
+    chart.edge('sync_server', 'display_chapters')
+    
+    chart.edge('display_chapters', 'read_decision')
+    chart.edge('read_decision', 'open_chapter', 'YES')
+    chart.edge('read_decision', 'quiz_decision', 'NO')
+    chart.edge('open_chapter', 'mark_read')
+    chart.edge('mark_read', 'save_progress_srv')
+    chart.edge('save_progress_srv', 'display_chapters')
+    
+    chart.edge('quiz_decision', 'check_hasread', 'YES')
+    chart.edge('quiz_decision', 'end', 'NO')
+    
+    chart.edge('check_hasread', 'show_read_modal', 'NO')
+    chart.edge('show_read_modal', 'end')
+    
+    chart.edge('check_hasread', 'check_pass_1st', 'YES')
+    chart.edge('check_pass_1st', 'show_pass_modal', 'YES')
+    chart.edge('show_pass_modal', 'end')
+    
+    chart.edge('check_pass_1st', 'check_fail_2x', 'NO')
+    chart.edge('check_fail_2x', 'show_fail_modal', 'YES')
+    chart.edge('show_fail_modal', 'end')
+    
+    chart.edge('check_fail_2x', 'load_quiz', 'NO')
+    chart.edge('load_quiz', 'show_questions')
+    
+    chart.edge('show_questions', 'save_answer')
+    chart.edge('save_answer', 'show_questions', 'More Questions')
+    
+    chart.edge('show_questions', 'submit_quiz', 'All Answered')
+    chart.edge('submit_quiz', 'calculate_score')
+    chart.edge('calculate_score', 'save_result')
+    chart.edge('save_result', 'update_progress')
+    chart.edge('update_progress', 'persist_progress')
+    chart.edge('persist_progress', 'show_results')
+    chart.edge('show_results', 'end')
+    
+    return chart
+
+def create_student_flowchart_visual(force=False):
+    """Create STUDENT_FLOWCHART_LAYERED.pdf"""
+    chart = build_student_flowchart_visual()
+    print(build_message(chart, build_flowchart(chart, force)))
 
-def create_admin_flowchart_visual():
-    """Create visual Admin Flow flowchart with boxes"""
+def build_admin_flowchart_visual():
+    """Build visual Admin Flow flowchart with boxes"""
     
-    dot = Digraph('Admin Flow', comment='Admin Management Flowchart')
-    dot.attr(rankdir='TB', size='12,14')
-    dot.attr('node', shape='box', style='filled', fillcolor='lightyellow', 
-             fontname='Helvetica', fontsize='10', margin='0.3,0.2')
-    dot.attr('graph', bgcolor='white', pad='0.5')
+    chart = Flowchart('admin', 'Admin Management Flowchart',
+                      os.path.join(OUTPUT_DIR, 'ADMIN_FLOWCHART_LAYERED.pdf'), rankdir='TB', routing='mixed')
+    width, height = chart.pagesize
+    chart.label(chart.title, 1*cm, height - 1*cm, 'Helvetica-Bold', 16)
     
-    dot.attr('node', fillcolor='#FFD700')
-    dot.node('admin_start', 'ADMIN LOGIN', shape='ellipse')
-    dot.node('admin_dashboard', 'Admin Dashboard\nloadAdminChapters()')
-    dot.node('admin_choice', 'Select Action', shape='diamond')
+    fill = '#FFD700'
+    chart.node('admin_start', 'ADMIN LOGIN', 'ellipse', fill)
+    chart.node('admin_dashboard', 'Admin Dashboard\nloadAdminChapters()', 'box', fill)
+    chart.node('admin_choice', 'Select Action', 'diamond', fill)
     
     # Content Management Branch
-    dot.attr('node', fillcolor='#87CEEB')
-    dot.node('content_choice', 'Manage Content?', shape='diamond')
-    dot.node('content_action', 'Choose Action', shape='diamond')
-    dot.node('create_chapter', 'Create Chapter\nFill Form\nsubmit chapter-form')
-    dot.node('edit_chapter', 'Edit Chapter\neditChapter()\nLoad & Modify')
-    dot.node('delete_chapter', 'Delete Chapter\ndeleteChapter()\nConfirm Delete')
-    dot.node('save_chapter', 'Save to Backend\nPOST/PUT /api/chapters\nUpdate chapters.json')
+    fill = '#87CEEB'
+    chart.node('content_choice', 'Manage Content?', 'diamond', fill)
+    chart.node('content_action', 'Choose Action', 'diamond', fill)
+    chart.node('create_chapter', 'Create Chapter\nFill Form\nsubmit chapter-form', 'box', fill)
+    chart.node('edit_chapter', 'Edit Chapter\neditChapter()\nLoad & Modify', 'box', fill)
+    chart.node('delete_chapter', 'Delete Chapter\ndeleteChapter()\nConfirm Delete', 'box', fill)
+    chart.node('save_chapter', 'Save to Backend\nPOST/PUT /api/chapters\nUpdate chapters.json', 'box', fill)
     
     # Quiz Management Branch
-    dot.attr('node', fillcolor='#DDA0DD')
-    dot.node('quiz_choice', 'Manage Quizzes?', shape='diamond')
-    dot.node('quiz_action', 'Choose Action', shape='diamond')
-    dot.node('create_quiz', 'Create Quiz\nSelect Chapter\nAdd Questions')
-    dot.node('edit_quiz', 'Edit Quiz\neditQuiz()\nModify Questions')
-    dot.node('delete_quiz', 'Delete Quiz\ndeleteQuiz()\nConfirm')
-    dot.node('save_quiz', 'Save to Backend\nPOST/PUT /api/quizzes\nUpdate quizzes.json')
+    fill = '#DDA0DD'
+    chart.node('quiz_choice', 'Manage Quizzes?', 'diamond', fill)
+    chart.node('quiz_action', 'Choose Action', 'diamond', fill)
+    chart.node('create_quiz', 'Create Quiz\nSelect Chapter\nAdd Questions', 'box', fill)
+    chart.node('edit_quiz', 'Edit Quiz\neditQuiz()\nModify Questions', 'box', fill)
+    chart.node('delete_quiz', 'Delete Quiz\ndeleteQuiz()\nConfirm', 'box', fill)
+    chart.node('save_quiz', 'Save to Backend\nPOST/PUT /api/quizzes\nUpdate quizzes.json', 'box', fill)
     
     # Results Management Branch
-    dot.attr('node', fillcolor='#FFB6C1')
-    dot.node('results_choice', 'View Results?', shape='diamond')
-    dot.node('results_action', 'Choose Action', shape='diamond')
-    dot.node('view_all', 'View All Results\nloadResults()\nGET /api/results/all')
-    dot.node('filter_results', 'Filter by Student\nfilterResults()\nGET /api/results/user/:id')
-    dot.node('download_pdf', 'Download PDF\ndownloadPDF()\nGET /api/results/download-pdf/:id')
-    dot.node('reset_quiz', 'Reset Student Quiz\nresetQuiz()\nPOST /api/results/reset-quiz')
+    fill = '#FFB6C1'
+    chart.node('results_choice', 'View Results?', 'diamond', fill)
+    chart.node('results_action', 'Choose Action', 'diamond', fill)
+    chart.node('view_all', 'View All Results\nloadResults()\nGET /api/results/all', 'box', fill)
+    chart.node('filter_results', 'Filter by Student\nfilterResults()\nGET /api/results/user/:id', 'box', fill)
+    chart.node('download_pdf', 'Download PDF\ndownloadPDF()\nGET /api/results/download-pdf/:id', 'box', fill)
+    chart.node('reset_quiz', 'Reset Student Quiz\nresetQuiz()\nPOST /api/results/reset-quiz', 'box', fill)
     
     # Display Results
-    dot.attr('node', fillcolor='#90EE90')
-    dot.node('display_results', 'Display Results\nTable with Data')
-    dot.node('take_action', 'Take Action?', shape='diamond')
-    dot.node('pdf_generated', 'PDF Generated\nwith Kannada\nDownload File')
+    fill = '#90EE90'
+    chart.node('display_results', 'Display Results\nTable with Data', 'box', fill)
+    chart.node('take_action', 'Take Action?', 'diamond', fill)
+    chart.node('pdf_generated', 'PDF Generated\nwith Kannada\nDownload File', 'box', fill)
     
     # Student Management Branch
-    dot.attr('node', fillcolor='#F0E68C')
-    dot.node('students_choice', 'Manage Students?', shape='diamond')
-    dot.node('load_students', 'Load Students\nloadStudents()\nGET /api/auth/users')
-    dot.node('search_student', 'Search Student\nsearchStudent()\nFilter by name/email')
-    dot.node('view_progress', 'View Progress\nviewStudentProgress()\nShow detail stats')
+    fill = '#F0E68C'
+    chart.node('students_choice', 'Manage Students?', 'diamond', fill)
+    chart.node('load_students', 'Load Students\nloadStudents()\nGET /api/auth/users', 'box', fill)
+    chart.node('search_student', 'Search Student\nsearchStudent()\nFilter by name/email', 'box', fill)
+    chart.node('view_progress', 'View Progress\nviewStudentProgress()\nShow detail stats', 'box', fill)
     
     # End
-    dot.attr('node', fillcolor='lightgreen')
-    dot.node('admin_end', 'Continue or\nLogout', shape='ellipse')
+    fill = 'lightgreen'
+    chart.node('admin_end', 'Continue or\nLogout', 'ellipse', fill)
     
     # Edges
-    dot.edge('admin_start', 'admin_dashboard')
-    dot.edge('admin_dashboard', 'admin_choice')
+    chart.edge('admin_start', 'admin_dashboard')
+    chart.edge('admin_dashboard', 'admin_choice')
     
     # Content Management Flow
-    dot.edge('admin_choice', 'content_choice', label='1. Content')
-    dot.edge('content_choice', 'content_action', label='YES')
-    dot.edge('content_action', 'create_chapter', label='Create')
-    dot.edge('content_action', 'edit_chapter', label='Edit')
-    dot.edge('content_action', 'delete_chapter', label='Delete')
-    dot.edge('create_chapter', 'save_chapter')
-    dot.edge('edit_chapter', 'save_chapter')
-    dot.edge('delete_chapter', 'save_chapter')
-    dot.edge('save_chapter', 'admin_dashboard')
+    chart.edge('admin_choice', 'content_choice', '1. Content')
+    chart.edge('content_choice', 'content_action', 'YES')
+    chart.edge('content_action', 'create_chapter', 'Create')
+    chart.edge('content_action', 'edit_chapter', 'Edit')
+    chart.edge('content_action', 'delete_chapter', 'Delete')
+    chart.edge('create_chapter', 'save_chapter')
+    chart.edge('edit_chapter', 'save_chapter')
+    chart.edge('delete_chapter', 'save_chapter')
+    chart.edge('save_chapter', 'admin_dashboard')
     
     # Quiz Management Flow
-    dot.edge('admin_choice', 'quiz_choice', label='2. Quizzes')
-    dot.edge('quiz_choice', 'quiz_action', label='YES')
-    dot.edge('quiz_action', 'create_quiz', label='Create')
-    dot.edge('quiz_action', 'edit_quiz', label='Edit')
-    dot.edge('quiz_action', 'delete_quiz', label='Delete')
-    dot.edge('create_quiz', 'save_quiz')
-    dot.edge('edit_quiz', 'save_quiz')
-    dot.edge('delete_quiz', 'save_quiz')
-    dot.edge('save_quiz', 'admin_dashboard')
+    chart.edge('admin_choice', 'quiz_choice', '2. Quizzes')
+    chart.edge('quiz_choice', 'quiz_action', 'YES')
+    chart.edge('quiz_action', 'create_quiz', 'Create')
+    chart.edge('quiz_action', 'edit_quiz', 'Edit')
+    chart.edge('quiz_action', 'delete_quiz', 'Delete')
+    chart.edge('create_quiz', 'save_quiz')
+    chart.edge('edit_quiz', 'save_quiz')
+    chart.edge('delete_quiz', 'save_quiz')
+    chart.edge('save_quiz', 'admin_dashboard')
     
     # Results Management Flow
-    dot.edge('admin_choice', 'results_choice', label='3. Results')
-    dot.edge('results_choice', 'results_action', label='YES')
-    dot.edge('results_action', 'view_all', label='View All')
-    dot.edge('results_action', 'filter_results', label='Filter')
-    dot.edge('view_all', 'display_results')
-    dot.edge('filter_results', 'display_results')
-    dot.edge('display_results', 'take_action')
-    dot.edge('take_action', 'download_pdf', label='Download')
-    dot.edge('take_action', 'reset_quiz', label='Reset')
-    dot.edge('download_pdf', 'pdf_generated')
-    dot.edge('reset_quiz', 'display_results', label='Refreshed')
-    dot.edge('pdf_generated', 'admin_dashboard')
+    chart.edge('admin_choice', 'results_choice', '3. Results')
+    chart.edge('results_choice', 'results_action', 'YES')
+    chart.edge('results_action', 'view_all', 'View All')
+    chart.edge('results_action', 'filter_results', 'Filter')
+    chart.edge('view_all', 'display_results')
+    chart.edge('filter_results', 'display_results')
+    chart.edge('display_results', 'take_action')
+    chart.edge('take_action', 'download_pdf', 'Download')
+    chart.edge('take_action', 'reset_quiz', 'Reset')
+    chart.edge('download_pdf', 'pdf_generated')
+    chart.edge('reset_quiz', 'display_results', 'Refreshed')
+    chart.edge('pdf_generated', 'admin_dashboard')
     
     # Student Management Flow
-    dot.edge('admin_choice', 'students_choice', label='4. Students')
-    dot.edge('students_choice', 'load_students', label='YES')
-    dot.edge('load_students', 'search_student')
-    dot.edge('search_student', 'view_progress')
-    dot.edge('view_progress', 'admin_dashboard')
-    
-    dot.edge('admin_choice', 'admin_end', label='Logout')
-    
-    # Render to PDF
-    output_path = 'd:\\VS\\Learn\\kannada-learning-app\\ADMIN_FLOWCHART_VISUAL'
-    dot.render(output_path, format='pdf', cleanup=True)
-    print(f"✅ ADMIN_FLOWCHART_VISUAL.pdf created")
+    chart.edge('admin_choice', 'students_choice', '4. Students')
+    chart.edge('students_choice', 'load_students', 'YES')
+    chart.edge('load_students', 'search_student')
+    chart.edge('search_student', 'view_progress')
+    chart.edge('view_progress', 'admin_dashboard')
+    
+    chart.edge('admin_choice', 'admin_end', 'Logout')
+    
+    return chart
 
-def create_complete_system_flowchart_visual():
-    """Create visual Complete System flowchart with boxes"""
+def create_admin_flowchart_visual(force=False):
+    """Create ADMIN_FLOWCHART_LAYERED.pdf"""
+    chart = build_admin_flowchart_visual()
+    print(build_message(chart, build_flowchart(chart, force)))
+
+def build_complete_system_flowchart_visual():
+    """Build visual Complete System flowchart with boxes"""
     
-    dot = Digraph('Complete System', comment='Complete System Flowchart')
-    dot.attr(rankdir='LR', size='16,10')
-    dot.attr('node', shape='box', style='filled', fillcolor='lightblue', 
-             fontname='Helvetica', fontsize='9', margin='0.3,0.2')
-    dot.attr('graph', bgcolor='white', pad='0.5')
+    chart = Flowchart('complete_system', 'Complete System Flowchart',
+                      os.path.join(OUTPUT_DIR, 'COMPLETE_SYSTEM_FLOWCHART_LAYERED.pdf'), rankdir='LR', routing='mixed')
+    width, height = chart.pagesize
+    chart.label(chart.title, 1*cm, height - 1*cm, 'Helvetica-Bold', 16)
     
     # Student Column
-    dot.attr('node', fillcolor='#90EE90')
-    dot.node('stu_start', 'STUDENT')
-    dot.node('stu_login', 'Login\nPOST /api/auth/login')
-    dot.node('stu_page', 'Page Load\nloadChapters()\nsyncProgressFromServer()')
-    dot.node('stu_read', 'Read Chapter\nopenChapterToRead()\nmarkAsReadAndClose()')
-    dot.node('stu_quiz', 'Take Quiz\nstartChapterQuiz()\nstartQuiz()')
-    dot.node('stu_answer', 'Answer Questions\nsaveAnswer()')
-    dot.node('stu_submit', 'Submit Quiz\nsubmitQuiz()')
-    dot.node('stu_result', 'View Result\nshowResults()')
-    dot.node('stu_end', 'Logout')
+    fill = '#90EE90'
+    chart.node('stu_start', 'STUDENT', 'box', fill)
+    chart.node('stu_login', 'Login\nPOST /api/auth/login', 'box', fill)
+    chart.node('stu_page', 'Page Load\nloadChapters()\nsyncProgressFromServer()', 'box', fill)
+    chart.node('stu_read', 'Read Chapter\nopenChapterToRead()\nmarkAsReadAndClose()', 'box', fill)
+    chart.node('stu_quiz', 'Take Quiz\nstartChapterQuiz()\nstartQuiz()', 'box', fill)
+    chart.node('stu_answer', 'Answer Questions\nsaveAnswer()', 'box', fill)
+    chart.node('stu_submit', 'Submit Quiz\nsubmitQuiz()', 'box', fill)
+    chart.node('stu_result', 'View Result\nshowResults()', 'box', fill)
+    chart.node('stu_end', 'Logout', 'box', fill)
     
     # Backend Column
-    dot.attr('node', fillcolor='#87CEEB')
-    dot.node('auth_api', 'Auth API\n/api/auth/login\n/api/auth/signup')
-    dot.node('chapter_api', 'Chapter API\n/api/chapters\n/api/chapters/:id')
-    dot.node('user_api', 'User API\n/api/auth/user/:id\nGET & PUT')
-    dot.node('quiz_api', 'Quiz API\n/api/quizzes/:id\n/api/quizzes/:id/submit')
-    dot.node('result_api', 'Result API\n/api/results/submit\n/api/results/all\n/api/results/download-pdf')
-    dot.node('reset_api', 'Reset API\n/api/results/reset-quiz')
+    fill = '#87CEEB'
+    chart.node('auth_api', 'Auth API\n/api/auth/login\n/api/auth/signup', 'box', fill)
+    chart.node('chapter_api', 'Chapter API\n/api/chapters\n/api/chapters/:id', 'box', fill)
+    chart.node('user_api', 'User API\n/api/auth/user/:id\nGET & PUT', 'box', fill)
+    chart.node('quiz_api', 'Quiz API\n/api/quizzes/:id\n/api/quizzes/:id/submit', 'box', fill)
+    chart.node('result_api', 'Result API\n/api/results/submit\n/api/results/all\n/api/results/download-pdf', 'box', fill)
+    chart.node('reset_api', 'Reset API\n/api/results/reset-quiz', 'box', fill)
     
     # Database Column
-    dot.attr('node', fillcolor='#FFD700')
-    dot.node('db_users', 'users.json\n(User Profiles +\nProgress)')
-    dot.node('db_chapters', 'chapters.json\n(Content)')
-    dot.node('db_quizzes', 'quizzes.json\n(Questions)')
-    dot.node('db_results', 'results.json\n(Quiz Results)')
+    fill = '#FFD700'
+    chart.node('db_users', 'users.json\n(User Profiles +\nProgress)', 'box', fill)
+    chart.node('db_chapters', 'chapters.json\n(Content)', 'box', fill)
+    chart.node('db_quizzes', 'quizzes.json\n(Questions)', 'box', fill)
+    chart.node('db_results', 'results.json\n(Quiz Results)', 'box', fill)
     
     # Admin Column
-    dot.attr('node', fillcolor='#FFB6C1')
-    dot.node('adm_start', 'ADMIN')
-    dot.node('adm_login', 'Admin Login')
-    dot.node('adm_content', 'Manage Content\nCreate/Edit/Delete\nChapters')
-    dot.node('adm_quiz', 'Manage Quizzes\nCreate/Edit/Delete\nQuestions')
-    dot.node('adm_results', 'View Results\nFilter by Student\nDownload PDF')
-    dot.node('adm_reset', 'Reset Student\nClear Progress')
-    dot.node('adm_end', 'Logout')
+    fill = '#FFB6C1'
+    chart.node('adm_start', 'ADMIN', 'box', fill)
+    chart.node('adm_login', 'Admin Login', 'box', fill)
+    chart.node('adm_content', 'Manage Content\nCreate/Edit/Delete\nChapters', 'box', fill)
+    chart.node('adm_quiz', 'Manage Quizzes\nCreate/Edit/Delete\nQuestions', 'box', fill)
+    chart.node('adm_results', 'View Results\nFilter by Student\nDownload PDF', 'box', fill)
+    chart.node('adm_reset', 'Reset Student\nClear Progress', 'box', fill)
+    chart.node('adm_end', 'Logout', 'box', fill)
     
     # PDF Export
-    dot.attr('node', fillcolor='#DDA0DD')
-    dot.node('pdf_gen', 'PDF Generation\njsPDF + Kannada\njspdf-autotable')
-    dot.node('pdf_file', 'PDF File Output\n(Download)')
+    fill = '#DDA0DD'
+    chart.node('pdf_gen', 'PDF Generation\njsPDF + Kannada\njspdf-autotable', 'box', fill)
+    chart.node('pdf_file', 'PDF File Output\n(Download)', 'box', fill)
     
     # STUDENT FLOW
-    dot.edge('stu_start', 'stu_login')
-    dot.edge('stu_login', 'auth_api', label='Register/Login')
-    dot.edge('auth_api', 'db_users', label='Save User')
-    dot.edge('stu_login', 'stu_page')
-    dot.edge('stu_page', 'chapter_api', label='Get Chapters')
-    dot.edge('chapter_api', 'db_chapters')
-    dot.edge('stu_page', 'user_api', label='Get Progress')
-    dot.edge('user_api', 'db_users')
-    dot.edge('stu_page', 'stu_read')
-    dot.edge('stu_read', 'user_api', label='Save hasRead')
-    dot.edge('stu_read', 'stu_quiz')
-    dot.edge('stu_quiz', 'quiz_api', label='Get Questions')
-    dot.edge('quiz_api', 'db_quizzes')
-    dot.edge('stu_quiz', 'stu_answer')
-    dot.edge('stu_answer', 'stu_submit')
-    dot.edge('stu_submit', 'quiz_api', label='Submit Answers')
-    dot.edge('stu_submit', 'result_api', label='Save Result')
-    dot.edge('result_api', 'db_results')
-    dot.edge('stu_submit', 'user_api', label='Update Progress')
-    dot.edge('user_api', 'db_users', label='Save Score')
-    dot.edge('stu_result', 'stu_end')
+    chart.edge('stu_start', 'stu_login')
+    chart.edge('stu_login', 'auth_api', 'Register/Login')
+    chart.edge('auth_api', 'db_users', 'Save User')
+    chart.edge('stu_login', 'stu_page')
+    chart.edge('stu_page', 'chapter_api', 'Get Chapters')
+    chart.edge('chapter_api', 'db_chapters')
+    chart.edge('stu_page', 'user_api', 'Get Progress')
+    chart.edge('user_api', 'db_users')
+    chart.edge('stu_page', 'stu_read')
+    chart.edge('stu_read', 'user_api', 'Save hasRead')
+    chart.edge('stu_read', 'stu_quiz')
+    chart.edge('stu_quiz', 'quiz_api', 'Get Questions')
+    chart.edge('quiz_api', 'db_quizzes')
+    chart.edge('stu_quiz', 'stu_answer')
+    chart.edge('stu_answer', 'stu_submit')
+    chart.edge('stu_submit', 'quiz_api', 'Submit Answers')
+    chart.edge('stu_submit', 'result_api', 'Save Result')
+    chart.edge('result_api', 'db_results')
+    chart.edge('stu_submit', 'user_api', 'Update Progress')
+    chart.edge('user_api', 'db_users', 'Save Score')
+    chart.edge('stu_result', 'stu_end')
     
     # ADMIN FLOW
-    dot.edge('adm_start', 'adm_login')
-    dot.edge('adm_login', 'auth_api')
-    dot.edge('adm_content', 'chapter_api', label='Create/Edit')
-    dot.edge('chapter_api', 'db_chapters')
-    dot.edge('adm_quiz', 'quiz_api', label='Manage')
-    dot.edge('quiz_api', 'db_quizzes')
-    dot.edge('adm_results', 'result_api', label='Query Results')
-    dot.edge('result_api', 'db_results')
-    dot.edge('adm_results', 'pdf_gen', label='Generate')
-    dot.edge('pdf_gen', 'pdf_file')
-    dot.edge('adm_reset', 'reset_api', label='Clear Progress')
-    dot.edge('reset_api', 'user_api')
-    dot.edge('user_api', 'db_users')
-    dot.edge('adm_login', 'adm_content')
-    dot.edge('adm_content', 'adm_quiz')
-    dot.edge('adm_quiz', 'adm_results')
-    dot.edge('adm_results', 'adm_reset')
-    dot.edge('adm_reset', 'adm_end')
-    
-    # Render to PDF
-    output_path = 'd:\\VS\\Learn\\kannada-learning-app\\COMPLETE_SYSTEM_FLOWCHART_VISUAL'
-    dot.render(output_path, format='pdf', cleanup=True)
-    print(f"✅ COMPLETE_SYSTEM_FLOWCHART_VISUAL.pdf created")
+    chart.edge('adm_start', 'adm_login')
+    chart.edge('adm_login', 'auth_api')
+    chart.edge('adm_content', 'chapter_api', 'Create/Edit')
+    chart.edge('chapter_api', 'db_chapters')
+    chart.edge('adm_quiz', 'quiz_api', 'Manage')
+    chart.edge('quiz_api', 'db_quizzes')
+    chart.edge('adm_results', 'result_api', 'Query Results')
+    chart.edge('result_api', 'db_results')
+    chart.edge('adm_results', 'pdf_gen', 'Generate')
+    chart.edge('pdf_gen', 'pdf_file')
+    chart.edge('adm_reset', 'reset_api', 'Clear Progress')
+    chart.edge('reset_api', 'user_api')
+    chart.edge('user_api', 'db_users')
+    chart.edge('adm_login', 'adm_content')
+    chart.edge('adm_content', 'adm_quiz')
+    chart.edge('adm_quiz', 'adm_results')
+    chart.edge('adm_results', 'adm_reset')
+    chart.edge('adm_reset', 'adm_end')
+    
+    return chart
+
+def create_complete_system_flowchart_visual(force=False):
+    """Create COMPLETE_SYSTEM_FLOWCHART_LAYERED.pdf"""
+    chart = build_complete_system_flowchart_visual()
+    print(build_message(chart, build_flowchart(chart, force)))
 
 if __name__ == "__main__":
+    args = batch_arguments("Generate the visual flowchart PDFs with boxes").parse_args()
+    apply_batch_arguments(args)
     print("🚀 Generating Visual Flowchart PDFs with Boxes...\n")
     
-    try:
-        create_student_flowchart_visual()
-        create_admin_flowchart_visual()
-        create_complete_system_flowchart_visual()
-        
-        print("\n✅ All three visual flowchart PDFs generated successfully!")
-        print("\n📁 Output Files in: d:\\VS\\Learn\\kannada-learning-app\\")
-        print("   1. STUDENT_FLOWCHART_VISUAL.pdf - Student journey with decision diamonds")
-        print("   2. ADMIN_FLOWCHART_VISUAL.pdf - Admin workflows with action boxes")
-        print("   3. COMPLETE_SYSTEM_FLOWCHART_VISUAL.pdf - Integrated student/admin/backend/database")
-        
-    except Exception as e:
-        print(f"❌ Error: {e}")
-        import traceback
-        traceback.print_exc()
+    results = run_charts([
+        ("STUDENT_FLOWCHART_LAYERED.pdf", create_student_flowchart_visual, (args.force,)),
+        ("ADMIN_FLOWCHART_LAYERED.pdf", create_admin_flowchart_visual, (args.force,)),
+        ("COMPLETE_SYSTEM_FLOWCHART_LAYERED.pdf", create_complete_system_flowchart_visual, (args.force,)),
+    ], jobs=args.jobs)
+    
+    if not report_results(results):
+        sys.exit(1)
+    
+    if args.dry_run:
+        print("\n📐 Dry run: charts laid out and recorded, no PDFs written")
+        sys.exit(0)
+
+    print("\n✅ All three visual flowchart PDFs generated successfully!")
+    print(f"\n📁 Output Files in: {report_dir()}")
+    print("   1. STUDENT_FLOWCHART_LAYERED.pdf - Student journey with decision diamonds")
+    print("   2. ADMIN_FLOWCHART_LAYERED.pdf - Admin workflows with action boxes")
+    print("   3. COMPLETE_SYSTEM_FLOWCHART_LAYERED.pdf - Integrated student/admin/backend/database")
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Item response theory calibration: Rasch and 2PL models over the quiz answers
+Each student's first answer to each quiz question forms a sparse student x question 0/1
+matrix, kept as coordinate arrays (student, item, response) in student-major and item-major
+order. Both models are fitted by marginal maximum likelihood with EM over a fixed quadrature
+grid. The E-step is two sparse x dense products done with np.add.reduceat over blocks of rows:
+a per-question log-likelihood table summed over each student's answers, and the students'
+posteriors summed over each question's answers. The M-step runs vectorized Newton steps on all
+questions at once. Abilities are posterior means (EAP). Writes IRT_CALIBRATION.pdf next to the
+flowcharts and the per-student abilities to irt_abilities.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from analytics_store import STORE_DIR, AnalyticsStore, compile_store
+from flowchart_batch import apply_batch_arguments
+from flowchart_cache import build_time, deterministic, report_dir
+from item_analysis import answer_items
+from student_reports import DATA_DIR, LEFT, ReportPage
+
+MODELS = ("rasch", "2pl")
+QUADRATURE = np.linspace(-4, 4, 21)  # standard-normal ability grid
+LOG_PRIOR = -QUADRATURE ** 2 / 2 - np.log(np.exp(-QUADRATURE ** 2 / 2).sum())
+CHUNK_ROWS = 1 << 18   # responses per E-step block: bounds the (rows x grid) temporaries
+MAX_ITERATIONS = 200
+TOLERANCE = 1e-3       # largest parameter change at convergence
+NEWTON_STEPS = 3       # per M-step
+MAX_STEP = 1.0
+# Weak normal priors keep items everyone (or no one) answers correctly finite
+INTERCEPT_VARIANCE = 25.0
+SLOPE_MEAN, SLOPE_VARIANCE = 1.0, 4.0
+SLOPE_RANGE = (0.05, 8.0)
+
+ITEM_COLUMNS = [("Quiz", 0), ("Q", 1.2 * cm), ("Question", 2.0 * cm), ("N", 13.4 * cm), ("p", 15.0 * cm),
+                ("Rasch b", 16.4 * cm), ("2PL a", 18.2 * cm), ("2PL b", 19.8 * cm)]
+CHAPTER_COLUMNS = [("Chapter", 0), ("Title", 1.8 * cm), ("Questions", 11.4 * cm), ("Mean b", 13.4 * cm),
+                   ("Students", 15.4 * cm), ("Mean ability", 17.4 * cm), ("Pass rate", 20.2 * cm)]
+
+
+class Responses:
+    """Sparse 0/1 response matrix as coordinate arrays, indexed both student-major and item-major"""
+    def __init__(self, student, item, correct, students, items):
+        order = np.argsort(student, kind="stable")
+        self.student = student[order].astype(np.int32)
+        self.item = item[order].astype(np.int32)
+        self.correct = correct[order].astype(np.float64)
+        self.students, self.items = students, items
+        self.starts = np.searchsorted(self.student, np.arange(students))  # first row of every student
+        self.counts = np.diff(np.append(self.starts, len(self.student)))
+        self.code = self.item + np.int32(items) * (self.correct > 0)      # row of the item x {0,1} table
+        # Item-major: the students of every question's responses, and of its correct responses only
+        by_item = np.argsort(self.item, kind="stable")
+        self.item_students = self.student[by_item]
+        self.item_starts = np.searchsorted(self.item[by_item], np.arange(items))
+        right = by_item[self.correct[by_item] > 0]
+        self.right_students = self.student[right]
+        self.right_starts = np.searchsorted(self.item[right], np.arange(items))
+
+
+def _blocks(starts, total):
+    """(first, end) segment ranges covering about CHUNK_ROWS rows each"""
+    if not len(starts):
+        return []
+    bounds = np.searchsorted(starts, np.arange(0, total, CHUNK_ROWS), side="right") - 1
+    bounds = np.unique(np.append(np.maximum(bounds, 0), len(starts)))
+    return zip(bounds[:-1].tolist(), bounds[1:].tolist())
+
+
+def _segment_sums(rows, starts, total, width):
+    """Sums of consecutive row segments (segment k = rows starts[k]..starts[k+1]) as a (segments, width) array
+    rows(lo, hi) gathers the rows of one block; np.add.reduceat sums its non-empty segments"""
+    out = np.zeros((len(starts), width))
+    ends = np.append(starts[1:], total)
+    for first, end in _blocks(starts, total):
+        lo, hi = starts[first], ends[end - 1]
+        nonempty = np.flatnonzero(ends[first:end] > starts[first:end]) + first
+        if len(nonempty):
+            out[nonempty] = np.add.reduceat(rows(lo, hi), starts[nonempty] - lo, axis=0)
+    return out
+
+
+def response_matrix(store, quizzes):
+    """Responses of every student (first attempt per question) to the questions of quizzes.json
+    Returns (responses, user codes of the matrix rows, layout from answer_items)"""
+    layout, items, item, known = answer_items(store, quizzes)
+    attempt = store.answer_result()
+    user = store.column("result", "user")[attempt].astype(np.int64)
+    submitted = store.column("result", "submitted")[attempt]
+    correct = store.correct()
+    keep = known & (user >= 0)
+    item, user, submitted, correct = item[keep], user[keep], submitted[keep], correct[keep]
+
+    # Later attempts are retakes after seeing the questions: keep the first answer per (user, item)
+    order = np.lexsort((submitted, item, user))
+    key = user[order] * max(items, 1) + item[order]
+    first = order[np.append(True, key[1:] != key[:-1])]
+    users, student = np.unique(user[first], return_inverse=True)
+    return Responses(student, item[first], correct[first], len(users), items), users, layout
+
+
+def _e_step(responses, slope, intercept, nodes):
+    """Posterior over the grid for every student
+    Returns expected (attempts, correct) per item and grid node, EAP mean / sd per student and the
+    marginal log-likelihood"""
+    logit = slope[:, None] * nodes + intercept[:, None]
+    # log P(y | item, node) for y = 0 (rows 0..items-1) and y = 1 (rows items..2*items-1)
+    table = np.concatenate([-np.logaddexp(0, logit), -np.logaddexp(0, -logit)])
+    grid = len(nodes)
+    # Log-likelihood of every student at every node: a sparse (students x 2*items) by dense table product
+    student_ll = _segment_sums(lambda lo, hi: table[responses.code[lo:hi]],
+                               responses.starts, len(responses.code), grid)
+    student_ll += LOG_PRIOR
+    norm = np.logaddexp.reduce(student_ll, axis=1)
+    weights = np.exp(student_ll - norm[:, None])
+    mean = weights @ nodes
+    sd = np.sqrt(np.maximum(weights @ nodes ** 2 - mean ** 2, 0))
+
+    # Expected attempts / correct answers per item and node: the item's students' posteriors summed
+    expected_n = _segment_sums(lambda lo, hi: weights[responses.item_students[lo:hi]],
+                               responses.item_starts, len(responses.item_students), grid)
+    expected_r = _segment_sums(lambda lo, hi: weights[responses.right_students[lo:hi]],
+                               responses.right_starts, len(responses.right_students), grid)
+    return expected_n, expected_r, mean, sd, norm.sum()
+
+
+def _m_step(expected_n, expected_r, slope, intercept, nodes, fit_slope):
+    """Newton steps on every item's (slope, intercept) against the expected counts"""
+    slope, intercept = slope.copy(), intercept.copy()
+    for _ in range(NEWTON_STEPS):
+        p = 1 / (1 + np.exp(-(slope[:, None] * nodes + intercept[:, None])))
+        residual = expected_r - expected_n * p
+        weight = expected_n * p * (1 - p)
+        grad_c = residual.sum(axis=1) - intercept / INTERCEPT_VARIANCE
+        hess_cc = weight.sum(axis=1) + 1 / INTERCEPT_VARIANCE
+        if not fit_slope:
+            intercept += np.clip(grad_c / hess_cc, -MAX_STEP, MAX_STEP)
+            continue
+        grad_a = residual @ nodes - (slope - SLOPE_MEAN) / SLOPE_VARIANCE
+        hess_ca = weight @ nodes
+        hess_aa = weight @ nodes ** 2 + 1 / SLOPE_VARIANCE
+        det = hess_cc * hess_aa - hess_ca ** 2
+        intercept += np.clip((hess_aa * grad_c - hess_ca * grad_a) / det, -MAX_STEP, MAX_STEP)
+        slope = np.clip(slope + np.clip((hess_cc * grad_a - hess_ca * grad_c) / det, -MAX_STEP, MAX_STEP),
+                        *SLOPE_RANGE)
+    return slope, intercept
+
+
+class Calibration:
+    """Fitted item parameters (difficulty b, discrimination a) and student abilities of one model"""
+    def __init__(self, model, slope, intercept, ability, ability_sd, loglik, iterations, responses):
+        self.model = model
+        self.discrimination = slope
+        self.difficulty = -intercept / slope
+        self.ability, self.ability_sd = ability, ability_sd
+        self.loglik, self.iterations = loglik, iterations
+        parameters = responses.items * (2 if model == "2pl" else 1) + (1 if model == "rasch" else 0)
+        self.aic = 2 * parameters - 2 * loglik
+        self.bic = parameters * np.log(max(responses.students, 1)) - 2 * loglik
+
+
+def calibrate(responses, model="2pl", max_iterations=MAX_ITERATIONS, tolerance=TOLERANCE):
+    """Fit a Rasch (common slope, ability spread estimated) or 2PL model by EM"""
+    fit_slope = model == "2pl"
+    # Start the intercepts at the logit of each item's proportion correct
+    attempts = np.bincount(responses.item, minlength=responses.items)
+    right = np.bincount(responses.item, weights=responses.correct, minlength=responses.items)
+    p = (right + 0.5) / (attempts + 1)
+    intercept = np.log(p / (1 - p))
+    slope = np.ones(responses.items)
+    spread = 1.0  # Rasch: the ability sd on the logit scale; 2PL fixes it at 1 (slopes are free)
+    for iteration in range(1, max_iterations + 1):
+        nodes = QUADRATURE * spread
+        expected_n, expected_r, mean, sd, loglik = _e_step(responses, slope, intercept, nodes)
+        new_slope, new_intercept = _m_step(expected_n, expected_r, slope, intercept, nodes, fit_slope)
+        change = max(np.abs(new_intercept - intercept).max(initial=0), np.abs(new_slope - slope).max(initial=0))
+        if not fit_slope:
+            new_spread = np.sqrt(np.mean(sd ** 2 + mean ** 2)) if responses.students else 1.0
+            change = max(change, abs(new_spread - spread))
+            spread = new_spread
+        slope, intercept = new_slope, new_intercept
+        if change < tolerance:
+            break
+    _, _, mean, sd, loglik = _e_step(responses, slope, intercept, QUADRATURE * spread)
+    return Calibration(model, slope, intercept, mean, sd, loglik, iteration, responses)
+
+
+def simulate(students, items, per_student, seed=0):
+    """Synthetic 2PL responses (each student answers `per_student` random questions) and the true parameters"""
+    rng = np.random.default_rng(seed)
+    ability = rng.normal(size=students)
+    slope = rng.lognormal(0, 0.3, size=items)
+    difficulty = rng.normal(size=items)
+    student = np.repeat(np.arange(students), per_student)
+    item = rng.integers(0, items, size=len(student))
+    p = 1 / (1 + np.exp(-slope[item] * (ability[student] - difficulty[item])))
+    correct = rng.random(len(student)) < p
+    return Responses(student, item, correct, students, items), (ability, slope, difficulty)
+
+
+# Report -----------------------------------------------------------------------
+def render_calibration(fits, responses, layout, chapter_rows, filename, stamp=None):
+    width, height = landscape(A4)
+    c = canvas.Canvas(filename, pagesize=(width, height), invariant=deterministic())
+    c.setTitle("IRT calibration")
+    page = ReportPage(c, "Kannada Learning App - IRT Calibration", (width, height))
+    page.text(LEFT, "IRT Calibration (Rasch / 2PL)", "Helvetica-Bold", 18)
+    page.y -= 0.6 * cm
+    if stamp is not None:
+        page.text(LEFT, f"Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}", "Helvetica", 9, colors.grey)
+    page.y -= 0.6 * cm
+    page.text(LEFT, f"{responses.students} students, {responses.items} questions, {len(responses.item)} responses "
+                    f"(first attempt per question). b = difficulty, a = discrimination, abilities on the same logit scale.",
+              "Helvetica", 9)
+    page.y -= 0.5 * cm
+    for fit in fits.values():
+        page.text(LEFT, f"{fit.model.upper()}: log-likelihood {fit.loglik:.1f}, AIC {fit.aic:.1f}, BIC {fit.bic:.1f}, "
+                        f"{fit.iterations} EM iterations", "Helvetica", 9)
+        page.y -= 0.45 * cm
+
+    page.heading("Chapters")
+    page.table_header(CHAPTER_COLUMNS)
+    for row in chapter_rows:
+        page.row(CHAPTER_COLUMNS, row)
+
+    page.heading("Questions")
+    page.table_header(ITEM_COLUMNS)
+    attempts = np.bincount(responses.item, minlength=responses.items)
+    right = np.bincount(responses.item, weights=responses.correct, minlength=responses.items)
+    rasch, two_pl = fits.get("rasch"), fits.get("2pl")
+    for quiz, questions, start in layout:
+        for k, question in enumerate(questions):
+            i = start + k
+            page.row(ITEM_COLUMNS,
+                     [quiz.get("id"), k + 1, question.get("question", ""), attempts[i],
+                      f"{right[i] / attempts[i]:.2f}" if attempts[i] else "-",
+                      f"{rasch.difficulty[i]:.2f}" if rasch and attempts[i] else "-",
+                      f"{two_pl.discrimination[i]:.2f}" if two_pl and attempts[i] else "-",
+                      f"{two_pl.difficulty[i]:.2f}" if two_pl and attempts[i] else "-"])
+    page.header = None
+    c.showPage()
+    c.save()
+
+
+def chapter_summary(fit, responses, layout, chapters):
+    """Table rows comparing chapters on one scale: mean question difficulty, mean ability of its students"""
+    titles = {str(chapter.get("id")): chapter.get("title", "") for chapter in chapters}
+    item_chapter = np.full(responses.items, -1, dtype=np.int64)
+    chapter_ids = []
+    for quiz, questions, start in layout:
+        chapter = str(quiz.get("chapterId"))
+        if chapter not in chapter_ids:
+            chapter_ids.append(chapter)
+        item_chapter[start:start + len(questions)] = chapter_ids.index(chapter)
+    attempted = np.bincount(responses.item, minlength=responses.items) > 0
+    rows = []
+    for code, chapter in enumerate(chapter_ids):
+        items = (item_chapter == code) & attempted
+        in_chapter = items[responses.item]
+        students = np.unique(responses.student[in_chapter])
+        rows.append([chapter, titles.get(chapter, ""), int((item_chapter == code).sum()),
+                     f"{fit.difficulty[items].mean():.2f}" if items.any() else "-", len(students),
+                     f"{fit.ability[students].mean():.2f}" if len(students) else "-",
+                     f"{responses.correct[in_chapter].mean():.0%}" if in_chapter.any() else "-"])
+    return rows
+
+
+def write_abilities(path, fits, responses, user_ids):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["userId", "responses"] + [f"{model}_{name}" for model in fits for name in ("ability", "se")])
+        columns = [responses.counts] + [values for fit in fits.values() for values in (fit.ability, fit.ability_sd)]
+        for user_id, row in zip(user_ids, zip(*[np.round(values, 4).tolist() for values in columns])):
+            writer.writerow([user_id, int(row[0])] + list(row[1:]))
+
+
+def generate_calibration(data_dir=DATA_DIR, store_dir=STORE_DIR, output_dir=None, models=MODELS):
+    """Update the store, fit the models and write the report and abilities into output_dir
+    (default: report_dir()); returns the PDF path"""
+    output_dir = output_dir or report_dir()
+    compile_store(data_dir, store_dir)
+    with open(os.path.join(data_dir, "quizzes.json"), encoding="utf-8") as f:
+        quizzes = json.load(f)
+    with open(os.path.join(data_dir, "chapters.json"), encoding="utf-8") as f:
+        chapters = json.load(f)
+    store = AnalyticsStore(store_dir)
+    responses, users, layout = response_matrix(store, quizzes)
+    fits = {}
+    for model in models:
+        start = time.perf_counter()
+        fits[model] = calibrate(responses, model)
+        print(f"⏱️  {model.upper()}: {fits[model].iterations} EM iterations in {time.perf_counter() - start:.1f}s")
+
+    os.makedirs(output_dir, exist_ok=True)
+    write_abilities(os.path.join(output_dir, "irt_abilities.csv"), fits, responses, store.decode("users", users))
+    filename = os.path.join(output_dir, "IRT_CALIBRATION.pdf")
+    # Chapters are compared on the Rasch scale when it was fitted: one slope, so b means the same everywhere
+    summary = chapter_summary(fits.get("rasch") or fits[models[0]], responses, layout, chapters)
+    render_calibration(fits, responses, layout, summary, filename, build_time())
+    return filename
+
+
+def run_simulation(students, items, per_student, models):
+    """Fit simulated data and print time and parameter recovery (correlation with the truth)"""
+    responses, (ability, slope, difficulty) = simulate(students, items, per_student)
+    print(f"📁 {students} students x {items} questions, {len(responses.item)} responses")
+    for model in models:
+        start = time.perf_counter()
+        fit = calibrate(responses, model)
+        print(f"⏱️  {model.upper()}: {fit.iterations} EM iterations in {time.perf_counter() - start:.1f}s  "
+              f"r(b) {np.corrcoef(fit.difficulty, difficulty)[0, 1]:.3f}  "
+              f"r(theta) {np.corrcoef(fit.ability, ability)[0, 1]:.3f}"
+              + (f"  r(a) {np.corrcoef(fit.discrimination, slope)[0, 1]:.3f}" if model == "2pl" else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rasch / 2PL calibration of the quiz questions and student abilities")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with quizzes.json, chapters.json, results.json")
+    parser.add_argument("--store", default=STORE_DIR, help="analytics store directory")
+    parser.add_argument("--output", help="directory for IRT_CALIBRATION.pdf and irt_abilities.csv "
+                                         "(default: $KLA_OUTPUT_DIR or reports/)")
+    parser.add_argument("--model", choices=MODELS + ("both",), default="both", help="model(s) to fit")
+    parser.add_argument("--simulate", nargs=3, type=int, metavar=("STUDENTS", "QUESTIONS", "PER_STUDENT"),
+                        help="fit synthetic 2PL data instead and report time and parameter recovery")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    models = MODELS if args.model == "both" else (args.model,)
+
+    if args.simulate:
+        run_simulation(*args.simulate, models)
+        sys.exit(0)
+    print("🚀 Calibrating IRT models...\n")
+    try:
+        filename = generate_calibration(args.data_dir, args.store, args.output, models)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Created: {filename}")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Item analysis of every quiz question: difficulty, discrimination and distractors
+Computed from the columnar analytics store with whole-array NumPy operations (bincount over
+item codes, no per-answer Python loop):
+- difficulty: p-value, the share of attempts answering the question correctly
+- discrimination: point-biserial correlation between answering it correctly and the rest of
+  the attempt's score (the share of the attempt's other questions answered correctly)
+- distractors: how often each option A-D was chosen
+Rendered as ITEM_ANALYSIS.pdf next to the flowcharts
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from analytics_store import STORE_DIR, AnalyticsStore, compile_store
+from flowchart_batch import apply_batch_arguments
+from flowchart_cache import build_time, deterministic, report_dir
+from student_reports import DATA_DIR, LEFT, ReportPage
+
+OPTIONS = "ABCD"
+EASY, HARD = 0.90, 0.20  # p-values outside this range are flagged
+LOW_DISCRIMINATION = 0.20
+MIN_RESPONSES = 20       # fewer responses: statistics shown but not flagged
+
+ITEM_COLUMNS = [("Q", 0), ("Question", 0.8 * cm), ("N", 11.2 * cm), ("p", 12.6 * cm), ("r pb", 13.8 * cm),
+                ("A", 15.2 * cm), ("B", 16.6 * cm), ("C", 18.0 * cm), ("D", 19.4 * cm), ("Flag", 20.8 * cm)]
+
+
+def item_statistics(item, attempt, correct, choice, items, choices):
+    """Per-item statistics from answer-level arrays
+    item: item index (0..items-1) of every answer; attempt: attempt index of every answer;
+    correct: bool per answer; choice: option code per answer (-1 = none).
+    Returns a dict of arrays: responses, p, r_pb (NaN where undefined), chosen[items, choices]"""
+    correct = correct.astype(np.float64)
+    attempts = int(attempt.max()) + 1 if len(attempt) else 0
+    answered = np.bincount(attempt, minlength=attempts).astype(np.float64)
+    right = np.bincount(attempt, weights=correct, minlength=attempts)
+
+    # Rest score: the attempt's share of correct answers among its other questions
+    others = answered[attempt] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rest = np.where(others > 0, (right[attempt] - correct) / others, np.nan)
+    has_rest = ~np.isnan(rest)
+    rest = np.where(has_rest, rest, 0.0)
+
+    responses = np.bincount(item, minlength=items).astype(np.float64)
+    n_correct = np.bincount(item, weights=correct, minlength=items)
+    n = np.bincount(item, weights=has_rest, minlength=items)
+    n1 = np.bincount(item, weights=correct * has_rest, minlength=items)
+    sum_x = np.bincount(item, weights=rest, minlength=items)
+    sum_x2 = np.bincount(item, weights=rest * rest, minlength=items)
+    sum_x1 = np.bincount(item, weights=rest * correct, minlength=items)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = n_correct / responses
+        n0 = n - n1
+        mean1, mean0 = sum_x1 / n1, (sum_x - sum_x1) / n0
+        std = np.sqrt(np.maximum(sum_x2 / n - (sum_x / n) ** 2, 0))
+        q1 = n1 / n
+        r_pb = (mean1 - mean0) / std * np.sqrt(q1 * (1 - q1))
+    r_pb[~np.isfinite(r_pb)] = np.nan
+
+    valid = choice >= 0
+    chosen = np.bincount(item[valid] * choices + choice[valid], minlength=items * choices).reshape(items, choices)
+    return {"responses": responses.astype(np.int64), "p": p, "r_pb": r_pb, "chosen": chosen}
+
+
+def answer_items(store, quizzes):
+    """Map every stored answer to its question in quizzes.json
+    Returns (layout, items, item, known): layout is [(quiz, questions, first item index)], item the
+    item index of every answer and known the mask of answers to a question of quizzes.json"""
+    quiz_codes = {value: code for code, value in enumerate(store.dictionaries["quizzes"])}
+    # Indexed by store quiz code; quizzes missing from quizzes.json (and code -1, the last slot) have size 0
+    offsets = np.zeros(len(quiz_codes) + 1, dtype=np.int64)
+    sizes = np.zeros(len(quiz_codes) + 1, dtype=np.int64)
+    layout, items = [], 0
+    for quiz in quizzes:
+        code = quiz_codes.get(str(quiz.get("id")))
+        questions = quiz.get("questions") or []
+        if code is not None:
+            offsets[code], sizes[code] = items, len(questions)
+        layout.append((quiz, questions, items))
+        items += len(questions)
+
+    quiz = store.column("result", "quiz")[store.answer_result()].astype(np.int64)
+    question = store.column("answer", "question").astype(np.int64)
+    known = (question >= 0) & (question < sizes[quiz])
+    return layout, items, offsets[quiz] + question, known
+
+
+def analyze(store, quizzes):
+    """Statistics for every question in quizzes.json: [(quiz, [(question, stats row), ...]), ...]"""
+    choice_values = store.dictionaries["choices"]
+    option_codes = np.full(len(choice_values) + 1, -1, dtype=np.int64)  # store choice code -> 0..3
+    for code, value in enumerate(choice_values):
+        if value.strip().upper() in OPTIONS:
+            option_codes[code] = OPTIONS.index(value.strip().upper())
+
+    layout, items, item, known = answer_items(store, quizzes)
+    stats = item_statistics(item[known], store.answer_result()[known], store.correct()[known],
+                            option_codes[store.column("answer", "choice")][known], items, len(OPTIONS))
+    return [(quiz, [(question, {name: values[start + k] for name, values in stats.items()})
+                    for k, question in enumerate(questions)])
+            for quiz, questions, start in layout]
+
+
+def flag(row, key):
+    """Why the question needs a look ('' if fine)"""
+    if row["responses"] < MIN_RESPONSES:
+        return ""
+    chosen = row["chosen"]
+    if key in OPTIONS and chosen.max() > chosen[OPTIONS.index(key)]:
+        return "Distractor beats key"
+    if not np.isnan(row["r_pb"]) and row["r_pb"] < 0:
+        return "Negative - check key"
+    if row["p"] > EASY:
+        return "Too easy"
+    if row["p"] < HARD:
+        return "Too hard"
+    if not np.isnan(row["r_pb"]) and row["r_pb"] < LOW_DISCRIMINATION:
+        return "Low discrimination"
+    return ""
+
+
+def render_item_analysis(analysis, chapters, filename, stamp=None):
+    width, height = landscape(A4)
+    c = canvas.Canvas(filename, pagesize=(width, height), invariant=deterministic())
+    c.setTitle("Quiz item analysis")
+    page = ReportPage(c, "Kannada Learning App - Item Analysis", (width, height))
+    page.text(LEFT, "Quiz Item Analysis", "Helvetica-Bold", 18)
+    page.y -= 0.6 * cm
+    if stamp is not None:
+        page.text(LEFT, f"Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}", "Helvetica", 9, colors.grey)
+    page.y -= 0.5 * cm
+    page.text(LEFT, f"p = share answering correctly (flagged above {EASY:.2f} / below {HARD:.2f});  "
+                    f"r pb = point-biserial with the rest of the attempt (flagged below {LOW_DISCRIMINATION:.2f});  "
+                    f"A-D = share choosing each option, * = key;  flags need {MIN_RESPONSES}+ responses",
+              "Helvetica", 8, colors.grey)
+    page.y -= 0.4 * cm
+
+    titles = {str(chapter.get("id")): chapter.get("title", "") for chapter in chapters}
+    for quiz, rows in analysis:
+        page.heading(f"Quiz {quiz.get('id')} - Chapter {quiz.get('chapterId')}: "
+                     f"{titles.get(str(quiz.get('chapterId')), '')}")
+        if not rows:
+            page.text(LEFT, "No questions.", "Helvetica-Oblique", 10, colors.grey)
+            page.y -= 0.5 * cm
+            continue
+        page.table_header(ITEM_COLUMNS)
+        for number, (question, row) in enumerate(rows, 1):
+            key = str(question.get("correctAnswer", "")).strip().upper()
+            total = row["chosen"].sum()
+            shares = [("*" if option == key else "") + (f"{row['chosen'][k] / total:.0%}" if total else "-")
+                      for k, option in enumerate(OPTIONS)]
+            reason = flag(row, key)
+            page.row(ITEM_COLUMNS,
+                     [number, question.get("question", ""), row["responses"],
+                      f"{row['p']:.2f}" if row["responses"] else "-",
+                      "-" if np.isnan(row["r_pb"]) else f"{row['r_pb']:.2f}"] + shares + [reason],
+                     {9: colors.red} if reason else None)
+    page.header = None
+    c.showPage()
+    c.save()
+
+
+def generate_item_analysis(data_dir=DATA_DIR, store_dir=STORE_DIR, output_dir=None):
+    """Update the store, analyze every question and write ITEM_ANALYSIS.pdf into output_dir
+    (default: report_dir()); returns its path"""
+    output_dir = output_dir or report_dir()
+    compile_store(data_dir, store_dir)
+    with open(os.path.join(data_dir, "quizzes.json"), encoding="utf-8") as f:
+        quizzes = json.load(f)
+    with open(os.path.join(data_dir, "chapters.json"), encoding="utf-8") as f:
+        chapters = json.load(f)
+    start = time.perf_counter()
+    store = AnalyticsStore(store_dir)
+    analysis = analyze(store, quizzes)
+    print(f"⏱️  {store.counts['answers']} answers analyzed in {time.perf_counter() - start:.2f}s")
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, "ITEM_ANALYSIS.pdf")
+    render_item_analysis(analysis, chapters, filename, build_time())
+    return filename
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-question difficulty / discrimination / distractor report")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with quizzes.json, chapters.json, results.json")
+    parser.add_argument("--store", default=STORE_DIR, help="analytics store directory")
+    parser.add_argument("--output", help="directory for ITEM_ANALYSIS.pdf (default: $KLA_OUTPUT_DIR or reports/)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    print("🚀 Generating item analysis...\n")
+    try:
+        filename = generate_item_analysis(args.data_dir, args.store, args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(f"✅ Created: {filename}")
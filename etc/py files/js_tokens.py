@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Small JavaScript tokenizer for the static scanners (API routes, frontend call graph)
+Good enough for the app's hand-written Express/vanilla JS: strings, template
+literals, comments and regex literals are recognised so their contents never look like code
+"""
+
+import re
+
+
+class Token:
+    """One lexical token: kind is name, number, string, template, regex, comment or punct"""
+    __slots__ = ("kind", "value", "line")
+
+    def __init__(self, kind, value, line):
+        self.kind = kind
+        self.value = value
+        self.line = line
+
+    def __repr__(self):
+        return f"Token({self.kind}, {self.value!r}, {self.line})"
+
+
+_SCANNER = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*")
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>=>|\.\.\.|===|!==|==|!=|<=|>=|&&|\|\||\?\?|\?\.|[-+*/%=<>!&|^~?:;,.(){}\[\]])
+""", re.S | re.X)
+
+_REGEX_LITERAL = re.compile(r"/(?:\\.|\[(?:\\.|[^\]\\\n])*\]|[^/\\\n\[])+/[a-z]*")
+
+# After these a '/' starts a regex literal rather than a division
+_REGEX_AFTER_NAMES = {"return", "typeof", "case", "do", "else", "in", "of", "new", "delete", "void", "throw"}
+
+
+def _template_end(source, start):
+    """Index just past the template literal opening at `start`, skipping ${...} nesting"""
+    i = start + 1
+    n = len(source)
+    while i < n:
+        ch = source[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "`":
+            return i + 1
+        if ch == "$" and i + 1 < n and source[i + 1] == "{":
+            depth = 1
+            i += 2
+            while i < n and depth:
+                ch = source[i]
+                if ch == "`":
+                    i = _template_end(source, i)
+                    continue
+                if ch in "'\"":
+                    m = _SCANNER.match(source, i)
+                    i = m.end() if m and m.lastgroup == "string" else i + 1
+                    continue
+                depth += ch == "{"
+                depth -= ch == "}"
+                i += 1
+            continue
+        i += 1
+    return n
+
+
+def tokenize(source, keep_comments=True):
+    """Return the list of Tokens for a JavaScript source string"""
+    tokens = []
+    line = 1
+    pos = 0
+    n = len(source)
+    prev = None  # last significant token, to tell regex literals from division
+    while pos < n:
+        ch = source[pos]
+        if ch == "`":
+            end = _template_end(source, pos)
+            tok = Token("template", source[pos + 1:end - 1], line)
+        elif ch == "/" and source[pos + 1:pos + 2] not in ("/", "*") and (
+                prev is None
+                or (prev.kind == "punct" and prev.value not in (")", "]", "}"))
+                or (prev.kind == "name" and prev.value in _REGEX_AFTER_NAMES)):
+            m = _REGEX_LITERAL.match(source, pos)
+            end = m.end() if m else pos + 1
+            tok = Token("regex" if m else "punct", source[pos:end], line)
+        else:
+            m = _SCANNER.match(source, pos)
+            if m is None:  # unknown character (e.g. '#', '@'): skip it
+                pos += 1
+                continue
+            end = m.end()
+            kind = m.lastgroup
+            if kind == "ws":
+                line += source.count("\n", pos, end)
+                pos = end
+                continue
+            value = m.group()
+            if kind == "string":
+                value = value[1:-1]
+            tok = Token(kind, value, line)
+
+        line += source.count("\n", pos, end)
+        pos = end
+        if tok.kind == "comment":
+            if keep_comments:
+                tokens.append(tok)
+            continue
+        tokens.append(tok)
+        prev = tok
+    return tokens
+
+
+def comment_text(token):
+    """Comment body without // or /* */ markers"""
+    value = token.value
+    if value.startswith("//"):
+        return value[2:].strip()
+    return value[2:-2].strip(" *\n")
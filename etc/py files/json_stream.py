@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Incremental reader for the backend's JSON data files
+Yields the elements of a top-level array (quizzes.json, chapters.json) or of the array
+under one key of a top-level object ({"results": [...]}, {"users": [...]}) one at a time,
+reading the file in chunks, so memory depends on the largest record, not the file
+AppendedItems resumes such an array from a saved byte-offset cursor, for files that only grow
+(files are read with newline="" so CRLF line ends count as the two bytes they are)
+"""
+
+import hashlib
+import io
+import json
+import os
+
+CHUNK_SIZE = 1 << 16
+WHITESPACE = " \t\r\n"
+NUMBER_TAIL = ("", ".", "e", "E", "+", "-") + tuple("0123456789")
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """A sliding text buffer over a file, refilled on demand"""
+    def __init__(self, f, chunk_size, offset=0):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.offset = offset  # byte offset of buffer[0] in the file
+
+    def fill(self):
+        """Drop the consumed prefix and read another chunk; False at end of file"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        self.offset += len(self.buffer[:self.pos].encode("utf-8"))
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self.eof = not chunk
+        return bool(chunk)
+
+    def peek(self):
+        """Next non-whitespace character (not consumed), '' at end of file"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch not in chars:
+            raise ValueError(f"JSON stream: expected {chars!r}, found {ch!r} in {self.f.name}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode one complete JSON value, reading more of the file until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # A number may continue in the next chunk ("12" + "34", "-1" + ".5e3")
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and self.buffer[end:end + 1] in NUMBER_TAIL and self.fill()):
+                continue
+            self.pos = end
+            return value
+
+
+def _items(reader):
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_items(path, key=None, chunk_size=CHUNK_SIZE):
+    """Yield the elements of the top-level array, or of the array stored under `key`"""
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = _Reader(f, chunk_size)
+        if reader.peek() == "\ufeff":  # byte order mark
+            reader.pos += 1
+        if key is None:
+            yield from _items(reader)
+            return
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                yield from _items(reader)
+                return
+            reader.value()  # some other member: decoded and dropped
+            if reader.expect(",}") == "}":
+                return
+
+
+def _prefix_digest(path, size):
+    """sha256 of the first `size` bytes of a file"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while size > 0:
+            chunk = f.read(min(size, CHUNK_SIZE * 16))
+            if not chunk:
+                break
+            digest.update(chunk)
+            size -= len(chunk)
+    return digest.hexdigest()
+
+
+class AppendedItems:
+    """The elements of the array under `key` that come after a saved cursor
+    A cursor is {"offset": byte offset just past the last element read, "digest": sha256 of the bytes
+    before it}. It resumes only while the file still starts with exactly those bytes (elements were
+    appended, nothing before them changed); otherwise `resumed` is False and iteration starts again at
+    the first element. After iterating, `cursor` points past the last element of the file"""
+    def __init__(self, path, key, cursor=None, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.key = key
+        self.chunk_size = chunk_size
+        self.resumed = bool(cursor) and os.path.getsize(path) >= cursor["offset"] \
+            and _prefix_digest(path, cursor["offset"]) == cursor["digest"]
+        self.cursor = cursor if self.resumed else None
+
+    def __iter__(self):
+        if not self.resumed:
+            with open(self.path, encoding="utf-8", newline="") as f:  # no \r\n translation: offsets stay in bytes
+                reader = _Reader(f, self.chunk_size)
+                if reader.peek() == "\ufeff":
+                    reader.pos += 1
+                reader.expect("{")
+                while reader.peek() != "}":
+                    name = reader.value()
+                    reader.expect(":")
+                    if name == self.key:
+                        reader.expect("[")
+                        if reader.peek() != "]":
+                            yield from self._rest(reader)
+                        return
+                    reader.value()
+                    if reader.expect(",}") == "}":
+                        return
+            return
+        with open(self.path, "rb") as raw:
+            raw.seek(self.cursor["offset"])
+            reader = _Reader(io.TextIOWrapper(raw, encoding="utf-8", newline=""), self.chunk_size, self.cursor["offset"])
+            if reader.expect(",]") == ",":
+                yield from self._rest(reader)
+
+    def _rest(self, reader):
+        """Elements up to the closing bracket; moves the cursor past the last one"""
+        while True:
+            yield reader.value()
+            end = (reader.offset, reader.buffer, reader.pos)  # byte offset computed once, at the end
+            if reader.expect(",]") == "]":
+                break
+        offset = end[0] + len(end[1][:end[2]].encode("utf-8"))
+        self.cursor = {"offset": offset, "digest": _prefix_digest(self.path, offset)}
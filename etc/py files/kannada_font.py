@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Kannada font support for the generated PDFs
+The TTF (Noto Sans Kannada, or the file in KLA_KANNADA_FONT) is parsed and registered once
+per process, so every document of a batch run reuses it; reportlab embeds only the glyphs
+each document uses. Text is split into Kannada / Latin runs that pick their font, and each
+run is shaped once (with uharfbuzz, when installed) and cached
+The font is not shipped with the repo: put NotoSansKannada-Regular.ttf / -Bold.ttf (SIL Open
+Font License, from Google Fonts) in etc/py files/fonts/, install it system-wide, or point
+KLA_KANNADA_FONT at a TTF; without uharfbuzz, conjuncts are drawn unshaped
+"""
+
+import os
+import re
+from functools import lru_cache
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import ShapedStr, TTFont, shapeStr
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_NAME = "NotoSansKannada"
+BOLD_FONT_NAME = "NotoSansKannada-Bold"
+
+# First existing file wins; KLA_KANNADA_FONT / KLA_KANNADA_BOLD_FONT override
+FONT_PATHS = [
+    os.path.join(SCRIPT_DIR, "fonts", "NotoSansKannada-Regular.ttf"),
+    "/usr/share/fonts/truetype/noto/NotoSansKannada-Regular.ttf",
+    "/usr/share/fonts/noto/NotoSansKannada-Regular.ttf",
+    "C:\\Windows\\Fonts\\NotoSansKannada-Regular.ttf",
+    "C:\\Windows\\Fonts\\Nirmala.ttf",
+    "C:\\Windows\\Fonts\\tunga.ttf",
+]
+BOLD_FONT_PATHS = [
+    os.path.join(SCRIPT_DIR, "fonts", "NotoSansKannada-Bold.ttf"),
+    "/usr/share/fonts/truetype/noto/NotoSansKannada-Bold.ttf",
+    "/usr/share/fonts/noto/NotoSansKannada-Bold.ttf",
+    "C:\\Windows\\Fonts\\NotoSansKannada-Bold.ttf",
+    "C:\\Windows\\Fonts\\NirmalaB.ttf",
+    "C:\\Windows\\Fonts\\tungab.ttf",
+]
+
+KANNADA = re.compile("[\u0c80-\u0cff]")
+NEUTRAL = re.compile(r"[\s\d.,:;!?()\[\]'\"/\-+&%#*]")  # stay in the current run if its font has them
+
+_fonts = None  # (regular, bold) registered names, () if no font was found
+
+
+def font_path(bold=False):
+    """The Kannada TTF that will be used, or None"""
+    configured = os.environ.get("KLA_KANNADA_BOLD_FONT" if bold else "KLA_KANNADA_FONT")
+    for path in ([configured] if configured else []) + (BOLD_FONT_PATHS if bold else FONT_PATHS):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def register_kannada_font():
+    """Register the Kannada TTFs once per process; returns (regular, bold) font names or None"""
+    global _fonts
+    if _fonts is None:
+        regular = font_path()
+        if regular is None:
+            print("⚠️  No Kannada font found (set KLA_KANNADA_FONT): Kannada text falls back to Helvetica")
+            _fonts = ()
+        else:
+            pdfmetrics.registerFont(TTFont(FONT_NAME, regular))
+            bold = font_path(bold=True)
+            if bold:
+                pdfmetrics.registerFont(TTFont(BOLD_FONT_NAME, bold))
+            _fonts = (FONT_NAME, BOLD_FONT_NAME if bold else FONT_NAME)
+    return _fonts or None
+
+
+def has_kannada(text):
+    return KANNADA.search(text) is not None
+
+
+def font_runs(text, font):
+    """((run, font), ...): Kannada runs in the Kannada font, the rest in `font`"""
+    if not has_kannada(text):
+        return ((text, font),)  # not cached: one-off Latin lines (dates, scores) would flood the cache
+    return _kannada_runs(text, font)
+
+
+@lru_cache(maxsize=16384)
+def _kannada_runs(text, font):
+    fonts = register_kannada_font()
+    if fonts is None:
+        return ((text, font),)
+    kannada = fonts[1] if "Bold" in font else fonts[0]
+    covered = pdfmetrics.getFont(kannada).face.charToGlyph
+    runs = []
+    for ch in text:
+        run_font = kannada if KANNADA.match(ch) else font
+        if runs and NEUTRAL.match(ch) and (runs[-1][1] != kannada or ord(ch) in covered):
+            run_font = runs[-1][1]
+        if runs and run_font == runs[-1][1]:
+            runs[-1][0] += ch
+        else:
+            runs.append([ch, run_font])
+    return tuple((run, run_font) for run, run_font in runs)
+
+
+@lru_cache(maxsize=16384)
+def shape(text, font, size):
+    """Shaped glyph run (ShapedStr) for TrueType fonts when uharfbuzz is available, else the text
+    The run keeps the text it was shaped from in `.source`: pdf_stream maps conjunct glyphs
+    (which have no character of their own) back to it"""
+    face = pdfmetrics.getFont(font)
+    if getattr(face, "shapable", False):
+        shaped = shapeStr(text, font, size)
+        if isinstance(shaped, ShapedStr):
+            shaped.source = text
+        return shaped
+    return text
+
+
+def run_width(text, font, size):
+    shaped = shape(text, font, size)
+    if isinstance(shaped, ShapedStr):
+        return sum(glyph.x_advance for glyph in shaped.__shapeData__) * size / 1000
+    return pdfmetrics.stringWidth(text, font, size)
+
+
+def text_width(text, font, size):
+    """Width of text drawn run by run"""
+    return sum(run_width(run, run_font, size) for run, run_font in font_runs(text, font))
+
+
+def draw_text(c, x, y, text, font, size):
+    """drawString in the current font `font`; Kannada runs switch to the Kannada font and back"""
+    runs = font_runs(text, font)
+    if len(runs) == 1 and runs[0][1] == font:
+        c.drawString(x, y, text)
+        return
+    for run, run_font in runs:
+        c.setFont(run_font, size)
+        c.drawString(x, y, shape(run, run_font, size))
+        x += run_width(run, run_font, size)
+    c.setFont(font, size)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+kla-charts: one entry point for every chart, report and analytics script
+  python kla_charts.py flowcharts [--generator NAME] [batch options]   flowchart PDFs
+  python kla_charts.py reports [options]                              per-student progress reports
+  python kla_charts.py analytics TOOL [options]                       funnel, items, irt, traffic, ...
+  python kla_charts.py serve [options]                                local render daemon
+  python kla_charts.py bench [options]                                scaling benchmarks (JSON, baseline check)
+Options after the command go to the script that runs it (COMMAND --help shows them). Nothing
+heavy is imported here: each command imports its own module, so --help costs no reportlab import.
+`flowcharts` first compares a stamp of its inputs (the scripts, the scanned JS sources, the
+options) and outputs with the last run and, when nothing changed, exits without loading reportlab
+"""
+
+import argparse
+import os
+import runpy
+import sys
+
+from callgraph_index import FRONTEND_DIR, SOURCE_FILES
+from route_index import BACKEND_DIR, route_files
+from scan_cache import CACHE_DIR, SCRIPT_DIR, load_cache, save_cache
+
+STAMP_VERSION = "1"
+STAMP_PATH = os.path.join(CACHE_DIR, "kla_charts.json")
+# Environment the charts depend on (the options set by apply_batch_arguments are part of argv)
+STAMP_ENV = ("SOURCE_DATE_EPOCH", "KLA_DETERMINISTIC", "KLA_KANNADA_FONT", "KLA_KANNADA_BOLD_FONT",
+             "KLA_OUTPUT_DIR", "KLA_OUTPUT_NAME", "KLA_COMPRESS")
+FLOWCHART_MODULES = ("generate_visual_flowcharts", "generate_flowcharts_visual", "generate_flowcharts")
+FLOWCHART_DEFAULT = FLOWCHART_MODULES
+
+COMMANDS = {
+    "flowcharts": ("Generate the flowchart PDFs", None),
+    "reports": ("Generate one progress report PDF per student", "student_reports"),
+    "analytics": ("Analytics reports and models (TOOL --help for options)", None),
+    "serve": ("Serve chart and report PDFs from a warm local process", "render_server"),
+    "bench": ("Time and measure the renderer and report pipelines on synthetic data", "benchmark"),
+}
+ANALYTICS = {
+    "store": "analytics_store",
+    "funnel": "chapter_funnel",
+    "items": "item_analysis",
+    "irt": "irt_calibration",
+    "traffic": "flowchart_traffic",
+    "quiz-lock": "quiz_lock_model",
+    "export": "results_export",
+}
+
+def run_script(module, argv):
+    """Run a script's __main__ block in this process; returns its exit status"""
+    saved = sys.argv
+    sys.argv = [module + ".py"] + list(argv)
+    try:
+        runpy.run_module(module, run_name="__main__", alter_sys=True)  # --jobs pickles __main__ functions
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    finally:
+        sys.argv = saved
+    return 0
+
+
+# Flowchart stamp ---------------------------------------------------------------
+def _sources():
+    """(mtime_ns, size) of everything the flowchart generators read"""
+    paths = [os.path.join(SCRIPT_DIR, name) for name in os.listdir(SCRIPT_DIR) if name.endswith(".py")]
+    paths += [os.path.join(FRONTEND_DIR, name) for name in SOURCE_FILES]
+    paths += [os.path.join(BACKEND_DIR, name) for name in route_files(BACKEND_DIR)]
+    sources = {}
+    for path in sorted(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        sources[path] = [stat.st_mtime_ns, stat.st_size]
+    return sources
+
+
+def _stamp_inputs(modules, argv):
+    return {"modules": list(modules), "argv": list(argv), "cwd": os.getcwd(), "sources": _sources(),
+            "env": {name: os.environ.get(name) for name in STAMP_ENV}}
+
+
+def stamp_fresh(inputs):
+    """True if the last successful run had these exact inputs and its outputs are untouched"""
+    stamp = load_cache(STAMP_PATH, STAMP_VERSION)
+    if stamp.get("inputs") != inputs or not stamp.get("outputs"):
+        return False
+    for path, size in stamp["outputs"].items():
+        try:
+            if os.path.getsize(path) != size:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def run_flowcharts(argv):
+    parser = argparse.ArgumentParser(prog="kla-charts flowcharts", add_help=False)
+    parser.add_argument("--generator", action="append", choices=FLOWCHART_MODULES)
+    known, rest = parser.parse_known_args(argv)
+    modules = known.generator or FLOWCHART_DEFAULT
+    if "-h" in rest or "--help" in rest:
+        print(f"kla-charts flowcharts [--generator {{{','.join(FLOWCHART_MODULES)}}}] ...\n"
+              f"  default generators: {', '.join(FLOWCHART_DEFAULT)}; the other options are theirs:\n")
+        return run_script(modules[0], rest)
+
+    stamped = not ({"--force", "--dry-run"} & set(rest))
+    inputs = _stamp_inputs(modules, rest) if stamped else None
+    if stamped and stamp_fresh(inputs):
+        print(f"⏭️  {', '.join(modules)}: inputs unchanged, every chart up to date")
+        return 0
+    status = 0
+    for module in modules:
+        status = run_script(module, rest) or status
+    cache = sys.modules.get("flowchart_cache")
+    # Charts rendered in --jobs workers are not seen here, so such runs leave no stamp
+    if stamped and status == 0 and cache is not None and cache.OUTPUTS:
+        outputs = {os.path.abspath(path): os.path.getsize(path) for path in cache.OUTPUTS if os.path.exists(path)}
+        if len(outputs) == len({os.path.abspath(path) for path in cache.OUTPUTS}):
+            save_cache(STAMP_PATH, {"version": STAMP_VERSION, "inputs": inputs, "outputs": outputs})
+    return status
+
+
+def main(argv):
+    epilog = "commands:\n" + "\n".join(f"  {name:<12} {help}" for name, (help, _) in COMMANDS.items()) \
+        + "\n\nanalytics tools:\n" + "\n".join(f"  {tool:<12} {module}.py" for tool, module in ANALYTICS.items())
+    parser = argparse.ArgumentParser(prog="kla-charts", description="Kannada Learning App charts and reports",
+                                     epilog=epilog, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=COMMANDS, metavar="COMMAND")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="options of the command (COMMAND --help)")
+    args = parser.parse_args(argv)
+
+    if args.command == "flowcharts":
+        return run_flowcharts(args.args)
+    if args.command == "analytics":
+        if not args.args or args.args[0] not in ANALYTICS:
+            parser.error(f"analytics needs a TOOL: {', '.join(ANALYTICS)}")
+        return run_script(ANALYTICS[args.args[0]], args.args[1:])
+    return run_script(COMMANDS[args.command][1], args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Streaming PDF writer for very long documents
+reportlab's Canvas keeps every finished page in memory until save(); this canvas writes each
+page's (compressed) content stream and page object to the file as soon as showPage() is
+called, keeping only object offsets, so memory stays flat however many pages are written.
+It implements the part of the Canvas API the report writers use (setFont, setFillColor,
+setStrokeColor, setLineWidth, line, rect, drawString, showPage, save). Standard fonts are
+referenced by name; TrueType fonts registered with pdfmetrics (the Kannada font) are embedded
+once at save() as a subset of the glyphs used, as CID fonts with a ToUnicode map. Shaped runs
+(kannada_font.shape) keep their glyphs, offsets and advances, and map back to the text they
+were shaped from
+"""
+
+import zlib
+from array import array
+from datetime import datetime
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import ShapedStr, TTFont
+
+# Reserved object numbers; pages, streams and fonts are numbered from FIRST_FREE
+CATALOG, PAGES, RESOURCES, INFO = 1, 2, 3, 4
+FIRST_FREE = 5
+
+_PRIVATE_USE, _PRIVATE_USE_END = 0xE000, 0xF8FF  # where reportlab puts glyphs the cmap has no character for
+_ESCAPES = str.maketrans({"\\": "\\\\", "(": "\\(", ")": "\\)", "\r": "\\r", "\n": "\\n"})
+
+
+def _num(value):
+    """Compact PDF number: 2 decimals, no trailing zeros"""
+    text = f"{value:.2f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _color(color):
+    return f"{_num(color.red)} {_num(color.green)} {_num(color.blue)}"
+
+
+def _literal(text):
+    return "(" + text.translate(_ESCAPES) + ")"
+
+
+class _TrueTypeFont:
+    """A registered TTFont drawn through 2-byte CIDs, assigned as new glyphs are first used"""
+    def __init__(self, font):
+        self.face = font.face
+        self.scale = 1000 / self.face.unitsPerEm
+        self.cids = {0: 0}  # original glyph -> cid (cid k is glyph k of the subset)
+        self.chars = []     # per used glyph, in cid order: the character that draws it (for the subset)
+        self.texts = []     # ... and the text it stands for (for ToUnicode)
+
+    def cid(self, ch, text):
+        glyph = self.face.charToGlyph.get(ord(ch), 0)
+        cid = self.cids.get(glyph)
+        if cid is None:
+            cid = self.cids[glyph] = len(self.cids)
+            self.chars.append(ch)
+            self.texts.append(text)
+        return cid
+
+    def encode(self, text):
+        return "<" + "".join(f"{self.cid(ch, ch):04X}" for ch in text) + ">"
+
+    def show(self, shaped, size):
+        """Text-showing operators for a ShapedStr: harfbuzz's offsets and advances become TJ
+        adjustments and rises"""
+        ops, parts, rise = [], [], 0.0
+        for ch, text, sd in zip(shaped, _glyph_texts(shaped), shaped.__shapeData__):
+            glyph_rise = size * sd.y_offset / 1000
+            if glyph_rise != rise:
+                if parts:
+                    ops.append(f"[{' '.join(parts)}] TJ")
+                    parts = []
+                ops.append(f"{_num(glyph_rise)} Ts")
+                rise = glyph_rise
+            width = self.face.hmetrics[self.face.charToGlyph.get(ord(ch), 0)][0] * self.scale
+            if sd.x_offset:
+                parts.append(_num(-sd.x_offset))
+            parts.append(f"<{self.cid(ch, text):04X}>")
+            if _num(width + sd.x_offset - sd.x_advance) != "0":
+                parts.append(_num(width + sd.x_offset - sd.x_advance))
+        if parts:
+            ops.append(f"[{' '.join(parts)}] TJ")
+        if rise:
+            ops.append("0 Ts")
+        return " ".join(ops)
+
+
+def _glyph_texts(shaped):
+    """The text each glyph of a ShapedStr stands for: a mapped glyph its own character; the
+    private-use glyphs harfbuzz added (conjunct and vowel-sign forms) share whatever of their
+    cluster's text (from shaped.source, see kannada_font.shape) the mapped glyphs don't draw"""
+    texts = list(shaped)
+    source = getattr(shaped, "source", None)
+    if source is None:
+        return texts
+    clusters = {}
+    for k, sd in enumerate(shaped.__shapeData__):
+        if 0 <= sd.cluster < len(source):
+            clusters.setdefault(sd.cluster, []).append(k)
+    starts = sorted(clusters) + [len(source)]
+    for start, end in zip(starts, starts[1:]):
+        left = list(source[start:end])
+        private = []
+        for k in clusters[start]:
+            if _PRIVATE_USE <= ord(shaped[k]) <= _PRIVATE_USE_END:
+                private.append(k)
+            elif shaped[k] in left:
+                left.remove(shaped[k])
+        for n, k in enumerate(private):
+            texts[k] = "" if n else "".join(left)
+    return texts
+
+
+class StreamingCanvas:
+    """Write-as-you-go PDF canvas: a finished page is on disk, not in memory"""
+    def __init__(self, filename, pagesize=A4, invariant=False, compress=True):
+        self.width, self.height = pagesize
+        self.invariant = invariant
+        self.compress = compress
+        self.file = open(filename, "wb")
+        self.offsets = array("Q", [0] * FIRST_FREE)  # byte offset of every object, by number
+        self.pages = array("L")                       # page object numbers
+        self.fonts = {}                               # font name -> (resource name, object number, TrueType or None)
+        self.title = ""
+        self.ops = []
+        self._font = None
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    # Output ----------------------------------------------------------------
+    def _write(self, data):
+        self.file.write(data)
+
+    def _reserve(self):
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def _object(self, number, body, stream=None):
+        self.offsets[number] = self.file.tell()
+        if stream is None:
+            self._write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+            return
+        self._write(f"{number} 0 obj\n<< {body} /Length {len(stream)} >>\nstream\n".encode("latin-1"))
+        self._write(stream)
+        self._write(b"\nendstream\nendobj\n")
+
+    def _stream(self, number, data, extra=""):
+        if self.compress:
+            data = zlib.compress(data)
+            extra += " /Filter /FlateDecode"
+        self._object(number, extra.strip(), data)
+
+    # Graphics state --------------------------------------------------------
+    def setTitle(self, title):
+        self.title = title
+
+    def setFont(self, name, size):
+        if name not in self.fonts:
+            font = pdfmetrics.getFont(name)
+            truetype = _TrueTypeFont(font) if isinstance(font, TTFont) else None
+            self.fonts[name] = (f"F{len(self.fonts) + 1}", self._reserve(), truetype)
+        self._font = (name, size)
+
+    def setFillColor(self, color):
+        self.ops.append(f"{_color(color)} rg")
+
+    def setStrokeColor(self, color):
+        self.ops.append(f"{_color(color)} RG")
+
+    def setLineWidth(self, width):
+        self.ops.append(f"{_num(width)} w")
+
+    def stringWidth(self, text, font, size):
+        return pdfmetrics.stringWidth(text, font, size)
+
+    # Drawing ---------------------------------------------------------------
+    def line(self, x1, y1, x2, y2):
+        self.ops.append(f"{_num(x1)} {_num(y1)} m {_num(x2)} {_num(y2)} l S")
+
+    def rect(self, x, y, width, height, stroke=1, fill=0):
+        paint = "B" if fill and stroke else "f" if fill else "S" if stroke else "n"
+        self.ops.append(f"{_num(x)} {_num(y)} {_num(width)} {_num(height)} re {paint}")
+
+    def drawString(self, x, y, text):
+        name, size = self._font
+        resource, _, truetype = self.fonts[name]
+        if truetype is not None and isinstance(text, ShapedStr):
+            shown = truetype.show(text, size)
+        elif truetype is not None:
+            shown = truetype.encode(text) + " Tj"
+        else:
+            shown = _literal(str(text).encode("cp1252", "replace").decode("latin-1")) + " Tj"
+        self.ops.append(f"BT /{resource} {_num(size)} Tf {_num(x)} {_num(y)} Td {shown} ET")
+
+    # Pages -----------------------------------------------------------------
+    def showPage(self):
+        """Write the current page to the file and start an empty one"""
+        content, page = self._reserve(), self._reserve()
+        self._stream(content, "\n".join(self.ops).encode("latin-1"))
+        self._object(page, f"<< /Type /Page /Parent {PAGES} 0 R /Resources {RESOURCES} 0 R "
+                           f"/MediaBox [0 0 {_num(self.width)} {_num(self.height)}] /Contents {content} 0 R >>")
+        self.pages.append(page)
+        self.ops = []
+        self._font = None
+
+    def getPageNumber(self):
+        return len(self.pages) + 1
+
+    # Fonts and trailer -----------------------------------------------------
+    def _write_truetype(self, number, truetype):
+        face = truetype.face
+        scale = 1000 / face.unitsPerEm
+        base = "AAAAAA+" + face.name.decode("latin-1")  # subset tag
+        glyphs = sorted(truetype.cids.items(), key=lambda item: item[1])
+
+        font_file = self._reserve()
+        data = face.makeSubset([ord(ch) for ch in truetype.chars])
+        self._stream(font_file, data, f"/Length1 {len(data)}")
+
+        descriptor = self._reserve()
+        self._object(descriptor, (
+            f"<< /Type /FontDescriptor /FontName /{base} /Flags {face.flags} "
+            f"/FontBBox [{' '.join(_num(v) for v in face.bbox)}] /ItalicAngle {_num(face.italicAngle)} "
+            f"/Ascent {_num(face.ascent)} /Descent {_num(face.descent)} /CapHeight {_num(face.capHeight)} "
+            f"/StemV {face.stemV} /FontFile2 {font_file} 0 R >>"))
+
+        widths = " ".join(_num(face.hmetrics[glyph][0] * scale) for glyph, _ in glyphs)
+        cid_font = self._reserve()
+        self._object(cid_font, (
+            f"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /{base} "
+            f"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+            f"/FontDescriptor {descriptor} 0 R /W [0 [{widths}]] /CIDToGIDMap /Identity >>"))
+
+        to_unicode = self._reserve()
+        mappings = [f"<{cid:04X}> <{''.join(f'{u:04X}' for ch in text for u in _utf16(ch))}>"
+                    for cid, text in enumerate(truetype.texts, 1) if text]
+        cmap = ["/CIDInit /ProcSet findresource begin 12 dict begin begincmap",
+                "/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+                "/CMapName /Adobe-Identity-UCS def /CMapType 2 def",
+                "1 begincodespacerange <0000> <FFFF> endcodespacerange"]
+        for start in range(0, len(mappings), 100):
+            chunk = mappings[start:start + 100]
+            cmap += [f"{len(chunk)} beginbfchar"] + chunk + ["endbfchar"]
+        cmap += ["endcmap CMapName currentdict /CMap defineresource pop end end"]
+        self._stream(to_unicode, "\n".join(cmap).encode("latin-1"))
+
+        self._object(number, f"<< /Type /Font /Subtype /Type0 /BaseFont /{base} /Encoding /Identity-H "
+                             f"/DescendantFonts [{cid_font} 0 R] /ToUnicode {to_unicode} 0 R >>")
+
+    def save(self):
+        """Write fonts, page tree, catalog, xref and trailer, and close the file"""
+        if self.ops or not self.pages:
+            self.showPage()
+        for name, (_, number, truetype) in self.fonts.items():
+            if truetype is not None:
+                self._write_truetype(number, truetype)
+            else:
+                self._object(number, f"<< /Type /Font /Subtype /Type1 /BaseFont /{name} "
+                                     f"/Encoding /WinAnsiEncoding >>")
+        fonts = " ".join(f"/{resource} {number} 0 R" for resource, number, _ in self.fonts.values())
+        self._object(RESOURCES, f"<< /Font << {fonts} >> /ProcSet [/PDF /Text] >>")
+
+        self.offsets[PAGES] = self.file.tell()
+        self._write(f"{PAGES} 0 obj\n<< /Type /Pages /Count {len(self.pages)} /Kids [".encode("latin-1"))
+        for start in range(0, len(self.pages), 1000):
+            self._write("".join(f"{page} 0 R " for page in self.pages[start:start + 1000]).encode("latin-1"))
+        self._write(b"] >>\nendobj\n")
+        self._object(CATALOG, f"<< /Type /Catalog /Pages {PAGES} 0 R >>")
+        info = f"/Title {_literal(self.title.encode('cp1252', 'replace').decode('latin-1'))} /Producer (kla pdf_stream)"
+        if not self.invariant:
+            info += f" /CreationDate (D:{datetime.now().strftime('%Y%m%d%H%M%S')})"
+        self._object(INFO, f"<< {info} >>")
+
+        xref = self.file.tell()
+        self._write(f"xref\n0 {len(self.offsets)}\n0000000000 65535 f \n".encode("latin-1"))
+        for start in range(1, len(self.offsets), 1000):
+            self._write("".join(f"{offset:010d} 00000 n \n"
+                                for offset in self.offsets[start:start + 1000]).encode("latin-1"))
+        self._write(f"trailer\n<< /Size {len(self.offsets)} /Root {CATALOG} 0 R /Info {INFO} 0 R >>\n"
+                    f"startxref\n{xref}\n%%EOF\n".encode("latin-1"))
+        self.file.close()
+
+
+def _utf16(ch):
+    """UTF-16 code units of one character (surrogate pair above the BMP)"""
+    data = ch.encode("utf-16-be")
+    return [int.from_bytes(data[k:k + 2], "big") for k in range(0, len(data), 2)]
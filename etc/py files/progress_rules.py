@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Chapter progress and quiz-lock rules, mirroring frontend/js/student.js
+(getChapterProgress, getChapterStatus and the checks in startChapterQuiz)
+"""
+
+PASS_SCORE = 50
+MAX_ATTEMPTS = 2
+
+
+def chapter_progress(progress, pass_score=PASS_SCORE):
+    """0, 50 or 100: 50% for reading + 50% for a passing best score"""
+    if not progress:
+        return 0
+    percentage = 0
+    if progress.get("hasRead"):
+        percentage += 50
+    if (progress.get("bestScore") or 0) >= pass_score:
+        percentage += 50
+    return percentage
+
+
+def chapter_status(progress, pass_score=PASS_SCORE):
+    """'completed', 'failed', 'in-progress' or 'not-started' (the chapter card label)"""
+    percentage = chapter_progress(progress, pass_score)
+    if percentage == 100:
+        return "completed"
+    best = (progress or {}).get("bestScore") or 0
+    if 0 < best < pass_score:
+        return "failed"
+    if percentage > 0:
+        return "in-progress"
+    return "not-started"
+
+
+def quiz_lock(progress, pass_score=PASS_SCORE):
+    """Why the quiz can't be started ('read-first', 'already-passed', 'failed-both'), or None"""
+    if not progress or not progress.get("hasRead"):
+        return "read-first"
+    attempts = progress.get("quizAttempts") or []
+    if len(attempts) == 1 and (attempts[0].get("score") or 0) >= pass_score:
+        return "already-passed"
+    if len(attempts) >= MAX_ATTEMPTS and all((a.get("score") or 0) < pass_score for a in attempts):
+        return "failed-both"
+    return None
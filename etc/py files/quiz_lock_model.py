@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Executable model of the per-chapter quiz-lock state machine (progress_rules)
+A chapter's state is (hasRead, attempt history class); the events are reading, passing or
+failing the quiz and the admin reset. Three modes:
+- chart: enumerate every reachable state through the real rule functions and draw the
+  student decision chart from that state graph (QUIZ_LOCK_STATES.pdf)
+- replay: re-run every users.json progress[chapterId] entry through the rules and list the
+  entries the app could not have produced (attempts while locked, wrong bestScore, ...)
+- simulate: vectorized Monte Carlo of millions of students' first and retake scores,
+  predicting the lock-out rate for several pass thresholds
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter, deque
+
+import numpy as np
+from reportlab.lib import colors
+
+from flowchart_batch import add_output_arguments, apply_batch_arguments
+from flowchart_cache import OUTPUT_DIR, build_flowchart, build_message
+from flowchart_model import Flowchart
+from generate_visual_flowcharts import add_header
+from json_stream import iter_items
+from progress_rules import MAX_ATTEMPTS, PASS_SCORE, chapter_progress, chapter_status, quiz_lock
+from student_reports import DATA_DIR
+
+EVENTS = {"read": "read chapter", "pass": "quiz: pass", "fail": "quiz: fail", "reset": "admin reset"}
+SCORES = {"pass": 100, "fail": 40}  # representative scores of a pass / fail when enumerating
+
+ATTEMPT_CLASSES = {"none": "no attempts", "passed-first": "passed on 1st attempt",
+                   "failed-once": "failed once", "failed-both": f"failed {MAX_ATTEMPTS} attempts",
+                   "passed-retake": "passed on a retake"}
+LOCK_LABELS = {"read-first": "quiz locked: read first", "already-passed": "quiz locked: already passed",
+               "failed-both": "quiz locked: failed both", None: "quiz open"}
+STATUS_COLORS = {"completed": colors.lightgreen, "failed": colors.lightsalmon,
+                 "in-progress": colors.lightyellow, "not-started": colors.lightblue}
+
+# Monte Carlo defaults (percentages), replaced by --from-results estimates when asked
+SIMULATION = {"mean": 60.0, "spread": 18.0, "noise": 10.0, "gain": 5.0, "retake": 0.9}
+SIMULATION_CHUNK = 1_000_000
+QUESTIONS = 10  # scores move in steps of 100 / QUESTIONS
+
+
+def attempt_class(scores, pass_score=PASS_SCORE):
+    """Class of an attempt history ('invalid' for one the rules cannot produce)"""
+    if not scores:
+        return "none"
+    passed = [score >= pass_score for score in scores]
+    if len(scores) == 1:
+        return "passed-first" if passed[0] else "failed-once"
+    if passed[0]:
+        return "invalid"
+    return "passed-retake" if any(passed) else "failed-both"
+
+
+def state_of(progress, pass_score=PASS_SCORE):
+    scores = [(attempt.get("score") or 0) for attempt in (progress.get("quizAttempts") or [])]
+    return bool(progress.get("hasRead")), attempt_class(scores, pass_score)
+
+
+def apply_event(progress, event, pass_score=PASS_SCORE):
+    """Progress after `event`, or None when the rules don't allow it"""
+    if event == "reset":
+        return {"hasRead": False, "quizAttempts": [], "bestScore": 0}
+    if event == "read":
+        return dict(progress, hasRead=True)
+    if quiz_lock(progress, pass_score) is not None:
+        return None
+    score = SCORES[event] if event == "pass" else min(SCORES["fail"], pass_score - 1)
+    attempts = list(progress.get("quizAttempts") or []) + [{"score": score}]
+    return dict(progress, quizAttempts=attempts, bestScore=max(progress.get("bestScore") or 0, score))
+
+
+def enumerate_states(pass_score=PASS_SCORE):
+    """Breadth-first walk of the state graph from a new chapter
+    Returns (states {state: example progress}, transitions [(state, event, state)], loops {state: [event]})"""
+    start = {"hasRead": False, "quizAttempts": [], "bestScore": 0}
+    states = {state_of(start, pass_score): start}
+    transitions, loops = [], {}
+    queue = deque([state_of(start, pass_score)])
+    while queue:
+        state = queue.popleft()
+        for event in EVENTS:
+            after = apply_event(states[state], event, pass_score)
+            if after is None:
+                continue
+            target = state_of(after, pass_score)
+            if target == state:
+                loops.setdefault(state, []).append(event)
+                continue
+            transitions.append((state, event, target))
+            if target not in states:
+                states[target] = after
+                queue.append(target)
+    return states, transitions, loops
+
+
+def _state_name(state):
+    return f"{'read' if state[0] else 'unread'}_{state[1]}"
+
+
+def build_state_chart(pass_score=PASS_SCORE):
+    """Student decision chart generated from the enumerated state graph"""
+    chart = Flowchart("quiz_lock_states", f"Quiz Lock State Machine (pass >= {pass_score}%, "
+                                          f"{MAX_ATTEMPTS} attempts)",
+                      os.path.join(OUTPUT_DIR, "QUIZ_LOCK_STATES.pdf"))
+    add_header(chart, chart.title)
+    states, transitions, loops = enumerate_states(pass_score)
+    for state, progress in states.items():
+        status = chapter_status(progress, pass_score)
+        lines = [f"{'Read' if state[0] else 'Not read'}, {ATTEMPT_CLASSES[state[1]]}",
+                 f"progress {chapter_progress(progress, pass_score)}% - {status}",
+                 LOCK_LABELS[quiz_lock(progress, pass_score)]]
+        if any(event in SCORES for event in loops.get(state, ())):
+            lines.append("retakes unlimited (state unchanged)")
+        chart.node(_state_name(state), "\n".join(lines), "ellipse" if not state[0] and state[1] == "none" else "box",
+                   STATUS_COLORS[status])
+    # Admin reset leads every state back to the start: one box instead of an arrow per state
+    resets = {target for _, event, target in transitions if event == "reset"}
+    for target in resets:
+        chart.node(f"reset_{_state_name(target)}", "Admin reset (from any state)\n"
+                   "attempts cleared, bestScore 0, hasRead false", "ellipse", colors.lightgrey)
+        chart.edge(f"reset_{_state_name(target)}", _state_name(target))
+    for state, event, target in transitions:
+        if event != "reset":
+            chart.edge(_state_name(state), _state_name(target), EVENTS[event])
+    return chart
+
+
+# Replay -------------------------------------------------------------------------
+def replay(progress, pass_score=PASS_SCORE):
+    """Rule violations in one progress[chapterId] entry, as short messages (#n = attempt number)"""
+    problems = []
+    attempts = progress.get("quizAttempts") or []
+    scores = [attempt.get("score") for attempt in attempts]
+    if attempts and not progress.get("hasRead"):
+        problems.append("quiz attempts but hasRead is false")
+    history = {"hasRead": True, "quizAttempts": [], "bestScore": 0}
+    for number, attempt in enumerate(attempts, 1):
+        lock = quiz_lock(history, pass_score)
+        if lock is not None:
+            problems.append(f"attempt taken while locked ({lock}) #{number}")
+            break
+        history = dict(history, quizAttempts=history["quizAttempts"] + [attempt])
+    if any(not isinstance(score, (int, float)) or not 0 <= score <= 100 for score in scores):
+        problems.append("score missing or outside 0-100")
+    elif (progress.get("bestScore") or 0) != max(scores, default=0):
+        problems.append("bestScore is not the best attempt score")
+    dates = [str(attempt.get("date") or "") for attempt in attempts]
+    if dates != sorted(dates):
+        problems.append("attempt dates out of order")
+    return problems
+
+
+def replay_users(users_file, pass_score=PASS_SCORE):
+    """Replay every progress entry of users.json; returns (entries, Counter of problems, [(user, chapter, problem)])"""
+    entries, counts, found = 0, Counter(), []
+    for user in iter_items(users_file, "users"):
+        for chapter_id, progress in (user.get("progress") or {}).items():
+            entries += 1
+            for problem in replay(progress or {}, pass_score):
+                counts[problem.split(" #")[0]] += 1
+                found.append((user.get("id"), chapter_id, problem))
+    return entries, counts, found
+
+
+# Monte Carlo --------------------------------------------------------------------
+def simulate_lockout(students, thresholds, mean, spread, noise, gain, retake, questions=QUESTIONS, seed=0):
+    """Share of students per outcome for every pass threshold, from simulated score pairs
+    Each student has an ability ~ N(mean, spread); an attempt scores ability + N(0, noise) (+ gain on
+    the retake), rounded to whole questions. Students who fail the first attempt retake with
+    probability `retake`. Returns {threshold: {outcome: share}}"""
+    rng = np.random.default_rng(seed)
+    thresholds = np.asarray(thresholds, dtype=np.float64)[:, None]
+    totals = {name: np.zeros(len(thresholds)) for name in ("passed_first", "passed_retake", "locked_out", "gave_up")}
+    step = 100 / questions
+    for start in range(0, students, SIMULATION_CHUNK):
+        n = min(SIMULATION_CHUNK, students - start)
+        ability = rng.normal(mean, spread, n)
+        first = np.clip(np.round((ability + rng.normal(0, noise, n)) / step) * step, 0, 100)
+        second = np.clip(np.round((ability + gain + rng.normal(0, noise, n)) / step) * step, 0, 100)
+        retakes = rng.random(n) < retake
+        passed_first = first >= thresholds
+        failed_first = ~passed_first
+        passed_second = second >= thresholds
+        totals["passed_first"] += passed_first.sum(axis=1)
+        totals["passed_retake"] += (failed_first & retakes & passed_second).sum(axis=1)
+        totals["locked_out"] += (failed_first & retakes & ~passed_second).sum(axis=1)
+        totals["gave_up"] += (failed_first & ~retakes).sum(axis=1)
+    return {float(t): {name: values[k] / students for name, values in totals.items()}
+            for k, t in enumerate(thresholds[:, 0])}
+
+
+def estimate_simulation(store, pass_score=PASS_SCORE, minimum=30):
+    """Monte Carlo parameters from the analytics store: first / second attempt per (user, chapter)"""
+    user = store.column("result", "user").astype(np.int64)
+    chapter = store.column("result", "chapter").astype(np.int64)
+    order = np.lexsort((store.column("result", "submitted"), chapter, user))
+    key = user[order] * (len(store.dictionaries["chapters"]) + 1) + chapter[order]
+    score = np.asarray(store.column("result", "percentage"), dtype=np.float64)[order]
+    first = np.append(True, key[1:] != key[:-1])
+    second = np.append(False, first[:-1] & ~first[1:])  # the row right after a first attempt, same pair
+    first_scores = score[first]
+    failed = first_scores < pass_score
+    if len(first_scores) < minimum:
+        return None
+    pairs = np.flatnonzero(second)
+    gains = score[pairs] - score[pairs - 1]
+    parameters = dict(SIMULATION, mean=float(first_scores.mean()))
+    if len(gains) >= minimum:
+        noise = float(gains.std() / np.sqrt(2))
+        parameters.update(gain=float(gains.mean()), noise=noise,
+                          spread=float(np.sqrt(max(first_scores.var() - noise ** 2, 1.0))))
+    else:
+        parameters["spread"] = float(np.sqrt(max(first_scores.var() - parameters["noise"] ** 2, 1.0)))
+    if failed.any():
+        retook = np.append(second[1:], False)[first]  # first attempts followed by a second one
+        parameters["retake"] = float(retook[failed].mean())
+    return parameters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz-lock state machine: chart, users.json replay, Monte Carlo")
+    parser.add_argument("--pass-score", type=int, default=PASS_SCORE, help="pass threshold for chart and replay")
+    parser.add_argument("--replay", nargs="?", const=os.path.join(DATA_DIR, "users.json"), metavar="USERS_JSON",
+                        help="check every progress entry of users.json against the rules")
+    parser.add_argument("--simulate", type=int, metavar="STUDENTS", help="Monte Carlo over this many students")
+    parser.add_argument("--thresholds", type=int, nargs="+", default=[30, 40, 50, 60, 70, 80],
+                        help="pass thresholds to simulate (scores move in whole questions)")
+    parser.add_argument("--from-results", action="store_true",
+                        help="estimate the simulated score distribution from results.json (analytics store)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with results.json / users.json")
+    parser.add_argument("--force", action="store_true", help="re-render the chart even if it is up to date")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    parser.add_argument("--dry-run", action="store_true", help="lay out the chart and print its stats, write nothing")
+    add_output_arguments(parser)
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+
+    if args.replay:
+        start = time.perf_counter()
+        entries, counts, found = replay_users(args.replay, args.pass_score)
+        print(f"⏱️  {entries} progress entries replayed in {time.perf_counter() - start:.1f}s")
+        if not found:
+            print("✅ Every progress entry is reachable under the rules")
+        else:
+            print(f"❌ {len(found)} rule violations:")
+            for problem, count in counts.most_common():
+                print(f"   {count:>8}  {problem}")
+            for user_id, chapter_id, problem in found[:20]:
+                print(f"   user {user_id}, chapter {chapter_id}: {problem}")
+        sys.exit(1 if found else 0)
+
+    if args.simulate:
+        parameters = dict(SIMULATION)
+        if args.from_results:
+            from analytics_store import AnalyticsStore, STORE_DIR, compile_store
+            compile_store(args.data_dir, STORE_DIR)
+            estimated = estimate_simulation(AnalyticsStore(STORE_DIR), args.pass_score)
+            if estimated is None:
+                print("⚠️  Too few results to estimate from; using the default score model")
+            else:
+                parameters = estimated
+        print("📁 Score model: " + ", ".join(f"{name} {value:.2f}" for name, value in parameters.items()))
+        start = time.perf_counter()
+        rates = simulate_lockout(args.simulate, args.thresholds, **parameters)
+        print(f"⏱️  {args.simulate} students x {len(args.thresholds)} thresholds in {time.perf_counter() - start:.1f}s\n")
+        print(f"{'pass at':>8}{'1st try':>10}{'retake':>10}{'locked':>10}{'gave up':>10}")
+        for threshold, rate in rates.items():
+            print(f"{threshold:>7.0f}%{rate['passed_first']:>10.1%}{rate['passed_retake']:>10.1%}"
+                  f"{rate['locked_out']:>10.1%}{rate['gave_up']:>10.1%}")
+        sys.exit(0)
+
+    chart = build_state_chart(args.pass_score)
+    print(build_message(chart, build_flowchart(chart, args.force),
+                        f"✅ {os.path.basename(chart.filename)} created ({len(chart.nodes)} states, "
+                        f"{len(chart.edges)} transitions)"))
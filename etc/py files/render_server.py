@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Local render daemon: one long-running process that keeps reportlab, the Kannada fonts, the
+chapter list and a per-student index of users.json/results.json warm and renders PDFs on request
+  POST /report  {"userId": "..."}                          one student's progress report
+  POST /chart   {"module": "generate_...", "chart": "build_..."}   a generator chart
+  POST /chart   {"spec": {"title", "nodes", "edges", ...}}  an inline chart (see chart_from_spec)
+  GET  /metrics  request counts and latency percentiles per endpoint;  GET /health
+PDF responses carry Server-Timing (refresh/render ms) and X-Render-Ms headers. The index is
+refreshed on every request from three os.stat() calls: users.json and chapters.json are reloaded
+when they change, results.json is read on from its saved cursor (it is only appended to).
+Listens on 127.0.0.1 only; requests are served one at a time (font registration and the
+renderer's caches are not thread-safe). The Node backend can POST to it, e.g.
+  curl -s -X POST localhost:8765/report -d '{"userId": "1763470027702"}' -o report.pdf
+Usage: python render_server.py [--port 8765] [--data-dir DIR] [--deterministic]
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from flowchart_batch import apply_batch_arguments
+from flowchart_cache import build_time, spec_hash
+from flowchart_model import Flowchart
+from flowchart_output import render_pdf
+from json_stream import AppendedItems, iter_items
+from kannada_font import register_kannada_font
+from render_stats import GENERATORS, chart_builders
+from student_reports import DATA_DIR, load_chapters, render_report, result_row, user_row
+
+PORT = 8765
+CHART_CACHE_SIZE = 64  # rendered charts kept by spec hash
+LATENCY_WINDOW = 1000  # latencies per endpoint the percentiles are computed over
+MAX_BODY = 1 << 20
+
+
+def _source(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class StudentIndex:
+    """Users by id and their projected results, kept in step with the data files"""
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.users = {}
+        self.results = {}
+        self.chapters = []
+        self.sources = {}
+        self.cursor = None
+
+    def _changed(self, name):
+        source = _source(os.path.join(self.data_dir, name))
+        if self.sources.get(name) == source:
+            return False
+        self.sources[name] = source
+        return True
+
+    def refresh(self):
+        """Bring the index up to date; returns the number of new results read"""
+        if self._changed("chapters.json"):
+            self.chapters = load_chapters(self.data_dir)
+        if self._changed("users.json"):
+            self.users = {str(user.get("id")): user_row(user)
+                          for user in iter_items(os.path.join(self.data_dir, "users.json"), "users")}
+        if not self._changed("results.json"):
+            return 0
+        results = AppendedItems(os.path.join(self.data_dir, "results.json"), "results", self.cursor)
+        if not results.resumed:
+            self.results = {}
+        count = 0
+        for result in results:
+            row = result_row(result)
+            self.results.setdefault(str(row[0]), []).append(row)
+            count += 1
+        self.cursor = results.cursor
+        return count
+
+    def student(self, user_id):
+        """(user, results sorted by submission time) or None for an unknown id"""
+        user = self.users.get(str(user_id))
+        if user is None:
+            return None
+        results = self.results.get(str(user_id), [])
+        results.sort(key=lambda row: row[6] or "")
+        return user, results
+
+
+class LatencyStats:
+    """Rolling per-endpoint latencies (ms) for /metrics"""
+    def __init__(self):
+        self.windows = {}
+        self.counts = {}
+
+    def add(self, endpoint, ms):
+        self.windows.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(ms)
+        self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def summary(self):
+        summary = {}
+        for endpoint, window in self.windows.items():
+            values = sorted(window)
+            summary[endpoint] = {"requests": self.counts[endpoint],
+                                 **{f"p{q}_ms": round(values[min(len(values) - 1, len(values) * q // 100)], 2)
+                                    for q in (50, 95, 99)},
+                                 "max_ms": round(values[-1], 2)}
+        return summary
+
+
+def chart_from_spec(spec):
+    """Flowchart from JSON (coordinates in points; boxes without x/y/width/height are auto-laid-out):
+    {"name", "title", "pagesize": [w, h], "rankdir", "routing",
+     "nodes": [{"name", "text", "type", "color", "x", "y", "width", "height", "cluster"}],
+     "edges": [{"tail", "head", "label", "width", "color"}], "clusters": [{"name", "label"}],
+     "labels": [{"text", "x", "y", "font", "size", "color"}]}"""
+    options = {key: spec[key] for key in ("rankdir", "routing") if key in spec}
+    if "pagesize" in spec:
+        options["pagesize"] = tuple(spec["pagesize"])
+    name = spec.get("name", "chart")
+    chart = Flowchart(name, spec.get("title", name), f"{name}.pdf", **options)
+    for cluster in spec.get("clusters", []):
+        chart.cluster(cluster["name"], cluster.get("label", cluster["name"]))
+    for node in spec.get("nodes", []):
+        position = {key: node[key] for key in ("x", "y", "width", "height", "cluster") if key in node}
+        chart.node(node["name"], node.get("text", node["name"]), node.get("type", "box"),
+                   node.get("color", "lightblue"), **position)
+    for edge in spec.get("edges", []):
+        chart.edge(edge["tail"], edge["head"], edge.get("label", ""), width=edge.get("width"), color=edge.get("color"))
+    for label in spec.get("labels", []):
+        chart.label(label["text"], label["x"], label["y"], label.get("font", "Helvetica"), label.get("size", 8),
+                    label.get("color", "black"))
+    chart.validate()
+    return chart
+
+
+class RenderService:
+    """Everything the daemon keeps warm between requests"""
+    def __init__(self, data_dir):
+        self.index = StudentIndex(data_dir)
+        self.charts = OrderedDict()  # spec hash -> PDF bytes
+        self.builders = {module: dict(chart_builders(module)) for module in GENERATORS}
+        self.stats = LatencyStats()
+
+    def warm_up(self):
+        """Fonts, the student index, and one render of every kind so the first request is fast"""
+        register_kannada_font()
+        self.index.refresh()
+        for module, builders in self.builders.items():
+            for name in builders:
+                self.chart({"module": module, "chart": name})
+        if self.index.users:
+            self.report({"userId": next(iter(self.index.users))})
+
+    def report(self, request):
+        student = self.index.student(request.get("userId"))
+        if student is None:
+            raise LookupError(f"unknown userId {request.get('userId')!r}")
+        buffer = io.BytesIO()
+        render_report(*student, self.index.chapters, buffer, build_time())
+        return buffer.getbuffer()
+
+    def chart(self, request):
+        """Rendered once per spec hash (volatile 'Generated' stamps are those of the first render)"""
+        if "spec" in request:
+            chart = chart_from_spec(request["spec"])
+        else:
+            builder = self.builders.get(request.get("module"), {}).get(request.get("chart"))
+            if builder is None:
+                raise LookupError(f"unknown chart {request.get('module')}.{request.get('chart')}")
+            chart = builder()
+        digest = spec_hash(chart)
+        pdf = self.charts.get(digest)
+        if pdf is None:
+            pdf = self.charts[digest] = render_pdf(chart)
+            if len(self.charts) > CHART_CACHE_SIZE:
+                self.charts.popitem(last=False)
+        self.charts.move_to_end(digest)
+        return pdf
+
+
+class RenderHandler(BaseHTTPRequestHandler):
+    service = None  # RenderService, set by serve()
+    quiet = False
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status, value):
+        self._send(status, json.dumps(value, indent=2).encode("utf-8"))
+
+    def do_GET(self):
+        if self.path == "/health":
+            index = self.service.index
+            self._json(200, {"status": "ok", "students": len(index.users),
+                             "results": sum(len(rows) for rows in index.results.values())})
+        elif self.path == "/metrics":
+            self._json(200, self.service.stats.summary())
+        else:
+            self._json(404, {"error": f"no such endpoint {self.path}"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        endpoint = {"/report": self.service.report, "/chart": self.service.chart}.get(self.path)
+        if endpoint is None:
+            self._json(404, {"error": f"no such endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY:
+                raise ValueError(f"request body over {MAX_BODY} bytes")
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            self.service.index.refresh()
+            refreshed = time.perf_counter()
+            pdf = endpoint(request)
+        except LookupError as e:
+            self._json(404, {"error": str(e)})
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            self._json(400, {"error": f"bad request: {e}"})
+            return
+        except Exception:
+            traceback.print_exc()
+            self._json(500, {"error": "render failed"})
+            return
+        end = time.perf_counter()
+        total = (end - start) * 1000
+        self.service.stats.add(self.path, total)
+        self._send(200, pdf, "application/pdf",
+                   [("Server-Timing", f"refresh;dur={(refreshed - start) * 1000:.2f}, "
+                                      f"render;dur={(end - refreshed) * 1000:.2f}"),
+                    ("X-Render-Ms", f"{total:.2f}")])
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            print(f"⏱️  {self.command} {self.path} {format % args}")
+
+
+def serve(port=PORT, data_dir=DATA_DIR, quiet=False):
+    service = RenderService(data_dir)
+    start = time.perf_counter()
+    service.warm_up()
+    print(f"✅ Warm in {time.perf_counter() - start:.2f}s: {len(service.index.users):,} students, "
+          f"{len(service.charts)} charts cached")
+    RenderHandler.service = service
+    RenderHandler.quiet = quiet
+    server = HTTPServer(("127.0.0.1", port), RenderHandler)
+    print(f"🚀 Render server on http://127.0.0.1:{server.server_port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(service.stats.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve chart and student report PDFs from a warm process")
+    parser.add_argument("--port", type=int, default=PORT, help="TCP port on 127.0.0.1 (0 = any free port)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with users.json, results.json, chapters.json")
+    parser.add_argument("--quiet", action="store_true", help="don't log every request")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    try:
+        serve(args.port, args.data_dir, args.quiet)
+    except OSError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
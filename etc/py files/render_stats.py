@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Before/after numbers for the batched flowchart renderer
+Renders every chart of the three generators in memory with batch=False and batch=True
+and prints the PDF content-stream operator count and the compressed file size of each
+Usage: python render_stats.py [generate_flowcharts generate_visual_flowcharts ...]
+"""
+
+import importlib
+import io
+import re
+import sys
+
+from reportlab.pdfgen import canvas
+
+from flowchart_batch import GENERATORS
+from flowchart_render import render_flowchart
+
+# Everything in a content stream that is an operand, not an operator
+OPERANDS = re.compile(rb"\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>|/[^\s/\[\]()<>]+|[-+]?(?:\d+\.?\d*|\.\d+)|[\[\]]")
+STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+
+
+def chart_builders(module_name):
+    """(name, builder) for every build_*flowchart* function of a generator module"""
+    module = importlib.import_module(module_name)
+    return [(name, getattr(module, name)) for name in sorted(dir(module))
+            if name.startswith("build_") and "flowchart" in name and name != "build_flowchart"]
+
+
+def render_bytes(chart, batch, compress):
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=chart.pagesize, invariant=True, pageCompression=int(compress))
+    render_flowchart(chart, c, batch=batch)
+    c.save()
+    return buffer.getvalue()
+
+
+def count_operators(pdf):
+    """Number of operators in the unfiltered (content) streams of an uncompressed PDF"""
+    total = 0
+    for match in STREAM.finditer(pdf):
+        header = pdf[pdf.rfind(b"<<", 0, match.start()):match.start()]
+        if b"/Filter" not in header:
+            total += len(OPERANDS.sub(b" ", match.group(1)).split())
+    return total
+
+
+def measure(builder, batch):
+    """(operators, compressed bytes) of one rendering"""
+    operators = count_operators(render_bytes(builder(), batch, compress=False))
+    size = len(render_bytes(builder(), batch, compress=True))
+    return operators, size
+
+
+def main(modules):
+    print(f"{'chart':<66} {'ops before':>10} {'ops after':>10} {'bytes before':>13} {'bytes after':>12}")
+    totals = [0, 0, 0, 0]
+    for module_name in modules:
+        for name, builder in chart_builders(module_name):
+            before = measure(builder, batch=False)
+            after = measure(builder, batch=True)
+            row = (before[0], after[0], before[1], after[1])
+            totals = [t + v for t, v in zip(totals, row)]
+            print(f"{module_name + '.' + name:<66} {row[0]:>10} {row[1]:>10} {row[2]:>13} {row[3]:>12}")
+    print(f"{'total':<66} {totals[0]:>10} {totals[1]:>10} {totals[2]:>13} {totals[3]:>12}")
+    print(f"\n⏱️  operators -{100 - 100 * totals[1] / totals[0]:.0f}%, bytes -{100 - 100 * totals[3] / totals[2]:.0f}%")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or GENERATORS)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Merged quiz results export: every result in backend/data/results.json, with its answers,
+in one PDF
+results.json is read record by record (json_stream) and each page is written to the file
+as soon as it is full (pdf_stream), so peak memory does not grow with the number of results
+or pages. --self-check exports synthetic files of two sizes and fails if peak RSS grows
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+
+from flowchart_batch import apply_batch_arguments
+from flowchart_cache import build_time, deterministic, report_dir
+from json_stream import iter_items
+from pdf_stream import StreamingCanvas
+from student_reports import DATA_DIR, LEFT, RIGHT, ROW, ReportPage, _date
+
+OUTPUT_NAME = "all_results.pdf"  # written to report_dir() unless --output is given
+
+ANSWER_COLUMNS = [("Q", 0), ("Question", 0.8 * cm), ("Answer", 11.4 * cm), ("Correct", 12.9 * cm),
+                  ("Result", 14.6 * cm)]
+
+SELF_CHECK_SIZES = (2000, 8000)  # results; the larger run must not need more memory
+SELF_CHECK_SLACK = 1.10          # allowed peak-RSS ratio between the two runs
+QUESTION_BANK = 500              # distinct questions in the synthetic results
+
+
+def render_result(page, result):
+    """One result: who, which quiz, the score, then a row per answer"""
+    page.need(2 * cm + ROW)
+    page.heading(f"{result.get('userName') or result.get('userId')} - "
+                 f"{result.get('chapterTitle') or 'Chapter ' + str(result.get('chapterId'))}")
+    try:
+        passed = float(result.get("percentage")) >= 50
+    except (TypeError, ValueError):
+        passed = False
+    page.text(LEFT, f"{result.get('userEmail') or '-'}    Quiz {result.get('quizId')}    "
+                    f"{_date(result.get('submittedAt'), with_time=True)}    "
+                    f"Score {result.get('score')}/{result.get('totalQuestions')} ({result.get('percentage')}%)",
+              "Helvetica", 9, colors.grey)
+    page.text(RIGHT - 1.2 * cm, "Pass" if passed else "Fail", "Helvetica-Bold", 9,
+              colors.darkgreen if passed else colors.red)
+    page.y -= ROW
+    page.table_header(ANSWER_COLUMNS)
+    for answer in result.get("answers") or []:
+        correct = answer.get("isCorrect")
+        page.row(ANSWER_COLUMNS,
+                 [answer.get("questionNumber", ""), answer.get("question", ""), answer.get("userAnswer") or "-",
+                  answer.get("correctAnswer", ""), "Correct" if correct else "Wrong"],
+                 {4: colors.darkgreen if correct else colors.red})
+    page.header = None
+    page.y -= 0.3 * cm
+
+
+def export_results(results_file, output_file):
+    """Stream every result into one PDF; returns (results, pages)"""
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    c = StreamingCanvas(output_file, pagesize=A4, invariant=deterministic())
+    c.setTitle("Quiz results")
+    page = ReportPage(c, "Kannada Learning App - Quiz Results")
+    page.text(LEFT, "Quiz Results", "Helvetica-Bold", 18)
+    page.y -= 0.6 * cm
+    stamp = build_time()
+    if stamp is not None:
+        page.text(LEFT, f"Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}", "Helvetica", 9, colors.grey)
+    page.y -= 0.6 * cm
+
+    count = 0
+    for result in iter_items(results_file, "results"):
+        render_result(page, result)
+        count += 1
+    if not count:
+        page.text(LEFT, "No quiz results yet.", "Helvetica-Oblique", 10, colors.grey)
+    c.showPage()
+    c.save()
+    return count, page.page
+
+
+# Self-check -----------------------------------------------------------------
+def write_synthetic_results(path, count, seed=0):
+    """A results.json with `count` 10-question results, written record by record
+    Questions come from a fixed bank, as real results repeat the questions of quizzes.json"""
+    rng = random.Random(seed)
+    words = ["ರಾಜನು", "ಯಾರಿಂದ", "ಪ್ರೇರಣೆ", "ಪಡೆದನು", "ಸತತ", "ಪ್ರಯತ್ನವೇ", "ಗೆಲುವಿನ", "ಗುಟ್ಟು", "what", "story"]
+    bank = [" ".join(rng.choice(words) for _ in range(rng.randint(3, 12))) + "?" for _ in range(QUESTION_BANK)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"results": [\n')
+        for k in range(count):
+            answers = []
+            for q in range(10):
+                user, correct = rng.choice("ABCD"), rng.choice("ABCD")
+                answers.append({"questionId": q, "questionNumber": q + 1,
+                                "question": rng.choice(bank),
+                                "userAnswer": user, "correctAnswer": correct, "isCorrect": user == correct,
+                                "explanation": "No explanation provided"})
+            score = sum(answer["isCorrect"] for answer in answers)
+            result = {"id": str(k), "userId": str(k % 997), "userName": f"Student {k % 997}",
+                      "userEmail": f"student{k % 997}@example.com", "chapterId": 1,
+                      "chapterTitle": "ಸತತ ಪ್ರಯತ್ನವೇ ಗೆಲುವಿನ ಗುಟ್ಟು", "quizId": 1, "answers": answers,
+                      "score": score, "totalQuestions": 10, "percentage": f"{score * 10:.2f}",
+                      "submittedAt": f"2025-11-{1 + k % 28:02d}T12:{k % 60:02d}:07.702Z"}
+            f.write(("," if k else "") + json.dumps(result, ensure_ascii=False) + "\n")
+        f.write("]}\n")
+
+
+def _peak_rss_kb(command):
+    """Run a command; returns (exit status, its peak RSS in KB)"""
+    process = subprocess.Popen(command)
+    _, status, usage = os.wait4(process.pid, 0)
+    return os.waitstatus_to_exitcode(status), usage.ru_maxrss
+
+
+def self_check():
+    """Export two synthetic inputs (4x apart) and compare the exporters' peak RSS"""
+    work_dir = tempfile.mkdtemp(prefix="kla_export_check_")
+    try:
+        peaks = []
+        for count in SELF_CHECK_SIZES:
+            results_file = os.path.join(work_dir, f"results_{count}.json")
+            output_file = os.path.join(work_dir, f"results_{count}.pdf")
+            write_synthetic_results(results_file, count)
+            start = time.perf_counter()
+            status, peak = _peak_rss_kb([sys.executable, os.path.abspath(__file__), "--input", results_file,
+                                         "--output", output_file, "--deterministic"])
+            if status:
+                print(f"❌ Export of {count} results failed (exit {status})")
+                return False
+            peaks.append(peak)
+            print(f"⏱️  {count} results ({os.path.getsize(results_file) / 1e6:.1f} MB in, "
+                  f"{os.path.getsize(output_file) / 1e6:.1f} MB out): "
+                  f"{time.perf_counter() - start:.1f}s, peak RSS {peak / 1024:.1f} MB")
+        if peaks[-1] > peaks[0] * SELF_CHECK_SLACK:
+            print(f"❌ Peak RSS grew with the input: {peaks[0] / 1024:.1f} MB -> {peaks[-1] / 1024:.1f} MB")
+            return False
+        print("✅ Peak RSS is flat")
+        return True
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export every quiz result (with answers) into one PDF")
+    parser.add_argument("--input", default=os.path.join(DATA_DIR, "results.json"), help="results.json to export")
+    parser.add_argument("--output", help=f"PDF file to write (default: {OUTPUT_NAME} in $KLA_OUTPUT_DIR or reports/)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: no creation date, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    parser.add_argument("--self-check", action="store_true",
+                        help="export synthetic inputs of two sizes and fail if peak memory grows")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    args.output = args.output or os.path.join(report_dir(), OUTPUT_NAME)
+
+    if args.self_check:
+        sys.exit(0 if self_check() else 1)
+    print("🚀 Exporting quiz results...\n")
+    start = time.perf_counter()
+    results, pages = export_results(args.input, args.output)
+    print(f"✅ {results} results on {pages} pages in {time.perf_counter() - start:.1f}s: {args.output}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Static API-route extractor for backend/server.js and backend/routes/*.js
+Finds router.<verb>(path) / app.<verb>(path) registrations and the app.use() mount
+prefixes, so the flowcharts list the endpoints the backend really serves.
+Per-file results are cached by mtime/size (and content hash) in .cache/route_index.json
+"""
+
+import os
+
+from js_tokens import tokenize, comment_text
+from scan_cache import CACHE_DIR, SCRIPT_DIR, cached_scan
+
+BACKEND_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "backend"))
+CACHE_PATH = os.path.join(CACHE_DIR, "route_index.json")
+INDEX_VERSION = 1
+
+HTTP_VERBS = ("get", "post", "put", "patch", "delete", "all")
+
+
+class ApiRoute:
+    """One registered endpoint"""
+    def __init__(self, verb, path, file, line, description=""):
+        self.verb = verb.upper()
+        self.path = path  # full path, mount prefix included
+        self.file = file
+        self.line = line
+        self.description = description
+
+    @property
+    def endpoint(self):
+        return f"{self.verb} {self.path}"
+
+    def __repr__(self):
+        return f"ApiRoute({self.endpoint!r}, {self.file}:{self.line})"
+
+
+def scan_source(source):
+    """Extract routes, mounts and requires from one JS file (paths relative to its router)"""
+    tokens = tokenize(source)
+    code = [t for t in tokens if t.kind != "comment"]
+    receivers = set()
+    requires = {}
+    for i in range(len(code) - 5):
+        # const router = express.Router()  /  const app = express()
+        if code[i].kind == "name" and code[i + 1].value == "=" and code[i + 2].value == "express":
+            receivers.add(code[i].value)
+        # const authRoutes = require('./routes/auth')
+        if (code[i].kind == "name" and code[i + 1].value == "=" and code[i + 2].value == "require"
+                and code[i + 3].value == "(" and code[i + 4].kind == "string"):
+            requires[code[i].value] = code[i + 4].value
+    receivers = receivers or {"router", "app"}
+
+    # The comment directly above a registration describes it
+    comments = {}
+    for t in tokens:
+        if t.kind == "comment":
+            comments[t.line + t.value.count("\n")] = comment_text(t)
+
+    routes, mounts = [], []
+    for i in range(len(code) - 4):
+        recv, dot, verb, paren, arg = code[i:i + 5]
+        if not (recv.kind == "name" and recv.value in receivers and dot.value == "."
+                and paren.value == "(" and arg.kind == "string"):
+            continue
+        if verb.value in HTTP_VERBS:
+            routes.append([verb.value, arg.value, recv.line, comments.get(recv.line - 1, "")])
+        elif verb.value == "use" and i + 6 < len(code) and code[i + 5].value == "," and code[i + 6].kind == "name":
+            mounts.append([arg.value, code[i + 6].value])
+    return {"routes": routes, "mounts": mounts, "requires": requires}
+
+
+def route_files(backend_dir=BACKEND_DIR):
+    """server.js plus every routes/*.js, as paths relative to backend_dir"""
+    files = ["server.js"]
+    routes_dir = os.path.join(backend_dir, "routes")
+    if os.path.isdir(routes_dir):
+        files += sorted("routes/" + name for name in os.listdir(routes_dir) if name.endswith(".js"))
+    return files
+
+
+def scan_routes(backend_dir=BACKEND_DIR, cache_path=CACHE_PATH):
+    """Return every ApiRoute with its mount prefix applied, in source order"""
+    entries = cached_scan(backend_dir, route_files(backend_dir), cache_path, INDEX_VERSION, scan_source)
+
+    # Resolve app.use('/api/auth', authRoutes) + require('./routes/auth') -> routes/auth.js
+    prefixes = {}
+    for rel, entry in entries.items():
+        base = os.path.dirname(rel)
+        for prefix, ident in entry["mounts"]:
+            target = entry["requires"].get(ident)
+            if target:
+                target = os.path.normpath(os.path.join(base, target)).replace(os.sep, "/")
+                prefixes[target if target.endswith(".js") else target + ".js"] = prefix
+
+    routes = []
+    for rel, entry in entries.items():
+        prefix = prefixes.get(rel, "")
+        for verb, path, line, description in entry["routes"]:
+            full = (prefix.rstrip("/") + path) if path != "/" else (prefix or "/")
+            routes.append(ApiRoute(verb, full, rel, line, description))
+    return routes
+
+
+def routes_under(routes, *prefixes):
+    """Routes whose path starts with any of the given prefixes"""
+    return [r for r in routes if any(r.path == p or r.path.startswith(p + "/") for p in prefixes)]
+
+
+if __name__ == "__main__":
+    for route in scan_routes():
+        print(f"{route.endpoint:<45} {route.file}:{route.line}  {route.description}")
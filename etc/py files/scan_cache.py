@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Per-file incremental cache shared by the static source scanners
+A file is rescanned only when its mtime/size changed and its sha256 differs too
+"""
+
+import hashlib
+import json
+import os
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(SCRIPT_DIR, ".cache")
+
+
+def load_cache(cache_path, version):
+    """Cached per-file entries, or an empty cache if missing, corrupt or from another version"""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == version:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": version, "files": {}}
+
+
+def save_cache(cache_path, cache):
+    """Atomically replace the cache file (safe with parallel --jobs workers)"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(cache))  # dumps uses the C encoder, dump() streams through the Python one
+    os.replace(tmp, cache_path)
+
+
+def scan_file(path, cached, scan):
+    """Return (entry, changed); reuse `cached` if mtime/size or, failing that, the content hash match"""
+    st = os.stat(path)
+    if cached and cached["mtime_ns"] == st.st_mtime_ns and cached["size"] == st.st_size:
+        return cached, False
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if cached and cached["sha256"] == digest:
+        entry = dict(cached)
+    else:
+        entry = dict(scan(data.decode("utf-8")), sha256=digest)
+    entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+    return entry, True
+
+
+def cached_scan(base_dir, rel_paths, cache_path, version, scan):
+    """Scan every file (relative to base_dir) through the cache; returns {rel_path: entry}"""
+    cache = load_cache(cache_path, version)
+    entries = {}
+    dirty = False
+    for rel in rel_paths:
+        entry, changed = scan_file(os.path.join(base_dir, rel), cache["files"].get(rel), scan)
+        entries[rel] = entry
+        dirty = dirty or changed
+    if dirty or set(cache["files"]) != set(entries):
+        cache["files"] = entries
+        save_cache(cache_path, cache)
+    return entries
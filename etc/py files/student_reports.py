@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Batch per-student progress reports: one PDF per student from backend/data/users.json and results.json
+Both files are streamed and hash-partitioned by user id into JSON-lines buckets in one pass.
+Each bucket is then joined (its users hashed by id, its results probed against them) and
+rendered on a worker of the process pool, so memory is bounded by one bucket, not by the
+number of students. Fonts and the chapter list are loaded once per worker, not per report
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+import zlib
+from datetime import datetime
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+from flowchart_batch import apply_batch_arguments, report_results, run_charts
+from flowchart_cache import build_time, deterministic, report_dir
+from flowchart_text import fit_line
+from json_stream import iter_items
+from kannada_font import draw_text
+from progress_rules import PASS_SCORE, chapter_progress, chapter_status, quiz_lock
+from scan_cache import SCRIPT_DIR
+
+DATA_DIR = os.path.normpath(os.path.join(SCRIPT_DIR, "..", "..", "backend", "data"))
+BUCKET_BYTES = 16 << 20  # input bytes per bucket; the projected rows are much smaller
+
+USER_FIELDS = ("id", "firstName", "lastName", "email", "schoolCollege", "createdAt", "progress")
+
+STATUS_LABELS = {"completed": "Completed", "failed": "Failed - Retake Quiz",
+                 "in-progress": "In Progress", "not-started": "New"}
+
+# Page layout (A4 portrait, points)
+WIDTH, HEIGHT = A4
+LEFT = 2 * cm
+RIGHT = WIDTH - 2 * cm
+BOTTOM = 2 * cm
+ROW = 0.55 * cm
+CHAPTER_COLUMNS = [("#", 0), ("Chapter", 0.8 * cm), ("Read", 8.4 * cm), ("Attempts", 9.6 * cm),
+                   ("Best", 11.3 * cm), ("Progress", 12.5 * cm), ("Status", 14.1 * cm)]
+ATTEMPT_COLUMNS = [("Date", 0), ("Chapter", 3.2 * cm), ("Score", 10.6 * cm), ("Percentage", 12.2 * cm),
+                   ("Result", 14.6 * cm)]
+
+
+def bucket_of(user_id, buckets):
+    """Stable bucket number of a user id (same in every process)"""
+    return zlib.crc32(str(user_id).encode("utf-8")) % buckets
+
+
+def load_chapters(data_dir):
+    with open(os.path.join(data_dir, "chapters.json"), encoding="utf-8") as f:
+        return sorted(json.load(f), key=lambda chapter: chapter.get("chapterNumber", 0))
+
+
+def user_row(user):
+    return {field: user.get(field) for field in USER_FIELDS}
+
+
+def result_row(result):
+    """Only what the report prints: the answers arrays are dropped"""
+    return [result.get("userId"), result.get("chapterId"), result.get("chapterTitle"), result.get("score"),
+            result.get("totalQuestions"), result.get("percentage"), result.get("submittedAt")]
+
+
+def partition(data_dir, work_dir, buckets):
+    """Stream users and results into per-bucket JSON-lines files; returns (users, results) counts"""
+    def open_all(kind):
+        return [open(os.path.join(work_dir, f"{kind}_{k}.jsonl"), "w", encoding="utf-8") for k in range(buckets)]
+
+    users = results = 0
+    files = open_all("users")
+    try:
+        for user in iter_items(os.path.join(data_dir, "users.json"), "users"):
+            row = user_row(user)
+            files[bucket_of(row["id"], buckets)].write(json.dumps(row, ensure_ascii=False) + "\n")
+            users += 1
+    finally:
+        for f in files:
+            f.close()
+
+    files = open_all("results")
+    try:
+        for result in iter_items(os.path.join(data_dir, "results.json"), "results"):
+            row = result_row(result)
+            files[bucket_of(row[0], buckets)].write(json.dumps(row, ensure_ascii=False) + "\n")
+            results += 1
+    finally:
+        for f in files:
+            f.close()
+    return users, results
+
+
+def report_filename(user):
+    return "report_" + re.sub(r"[^\w-]", "_", str(user["id"])) + ".pdf"
+
+
+def render_bucket(work_dir, bucket, chapters, output_dir):
+    """Hash-join one bucket (users by id, results probed) and write every student's report"""
+    students = {}
+    with open(os.path.join(work_dir, f"users_{bucket}.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            user = json.loads(line)
+            students[str(user["id"])] = (user, [])
+    with open(os.path.join(work_dir, f"results_{bucket}.jsonl"), encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            student = students.get(str(row[0]))
+            if student is not None:  # results of deleted accounts get no report
+                student[1].append(row)
+
+    stamp = build_time()
+    os.makedirs(output_dir, exist_ok=True)
+    for user, results in students.values():
+        results.sort(key=lambda row: row[6] or "")
+        render_report(user, results, chapters, os.path.join(output_dir, report_filename(user)), stamp)
+
+
+def _date(value, with_time=False):
+    """'2025-11-18T12:47:07.702Z' -> '2025-11-18 12:47' (or the raw value if it doesn't parse)"""
+    try:
+        when = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return str(value or "-")
+    return when.strftime("%Y-%m-%d %H:%M" if with_time else "%Y-%m-%d")
+
+
+class ReportPage:
+    """Top-down writer over a canvas that starts a new page (with the table header) when full"""
+    def __init__(self, c, title, pagesize=A4):
+        self.c = c
+        self.title = title
+        self.top = pagesize[1] - 2 * cm
+        self.right = pagesize[0] - 2 * cm
+        self.page = 0
+        self.header = None
+        self.new_page()
+
+    def new_page(self):
+        if self.page:
+            self.c.showPage()
+        self.page += 1
+        self.y = self.top
+        self.c.setFont("Helvetica", 8)
+        self.c.setFillColor(colors.grey)
+        draw_text(self.c, LEFT, BOTTOM - 0.8 * cm, f"{self.title} - page {self.page}", "Helvetica", 8)
+        self.c.setFillColor(colors.black)
+        if self.header:
+            self.table_header(*self.header)
+
+    def need(self, height):
+        if self.y - height < BOTTOM:
+            self.new_page()
+
+    def text(self, x, text, font="Helvetica", size=10, color=colors.black):
+        self.c.setFont(font, size)
+        self.c.setFillColor(color)
+        draw_text(self.c, x, self.y, text, font, size)
+
+    def heading(self, text):
+        self.header = None
+        self.need(1.6 * cm)
+        self.y -= 0.4 * cm
+        self.text(LEFT, text, "Helvetica-Bold", 13)
+        self.y -= 0.6 * cm
+
+    def table_header(self, columns):
+        self.header = (columns,)
+        for name, x in columns:
+            self.text(LEFT + x, name, "Helvetica-Bold", 9)
+        self.c.setStrokeColor(colors.black)
+        self.c.setLineWidth(0.5)
+        self.c.line(LEFT, self.y - 0.15 * cm, self.right, self.y - 0.15 * cm)
+        self.y -= ROW
+
+    def row(self, columns, values, tints=None):
+        """One table row; tints maps column index -> text color"""
+        self.need(ROW)
+        for k, ((_, x), value) in enumerate(zip(columns, values)):
+            limit = (columns[k + 1][1] if k + 1 < len(columns) else self.right - LEFT) - x - 0.2 * cm
+            self.text(LEFT + x, fit_line(str(value), limit, "Helvetica", 9), "Helvetica", 9,
+                      (tints or {}).get(k, colors.black))
+        self.y -= ROW
+
+
+def render_report(user, results, chapters, filename, stamp=None):
+    """One student's progress report: profile, per-chapter progress and every quiz attempt
+    filename may also be a writable file object (render_server streams reports from memory)"""
+    name = f"{user.get('firstName') or ''} {user.get('lastName') or ''}".strip() or str(user["id"])
+    progress = user.get("progress") or {}
+    c = canvas.Canvas(filename, pagesize=A4, invariant=deterministic())
+    c.setTitle(f"Progress report - {name}")
+    page = ReportPage(c, f"Kannada Learning App - {name}")
+
+    page.text(LEFT, "Student Progress Report", "Helvetica-Bold", 18)
+    page.y -= 0.6 * cm
+    if stamp is not None:
+        page.text(LEFT, f"Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}", "Helvetica", 9, colors.grey)
+    page.y -= 0.8 * cm
+    for label, value in (("Student", name), ("Email", user.get("email") or "-"),
+                         ("School/College", user.get("schoolCollege") or "-"),
+                         ("Joined", _date(user.get("createdAt")))):
+        page.text(LEFT, f"{label}:", "Helvetica-Bold", 10)
+        page.text(LEFT + 3.2 * cm, value, "Helvetica", 10)
+        page.y -= 0.5 * cm
+
+    # Summary with an overall progress bar (chapters weigh equally, as on the student dashboard)
+    chapter_ids = [str(chapter["id"]) for chapter in chapters]
+    read = sum(1 for k in chapter_ids if (progress.get(k) or {}).get("hasRead"))
+    passed = sum(1 for k in chapter_ids if ((progress.get(k) or {}).get("bestScore") or 0) >= PASS_SCORE)
+    overall = sum(chapter_progress(progress.get(k)) for k in chapter_ids) / len(chapter_ids) if chapter_ids else 0
+    page.y -= 0.3 * cm
+    page.text(LEFT, f"Chapters read: {read}/{len(chapter_ids)}    Quizzes passed: {passed}/{len(chapter_ids)}    "
+                    f"Quiz attempts: {len(results)}    Overall progress: {overall:.0f}%", "Helvetica", 10)
+    page.y -= 0.6 * cm
+    c.setStrokeColor(colors.black)
+    c.setLineWidth(0.5)
+    c.setFillColor(colors.lightgrey)
+    c.rect(LEFT, page.y, RIGHT - LEFT, 0.35 * cm, fill=1, stroke=1)
+    if overall:
+        c.setFillColor(colors.lightgreen)
+        c.rect(LEFT, page.y, (RIGHT - LEFT) * overall / 100, 0.35 * cm, fill=1, stroke=1)
+    page.y -= 0.5 * cm
+
+    page.heading("Chapter Progress")
+    page.table_header(CHAPTER_COLUMNS)
+    for chapter in chapters:
+        data = progress.get(str(chapter["id"])) or {}
+        attempts = data.get("quizAttempts") or []
+        status = chapter_status(data)
+        label = "Locked - 2 failed attempts" if quiz_lock(data) == "failed-both" else STATUS_LABELS[status]
+        page.row(CHAPTER_COLUMNS,
+                 [chapter.get("chapterNumber", chapter["id"]), chapter.get("title", ""),
+                  "Yes" if data.get("hasRead") else "No", len(attempts),
+                  f"{data.get('bestScore', 0)}%" if attempts else "-", f"{chapter_progress(data)}%", label],
+                 {6: colors.darkgreen if status == "completed" else colors.red if status == "failed" else colors.black})
+
+    page.heading("Quiz Attempts")
+    if not results:
+        page.text(LEFT, "No quiz attempts yet.", "Helvetica-Oblique", 10, colors.grey)
+    else:
+        page.table_header(ATTEMPT_COLUMNS)
+        for _, chapter_id, title, score, total, percentage, submitted in results:
+            try:
+                passed = float(percentage) >= PASS_SCORE
+            except (TypeError, ValueError):
+                passed = False
+            page.row(ATTEMPT_COLUMNS,
+                     [_date(submitted, with_time=True), title or f"Chapter {chapter_id}", f"{score}/{total}",
+                      f"{percentage}%", "Pass" if passed else "Fail"],
+                     {4: colors.darkgreen if passed else colors.red})
+    c.showPage()
+    c.save()
+
+
+def generate_reports(data_dir=DATA_DIR, output_dir=None, jobs=1, buckets=None):
+    """Write one report per student into output_dir (default: report_dir());
+    returns the run_charts results (one per bucket)"""
+    output_dir = output_dir or report_dir()
+    chapters = load_chapters(data_dir)
+    workers = jobs or os.cpu_count() or 1
+    if buckets is None:
+        size = sum(os.path.getsize(os.path.join(data_dir, name)) for name in ("users.json", "results.json"))
+        buckets = max(math.ceil(size / BUCKET_BYTES), 4 * workers if workers > 1 else 1)
+
+    work_dir = tempfile.mkdtemp(prefix="kla_reports_")
+    try:
+        users, results = partition(data_dir, work_dir, buckets)
+        print(f"📁 {users} students, {results} quiz results in {buckets} buckets")
+        return run_charts([(f"bucket {k}", render_bucket, (work_dir, k, chapters, output_dir))
+                           for k in range(buckets)], jobs=jobs)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate one progress report PDF per student")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="directory with users.json, results.json, chapters.json")
+    parser.add_argument("--output", help="directory for the report PDFs (default: $KLA_OUTPUT_DIR or reports/)")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="render buckets in N worker processes (0 = one per CPU)")
+    parser.add_argument("--buckets", type=int, help="number of user-id hash buckets (default: from the input size)")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="reproducible output: fixed PDF ids, no wall-clock 'Generated' stamp")
+    parser.add_argument("--kannada-font", metavar="TTF", help="TrueType font for Kannada text")
+    args = parser.parse_args()
+    apply_batch_arguments(args)
+    args.output = args.output or report_dir()
+    print("🚀 Generating student progress reports...\n")
+
+    results = generate_reports(args.data_dir, args.output, args.jobs, args.buckets)
+    if not report_results(results):
+        sys.exit(1)
+    print(f"\n✅ Reports written to {args.output}")
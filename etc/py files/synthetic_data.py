@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Synthetic datasets for benchmarks and load tests (synthetic flowcharts come from
+flowchart_golden.synthetic_flowchart)
+- write_dataset(): chapters.json, quizzes.json, users.json and results.json in the backend's
+  schemas, written record by record. Every student reads chapters and takes quizzes under the
+  app's lock rules (progress_rules.quiz_lock), so users.json progress and results.json agree
+Usage: python synthetic_data.py DIR --attempts N [--chapters 10] [--questions 10] [--seed 0]
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import time
+
+from progress_rules import quiz_lock
+
+DATASET_VERSION = "1"  # bump when write_dataset output changes (benchmark datasets are cached by it)
+
+WORDS = ("ರಾಜನು", "ಯಾರಿಂದ", "ಪ್ರೇರಣೆ", "ಪಡೆದನು", "ಸತತ", "ಪ್ರಯತ್ನವೇ", "ಗೆಲುವಿನ", "ಗುಟ್ಟು", "ಕನ್ನಡ", "ಪಾಠ")
+FIRST_NAMES = ("Abheesht", "Ananya", "Bhavana", "Chetan", "Deepa", "Girish", "Kavya", "Manoj", "Nandini", "Rahul")
+LAST_NAMES = ("Bagalkot", "Hegde", "Rao", "Shetty", "Gowda", "Kulkarni", "Patil", "Joshi")
+SCHOOLS = 40
+START = 1763400000000  # ms; the first synthetic account
+
+
+# Datasets ---------------------------------------------------------------------
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _stamp(millis):
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(millis // 1000)) + f".{millis % 1000:03d}Z"
+
+
+class _ArrayWriter:
+    """Writes {"key": [item, item, ...]} one item at a time"""
+    def __init__(self, path, key):
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write(f'{{"{key}": [\n')
+        self.count = 0
+
+    def add(self, item):
+        self.f.write(("," if self.count else "") + json.dumps(item, ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.f.write("]}\n")
+        self.f.close()
+
+
+def write_dataset(data_dir, attempts, chapters=10, questions=10, seed=0):
+    """Write a dataset with `attempts` quiz results; returns (students, results)"""
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    chapter_list = [{"id": k, "chapterNumber": k, "title": _text(rng, 4), "studyMaterial": _text(rng, 60),
+                     "summary": _text(rng, 10), "createdAt": _stamp(START), "updatedAt": _stamp(START)}
+                    for k in range(1, chapters + 1)]
+    quizzes = [{"id": k, "chapterId": k,
+                "questions": [{"question": _text(rng, rng.randint(3, 10)) + "?",
+                               "options": [_text(rng, 2) for _ in range(4)], "correctAnswer": rng.choice("ABCD"),
+                               "explanation": ""} for _ in range(questions)],
+                "createdAt": _stamp(START), "updatedAt": _stamp(START)}
+               for k in range(1, chapters + 1)]
+    for name, items in (("chapters.json", chapter_list), ("quizzes.json", quizzes)):
+        with open(os.path.join(data_dir, name), "w", encoding="utf-8") as f:
+            json.dump(items, f, ensure_ascii=False, indent=2)
+    difficulty = [rng.gauss(0, 0.8) for _ in range(chapters)]
+
+    users = _ArrayWriter(os.path.join(data_dir, "users.json"), "users")
+    results = _ArrayWriter(os.path.join(data_dir, "results.json"), "results")
+    clock = START
+    try:
+        while results.count < attempts:
+            k = users.count
+            user_id = str(START + k * 1000)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first.lower()}{k}@example.com"
+            ability = rng.gauss(0.3, 1.0)
+            progress = {}
+            for chapter, quiz in zip(chapter_list, quizzes):
+                if results.count >= attempts or rng.random() > 0.7:
+                    continue
+                entry = progress[str(chapter["id"])] = {"hasRead": True, "quizAttempts": [], "bestScore": 0}
+                chance = 0.85
+                while results.count < attempts and quiz_lock(entry) is None and rng.random() < chance:
+                    p = 1 / (1 + math.exp(difficulty[chapter["id"] - 1] - ability))
+                    answers = []
+                    for number, question in enumerate(quiz["questions"]):
+                        correct = rng.random() < p
+                        answer = question["correctAnswer"] if correct else rng.choice(
+                            [c for c in "ABCD" if c != question["correctAnswer"]])
+                        answers.append({"questionId": number, "questionNumber": number + 1,
+                                        "question": question["question"], "userAnswer": answer,
+                                        "correctAnswer": question["correctAnswer"], "isCorrect": correct,
+                                        "explanation": "No explanation provided"})
+                    score = sum(answer["isCorrect"] for answer in answers)
+                    percentage = 100 * score / len(answers)
+                    clock += rng.randint(1000, 120000)
+                    results.add({"id": str(clock), "userId": user_id, "userName": f"{first} {last}",
+                                 "userEmail": email, "chapterId": chapter["id"], "chapterTitle": chapter["title"],
+                                 "quizId": quiz["id"], "answers": answers, "score": score,
+                                 "totalQuestions": len(answers), "percentage": f"{percentage:.2f}",
+                                 "submittedAt": _stamp(clock)})
+                    entry["quizAttempts"].append({"score": round(percentage), "date": _stamp(clock)})
+                    entry["bestScore"] = max(entry["bestScore"], round(percentage))
+                    chance = 0.6 if percentage < 50 else 0.1  # retake after a fail, rarely after a pass
+            users.add({"id": user_id, "firstName": first, "lastName": last,
+                       "schoolCollege": f"School {min(int(rng.paretovariate(1.2)), SCHOOLS)}", "email": email,
+                       "mobile": f"9{rng.randrange(10**9):09d}", "password": "$2b$10$" + "x" * 53,
+                       "createdAt": _stamp(START + k * 1000), "progress": progress, "updatedAt": _stamp(clock)})
+    finally:
+        users.close()
+        results.close()
+    return users.count, results.count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic backend/data dataset")
+    parser.add_argument("data_dir", help="directory to write chapters/quizzes/users/results.json into")
+    parser.add_argument("--attempts", type=int, required=True, help="number of quiz results")
+    parser.add_argument("--chapters", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    students, results = write_dataset(args.data_dir, args.attempts, args.chapters, args.questions, args.seed)
+    size = sum(os.path.getsize(os.path.join(args.data_dir, name)) for name in ("users.json", "results.json"))
+    print(f"✅ {students:,} students, {results:,} results ({size / 1e6:.1f} MB) in {args.data_dir} "
+          f"in {time.perf_counter() - start:.1f}s")
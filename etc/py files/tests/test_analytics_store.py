@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+
+from analytics_store import AnalyticsStore, compile_store
+
+
+def result(result_id, user, chapter, answers, submitted):
+    return {"id": result_id, "userId": user, "chapterId": chapter, "quizId": chapter,
+            "score": sum(answers), "totalQuestions": len(answers),
+            "percentage": f"{100 * sum(answers) / len(answers):.2f}", "submittedAt": submitted,
+            "answers": [{"questionId": k, "userAnswer": "A" if ok else "B", "correctAnswer": "A", "isCorrect": ok}
+                        for k, ok in enumerate(answers)]}
+
+
+RESULTS = [result("r1", "u1", 1, [True, False, True], "2025-11-18T10:00:00.000Z"),
+           result("r2", "u2", 1, [True] * 5, "2025-11-18T11:00:00.000Z"),
+           result("r3", "u1", 2, [False] * 4, "2025-11-18T11:00:00.000Z")]
+USERS = [{"id": "u1", "schoolCollege": "School A", "createdAt": "2025-11-01T00:00:00.000Z"},
+         {"id": "u2", "schoolCollege": "School B", "createdAt": "2025-11-02T00:00:00.000Z"}]
+
+
+def write_data(data_dir, results, users=USERS):
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / "results.json").write_text(json.dumps({"results": results}), encoding="utf-8")
+    (data_dir / "users.json").write_text(json.dumps({"users": users}), encoding="utf-8")
+
+
+def test_columns_match_the_json(tmp_path):
+    write_data(tmp_path / "data", RESULTS)
+    assert compile_store(str(tmp_path / "data"), str(tmp_path / "store")) == (3, 3)
+    store = AnalyticsStore(str(tmp_path / "store"))
+    assert store.decode("users", store.column("result", "user")) == ["u1", "u2", "u1"]
+    assert store.decode("chapters", store.column("result", "chapter")) == ["1", "1", "2"]
+    assert store.column("result", "score").tolist() == [2, 5, 0]
+    assert store.column("result", "percentage").tolist() == [np.float32(66.67), 100, 0]
+    assert store.correct().tolist() == [True, False, True] + [True] * 5 + [False] * 4  # 12 bits over 2 bytes
+    assert store.answer_result().tolist() == [0] * 3 + [1] * 5 + [2] * 4
+    assert store.decode("choices", store.column("answer", "choice"))[:3] == ["A", "B", "A"]
+    school = store.column("user", "school")[store.column("result", "user")]
+    assert store.decode("schools", school) == ["School A", "School B", "School A"]
+
+
+def test_recompile_appends_only_new_results(tmp_path):
+    data_dir, store_dir = tmp_path / "data", str(tmp_path / "store")
+    write_data(data_dir, RESULTS[:2])
+    compile_store(str(data_dir), store_dir)
+    assert compile_store(str(data_dir), store_dir) == (0, 2)  # nothing changed
+    # r3 shares r2's submittedAt: told apart by id, not dropped at the watermark
+    later = result("r4", "u3", 2, [True], "2025-11-19T09:00:00.000Z")
+    write_data(data_dir, RESULTS + [later], USERS + [{"id": "u3", "schoolCollege": "School A"}])
+    assert compile_store(str(data_dir), store_dir) == (2, 4)
+
+    store = AnalyticsStore(store_dir)
+    write_data(tmp_path / "full", RESULTS + [later], USERS + [{"id": "u3", "schoolCollege": "School A"}])
+    compile_store(str(tmp_path / "full"), str(tmp_path / "full_store"))
+    rebuilt = AnalyticsStore(str(tmp_path / "full_store"))
+    for table, name in (("result", "user"), ("result", "answer_start"), ("answer", "question"), ("user", "school")):
+        assert store.column(table, name).tolist() == rebuilt.column(table, name).tolist()
+    assert store.correct().tolist() == rebuilt.correct().tolist()
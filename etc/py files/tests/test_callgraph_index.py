@@ -0,0 +1,55 @@
+import os
+
+from callgraph_index import FRONTEND_DIR, FrontendFunction, api_requests, build_index, call_chain, scan_source
+
+API_JS = """
+const api = {
+    chapters: {
+        delete: (id) => apiRequest(`/chapters/${id}`, 'DELETE')
+    }
+};
+"""
+ADMIN_JS = """
+async function deleteChapter(id) {
+    delete cache[id];
+    await api.chapters.delete(id);
+    loadAdminChapters();
+}
+function loadAdminChapters() {}
+"""
+
+
+def test_member_call_named_like_a_keyword():
+    calls = [callee for caller, callee, _ in scan_source(ADMIN_JS)["calls"] if caller == "deleteChapter"]
+    assert calls == ["api.chapters.delete", "loadAdminChapters"]
+
+
+def test_admin_delete_handler_reaches_delete_route(tmp_path):
+    for name, source in (("api.js", API_JS), ("admin.js", ADMIN_JS)):
+        (tmp_path / name).write_text(source, encoding="utf-8")
+    functions = build_index(str(tmp_path), str(tmp_path / "index.json"), ("api.js", "admin.js"))
+    assert functions["deleteChapter"].calls == ["api.chapters.delete", "loadAdminChapters"]
+    assert api_requests(functions, "deleteChapter") == [("DELETE", "/api/chapters/:param")]
+
+
+def test_frontend_admin_delete_chapter(tmp_path):
+    if not os.path.exists(os.path.join(FRONTEND_DIR, "admin.js")):
+        return
+    functions = build_index(cache_path=str(tmp_path / "index.json"))
+    assert "api.chapters.delete" in functions["deleteChapter"].calls
+    assert ("DELETE", "/api/chapters/:param") in api_requests(functions, "deleteChapter")
+
+
+def test_call_chain_on_dense_graph():
+    # Every function calls every other one: far too many simple paths to enumerate
+    names = [f"f{k}" for k in range(200)]
+    functions = {name: FrontendFunction(name, "", "app.js", k, k) for k, name in enumerate(names)}
+    for name in names:
+        functions[name].calls = [callee for callee in reversed(names) if callee != name]
+    assert call_chain(functions, "f0", "f1") == ["f0", "f1"]
+    assert call_chain(functions, "f0", "missing") == ["f0", "f1"]  # farthest: one call away
+    functions["f7"].calls.append("g")
+    functions["g"] = FrontendFunction("g", "", "app.js", 300, 300)
+    functions["g"].calls = ["api.chapters.delete"]
+    assert call_chain(functions, "f0") == ["f0", "f7", "g"]
+    assert call_chain(functions, "nowhere") == []
@@ -0,0 +1,57 @@
+import json
+
+from chapter_funnel import STAGES, update_funnel
+from progress_rules import PASS_SCORE, quiz_lock
+from synthetic_data import write_dataset
+
+
+def write_results(path, results):
+    """The results array laid out as synthetic_data writes it, so a longer list only appends"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"results": [\n' + "".join(("," if k else "") + json.dumps(result, ensure_ascii=False) + "\n"
+                                          for k, result in enumerate(results)) + "]}\n")
+
+
+def expected_counts(users_file):
+    """Funnel stages per chapter straight from users.json progress and the progress_rules lock"""
+    with open(users_file, encoding="utf-8") as f:
+        users = json.load(f)["users"]
+    counts = {}
+    for user in users:
+        for chapter, progress in user["progress"].items():
+            passed = [attempt["score"] >= PASS_SCORE for attempt in progress["quizAttempts"][:2]]
+            stages = [progress["hasRead"], bool(passed), passed[:1] == [True], passed == [False, True],
+                      quiz_lock(progress) == "failed-both"]
+            row = counts.setdefault(chapter, [0] * len(STAGES))
+            for k, value in enumerate(stages):
+                row[k] += value
+    return counts
+
+
+def totals(funnel):
+    return {chapter: [sum(row[k] for row in schools.values()) for k in range(len(STAGES))]
+            for chapter, schools in funnel.counts.items()}
+
+
+def test_funnel_matches_progress_rules(tmp_path):
+    students, _ = write_dataset(str(tmp_path), 300, chapters=4, questions=4)
+    funnel, new_results = update_funnel(str(tmp_path), str(tmp_path / "funnel.json"))
+    assert new_results == 300
+    assert sum(funnel.enrolled.values()) == students
+    assert totals(funnel) == expected_counts(tmp_path / "users.json")
+
+
+def test_appended_results_update_only_their_chapters(tmp_path):
+    write_dataset(str(tmp_path), 300, chapters=4, questions=4)
+    with open(tmp_path / "results.json", encoding="utf-8") as f:
+        results = json.load(f)["results"]
+    cache = str(tmp_path / "funnel.json")
+    write_results(tmp_path / "results.json", results[:250])
+    update_funnel(str(tmp_path), cache)
+
+    write_results(tmp_path / "results.json", results)
+    funnel, new_results = update_funnel(str(tmp_path), cache)
+    assert new_results == 50
+    assert funnel.changed == {str(result["chapterId"]) for result in results[250:]}
+    rebuilt, _ = update_funnel(str(tmp_path), str(tmp_path / "rebuilt.json"), rebuild=True)
+    assert funnel.counts == rebuilt.counts
@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from reportlab.lib.units import cm
+
+from flowchart_cache import BUILT, FRESH, MANIFEST_NAME, _manifest_lock, build_flowchart, spec_hash
+from flowchart_model import Flowchart
+
+
+def small_chart(text="Start"):
+    chart = Flowchart("cache", "Cache", "cache.pdf")
+    chart.node("a", text, x=2 * cm, y=2 * cm, width=3 * cm, height=1 * cm)
+    chart.node("b", "End", x=2 * cm, y=5 * cm, width=3 * cm, height=1 * cm)
+    chart.edge("a", "b")
+    return chart
+
+
+def test_unchanged_chart_is_not_rebuilt(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLA_OUTPUT_DIR", str(tmp_path))
+    assert build_flowchart(small_chart()) == BUILT
+    pdf = tmp_path / "cache.pdf"
+    mtime = os.path.getmtime(pdf)
+    assert build_flowchart(small_chart()) == FRESH
+    assert os.path.getmtime(pdf) == mtime
+    assert build_flowchart(small_chart(), force=True) == BUILT
+
+    with open(tmp_path / MANIFEST_NAME, encoding="utf-8") as f:
+        manifest = json.load(f)
+    assert list(manifest) == [spec_hash(small_chart())]  # one entry per output file
+    assert manifest[spec_hash(small_chart())] == {"file": "cache.pdf", "bytes": os.path.getsize(pdf)}
+
+
+def test_changed_spec_or_damaged_output_rebuilds(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLA_OUTPUT_DIR", str(tmp_path))
+    assert build_flowchart(small_chart()) == BUILT
+    assert spec_hash(small_chart("Begin")) != spec_hash(small_chart())
+    assert build_flowchart(small_chart("Begin")) == BUILT
+    with open(tmp_path / "cache.pdf", "ab") as f:
+        f.write(b"% edited by hand\n")
+    assert build_flowchart(small_chart("Begin")) == BUILT
+    os.remove(tmp_path / "cache.pdf")
+    assert build_flowchart(small_chart("Begin")) == BUILT
+    assert build_flowchart(small_chart("Begin")) == FRESH
+
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOLD_LOCK = """
+import sys, time
+sys.path.insert(0, sys.argv[1])
+from flowchart_cache import _manifest_lock
+with _manifest_lock(sys.argv[2]):
+    print("locked", flush=True)
+    time.sleep(60)
+"""
+
+
+def test_manifest_lock_waits_for_live_holder_not_for_killed_one(tmp_path):
+    path = str(tmp_path / MANIFEST_NAME)
+    holder = subprocess.Popen([sys.executable, "-c", HOLD_LOCK, SCRIPTS, path], stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        with pytest.raises(TimeoutError):
+            with _manifest_lock(path, timeout=0.2):
+                pass
+    finally:
+        holder.kill()
+        holder.wait()
+        holder.stdout.close()
+    start = time.monotonic()
+    with _manifest_lock(path, timeout=5):
+        assert time.monotonic() - start < 1  # released by the OS when the holder died
@@ -0,0 +1,6 @@
+from flowchart_golden import GOLDEN_DIR, check, golden_charts
+
+
+def test_generator_charts_match_goldens(monkeypatch):
+    monkeypatch.setenv("KLA_DETERMINISTIC", "1")  # goldens never contain wall-clock stamps
+    assert check(golden_charts(), GOLDEN_DIR) == 0
@@ -0,0 +1,52 @@
+from flowchart_cache import BUILT, build_flowchart
+from flowchart_canvas import record_chart
+from flowchart_golden import synthetic_flowchart
+from flowchart_layout import assign_ranks, count_crossings, order_layers, remove_cycles
+from flowchart_render import edge_points
+from flowchart_spatial import box_rect, segment_hits_rect
+
+
+def test_ranks_point_down_after_cycle_removal():
+    edges = [(0, 1), (1, 2), (2, 0), (0, 2), (3, 2)]
+    back = remove_cycles(4, edges)
+    assert back == {2}
+    dag = [(v, u) if i in back else (u, v) for i, (u, v) in enumerate(edges)]
+    rank = assign_ranks(4, dag)
+    assert all(rank[v] > rank[u] for u, v in dag)
+    assert rank[3] == rank[2] - 1  # a source sits just above its child
+
+
+def test_count_crossings():
+    down = {0: [3], 1: [2]}
+    assert count_crossings([0, 1], {2: 0, 3: 1}, down) == 1
+    assert count_crossings([1, 0], {2: 0, 3: 1}, down) == 0
+    assert count_crossings([0, 1], {2: 0, 3: 1}, {0: [2, 3], 1: [2]}) == 1
+
+
+def test_order_layers_untangles_two_layers():
+    down = [[4], [3], [], [], []]
+    up = [[], [], [], [1], [0]]
+    layers = order_layers([[0, 1, 2], [3, 4]], up, down)
+    positions = {v: i for i, v in enumerate(layers[1])}
+    assert count_crossings(layers[0], positions, down) == 0
+
+
+def test_layer_chains_stay_clear_of_boxes():
+    chart = synthetic_flowchart(1, 60, placed=False, density=1.5, routing="straight")
+    record_chart(chart)
+    for edge in chart.edges:
+        if not edge.points:  # over the dummy budget: drawn direct, left to the router
+            continue
+        points = edge_points(chart, edge)
+        for box in chart.nodes.values():
+            if box.name not in (edge.tail, edge.head):
+                assert not any(segment_hits_rect(p, q, box_rect(box)) for p, q in zip(points, points[1:])), \
+                    (edge.tail, edge.head, box.name)
+
+
+def test_auto_layout_builds_without_overlaps(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLA_OUTPUT_DIR", str(tmp_path))
+    chart = synthetic_flowchart(2, 40, placed=False, density=1.5)
+    assert chart.routing == "auto"
+    assert build_flowchart(chart) == BUILT
+    assert chart.overlaps == []
@@ -0,0 +1,54 @@
+import io
+import zipfile
+
+from reportlab.lib.units import cm
+
+from flowchart_model import Flowchart
+from flowchart_output import render_pdf, write_archive
+
+
+def small_chart(name="output"):
+    chart = Flowchart(name, "Output", "never_written.pdf")
+    chart.node("a", "Start", x=2 * cm, y=2 * cm, width=3 * cm, height=1 * cm)
+    chart.node("b", "End", x=2 * cm, y=5 * cm, width=3 * cm, height=1 * cm)
+    chart.edge("a", "b")
+    return chart
+
+
+class WriteOnly:
+    """A response-like sink: write() only, no seek or tell"""
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+def test_render_pdf_returns_memory_and_writes_no_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data = render_pdf(small_chart(), invariant=True)
+    assert isinstance(data, memoryview) and data.readonly
+    assert bytes(data[:5]) == b"%PDF-"
+    assert list(tmp_path.iterdir()) == []
+    assert bytes(render_pdf(small_chart(), invariant=True)) == bytes(data)  # invariant output is reproducible
+
+    out = io.BytesIO()
+    assert render_pdf(small_chart(), out, invariant=True) == len(data)
+    assert out.getvalue() == bytes(data)
+    plain = bytes(render_pdf(small_chart(), compress=False, invariant=True))
+    assert b"/FlateDecode" in bytes(data) and b"/FlateDecode" not in plain
+
+
+def test_archive_streams_to_unseekable_output():
+    sink = WriteOnly()
+    sizes = write_archive([("a/one.pdf", small_chart("one")), ("b/two.pdf", small_chart("two"))], sink, compress=True)
+    with zipfile.ZipFile(io.BytesIO(b"".join(sink.chunks))) as zf:
+        assert zf.namelist() == ["a/one.pdf", "b/two.pdf"]
+        for info in zf.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED  # compressed PDFs are not deflated again
+            assert info.file_size == sizes[info.filename]
+            assert zf.read(info).startswith(b"%PDF-")
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+from reportlab.lib.units import cm
+
+from flowchart_batch import GENERATORS
+from flowchart_cache import MANIFEST_NAME, OverlapError, build_flowchart
+from flowchart_canvas import record_chart
+from flowchart_golden import chart_builders
+from flowchart_model import Flowchart
+
+
+@pytest.mark.parametrize("module", GENERATORS)
+def test_generator_charts_have_no_overlaps(module):
+    for name, builder in chart_builders(module):
+        chart = builder()
+        record_chart(chart)
+        assert [str(overlap) for overlap in chart.overlaps] == [], name
+
+
+def test_overlapping_chart_fails_build(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLA_OUTPUT_DIR", str(tmp_path))
+    chart = Flowchart("clash", "Clash", "clash.pdf")
+    chart.node("a", "A", x=2 * cm, y=2 * cm, width=3 * cm, height=1 * cm)
+    chart.node("b", "B", x=3 * cm, y=2.5 * cm, width=3 * cm, height=1 * cm)
+    with pytest.raises(OverlapError, match="1 overlaps"):
+        build_flowchart(chart)
+    assert os.path.exists(tmp_path / "clash_overlaps.txt")
+    assert not os.path.exists(tmp_path / MANIFEST_NAME)
@@ -0,0 +1,88 @@
+from reportlab.lib import colors
+from reportlab.lib.units import cm
+
+from flowchart_canvas import RecordingCanvas, record_chart
+from flowchart_model import Flowchart
+from flowchart_render import TEMPLATE_MIN_USES, StateCanvas, render_flowchart
+
+COLORS = [colors.lightblue, colors.lightgreen, colors.pink]
+
+
+def striped_chart(count=9):
+    """A column of boxes whose fill colours alternate, each linked to the next"""
+    chart = Flowchart("render", "Render", "render.pdf")
+    for k in range(count):
+        chart.node(f"n{k}", f"Step {k}", x=2 * cm, y=(1 + 2 * k) * cm, width=3 * cm, height=1 * cm,
+                   color=COLORS[k % len(COLORS)])
+    for k in range(count - 1):
+        chart.edge(f"n{k}", f"n{k + 1}", label="next" if k % 2 else "")
+    return chart
+
+
+def diamond_grid(count):
+    """`count` equal diamonds in a row, each with an edge straight down to a box below it"""
+    chart = Flowchart("forms", "Forms", "forms.pdf", pagesize=(count * 3 * cm + 2 * cm, 12 * cm))
+    for k in range(count):
+        chart.node(f"d{k}", "?", "diamond", colors.yellow, x=(1 + 3 * k) * cm, y=6 * cm, width=2 * cm, height=2 * cm)
+        chart.node(f"b{k}", "", x=(1 + 3 * k) * cm, y=1 * cm, width=2 * cm, height=1 * cm)
+        chart.edge(f"d{k}", f"b{k}")
+    return chart
+
+
+def drawn_strings(ops):
+    strings = [op[3] for op in ops if op[0] == "string"]
+    strings += [text_op[1] for op in ops if op[0] == "text" for text_op in op[1] if text_op[0] == "show"]
+    return sorted(strings)
+
+
+def test_batching_sets_each_style_once_and_draws_the_same_text():
+    batched = record_chart(striped_chart(), templates=False)
+    single = record_chart(striped_chart(), batch=False)
+    count = lambda ops, kind: sum(1 for op in ops if op[0] == kind)
+    # One path per fill colour (and one for the edges' lines and heads) instead of one per item
+    assert count(batched, "path") == len(COLORS) + 2
+    assert count(batched, "fill") <= len(COLORS) + 2
+    assert count(single, "fill") >= 2 * 9
+    assert count(batched, "text") <= 2  # box text, edge labels: one text object each
+    assert drawn_strings(batched) == drawn_strings(single)
+    assert len(batched) < len(single) / 3
+
+
+def test_state_canvas_drops_repeated_state():
+    recording = RecordingCanvas()
+    c = StateCanvas(recording)
+    c.setFillColor(colors.red)
+    c.setFillColor(colors.red)
+    c.setLineWidth(1.5)
+    c.saveState()
+    c.setFillColor(colors.blue)
+    c.restoreState()
+    c.setFillColor(colors.red)  # restored: nothing to emit
+    c.setLineWidth(2)
+    c.showPage()
+    c.setLineWidth(2)  # a new page starts from the default state
+    assert recording.ops == [("fill", "ff0000"), ("width", 1.5), ("save",), ("fill", "0000ff"), ("restore",),
+                             ("width", 2), ("page",), ("width", 2)]
+
+
+def test_repeated_shapes_become_one_form_each(tmp_path):
+    ops = record_chart(diamond_grid(TEMPLATE_MIN_USES))
+    forms = [op[1] for op in ops if op[0] == "form"]
+    assert len(forms) == 2  # the diamond and the downward arrowhead
+    for name in forms:
+        assert sum(1 for op in ops if op == ("use", name)) == TEMPLATE_MIN_USES
+    # Each form is defined with its own drawing, placed by translation only
+    first_use = ops.index(("use", forms[0]))
+    assert ops[first_use - 2][0] == "save" and ops[first_use - 1][0] == "translate"
+
+    chart = diamond_grid(TEMPLATE_MIN_USES)
+    chart.filename = str(tmp_path / "forms.pdf")
+    render_flowchart(chart, invariant=True)
+    with open(chart.filename, "rb") as f:
+        assert f.read().count(b"/Subtype /Form") == 2
+
+
+def test_rare_shapes_stay_inline():
+    ops = record_chart(diamond_grid(TEMPLATE_MIN_USES - 1))
+    assert not [op for op in ops if op[0] in ("form", "use")]
+    assert [op[:1] for op in ops].count(("path",)) == 4  # diamonds, rectangles, edge lines, heads
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+from reportlab.lib.units import cm
+
+from flowchart_golden import synthetic_flowchart
+from flowchart_layout import layout_flowchart
+from flowchart_model import Flowchart
+from flowchart_render import edge_points
+from flowchart_route import route_flowchart
+
+
+def crosses(points, box):
+    x0, y0, x1, y1 = box.x, box.y, box.x + box.width, box.y + box.height
+    for (ax, ay), (bx, by) in zip(points, points[1:]):
+        if ax == bx and x0 < ax < x1 and min(ay, by) < y1 and max(ay, by) > y0:
+            return True
+        if ay == by and y0 < ay < y1 and min(ax, bx) < x1 and max(ax, bx) > x0:
+            return True
+    return False
+
+
+def test_edge_goes_around_box_in_between():
+    chart = Flowchart("route", "Route", "route.pdf", routing="orthogonal")
+    chart.node("a", "A", x=1 * cm, y=5 * cm, width=2 * cm, height=1 * cm)
+    chart.node("wall", "Wall", x=5 * cm, y=3 * cm, width=2 * cm, height=5 * cm)
+    chart.node("b", "B", x=9 * cm, y=5 * cm, width=2 * cm, height=1 * cm)
+    chart.edge("a", "b")
+    assert route_flowchart(chart) == []
+    points = edge_points(chart, chart.edges[0])
+    assert len(points) > 2
+    assert not crosses(points, chart.nodes["wall"])
+
+
+def test_boxed_in_edge_gets_elbow_and_warning():
+    chart = Flowchart("route", "Route", "route.pdf", routing="orthogonal")
+    chart.node("a", "A", x=5 * cm, y=5 * cm, width=2 * cm, height=1 * cm)
+    # A frame hugging `a` covers every port stub
+    chart.node("top", "", x=4 * cm, y=6.05 * cm, width=4 * cm, height=1 * cm)
+    chart.node("bottom", "", x=4 * cm, y=3.95 * cm, width=4 * cm, height=1 * cm)
+    chart.node("left", "", x=3.95 * cm, y=4.9 * cm, width=1 * cm, height=1.2 * cm)
+    chart.node("right", "", x=7.05 * cm, y=4.9 * cm, width=1 * cm, height=1.2 * cm)
+    chart.node("b", "B", x=12 * cm, y=10 * cm, width=2 * cm, height=1 * cm)
+    chart.edge("a", "b")
+    warnings = route_flowchart(chart)
+    assert [(w.kind, w.first) for w in warnings] == [("unrouted edge", "a -> b")]
+    assert chart.edges[0].points == [chart.nodes["a"].center()[:1] + chart.nodes["b"].center()[1:]]
+
+
+# 3000 edges, auto-laid-out: about 15s here, over 60s before corridors were cached and the
+# crossings built per tile
+ROUTE_BUDGET = 40.0
+
+
+@pytest.mark.slow
+def test_large_chart_routes_within_budget():
+    chart = synthetic_flowchart(0, 2000, placed=False, density=1.5, routing="orthogonal")
+    layout_flowchart(chart)
+    start = time.perf_counter()
+    warnings = route_flowchart(chart)
+    elapsed = time.perf_counter() - start
+    assert [w for w in warnings if w.kind == "unrouted edge"] == []
+    assert elapsed < ROUTE_BUDGET, f"routing {len(chart.edges)} edges took {elapsed:.1f}s"
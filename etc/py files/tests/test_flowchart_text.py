@@ -0,0 +1,52 @@
+import unicodedata
+
+from reportlab.lib.units import cm
+
+from flowchart_model import Flowchart
+from flowchart_text import LINE_HEIGHT, VIRAMA, fit_box, fit_line, graphemes, string_width, wrap_text
+
+
+def test_wrapped_lines_fit_and_keep_the_words():
+    text = "Load the chapter list from the server and show it\nthen wait"
+    lines = wrap_text(text, 80)
+    assert all(string_width(line) <= 80 for line in lines)
+    assert " ".join(lines).split() == text.split()
+    assert lines[-1] == "then wait"  # an explicit newline always starts a line
+
+
+def test_long_path_breaks_after_separators():
+    lines = wrap_text("/api/progress/chapters/:chapterId/attempts", 60)
+    assert len(lines) > 1
+    assert all(string_width(line) <= 60 for line in lines)
+    assert "".join(lines) == "/api/progress/chapters/:chapterId/attempts"
+    assert all(line.endswith(("/", "-", "_", ".")) for line in lines[:-1])
+
+
+def test_kannada_clusters_stay_whole():
+    assert graphemes("ಪ್ರಯತ್ನ") == ["ಪ್ರ", "ಯ", "ತ್ನ"]
+    assert graphemes("ಕಾಲು") == ["ಕಾ", "ಲು"]
+    word = "ಸತತಪ್ರಯತ್ನವೇಗೆಲುವಿನಗುಟ್ಟು" * 3
+    lines = wrap_text(word, 40)
+    assert len(lines) > 1 and "".join(lines) == word
+    for line in lines[1:]:
+        assert not unicodedata.category(line[0]).startswith("M")  # no orphaned vowel sign
+    for line in lines[:-1]:
+        assert line[-1] != VIRAMA  # no conjunct split
+
+
+def test_fit_line_trims_with_ellipsis():
+    line = "A very long edge label that cannot possibly fit"
+    fitted = fit_line(line, 60)
+    assert fitted.endswith("…") and line.startswith(fitted[:-1])
+    assert string_width(fitted, "Helvetica", 9) <= 60
+    assert fit_line("short", 60) == "short"
+
+
+def test_fit_box_grows_around_its_center():
+    chart = Flowchart("text", "Text", "text.pdf")
+    box = chart.node("a", "word " * 12, x=1 * cm, y=5 * cm, width=2 * cm, height=0.5 * cm)
+    center = box.center()
+    lines = fit_box(box)
+    assert len(lines) > 2
+    assert box.height >= len(lines) * LINE_HEIGHT
+    assert box.center() == center
@@ -0,0 +1,53 @@
+import json
+
+from flowchart_traffic import LOCK_PATHS, QUIZ_PATH, _edge_key, count_results, student_traffic
+
+LOCKED_PASSED = _edge_key(*LOCK_PATHS["already-passed"][-1])
+LOCKED_FAILED = _edge_key(*LOCK_PATHS["failed-both"][-1])
+TAKE_QUIZ = _edge_key(*QUIZ_PATH[3])  # "Failed 2 times?" -> NO -> Load Quiz
+
+
+def result(user, chapter, day, percentage):
+    return {"userId": user, "chapterId": chapter, "submittedAt": f"2025-01-{day:02d}T10:00:00.000Z",
+            "percentage": percentage}
+
+
+RESULTS = [
+    result("a", 1, 1, 80),                          # passed at once: locked, already passed
+    result("b", 1, 1, 20), result("b", 1, 2, 30),   # failed twice: locked out
+    result("c", 1, 1, 20), result("c", 1, 2, 70),   # passed on the 2nd attempt: not locked
+    result("d", 1, 2, 90), result("d", 1, 1, 40),   # out of order: fail, then pass, so not locked
+    result("e", 1, 1, 10),                          # one failure: may retake
+]
+
+
+def test_branches_follow_attempt_sequence():
+    counts, attempts = {}, {}
+    assert count_results(RESULTS, counts, attempts) == len(RESULTS)
+    assert counts[TAKE_QUIZ] == len(RESULTS)
+    assert counts[LOCKED_PASSED] == 1
+    assert counts[LOCKED_FAILED] == 1
+    assert attempts["d|1"] == [["2025-01-01T10:00:00.000Z", 40.0], ["2025-01-02T10:00:00.000Z", 90.0]]
+
+
+def write_data(data_dir, results, users=()):
+    data_dir.mkdir(exist_ok=True)
+    (data_dir / "results.json").write_text(
+        '{"results": [\n' + ",\n".join(json.dumps(r) for r in results) + "\n]}\n", encoding="utf-8")
+    (data_dir / "users.json").write_text(json.dumps({"users": list(users)}), encoding="utf-8")
+
+
+def test_incremental_counts_match_rebuild_per_data_dir(tmp_path):
+    cache = str(tmp_path / "traffic.json")
+    first, second = tmp_path / "first", tmp_path / "second"
+    write_data(first, RESULTS[:3], [{"id": "a", "progress": {"1": {"hasRead": True}, "2": {"hasRead": False}}}])
+    write_data(second, RESULTS[5:])
+    student_traffic(str(first), cache)
+    student_traffic(str(second), cache)
+
+    write_data(first, RESULTS, [{"id": "a", "progress": {"1": {"hasRead": True}, "2": {"hasRead": False}}}])
+    counts, totals = student_traffic(str(first), cache)
+    assert totals["new_results"] == len(RESULTS) - 3
+    assert (counts, totals["results"]) == (student_traffic(str(first), str(tmp_path / "fresh.json"))[0], len(RESULTS))
+    assert counts[_edge_key(*LOCK_PATHS["read-first"][-1])] == 1
+    assert student_traffic(str(second), cache)[1]["results"] == len(RESULTS) - 5
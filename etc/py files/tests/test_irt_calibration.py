@@ -0,0 +1,19 @@
+import numpy as np
+
+from irt_calibration import calibrate, simulate
+
+
+def test_rasch_and_2pl_recover_simulated_parameters():
+    responses, (ability, slope, difficulty) = simulate(1500, 30, 20, seed=1)
+    rasch, two_pl = calibrate(responses, "rasch"), calibrate(responses, "2pl")
+    r = lambda fitted, true: np.corrcoef(fitted, true)[0, 1]
+
+    assert np.ptp(rasch.discrimination) == 0  # one common slope
+    assert r(rasch.difficulty, difficulty) > 0.95
+    assert r(rasch.ability, ability) > 0.85
+    assert r(two_pl.difficulty, difficulty) > 0.98
+    assert r(two_pl.discrimination, slope) > 0.9
+    assert np.abs(two_pl.difficulty - difficulty).max() < 0.6  # same scale as the truth, not just correlated
+    # The data has unequal slopes: 2PL fits better, by more than its extra parameters cost
+    assert two_pl.loglik > rasch.loglik and two_pl.aic < rasch.aic
+    assert max(rasch.iterations, two_pl.iterations) < 100
@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+
+from item_analysis import flag, item_statistics
+
+# Attempts x questions answered correctly; the last attempt answered only question 0
+ATTEMPTS = [[1, 1, 1], [1, 1, 0], [1, 0, 0], [0, 0, 1], [0]]
+
+
+def answer_arrays(attempts):
+    item = np.array([k for row in attempts for k in range(len(row))])
+    attempt = np.array([a for a, row in enumerate(attempts) for _ in row])
+    correct = np.array([ok for row in attempts for ok in row], dtype=bool)
+    choice = np.where(correct, 0, 1)
+    choice[-1] = -1  # no option recorded
+    return item, attempt, correct, choice
+
+
+def test_statistics_match_hand_computation():
+    stats = item_statistics(*answer_arrays(ATTEMPTS), 3, 4)
+    assert stats["responses"].tolist() == [5, 4, 4]
+    assert np.allclose(stats["p"], [3 / 5, 2 / 4, 2 / 4])
+    # Rest scores of question 1 are 1, .5, .5, .5 (mean .75 when right, .5 when wrong, sd sqrt(3)/8);
+    # question 2's are 1, 1, .5, 0 (mean .5 when right, .75 when wrong, sd sqrt(11)/8).
+    # Question 0's are equal on both sides, and the one-question attempt has no rest score
+    assert np.allclose(stats["r_pb"], [0, 1 / math.sqrt(3), -1 / math.sqrt(11)])
+    assert stats["chosen"].tolist() == [[3, 1, 0, 0], [2, 2, 0, 0], [2, 2, 0, 0]]
+
+
+def test_undefined_correlation_is_nan():
+    stats = item_statistics(*answer_arrays([[1, 1], [1, 0], [1, 1]]), 2, 4)
+    assert np.isnan(stats["r_pb"][0])  # everyone right: no spread to correlate with
+
+
+def test_flags():
+    row = {"responses": 40, "p": 0.5, "r_pb": 0.4, "chosen": np.array([20, 8, 7, 5])}
+    assert flag(row, "A") == ""
+    assert flag(dict(row, chosen=np.array([10, 20, 5, 5])), "A") == "Distractor beats key"
+    assert flag(dict(row, r_pb=-0.1), "A") == "Negative - check key"
+    assert flag(dict(row, p=0.95), "A") == "Too easy"
+    assert flag(dict(row, r_pb=0.1), "A") == "Low discrimination"
+    assert flag(dict(row, responses=5, p=0.95), "A") == ""  # too few responses to judge
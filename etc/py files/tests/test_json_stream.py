@@ -0,0 +1,40 @@
+import json
+
+from json_stream import AppendedItems, iter_items
+
+
+def write_results(path, count, newline):
+    rows = [json.dumps({"id": k, "chapterTitle": "ಕನ್ನಡ ಪಾಠ"}, ensure_ascii=False) for k in range(count)]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(f'{{"results": [{newline}' + f",{newline}".join(rows) + f"{newline}]}}{newline}")
+
+
+def test_crlf_resume(tmp_path):
+    path = str(tmp_path / "results.json")
+    write_results(path, 3, "\r\n")
+    first = AppendedItems(path, "results")
+    assert [row["id"] for row in first] == [0, 1, 2]
+
+    write_results(path, 7, "\r\n")
+    with open(path, "rb") as f:
+        assert f.read()[first.cursor["offset"]:].startswith(b",\r\n")
+    rest = AppendedItems(path, "results", first.cursor)
+    assert rest.resumed
+    assert [row["id"] for row in rest] == [3, 4, 5, 6]
+    assert [row["id"] for row in AppendedItems(path, "results", rest.cursor)] == []
+
+
+def test_crlf_resume_small_chunks(tmp_path):
+    path = str(tmp_path / "results.json")
+    write_results(path, 2, "\r\n")
+    first = AppendedItems(path, "results", chunk_size=7)
+    list(first)
+    write_results(path, 5, "\r\n")
+    assert [row["id"] for row in AppendedItems(path, "results", first.cursor, chunk_size=7)] == [2, 3, 4]
+
+
+def test_iter_items_crlf_and_lf(tmp_path):
+    for newline in ("\n", "\r\n"):
+        path = str(tmp_path / "results.json")
+        write_results(path, 4, newline)
+        assert [row["id"] for row in iter_items(path, "results", chunk_size=5)] == [0, 1, 2, 3]
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import flowchart_cache
+import kla_charts
+
+SCRIPTS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_commands_dispatch_to_their_scripts(monkeypatch):
+    calls = []
+    monkeypatch.setattr(kla_charts, "run_script", lambda module, argv: calls.append((module, list(argv))) or 3)
+    assert kla_charts.main(["reports", "--jobs", "2"]) == 3  # the script's exit status is passed on
+    kla_charts.main(["analytics", "quiz-lock", "--simulate", "1000"])
+    kla_charts.main(["serve", "--port", "0"])
+    assert calls == [("student_reports", ["--jobs", "2"]), ("quiz_lock_model", ["--simulate", "1000"]),
+                     ("render_server", ["--port", "0"])]
+    with pytest.raises(SystemExit):
+        kla_charts.main(["analytics", "nonsense"])
+
+
+def test_run_script_passes_argv_and_exit_status(tmp_path, monkeypatch):
+    (tmp_path / "exit_script.py").write_text("import sys\nprint(' '.join(sys.argv))\nsys.exit(int(sys.argv[2]))\n",
+                                             encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    argv = list(sys.argv)
+    assert kla_charts.run_script("exit_script", ["--status", "4"]) == 4
+    assert kla_charts.run_script("exit_script", ["--status", "0"]) == 0
+    assert sys.argv == argv
+
+
+def test_startup_imports_no_reportlab():
+    code = "import sys, kla_charts; print(sorted({m.split('.')[0] for m in sys.modules} & {'reportlab', 'numpy'}))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=SCRIPTS, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_unchanged_flowchart_inputs_skip_the_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(kla_charts, "STAMP_PATH", str(tmp_path / "stamp.json"))
+    monkeypatch.setattr(flowchart_cache, "OUTPUTS", [])
+    output, runs = tmp_path / "chart.pdf", []
+
+    def fake_run(module, argv):
+        runs.append(module)
+        output.write_bytes(b"%PDF-" + b"x" * len(runs))
+        flowchart_cache.OUTPUTS.append(str(output))
+        return 0
+
+    monkeypatch.setattr(kla_charts, "run_script", fake_run)
+    generator = ["--generator", "generate_flowcharts"]
+    assert kla_charts.run_flowcharts(generator) == 0 and runs == ["generate_flowcharts"]
+    assert kla_charts.run_flowcharts(generator) == 0 and len(runs) == 1  # stamp fresh: not run again
+    kla_charts.run_flowcharts(generator + ["--force"])
+    assert len(runs) == 2
+    output.write_bytes(b"changed by hand")
+    kla_charts.run_flowcharts(generator)
+    assert len(runs) == 3  # an output that changed size is rebuilt
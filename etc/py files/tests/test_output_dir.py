@@ -0,0 +1,23 @@
+import os
+
+from flowchart_batch import GENERATORS
+from flowchart_cache import OUTPUT_DIR, output_path, report_dir
+from flowchart_golden import chart_builders
+
+
+def generator_files():
+    return [builder().filename for module in GENERATORS for _, builder in chart_builders(module)]
+
+
+def test_generators_write_distinct_files_under_output_dir():
+    files = generator_files()
+    assert len(set(files)) == len(files)
+    assert all(os.path.dirname(path) == OUTPUT_DIR for path in files)
+
+
+def test_output_dir_follows_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv("KLA_OUTPUT_DIR", raising=False)
+    assert report_dir() == OUTPUT_DIR
+    monkeypatch.setenv("KLA_OUTPUT_DIR", str(tmp_path))
+    assert report_dir() == str(tmp_path)
+    assert output_path(generator_files()[0]) == os.path.join(str(tmp_path), os.path.basename(generator_files()[0]))
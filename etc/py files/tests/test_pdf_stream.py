@@ -0,0 +1,44 @@
+import os
+import re
+
+import reportlab
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import ShapeData, ShapedStr, TTFont
+
+from pdf_stream import StreamingCanvas
+
+VERA = os.path.join(os.path.dirname(reportlab.__file__), "fonts", "Vera.ttf")
+UNMAPPED_GLYPH = 172  # a Vera glyph no character maps to, standing in for a conjunct form
+
+
+def shaped_run(font):
+    """'AVfi' as harfbuzz would shape it: V kerned 80 units closer, 'fi' as one private-use
+    glyph (the way reportlab files glyphs without a character) set 20 units right and raised"""
+    face = font.face
+    face.charToGlyph[0xE000] = UNMAPPED_GLYPH
+    width = lambda ch: face.hmetrics[face.charToGlyph[ord(ch)]][0] * 1000 / face.unitsPerEm
+    private = face.hmetrics[UNMAPPED_GLYPH][0] * 1000 / face.unitsPerEm
+    shaped = ShapedStr("AV\ue000", [ShapeData(0, width("A"), 0, 0, 0, width("A")),
+                                     ShapeData(1, width("V") - 80, 0, 0, 0, width("V")),
+                                     ShapeData(2, private, 0, 20, 100, private)])
+    shaped.source = "AVfi"
+    return shaped
+
+
+def test_shaped_glyphs_keep_positions_and_text(tmp_path):
+    font = TTFont("StreamVera", VERA)
+    pdfmetrics.registerFont(font)
+    path = str(tmp_path / "shaped.pdf")
+    c = StreamingCanvas(path, compress=False)
+    c.setFont("StreamVera", 10)
+    c.drawString(10, 20, shaped_run(font))
+    c.drawString(10, 40, "VA")
+    c.save()
+    with open(path, "rb") as f:
+        pdf = f.read().decode("latin-1")
+
+    assert "10 20 Td [<0001> <0002> 80] TJ 1 Ts [-20 <0003> 20] TJ 0 Ts ET" in pdf
+    assert "10 40 Td <00020001> Tj ET" in pdf  # plain text reuses the same cids
+    cmap = re.search(r"beginbfchar\n(.*?)\nendbfchar", pdf, re.S).group(1).split("\n")
+    assert cmap == ["<0001> <0041>", "<0002> <0056>", "<0003> <00660069>"]  # the private glyph reads 'fi'
+    assert c.fonts["StreamVera"][2].chars == ["A", "V", "\ue000"]  # so the subset includes its glyph
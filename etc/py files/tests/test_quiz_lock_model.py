@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+
+from quiz_lock_model import enumerate_states, replay, replay_users, simulate_lockout
+from synthetic_data import write_dataset
+
+
+def test_enumerated_state_graph():
+    states, transitions, loops = enumerate_states()
+    assert set(states) == {(False, "none"), (True, "none"), (True, "passed-first"), (True, "failed-once"),
+                           (True, "failed-both"), (True, "passed-retake")}
+    edges = {(state, event): target for state, event, target in transitions}
+    assert edges[(True, "none"), "pass"] == (True, "passed-first")
+    assert edges[(True, "failed-once"), "fail"] == (True, "failed-both")
+    assert edges[(True, "failed-once"), "pass"] == (True, "passed-retake")
+    # Locked states only leave through the admin reset
+    for locked in ((True, "passed-first"), (True, "failed-both")):
+        assert {event for (state, event) in edges if state == locked} == {"reset"}
+    assert sorted(loops[(True, "passed-retake")]) == ["fail", "pass", "read"]  # retakes stay open
+
+
+def test_replay_finds_what_the_rules_forbid():
+    attempt = lambda score, date: {"score": score, "date": date}
+    assert replay({"hasRead": True, "quizAttempts": [attempt(40, "1"), attempt(70, "2")], "bestScore": 70}) == []
+    assert replay({"hasRead": True, "quizAttempts": [attempt(40, "1"), attempt(30, "2"), attempt(90, "3")],
+                   "bestScore": 90}) == ["attempt taken while locked (failed-both) #3"]
+    assert replay({"hasRead": False, "quizAttempts": [attempt(80, "2"), attempt(60, "1")], "bestScore": 60}) == [
+        "quiz attempts but hasRead is false", "attempt taken while locked (already-passed) #2",
+        "bestScore is not the best attempt score", "attempt dates out of order"]
+
+
+def test_synthetic_users_replay_cleanly(tmp_path):
+    write_dataset(str(tmp_path), 200, chapters=4, questions=4)
+    entries, counts, found = replay_users(os.path.join(tmp_path, "users.json"))
+    assert entries > 0 and not counts and not found
+
+
+def test_monte_carlo_shares():
+    shares = simulate_lockout(20000, [30, 50, 70], mean=60, spread=18, noise=10, gain=5, retake=0.9)
+    for outcome in shares.values():
+        assert abs(sum(outcome.values()) - 1) < 1e-9
+        assert outcome["gave_up"] < 0.1 * (1 - outcome["passed_first"]) + 0.01  # 90% of failers retake
+    passed_first = [shares[t]["passed_first"] for t in (30.0, 50.0, 70.0)]
+    assert passed_first == sorted(passed_first, reverse=True)
+    assert np.isclose(shares[70.0]["passed_first"], 0.40, atol=0.02)  # P(N(60, sqrt(18^2 + 10^2)) >= 65)
+    no_retakes = simulate_lockout(1000, [50], 60, 18, 10, 5, retake=0)[50.0]
+    assert no_retakes["passed_retake"] == no_retakes["locked_out"] == 0
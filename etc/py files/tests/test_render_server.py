@@ -0,0 +1,85 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import HTTPServer
+
+import pytest
+
+from render_server import RenderHandler, RenderService
+from synthetic_data import write_dataset
+
+SPEC = {"name": "inline", "title": "Inline", "pagesize": [400, 300],
+        "nodes": [{"name": "a", "text": "Start", "x": 50, "y": 50, "width": 100, "height": 30},
+                  {"name": "b", "text": "End", "x": 50, "y": 200, "width": 100, "height": 30}],
+        "edges": [{"tail": "a", "head": "b", "label": "next"}]}
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """A render server on a free port over a small synthetic dataset (not warmed up: that renders every chart)"""
+    write_dataset(str(tmp_path), 30, chapters=3, questions=4)
+    service = RenderService(str(tmp_path))
+    monkeypatch.setattr(RenderHandler, "service", service)
+    monkeypatch.setattr(RenderHandler, "quiet", True)
+    httpd = HTTPServer(("127.0.0.1", 0), RenderHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", service
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def request(url, body=None):
+    """(status, headers, body) of a GET, or of a POST when body is given (bytes are sent as they are)"""
+    data = body if body is None or isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data)) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_report_and_chart_requests(server):
+    url, service = server
+    assert request(url + "/report", {"userId": "nobody"})[0] == 404  # every POST refreshes the index first
+    status, _, body = request(url + "/health")
+    assert status == 200 and json.loads(body)["results"] == 30
+
+    user_id = next(iter(service.index.users))
+    status, headers, body = request(url + "/report", {"userId": user_id})
+    assert status == 200 and body.startswith(b"%PDF-")
+    assert headers["Content-Type"] == "application/pdf" and "render;dur=" in headers["Server-Timing"]
+
+    first = request(url + "/chart", {"spec": SPEC})
+    assert first[0] == 200 and first[2].startswith(b"%PDF-")
+    assert request(url + "/chart", {"spec": SPEC})[2] == first[2]  # served from the chart cache
+    assert len(service.charts) == 1
+
+    metrics = json.loads(request(url + "/metrics")[2])
+    assert metrics["/chart"]["requests"] == 2 and metrics["/report"]["requests"] == 1
+
+
+def test_bad_requests_get_json_errors(server):
+    url, _ = server
+    for body, status in (({"userId": "nobody"}, 404), (b"not json", 400), (b"[1, 2]", 400)):
+        code, headers, reply = request(url + "/report", body)
+        assert code == status and headers["Content-Type"] == "application/json"
+        assert "error" in json.loads(reply)
+    assert request(url + "/chart", {"module": "generate_flowcharts", "chart": "nope"})[0] == 404
+    assert request(url + "/chart", {"spec": {"edges": [{"tail": "a", "head": "missing"}]}})[0] == 400
+    assert request(url + "/nowhere")[0] == 404
+
+
+def test_appended_results_are_picked_up(server, tmp_path):
+    url, service = server
+    request(url + "/report", {"userId": "nobody"})
+    user_id = next(iter(service.index.users))
+    path = tmp_path / "results.json"
+    text = path.read_text(encoding="utf-8")
+    extra = {"id": "extra", "userId": user_id, "chapterId": 1, "chapterTitle": "One", "score": 4,
+             "totalQuestions": 4, "percentage": "100.00", "submittedAt": "2030-01-01T00:00:00.000Z", "answers": []}
+    path.write_text(text[:text.rindex("]")] + "," + json.dumps(extra) + "\n]}\n", encoding="utf-8")
+    assert request(url + "/report", {"userId": user_id})[0] == 200
+    assert json.loads(request(url + "/health")[2])["results"] == 31
+    assert service.index.student(user_id)[1][-1][6] == extra["submittedAt"]  # the appended result comes last
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+
+import results_export
+from results_export import export_results, write_synthetic_results
+
+RSS_GROWTH_BOUND_KB = 8 * 1024  # 100 -> 8000 results: about 1.3 MB here
+
+
+def test_export_counts_results_and_pages(tmp_path):
+    results_file, output_file = str(tmp_path / "results.json"), str(tmp_path / "out" / "all.pdf")
+    write_synthetic_results(results_file, 12)
+    results, pages = export_results(results_file, output_file)
+    assert results == 12
+    assert pages > 1  # 10 answers per result: a dozen do not fit on one page
+    with open(output_file, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+
+
+def test_export_without_results(tmp_path):
+    results_file, output_file = str(tmp_path / "results.json"), str(tmp_path / "all.pdf")
+    with open(results_file, "w", encoding="utf-8") as f:
+        f.write('{"results": []}')
+    assert export_results(results_file, output_file) == (0, 1)
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(not hasattr(os, "wait4"), reason="peak RSS needs os.wait4")
+def test_peak_rss_does_not_grow_with_results(tmp_path):
+    peaks = []
+    for count in (100, results_export.SELF_CHECK_SIZES[-1]):
+        results_file, output_file = str(tmp_path / f"results_{count}.json"), str(tmp_path / f"{count}.pdf")
+        write_synthetic_results(results_file, count)
+        status, peak = results_export._peak_rss_kb([sys.executable, results_export.__file__, "--input", results_file,
+                                                    "--output", output_file, "--deterministic"])
+        assert status == 0
+        peaks.append(peak)
+    assert peaks[1] - peaks[0] < RSS_GROWTH_BOUND_KB, f"peak RSS {peaks[0]} KB -> {peaks[1]} KB"
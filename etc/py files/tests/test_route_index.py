@@ -0,0 +1,56 @@
+import os
+
+from route_index import BACKEND_DIR, routes_under, scan_routes
+
+SERVER_JS = """
+const express = require('express');
+const authRoutes = require('./routes/auth');
+const app = express();
+app.use('/api/auth', authRoutes);
+// Health check
+app.get('/api/health', (req, res) => res.json({ ok: true }));
+"""
+AUTH_JS = """
+const router = express.Router();
+// Log in with email and password
+router.post('/login', async (req, res) => {
+    res.send(`router.get('/not-a-route')`);
+});
+/* router.delete('/commented-out') */
+
+router.get('/', listUsers);
+module.exports = router;
+"""
+
+
+def write_backend(root, auth=AUTH_JS):
+    os.makedirs(root / "routes", exist_ok=True)
+    (root / "server.js").write_text(SERVER_JS, encoding="utf-8")
+    (root / "routes" / "auth.js").write_text(auth, encoding="utf-8")
+
+
+def test_routes_get_mount_prefix_and_description(tmp_path):
+    write_backend(tmp_path)
+    routes = scan_routes(str(tmp_path), str(tmp_path / "index.json"))
+    assert [(r.endpoint, r.file, r.description) for r in routes] == [
+        ("GET /api/health", "server.js", "Health check"),
+        ("POST /api/auth/login", "routes/auth.js", "Log in with email and password"),
+        ("GET /api/auth", "routes/auth.js", ""),
+    ]
+    assert routes[1].line == 4
+    assert [r.endpoint for r in routes_under(routes, "/api/auth")] == ["POST /api/auth/login", "GET /api/auth"]
+
+
+def test_edited_route_file_is_rescanned(tmp_path):
+    write_backend(tmp_path)
+    cache = str(tmp_path / "index.json")
+    scan_routes(str(tmp_path), cache)
+    write_backend(tmp_path, AUTH_JS.replace("router.get('/', listUsers);", "router.put('/password', change);"))
+    assert "PUT /api/auth/password" in [r.endpoint for r in scan_routes(str(tmp_path), cache)]
+
+
+def test_backend_serves_login(tmp_path):
+    if not os.path.exists(os.path.join(BACKEND_DIR, "server.js")):
+        return
+    endpoints = [r.endpoint for r in scan_routes(cache_path=str(tmp_path / "index.json"))]
+    assert "POST /api/auth/login" in endpoints
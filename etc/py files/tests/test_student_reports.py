@@ -0,0 +1,40 @@
+import json
+import os
+
+from student_reports import bucket_of, generate_reports, partition, report_filename
+from synthetic_data import write_dataset
+
+
+def test_partition_puts_each_student_in_one_bucket(tmp_path):
+    data_dir, work_dir = tmp_path / "data", tmp_path / "work"
+    os.makedirs(work_dir)
+    students, results = write_dataset(str(data_dir), 40, chapters=3, questions=4)
+    assert partition(str(data_dir), str(work_dir), 3) == (students, results)
+
+    seen, rows = [], 0
+    for k in range(3):
+        with open(work_dir / f"users_{k}.jsonl", encoding="utf-8") as f:
+            ids = [json.loads(line)["id"] for line in f]
+        assert all(bucket_of(user_id, 3) == k for user_id in ids)
+        seen += ids
+        with open(work_dir / f"results_{k}.jsonl", encoding="utf-8") as f:
+            for line in f:
+                row = json.loads(line)
+                assert bucket_of(row[0], 3) == k and len(row) == 7  # answers dropped
+                rows += 1
+    assert len(seen) == len(set(seen)) == students and rows == results
+
+
+def test_one_report_per_student(tmp_path, monkeypatch):
+    monkeypatch.setenv("KLA_DETERMINISTIC", "1")
+    data_dir, output_dir = tmp_path / "data", tmp_path / "reports"
+    students, _ = write_dataset(str(data_dir), 25, chapters=3, questions=4)
+    with open(data_dir / "users.json", encoding="utf-8") as f:
+        users = json.load(f)["users"]
+
+    results = generate_reports(str(data_dir), str(output_dir), jobs=1, buckets=2)
+    assert [result["error"] for result in results] == [None, None]
+    assert sorted(os.listdir(output_dir)) == sorted(report_filename(user) for user in users)
+    for name in os.listdir(output_dir):
+        with open(output_dir / name, "rb") as f:
+            assert f.read(5) == b"%PDF-"